@@ -0,0 +1,195 @@
+"""
+API Load Benchmark / API 负载基准
+
+Drives the FastAPI app with concurrent clients and reports throughput,
+latency percentiles and error counts per endpoint and concurrency level.
+The LLM is the replay provider with simulated latency, so results show
+the API's own overhead and concurrency behaviour, not a vendor's.
+
+By default the app runs in-process (httpx ASGI transport, no sockets).
+With --url, a running server is targeted instead; start it with the
+replay provider enabled and first in config.yaml.
+
+Usage:
+    python benchmarks/api_load.py [--concurrency 1 8 32] [--requests 64] [--json] [scenario ...]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.common import load_jds, load_resumes, replay_engine, summarize
+
+SCENARIOS = ["analyze", "analyze_stream", "batch_analyze_match", "search"]
+DEFAULT_CONCURRENCY = [1, 8, 32]
+
+
+class Workload:
+    """Request bodies for each scenario, cycling through the mock corpus."""
+
+    def __init__(self, resumes: List, jds: List):
+        self.resumes = resumes
+        self.jds = jds
+
+    def request(self, scenario: str, i: int) -> Dict:
+        name, resume = self.resumes[i % len(self.resumes)]
+        jd = self.jds[i % len(self.jds)][1]
+        if scenario in ("analyze", "analyze_stream"):
+            return {"url": f"/{scenario}", "files": {"resume_file": (name, resume.encode("utf-8"), "text/plain")},
+                    "data": {"jd_text": jd}}
+        if scenario == "batch_analyze_match":
+            files = [("files", (n, text.encode("utf-8"), "text/plain")) for n, text in self.resumes[:5]]
+            return {"url": "/batch_analyze_match", "files": files, "data": {"jd_text": jd, "screening": "false"}}
+        return {"url": "/search", "json": {"query": jd[:200], "limit": 10}}
+
+
+async def _timed_request(client, scenario: str, request: Dict) -> Dict:
+    """Send one request; latency to the full body and, for streams, to the first byte."""
+    url = request.pop("url")
+    start = time.perf_counter()
+    first_byte_ms = None
+    try:
+        async with client.stream("POST", url, **request) as response:
+            async for _ in response.aiter_bytes():
+                if first_byte_ms is None:
+                    first_byte_ms = (time.perf_counter() - start) * 1000
+            status = response.status_code
+    except Exception as e:
+        status = type(e).__name__
+    return {"status": status, "latency_ms": (time.perf_counter() - start) * 1000, "first_byte_ms": first_byte_ms}
+
+
+async def _load(client, workload: Workload, scenario: str, concurrency: int, total: int) -> Dict:
+    """total requests from concurrency clients, each sending its next request when the last completes."""
+    next_index = iter(range(total))
+    outcomes = []
+
+    async def worker():
+        for i in next_index:
+            outcomes.append(await _timed_request(client, scenario, workload.request(scenario, i)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    ok = [o for o in outcomes if o["status"] == 200]
+    result = {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": len(outcomes),
+        "errors": dict(Counter(str(o["status"]) for o in outcomes if o["status"] != 200)),
+        "throughput_rps": round(len(ok) / elapsed, 2),
+        "latency": summarize([o["latency_ms"] for o in ok]),
+    }
+    if scenario == "analyze_stream":
+        result["first_byte"] = summarize([o["first_byte_ms"] for o in ok if o["first_byte_ms"] is not None])
+    return result
+
+
+async def _run(client, workload: Workload, scenarios: List[str], concurrency: List[int], requests: int) -> List[Dict]:
+    if "search" in scenarios:
+        for name, text in workload.resumes:
+            await client.post("/index_text", json={"text": text, "metadata": {"source": name}})
+
+    results = []
+    for scenario in scenarios:
+        await _load(client, workload, scenario, 1, 2)  # Warm-up
+        for level in concurrency:
+            results.append(await _load(client, workload, scenario, level, max(requests, level)))
+    return results
+
+
+def run(scenarios: List[str] = None, concurrency: List[int] = None, requests: int = 64, url: str = None,
+        **replay_options) -> List[Dict]:
+    """
+    Run the load test.
+
+    Args:
+        scenarios: Scenarios to run (default: all)
+        concurrency: Concurrent client counts
+        requests: Requests per scenario and concurrency level
+        url: Base URL of a running server (default: in-process app)
+        **replay_options: Replay provider options for the in-process engine
+
+    Returns:
+        One result per scenario and concurrency level
+    """
+    import httpx
+
+    workload = Workload(load_resumes(), load_jds())
+    scenarios = scenarios or SCENARIOS
+    concurrency = concurrency or DEFAULT_CONCURRENCY
+    timeout = httpx.Timeout(300.0)
+    if url:
+        async def remote():
+            async with httpx.AsyncClient(base_url=url, timeout=timeout) as client:
+                return await _run(client, workload, scenarios, concurrency, requests)
+        return asyncio.run(remote())
+
+    from src import api_server
+    from src.core.parsing_service import get_parsing_service
+    from src.plugins.vector_stores.simple_store import SimpleVectorStore
+
+    previous = api_server.engine
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = replay_engine(**replay_options)
+        # Keep indexed benchmark resumes out of data/vector_store.json
+        engine._vector_store = SimpleVectorStore(storage_path=os.path.join(tmp, "vector_store.json"))
+        api_server.engine = engine
+
+        async def local():
+            transport = httpx.ASGITransport(app=api_server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=timeout) as client:
+                return await _run(client, workload, scenarios, concurrency, requests)
+        try:
+            return asyncio.run(local())
+        finally:
+            api_server.engine = previous
+            get_parsing_service().shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenarios", nargs="*", default=SCENARIOS, help=f"any of {', '.join(SCENARIOS)}")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=DEFAULT_CONCURRENCY, help="concurrent clients")
+    parser.add_argument("--requests", type=int, default=64, help="requests per scenario and concurrency level")
+    parser.add_argument("--url", help="base URL of a running server (default: in-process)")
+    parser.add_argument("--llm-latency-ms", type=float, default=300, help="replay LLM median latency")
+    parser.add_argument("--llm-ttft-ms", type=float, default=150, help="replay LLM median time to first token")
+    parser.add_argument("--llm-chunk-interval-ms", type=float, default=10, help="replay LLM mean gap between chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="replay LLM 5xx rate")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="replay LLM 429 rate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    results = run(
+        args.scenarios, args.concurrency, max(args.requests, 1), args.url,
+        latency_median_ms=args.llm_latency_ms, ttft_median_ms=args.llm_ttft_ms,
+        chunk_interval_ms=args.llm_chunk_interval_ms, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, seed=args.seed
+    )
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'scenario':<20} {'conc':>5} {'req/s':>8} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}  errors")
+    for r in results:
+        latency = r["latency"]
+        print(f"{r['scenario']:<20} {r['concurrency']:>5} {r['throughput_rps']:>8} {latency.get('p50_ms', '-'):>9} "
+              f"{latency.get('p90_ms', '-'):>9} {latency.get('p99_ms', '-'):>9}  {r['errors'] or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Cache Latency Benchmark / 缓存延迟基准
+
+Per storage backend:
+- raw save / load-hit / load-miss latency with analysis-sized values
+- engine-level evaluate_match latency on a cache miss (replay LLM with
+  no simulated latency, so only the engine's own work is measured)
+  versus a cache hit
+
+Supabase is included when SUPABASE_URL and SUPABASE_KEY are set.
+
+Usage:
+    python benchmarks/cache.py [--keys 200] [--json] [backend ...]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from typing import Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.common import load_jds, load_resumes, replay_engine, summarize, time_calls
+
+BACKENDS = ["memory", "local", "supabase"]
+
+
+def _payload(i: int, resume_text: str) -> Dict:
+    """A cached analysis result of realistic size."""
+    return {
+        "score": i % 100,
+        "status": "Recommended",
+        "dimensions": {name: {"score": 80, "comment": resume_text[:200]} for name in ("skills", "experience")},
+        "reason": resume_text[:1500],
+        "strengths": [resume_text[:80]] * 3,
+        "missing": [],
+    }
+
+
+def _create_storage(backend: str, cache_dir: str):
+    from src.plugins.storage import get_storage
+
+    if backend == "supabase":
+        if not (os.environ.get("SUPABASE_URL") and os.environ.get("SUPABASE_KEY")):
+            raise RuntimeError("SUPABASE_URL / SUPABASE_KEY not set")
+        return get_storage(backend, url=os.environ["SUPABASE_URL"], key=os.environ["SUPABASE_KEY"],
+                           table_name="benchmark_cache")
+    return get_storage(backend, cache_dir=cache_dir)
+
+
+def bench_backend(backend: str, keys: int, resumes: List) -> Dict:
+    """Raw storage operations."""
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = _create_storage(backend, tmp)
+        items = [(f"bench:{i}", _payload(i, resumes[i % len(resumes)][1])) for i in range(keys)]
+        try:
+            save = time_calls(storage.save, items)
+            hit = time_calls(storage.load, [(key,) for key, _ in items], repeat=3)
+            miss = time_calls(storage.load, [(f"bench:missing:{i}",) for i in range(keys)])
+        finally:
+            for key, _ in items:
+                storage.delete(key)
+    return {
+        "value_bytes": len(json.dumps(items[0][1], ensure_ascii=False).encode("utf-8")),
+        "save": summarize(save),
+        "load_hit": summarize(hit),
+        "load_miss": summarize(miss),
+    }
+
+
+def bench_engine(backend: str, resumes: List, jds: List) -> Dict:
+    """evaluate_match on a cold cache (LLM call) and again on a warm one."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = replay_engine(storage_backend=backend, cache_dir=tmp, time_scale=0)
+        pairs = [(resume, jd) for _, resume in resumes for _, jd in jds]
+        miss = time_calls(engine.evaluate_match, pairs)
+        hit = time_calls(engine.evaluate_match, pairs, repeat=3)
+    return {"evaluate_match_miss": summarize(miss), "evaluate_match_hit": summarize(hit)}
+
+
+def run(backends: List[str] = None, keys: int = 200) -> List[Dict]:
+    resumes = load_resumes()
+    jds = load_jds()
+    results = []
+    for backend in backends or BACKENDS:
+        try:
+            result = {"backend": backend, **bench_backend(backend, keys, resumes)}
+        except Exception as e:
+            results.append({"backend": backend, "skipped": str(e)})
+            continue
+        if backend != "supabase":  # The engine only passes cache_dir to its storage backend
+            result.update(bench_engine(backend, resumes, jds))
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("backends", nargs="*", default=BACKENDS, help=f"any of {', '.join(BACKENDS)}")
+    parser.add_argument("--keys", type=int, default=200, help="entries written per backend")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    unknown = [name for name in args.backends if name not in BACKENDS]
+    if unknown:
+        parser.error(f"unknown backend(s): {', '.join(unknown)}")
+
+    results = run(args.backends, max(args.keys, 1))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'backend':<10} {'operation':<22} {'p50 ms':>9} {'p99 ms':>9}")
+    for r in results:
+        if "skipped" in r:
+            print(f"{r['backend']:<10} skipped: {r['skipped']}")
+            continue
+        for operation in ("save", "load_hit", "load_miss", "evaluate_match_miss", "evaluate_match_hit"):
+            if operation in r:
+                print(f"{r['backend']:<10} {operation:<22} {r[operation]['p50_ms']:>9} {r[operation]['p99_ms']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark Helpers / 基准测试公共工具
+
+Corpus loading (mock resumes and JDs, fixture PDFs/DOCXs built from
+them) and latency summaries shared by the benchmark scripts.
+"""
+
+import contextlib
+import io
+import math
+import os
+import sys
+import tempfile
+import textwrap
+import time
+from typing import Callable, Dict, List, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Written by scripts/generate_mock_resumes.py (needs a live LLM, so the output is checked in)
+RESUME_DIRS = [
+    os.path.join(ROOT, "tests", "fixtures", "resumes"),
+    os.path.join(ROOT, "tests", "fixtures", "china_scenarios"),
+]
+
+PDF_LINES_PER_PAGE = 45
+
+
+def percentile(sorted_samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted samples (q in 0-100)."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(sorted_samples)), 1)
+    return sorted_samples[min(rank, len(sorted_samples)) - 1]
+
+
+def summarize(samples_ms: List[float]) -> Dict:
+    """Count, mean and percentiles of latency samples (milliseconds)."""
+    ordered = sorted(samples_ms)
+    if not ordered:
+        return {"n": 0}
+    return {
+        "n": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered), 3),
+        "p50_ms": round(percentile(ordered, 50), 3),
+        "p90_ms": round(percentile(ordered, 90), 3),
+        "p99_ms": round(percentile(ordered, 99), 3),
+        "min_ms": round(ordered[0], 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def time_calls(fn: Callable, args_list: List, repeat: int = 1) -> List[float]:
+    """Call fn(*args) for every args tuple, repeat times; per-call latencies in ms."""
+    samples = []
+    for _ in range(repeat):
+        for args in args_list:
+            start = time.perf_counter()
+            fn(*args)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def load_resumes() -> List[Tuple[str, str]]:
+    """Mock resumes as (file name, text)."""
+    resumes = []
+    for directory in RESUME_DIRS:
+        for name in sorted(os.listdir(directory)):
+            if not name.startswith("jd_"):
+                with open(os.path.join(directory, name), "r", encoding="utf-8") as f:
+                    resumes.append((name, f.read()))
+    return resumes
+
+
+def load_jds() -> List[Tuple[str, str]]:
+    """Mock JDs as (file name, text), freshly written by scripts/generate_mock_jds.py."""
+    scripts_dir = os.path.join(ROOT, "scripts")
+    if scripts_dir not in sys.path:
+        sys.path.append(scripts_dir)
+    from generate_mock_jds import generate_mock_jds
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_mock_jds(tmp)
+        jds = []
+        for name in sorted(os.listdir(tmp)):
+            with open(os.path.join(tmp, name), "r", encoding="utf-8") as f:
+                jds.append((name, f.read()))
+    return jds
+
+
+def build_documents(resumes: List[Tuple[str, str]]) -> Dict[str, List[Tuple[str, bytes]]]:
+    """
+    Fixture documents built from the resumes, by file extension.
+
+    PDFs use the standard Helvetica font, so their text is limited to
+    ASCII (other characters are dropped); DOCX and text keep everything.
+    """
+    from tests.fixture_builders import build_docx, build_pdf
+
+    documents = {".pdf": [], ".docx": [], ".txt": []}
+    for name, text in resumes:
+        stem = os.path.splitext(name)[0]
+        lines = []
+        for line in text.splitlines():
+            ascii_line = line.encode("ascii", "ignore").decode().strip()
+            lines.extend(textwrap.wrap(ascii_line, 90) or [""])
+        pages = [lines[i:i + PDF_LINES_PER_PAGE] for i in range(0, len(lines), PDF_LINES_PER_PAGE)] or [[""]]
+
+        documents[".pdf"].append((stem + ".pdf", build_pdf(pages)))
+        documents[".docx"].append((stem + ".docx", build_docx([p for p in text.split("\n\n") if p.strip()])))
+        documents[".txt"].append((stem + ".txt", text.encode("utf-8")))
+    return documents
+
+
+def replay_engine(storage_backend: str = None, cache_dir: str = None, **options):
+    """
+    Engine on the replay provider (no network, no API key).
+
+    Args:
+        storage_backend: Storage backend for the engine's cache (None = caching off)
+        cache_dir: Cache directory for file-based storage
+        **options: Replay provider options (latency_median_ms, time_scale, ...)
+
+    Returns:
+        TalentOSEngine
+    """
+    import dataclasses
+    from src.core.config import LLMProviderConfig, ModelConfig, RoutingConfig, StorageConfig, get_config
+    from src.core.engine import TalentOSEngine
+
+    replay = LLMProviderConfig(
+        provider="replay",
+        models=[ModelConfig(name="replay", context_window=128000)],
+        default_model="replay",
+        options=options
+    )
+    config = dataclasses.replace(
+        get_config(),
+        llm_providers={"replay": replay},
+        storage=StorageConfig(backend=storage_backend or "memory", enabled=storage_backend is not None),
+        routing=RoutingConfig(enabled=False),
+        cache_dir=cache_dir or get_config().cache_dir
+    )
+    return TalentOSEngine(config=config, llm_provider="replay")
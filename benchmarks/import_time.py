@@ -0,0 +1,98 @@
+"""
+Import-Time Benchmark / 导入耗时基准
+
+Measures cold import time of the API's entry modules, each in a fresh
+interpreter (`python -X importtime`), and lists which heavy optional
+dependencies got imported along the way.
+
+Usage:
+    python benchmarks/import_time.py [--repeat 5] [--json] [module ...]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+DEFAULT_MODULES = [
+    "src",
+    "src.plugins.llm_providers",
+    "src.plugins.storage",
+    "src.plugins.document_parsers",
+    "src.core.engine",
+    "src.api_server",
+]
+
+# Optional dependencies that should only load when their plugin is selected
+HEAVY_MODULES = [
+    "openai", "anthropic", "httpx", "supabase", "sentence_transformers", "torch",
+    "onnxruntime", "pdfplumber", "pypdfium2", "docx", "numpy",
+]
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\| (\s*)(\S+)")
+
+
+def measure(module: str) -> Dict:
+    """Import module in a fresh interpreter and return timings (microseconds)."""
+    code = (
+        f"import sys; import {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match and not match.group(3):  # Top-level imports only
+            cumulative[match.group(4)] = int(match.group(2))
+    total_us = sum(cumulative.values())
+    return {
+        "module_us": cumulative.get(module, 0),
+        "total_us": total_us,
+        "heavy_imports": [m for m in proc.stdout.strip().split(",") if m],
+    }
+
+
+def run(modules: List[str], repeat: int) -> List[Dict]:
+    results = []
+    for module in modules:
+        runs = [measure(module) for _ in range(repeat)]
+        results.append({
+            "module": module,
+            "median_ms": round(statistics.median(r["total_us"] for r in runs) / 1000, 1),
+            "min_ms": round(min(r["total_us"] for r in runs) / 1000, 1),
+            "heavy_imports": runs[-1]["heavy_imports"],
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per module")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.modules, max(args.repeat, 1))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'module':<32} {'median ms':>10} {'min ms':>8}  heavy imports")
+    for r in results:
+        print(f"{r['module']:<32} {r['median_ms']:>10} {r['min_ms']:>8}  {', '.join(r['heavy_imports']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
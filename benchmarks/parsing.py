@@ -0,0 +1,98 @@
+"""
+Parsing Throughput Benchmark / 文档解析吞吐基准
+
+Parses fixture PDF, DOCX and text documents (built from the mock
+resumes) with every registered parser for the format and reports
+documents/s, MB/s and per-document latency. Parsers are called
+directly, bypassing the parse cache and the worker pool.
+
+Usage:
+    python benchmarks/parsing.py [--repeat 5] [--json] [parser ...]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.common import build_documents, load_resumes, summarize
+
+# Parser -> document extension it is benchmarked on
+PARSERS = {
+    "pdf": ".pdf",
+    "pdf_fast": ".pdf",
+    "docx": ".docx",
+    "docx_fast": ".docx",
+    "text": ".txt",
+}
+
+
+def run(parsers: List[str] = None, repeat: int = 5) -> List[Dict]:
+    from src.plugins.document_parsers import get_parser
+
+    documents = build_documents(load_resumes())
+    results = []
+    for name in parsers or list(PARSERS):
+        extension = PARSERS[name]
+        docs = documents[extension]
+        try:
+            parser = get_parser(name)
+            parser.parse_bytes(docs[0][1], extension, docs[0][0])  # Warm-up (lazy imports)
+        except Exception as e:
+            results.append({"parser": name, "skipped": str(e)})
+            continue
+
+        samples = []
+        chars = 0
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for file_name, content in docs:
+                doc_start = time.perf_counter()
+                chars += len(parser.parse_bytes(content, extension, file_name).content)
+                samples.append((time.perf_counter() - doc_start) * 1000)
+        elapsed = time.perf_counter() - start
+
+        total_bytes = sum(len(content) for _, content in docs) * repeat
+        results.append({
+            "parser": name,
+            "format": extension,
+            "documents": len(samples),
+            "docs_per_s": round(len(samples) / elapsed, 1),
+            "mb_per_s": round(total_bytes / elapsed / 1e6, 2),
+            "chars_per_doc": chars // len(samples),
+            "latency": summarize(samples),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("parsers", nargs="*", default=list(PARSERS), help=f"any of {', '.join(PARSERS)}")
+    parser.add_argument("--repeat", type=int, default=5, help="passes over the fixture documents")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    unknown = [name for name in args.parsers if name not in PARSERS]
+    if unknown:
+        parser.error(f"unknown parser(s): {', '.join(unknown)}")
+
+    results = run(args.parsers, max(args.repeat, 1))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'parser':<12} {'docs/s':>9} {'MB/s':>7} {'p50 ms':>8} {'p99 ms':>8}")
+    for r in results:
+        if "skipped" in r:
+            print(f"{r['parser']:<12} skipped: {r['skipped']}")
+            continue
+        latency = r["latency"]
+        print(f"{r['parser']:<12} {r['docs_per_s']:>9} {r['mb_per_s']:>7} "
+              f"{latency['p50_ms']:>8} {latency['p99_ms']:>8}")
+
+
+if __name__ == "__main__":
+    main()
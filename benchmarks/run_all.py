@@ -0,0 +1,150 @@
+"""
+Benchmark Suite / 基准测试套件
+
+Runs the parsing, cache, vector search and API load benchmarks and
+writes one JSON report (results plus environment) for regression
+tracking. With --compare, latency and throughput figures are checked
+against an earlier report; the exit status is 1 if any regressed by
+more than the tolerance.
+
+Usage:
+    python benchmarks/run_all.py [--quick] [--output report.json] [--compare baseline.json] [suite ...]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks import api_load, cache, parsing, vector_search
+from benchmarks.common import ROOT
+
+SUITES = ["parsing", "cache", "vector_search", "api_load"]
+
+# Fields identifying a result row within its suite
+ROW_KEYS = {
+    "parsing": ("parser",),
+    "cache": ("backend",),
+    "vector_search": ("corpus_size",),
+    "api_load": ("scenario", "concurrency"),
+}
+
+HIGHER_IS_BETTER = ("docs_per_s", "mb_per_s", "throughput_rps")
+
+
+def run_suite(name: str, quick: bool) -> List[Dict]:
+    if name == "parsing":
+        return parsing.run(repeat=1 if quick else 5)
+    if name == "cache":
+        return cache.run(keys=20 if quick else 200)
+    if name == "vector_search":
+        return vector_search.run(sizes=[100, 1000] if quick else None, queries=10 if quick else 50)
+    if quick:
+        return api_load.run(concurrency=[1, 4], requests=4, latency_median_ms=20, ttft_median_ms=10,
+                            chunk_interval_ms=1)
+    return api_load.run(latency_median_ms=300, ttft_median_ms=150, chunk_interval_ms=10)
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def metrics(report: Dict) -> Dict[str, float]:
+    """Flatten a report into {"suite/row/field/stat": value} for comparison."""
+    flat = {}
+
+    def walk(prefix: str, value):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                walk(f"{prefix}/{key}", item)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[prefix] = value
+
+    for suite, rows in report["results"].items():
+        for row in rows:
+            row_id = ",".join(str(row[key]) for key in ROW_KEYS[suite])
+            walk(f"{suite}/{row_id}", {k: v for k, v in row.items() if k not in ROW_KEYS[suite]})
+    return flat
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float) -> List[Tuple[str, float, float]]:
+    """
+    Figures that got worse than the baseline by more than tolerance.
+
+    Only latencies (*_ms, except min/max) and throughputs are compared.
+
+    Returns:
+        List of (metric, baseline value, current value)
+    """
+    current = metrics(report)
+    regressions = []
+    for name, old in metrics(baseline).items():
+        field = name.rsplit("/", 1)[-1]
+        new = current.get(name)
+        if new is None or not old:
+            continue
+        if field in HIGHER_IS_BETTER:
+            worse = new < old * (1 - tolerance)
+        elif field.endswith("_ms") and field not in ("min_ms", "max_ms"):
+            worse = new > old * (1 + tolerance)
+        else:
+            continue
+        if worse:
+            regressions.append((name, old, new))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("suites", nargs="*", default=SUITES, help=f"any of {', '.join(SUITES)}")
+    parser.add_argument("--quick", action="store_true", help="small sizes, for smoke runs")
+    parser.add_argument("--output", help="write the JSON report to this file (default: stdout)")
+    parser.add_argument("--compare", help="baseline report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args()
+    unknown = [name for name in args.suites if name not in SUITES]
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(unknown)}")
+
+    report = {"environment": environment(), "quick": args.quick, "results": {}}
+    for suite in args.suites:
+        print(f"Running {suite}...", file=sys.stderr)
+        report["results"][suite] = run_suite(suite, args.quick)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"Report written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for name, old, new in regressions:
+            print(f"REGRESSION {name}: {old} -> {new}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("No regressions.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
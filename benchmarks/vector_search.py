@@ -0,0 +1,71 @@
+"""
+Vector Search Benchmark / 向量检索基准
+
+Top-k search latency of the vector store as the corpus grows. Documents
+are the mock resumes repeated up to the corpus size, with seeded random
+unit embeddings (search cost does not depend on the embedding model).
+
+Usage:
+    python benchmarks/vector_search.py [--sizes 100 1000 5000] [--dim 512] [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.common import load_resumes, summarize, time_calls
+
+DEFAULT_SIZES = [100, 1000, 5000, 10000]
+
+
+def run(sizes: List[int] = None, dim: int = 512, queries: int = 50, limit: int = 10, seed: int = 0) -> List[Dict]:
+    from src.interfaces.ivector_store import VectorDocument
+    from src.plugins.vector_stores.simple_store import SimpleVectorStore
+
+    resumes = load_resumes()
+    rng = np.random.default_rng(seed)
+    query_vectors = rng.standard_normal((queries, dim))
+    results = []
+    for size in sizes or DEFAULT_SIZES:
+        vectors = rng.standard_normal((size, dim))
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SimpleVectorStore(storage_path=os.path.join(tmp, "vector_store.json"))
+            store.add_documents([
+                VectorDocument(id=f"doc-{i}", content=resumes[i % len(resumes)][1],
+                               metadata={"source": resumes[i % len(resumes)][0]}, embedding=vectors[i].tolist())
+                for i in range(size)
+            ])
+            samples = time_calls(store.search, [(q.tolist(), limit) for q in query_vectors])
+        results.append({"corpus_size": size, "dim": dim, "limit": limit, "search": summarize(samples)})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="corpus sizes")
+    parser.add_argument("--dim", type=int, default=512, help="embedding dimension")
+    parser.add_argument("--queries", type=int, default=50, help="queries per corpus size")
+    parser.add_argument("--limit", type=int, default=10, help="top-k")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.dim, max(args.queries, 1), args.limit)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'corpus':>8} {'p50 ms':>9} {'p99 ms':>9}")
+    for r in results:
+        print(f"{r['corpus_size']:>8} {r['search']['p50_ms']:>9} {r['search']['p99_ms']:>9}")
+
+
+if __name__ == "__main__":
+    main()
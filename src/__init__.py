@@ -1,18 +1,25 @@
 """
 TalentOS Package / 人才操作系统主包
 
-v1.0 Plugin-based architecture.
+v1.0 Plugin-based architecture. Exports are imported on first access
+(PEP 562), so importing a submodule does not load the engine.
 """
 
-from .core.engine import TalentOSEngine, create_engine, AnalysisResult
-from .core.config import get_config, reload_config, AppConfig
-from .core.exceptions import (
-    TalentOSError,
-    PluginError,
-    LLMProviderError,
-    DocumentParserError,
-    StorageError,
-)
+from importlib import import_module
+
+_EXPORTS = {
+    'TalentOSEngine': '.core.engine',
+    'create_engine': '.core.engine',
+    'AnalysisResult': '.core.engine',
+    'get_config': '.core.config',
+    'reload_config': '.core.config',
+    'AppConfig': '.core.config',
+    'TalentOSError': '.core.exceptions',
+    'PluginError': '.core.exceptions',
+    'LLMProviderError': '.core.exceptions',
+    'DocumentParserError': '.core.exceptions',
+    'StorageError': '.core.exceptions',
+}
 
 __version__ = "1.0.0"
 
@@ -29,3 +36,11 @@ __all__ = [
     'DocumentParserError',
     'StorageError',
 ]
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
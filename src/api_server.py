@@ -1,16 +1,16 @@
 
 import os
 import sys
+import time
+import asyncio
 import logging
-import tempfile
-import shutil
 import json
 from typing import Optional, Dict, Any, List
 from pathlib import Path
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
@@ -19,8 +19,13 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from src.core.engine import TalentOSEngine
 from src.core.config import get_config
-from src.core.exceptions import TalentOSError, UnsupportedFormatError
-from src.plugins.document_parsers import get_parser_for_file, get_parser
+from src.core.exceptions import TalentOSError, UnsupportedFormatError, UploadError, UploadTooLargeError
+from src.core.parsing_service import get_parsing_service, ParseOutcome
+from src.core.uploads import UploadReader, UploadLimitMiddleware
+from src.core.parse_cache import get_parse_cache
+from src.core.ingestion import get_ingestion_pipeline
+from src.core.metrics import get_metrics, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from src.plugins.document_parsers import shutdown_worker_pools
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -36,13 +41,25 @@ async def lifespan(app: FastAPI):
     try:
         logger.info("Initializing TalentOS Engine...")
         engine = TalentOSEngine()
+        engine.health_monitor.start()
+        # Load the local embedding model off the request path (first search would wait otherwise)
+        engine.warm_up_embeddings()
         logger.info("Engine initialized successfully.")
     except Exception as e:
         logger.error(f"Failed to initialize engine: {e}")
         # We don't raise here to allow the server to start, but health check will fail
+    try:
+        get_parsing_service().start()
+        logger.info(f"Parsing service started ({get_parsing_service().max_workers} workers).")
+    except Exception as e:
+        logger.error(f"Failed to start parsing service: {e}")
     yield
     # Cleanup if necessary
     logger.info("Shutting down...")
+    get_parsing_service().shutdown()
+    shutdown_worker_pools()
+    if engine:
+        engine.health_monitor.stop()
 
 app = FastAPI(
     title="TalentOS API",
@@ -61,6 +78,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Reject oversized request bodies while they stream in
+app.add_middleware(UploadLimitMiddleware)
+
 @app.middleware("http")
 async def strip_api_prefix(request, call_next):
     """Strip /api prefix from path if present."""
@@ -113,80 +133,65 @@ def get_file_extension(filename: str) -> str:
     _, ext = os.path.splitext(filename)
     return ext.lower()
 
+async def _ingest_upload(reader: UploadReader, upload: UploadFile, label: str = "file") -> str:
+    """Read and parse an upload through the ingestion pipeline, mapping failures to HTTP errors."""
+    ext = get_file_extension(upload.filename or "")
+    logger.info(f"Received {label}: {upload.filename} ({ext})")
+
+    try:
+        doc = await get_ingestion_pipeline().ingest_upload(upload, reader)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UnsupportedFormatError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported {label} format: {ext}. Supported: PDF, DOCX, TXT, MD"
+        )
+    except UploadError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except Exception as e:
+        logger.error(f"Parsing error ({label}): {e}")
+        raise HTTPException(status_code=400, detail=f"Failed to parse {label}: {str(e)}")
+
+    return doc.content
+
+async def _ingest_uploads(reader: UploadReader, files: List[UploadFile]) -> List[ParseOutcome]:
+    """Read and parse a batch of uploads in the worker pool."""
+    try:
+        return await get_ingestion_pipeline().ingest_uploads(files, reader)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+def _timed_stream(endpoint: str, generator, start: float):
+    """Pass a stream through, recording when its first chunk was ready (from start)."""
+    first = True
+    for chunk in generator:
+        if first:
+            get_metrics().record_endpoint_first_chunk(endpoint, (time.perf_counter() - start) * 1000)
+            first = False
+        yield chunk
+
 async def _process_upload_request(
     resume_file: UploadFile,
     jd_file: Optional[UploadFile],
     jd_text: Optional[str]
 ) -> tuple[str, str]:
     """Helper to process uploaded files and text."""
+    reader = get_ingestion_pipeline().new_reader()
+
     # 0. Process JD (Text or File)
     final_jd_text = ""
     
     if jd_file:
-        # Parse JD file
-        jd_ext = get_file_extension(jd_file.filename)
-        logger.info(f"Received JD file: {jd_file.filename} ({jd_ext})")
-        
-        # Map extension to parser
-        ext_map = {
-            '.pdf': 'pdf',
-            '.docx': 'docx',
-            '.doc': 'docx',
-            '.txt': 'text',
-            '.md': 'text'
-        }
-        jd_parser_name = ext_map.get(jd_ext)
-        if not jd_parser_name:
-                raise HTTPException(
-                status_code=400, 
-                detail=f"Unsupported JD file format: {jd_ext}. Supported: PDF, DOCX, TXT, MD"
-            )
-        
-        jd_parser = get_parser(jd_parser_name)
-        jd_bytes = await jd_file.read()
-        try:
-            final_jd_text = jd_parser.parse_content(jd_bytes, jd_ext)
-        except Exception as e:
-            logger.error(f"JD Parsing error: {e}")
-            raise HTTPException(status_code=400, detail=f"Failed to parse JD file: {str(e)}")
-    
+        final_jd_text = await _ingest_upload(reader, jd_file, "JD file")
     elif jd_text:
         final_jd_text = jd_text
     
     if not final_jd_text or len(final_jd_text.strip()) == 0:
             raise HTTPException(status_code=400, detail="Job Description is required (text or file)")
 
-    # 1. Validate resume file extension
-    ext = get_file_extension(resume_file.filename)
-    logger.info(f"Received file: {resume_file.filename} ({ext})")
-
-    # 2. Get appropriate parser
-    ext_map = {
-        '.pdf': 'pdf',
-        '.docx': 'docx',
-        '.doc': 'docx',
-        '.txt': 'text',
-        '.md': 'text'
-    }
-    
-    parser_name = ext_map.get(ext)
-    if not parser_name:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Unsupported file format: {ext}. Supported: PDF, DOCX, TXT, MD"
-        )
-
-    parser = get_parser(parser_name)
-
-    # 3. Read file content
-    content_bytes = await resume_file.read()
-    
-    # 4. Parse content
-    try:
-        resume_text = parser.parse_content(content_bytes, ext)
-    except Exception as e:
-        logger.error(f"Parsing error: {e}")
-        raise HTTPException(status_code=400, detail=f"Failed to parse file: {str(e)}")
+    # 1. Validate, read (streamed, size-limited) and parse the resume
+    resume_text = await _ingest_upload(reader, resume_file)
 
     if not resume_text or len(resume_text.strip()) == 0:
         raise HTTPException(status_code=400, detail="Parsed resume content is empty")
@@ -207,7 +212,9 @@ async def health_check():
         )
     
     try:
-        health = engine.health_check()
+        # In-memory snapshot: no LLM request or storage round trip per probe
+        health = dict(engine.health_check())
+        health["parse_cache"] = get_parse_cache().get_stats()
         status_str = "healthy" if health.get("llm_provider", {}).get("healthy") else "degraded"
         return HealthCheckResponse(
             status=status_str,
@@ -221,6 +228,11 @@ async def health_check():
             version="1.0.0"
         )
 
+@app.get("/metrics")
+async def metrics():
+    """LLM request, token, cost and cache metrics in the Prometheus text format."""
+    return Response(content=get_metrics().render(), media_type=METRICS_CONTENT_TYPE)
+
 @app.post("/analyze", response_model=AnalysisResponse)
 async def analyze_resume(
     resume_file: UploadFile = File(...),
@@ -238,7 +250,7 @@ async def analyze_resume(
 
     try:
         # 5. Call Engine
-        result = engine.analyze_resume(
+        result = engine.analyze(
             resume_text=resume_text,
             jd_text=final_jd_text,
             persona=persona
@@ -263,6 +275,8 @@ async def analyze_resume_stream(
     """
     Analyze a resume file against a job description with streaming response.
     """
+    # Handler entry: the upload has been received, parsing and the model call are timed
+    start = time.perf_counter()
     if not engine:
         raise HTTPException(status_code=503, detail="Engine not initialized")
 
@@ -272,7 +286,7 @@ async def analyze_resume_stream(
         def stream_with_ping(generator):
             """Yield a space immediately to establish connection."""
             yield " "
-            yield from generator
+            yield from _timed_stream("/analyze_stream", generator, start)
 
         return StreamingResponse(
             stream_with_ping(engine.analyze_resume_stream(
@@ -304,19 +318,7 @@ async def optimize_jd(
 
     final_jd_text = ""
     if jd_file:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(jd_file.filename)[1]) as tmp:
-            shutil.copyfileobj(jd_file.file, tmp)
-            tmp_path = tmp.name
-        try:
-            parser = get_parser_for_file(tmp_path)
-            doc = parser.parse(tmp_path)
-            final_jd_text = doc.content
-        except Exception as e:
-            logger.error(f"Error parsing JD file: {e}")
-            raise HTTPException(status_code=400, detail=f"Failed to parse JD file: {str(e)}")
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+        final_jd_text = await _ingest_upload(get_ingestion_pipeline().new_reader(), jd_file, "JD file")
     elif jd_text:
         final_jd_text = jd_text
     
@@ -342,69 +344,86 @@ async def batch_parse_resumes(files: List[UploadFile] = File(...)):
          raise HTTPException(status_code=503, detail="Engine not initialized")
     
     results = []
-    
-    with tempfile.TemporaryDirectory() as temp_dir:
-        for file in files:
-            try:
-                # Save uploaded file
-                temp_path = os.path.join(temp_dir, file.filename)
-                with open(temp_path, "wb") as buffer:
-                    shutil.copyfileobj(file.file, buffer)
-                
-                # Parse document text
-                # Note: get_parser_for_file might raise PluginNotFoundError if format not supported
-                parser = get_parser_for_file(temp_path)
-                parsed_doc = parser.parse(temp_path)
-                resume_text = parsed_doc.content
-                
-                # Extract fields using Engine
-                extraction_result = engine.extract_resume_fields(resume_text=resume_text)
-                
-                results.append({
-                    "filename": file.filename,
-                    "status": "success",
-                    "data": extraction_result
-                })
-                
-            except Exception as e:
-                logger.error(f"Error processing {file.filename}: {e}")
-                results.append({
-                    "filename": file.filename,
-                    "status": "error",
-                    "error": str(e)
-                })
-                
+
+    # Parse all documents in the worker pool first
+    outcomes = await _ingest_uploads(get_ingestion_pipeline().new_reader(), files)
+
+    for outcome in outcomes:
+        try:
+            if not outcome.ok:
+                raise TalentOSError(outcome.error)
+
+            # Extract fields using Engine
+            extraction_result = engine.extract_resume_fields(resume_text=outcome.content)
+
+            results.append({
+                "filename": outcome.file_name,
+                "status": "success",
+                "data": extraction_result
+            })
+
+        except Exception as e:
+            logger.error(f"Error processing {outcome.file_name}: {e}")
+            results.append({
+                "filename": outcome.file_name,
+                "status": "error",
+                "error": str(e)
+            })
+
     return results
 
+@app.post("/extract_fields_stream")
+async def extract_fields_stream(resume_file: UploadFile = File(...)):
+    """
+    Extract structured resume fields, streaming each field as it arrives.
+
+    Server-sent events: one "field" event per completed top-level field,
+    then a "done" event with the validated result (or an "error" event).
+    """
+    start = time.perf_counter()
+    if not engine:
+        raise HTTPException(status_code=503, detail="Engine not initialized")
+
+    resume_text = await _ingest_upload(get_ingestion_pipeline().new_reader(), resume_file)
+    if not resume_text or len(resume_text.strip()) == 0:
+        raise HTTPException(status_code=400, detail="Parsed resume content is empty")
+
+    def events():
+        try:
+            stream = engine.extract_resume_fields_stream(resume_text=resume_text)
+            for event in _timed_stream("/extract_fields_stream", stream, start):
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+        except TalentOSError as e:
+            logger.error(f"Extraction error: {e}")
+            yield f"data: {json.dumps({'event': 'error', 'error': str(e)}, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
 @app.post("/batch_analyze_match")
 async def batch_analyze_match(
     files: List[UploadFile] = File(...),
     jd_text: Optional[str] = Form(None),
     jd_file: Optional[UploadFile] = File(None),
-    weights: Optional[str] = Form(None) # JSON string: {"skills":30, "experience":30...}
+    weights: Optional[str] = Form(None), # JSON string: {"skills":30, "experience":30...}
+    screening: Optional[bool] = Form(None), # Local pre-ranking (config default if omitted)
+    top_k: Optional[int] = Form(None), # Resumes scored by the LLM (0 = no limit)
+    min_local_score: Optional[float] = Form(None) # Local score (0-100) needed for the LLM
 ):
     """
     Batch analyze match between multiple resumes and a JD (Text or File).
+
+    With screening enabled, resumes are ranked locally first and only the
+    best-ranked ones are scored by the LLM; the rest carry their local
+    score and "scored_by": "local".
     """
     if not engine:
         raise HTTPException(status_code=503, detail="Engine not initialized")
 
     # 1. Process JD
+    reader = get_ingestion_pipeline().new_reader()
     final_jd_text = ""
     if jd_file:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(jd_file.filename)[1]) as tmp:
-            shutil.copyfileobj(jd_file.file, tmp)
-            tmp_path = tmp.name
-        try:
-            parser = get_parser_for_file(tmp_path)
-            doc = parser.parse(tmp_path)
-            final_jd_text = doc.content
-        except Exception as e:
-            logger.error(f"Error parsing JD file: {e}")
-            raise HTTPException(status_code=400, detail=f"Failed to parse JD file: {str(e)}")
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+        final_jd_text = await _ingest_upload(reader, jd_file, "JD file")
     elif jd_text:
         final_jd_text = jd_text
     
@@ -419,59 +438,60 @@ async def batch_analyze_match(
         except:
             pass # Ignore invalid weights
 
-    # 3. Process Resumes
-    results = []
-    
-    # Process files sequentially (to avoid API rate limits if parallel)
+    # 3. Parse Resumes in the worker pool
+    outcomes = await _ingest_uploads(reader, files)
+
+    # 4. Evaluate Resumes, several per LLM request
     # For production, this should be a background task (Celery/Redis Queue)
-    for file in files:
-        # ... (file saving and parsing logic similar to parse_batch)
-        # We reuse logic here for simplicity in this MVP
-        
-        tmp_path = None
-        try:
-            suffix = os.path.splitext(file.filename)[1]
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                shutil.copyfileobj(file.file, tmp)
-                tmp_path = tmp.name
-            
-            # Parse Resume Text
-            parser = get_parser_for_file(tmp_path)
-            doc = parser.parse(tmp_path)
-            resume_text = doc.content
-            
-            # Evaluate Match
-            analysis = engine.evaluate_match(
-                resume_text=resume_text, 
+    parsed = [outcome for outcome in outcomes if outcome.ok]
+    use_screening = screening if screening is not None else get_config().screening.enabled
+    try:
+        if use_screening:
+            analyses = engine.screen_candidates(
+                [outcome.content for outcome in parsed],
                 jd_text=final_jd_text,
+                top_k=top_k,
+                min_local_score=min_local_score,
                 weights=match_weights
             )
-            
-            # Add filename
-            analysis["filename"] = file.filename
-            
-            # Ensure ID
-            if "id" not in analysis:
-                analysis["id"] = os.path.splitext(file.filename)[0] # Fallback ID
+        else:
+            analyses = engine.evaluate_match_batch(
+                [outcome.content for outcome in parsed],
+                jd_text=final_jd_text,
+                weights=match_weights
+            )
+    except Exception as e:
+        logger.error(f"Batch match evaluation failed: {e}")
+        analyses = [{"status": "Error", "error": str(e), "score": 0, "reason": "Processing failed"}] * len(parsed)
+    evaluated = {id(outcome): analysis for outcome, analysis in zip(parsed, analyses)}
 
-            results.append(analysis)
-            
-        except Exception as e:
-            logger.error(f"Error processing file {file.filename}: {e}")
+    results = []
+    for outcome in outcomes:
+        if not outcome.ok:
+            logger.error(f"Error processing file {outcome.file_name}: {outcome.error}")
             results.append({
-                "filename": file.filename,
+                "filename": outcome.file_name,
                 "status": "Error",
-                "error": str(e),
+                "error": outcome.error,
                 "score": 0,
                 "reason": "Processing failed"
             })
-        finally:
-            if tmp_path and os.path.exists(tmp_path):
-                try:
-                    os.remove(tmp_path)
-                except:
-                    pass
-                    
+            continue
+
+        # Copy: cached results may be shared between identical resumes
+        analysis = dict(evaluated[id(outcome)])
+        if analysis.get("status") == "Error" and "error" in analysis:
+            logger.error(f"Error processing file {outcome.file_name}: {analysis['error']}")
+
+        # Add filename
+        analysis["filename"] = outcome.file_name
+
+        # Ensure ID
+        if "id" not in analysis:
+            analysis["id"] = os.path.splitext(outcome.file_name)[0] # Fallback ID
+
+        results.append(analysis)
+
     return results
 
 class MessageRequest(BaseModel):
@@ -536,11 +556,11 @@ async def search_candidates(req: SearchRequest):
     
     try:
         # Check if vector store is enabled
-        status = engine.health_check()
-        if not status["vector_store"]["enabled"]:
+        if not engine.vector_store_enabled:
              raise HTTPException(status_code=501, detail="Vector store not enabled")
 
-        results = engine.search_candidates(req.query, limit=req.limit)
+        # Blocks on the embedding batch; keep it off the event loop
+        results = await asyncio.to_thread(engine.search_candidates, req.query, limit=req.limit)
         
         # Convert to response model
         items = [
@@ -568,7 +588,7 @@ async def index_candidate_text(req: IndexRequest):
         raise HTTPException(status_code=503, detail="Engine not initialized")
         
     try:
-        success = engine.index_resume(req.text, metadata=req.metadata)
+        success = await asyncio.to_thread(engine.index_resume, req.text, metadata=req.metadata)
         if success:
             return {"status": "success", "message": "Resume indexed successfully"}
         else:
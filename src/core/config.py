@@ -42,6 +42,7 @@ class LLMProviderConfig:
     default_model: str = ""
     timeout: int = 60
     max_retries: int = 3
+    options: Dict[str, Any] = field(default_factory=dict)  # Provider-specific settings
 
 
 @dataclass
@@ -61,6 +62,169 @@ class StorageConfig:
     options: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class ParsingConfig:
+    """Configuration for the process-pool parsing service."""
+    enabled: bool = True
+    max_workers: int = 0  # 0 = one worker per CPU core
+    file_timeout: int = 30  # Seconds allowed per file
+    warm_start: bool = True
+    cache_enabled: bool = True
+    cache_backend: str = "memory"
+    cache_max_items: int = 512
+    cache_ttl: int = 86400  # 24 hours
+
+
+@dataclass
+class UploadConfig:
+    """Configuration for streaming upload handling."""
+    max_file_bytes: int = 10 * 1024 * 1024  # 10 MB per file
+    max_request_bytes: int = 60 * 1024 * 1024  # 60 MB per request body
+    chunk_size: int = 64 * 1024
+    sniff_content: bool = True  # Check magic bytes against the file extension
+
+
+@dataclass
+class PromptConfig:
+    """Configuration for prompt input normalisation and token budgeting."""
+    normalize: bool = True
+    max_input_tokens: int = 12000  # Cap on resume + JD tokens (0 = context window only)
+    min_input_tokens: int = 1024
+    reserve_tokens: int = 512  # Safety margin for token count estimates
+    tokenizer: str = "cl100k_base"  # tiktoken encoding, estimated if tiktoken is missing
+
+
+@dataclass
+class MatchBatchConfig:
+    """Configuration for scoring several resumes per LLM request."""
+    enabled: bool = True
+    max_batch_size: int = 10  # Upper bound on resumes per request
+    resume_tokens: int = 1500  # Each resume is condensed to at most this many tokens
+    output_tokens_per_resume: int = 350  # Completion tokens reserved per result
+
+
+@dataclass
+class MetricsConfig:
+    """Configuration for the in-process metrics served at /metrics."""
+    enabled: bool = True
+    # Histogram buckets (seconds) for request latency and time to first token
+    latency_buckets: List[float] = field(default_factory=lambda: [
+        0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0
+    ])
+    # Streaming: gaps between chunks (seconds) and generation throughput (tokens/s)
+    chunk_gap_buckets: List[float] = field(default_factory=lambda: [
+        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+    ])
+    throughput_buckets: List[float] = field(default_factory=lambda: [
+        5.0, 10.0, 20.0, 40.0, 80.0, 160.0, 320.0
+    ])
+
+
+@dataclass
+class EmbeddingConfig:
+    """
+    Configuration for the local embedding model.
+
+    The ONNX backend runs an exported model from model_dir with ONNX
+    Runtime (int8 weights when quantized, created from model.onnx if
+    missing) and never touches the network.
+    """
+    backend: str = "auto"  # auto | onnx | sentence_transformers
+    model_name: str = "BAAI/bge-small-zh-v1.5"
+    model_dir: str = ""  # Local model directory (model.onnx + tokenizer.json for onnx)
+    quantized: bool = True  # Prefer int8 weights (model_quantized.onnx)
+    num_threads: int = 0  # Intra-op threads (0 = runtime default)
+    batch_size: int = 32  # Texts per forward pass in embed_batch
+    max_seq_length: int = 512
+    # Coalesce concurrent embed requests (any embedding provider)
+    batching: bool = True
+    max_batch_size: int = 64
+    max_wait_ms: float = 5.0
+
+
+@dataclass
+class ScreeningConfig:
+    """Configuration for local pre-ranking before LLM match scoring."""
+    enabled: bool = True
+    top_k: int = 20  # Resumes sent to the LLM (0 = no limit)
+    min_local_score: float = 0.0  # Resumes below this local score skip the LLM
+    embedding_weight: float = 0.6  # Share of embedding similarity in the local score
+    embed_chars: int = 2000  # Leading characters of each text that are embedded
+
+
+@dataclass
+class RouteConfig:
+    """Model routing for one engine operation."""
+    tier: str = "default"
+    escalate_to: str = ""  # Tier retried when the output fails validation
+
+
+def _default_routing_tiers() -> Dict[str, List[str]]:
+    return {
+        "fast": ["deepseek:deepseek-chat", "default"],
+        "strong": ["default"],
+    }
+
+
+def _default_routing_operations() -> Dict[str, RouteConfig]:
+    return {
+        "extract_resume_fields": RouteConfig(tier="fast", escalate_to="strong"),
+        "translate_text": RouteConfig(tier="fast"),
+        "generate_message": RouteConfig(tier="fast"),
+        "evaluate_match": RouteConfig(tier="fast", escalate_to="strong"),
+        "analyze": RouteConfig(tier="strong"),
+    }
+
+
+@dataclass
+class RoutingConfig:
+    """
+    Configuration for task-aware model routing.
+
+    Tiers are latency/cost classes: ordered "provider:model" candidates
+    (model optional; "default" is the engine's current provider). Each
+    operation names its tier and an optional stronger tier to escalate to.
+    Disabled by default, so every operation uses the current provider.
+    """
+    enabled: bool = False
+    tiers: Dict[str, List[str]] = field(default_factory=_default_routing_tiers)
+    operations: Dict[str, RouteConfig] = field(default_factory=_default_routing_operations)
+
+
+@dataclass
+class ResilienceConfig:
+    """
+    Configuration for LLM provider failover, hedging and circuit breaking.
+
+    Failed requests move on to the next enabled provider instead of
+    sleeping; backoff only applies once every provider has been tried.
+    """
+    failover: bool = True
+    hedging: bool = False  # Duplicate slow requests (costs extra tokens)
+    hedge_quantile: float = 0.95  # Hedge once a request is slower than this latency quantile
+    hedge_min_samples: int = 20  # Successful requests needed before hedging a provider
+    hedge_min_delay_ms: float = 500.0
+    failure_threshold: int = 5  # Consecutive failures that open a provider's circuit
+    reset_timeout: float = 30.0  # Seconds before an open circuit lets a probe through
+    latency_window: int = 200  # Recent latencies kept per provider
+    retry_backoff: float = 1.0  # Seconds, doubled per round over all providers
+
+
+@dataclass
+class HealthConfig:
+    """
+    Configuration for the passive health monitor behind /health.
+
+    Component state comes from real request outcomes; a component is only
+    probed when it has seen no traffic for probe_idle_seconds. LLM
+    providers are never probed with chat requests.
+    """
+    refresh_interval: float = 5.0  # Seconds between snapshot refreshes
+    probe_idle_seconds: float = 60.0
+    failure_threshold: int = 3  # Consecutive failures that mark a component unhealthy
+    reset_timeout: float = 30.0
+
+
 @dataclass
 class AppConfig:
     """Main application configuration."""
@@ -73,6 +237,16 @@ class AppConfig:
     llm_providers: Dict[str, LLMProviderConfig] = field(default_factory=dict)
     document_parsers: Dict[str, ParserConfig] = field(default_factory=dict)
     storage: StorageConfig = None
+    parsing: ParsingConfig = field(default_factory=ParsingConfig)
+    uploads: UploadConfig = field(default_factory=UploadConfig)
+    prompt: PromptConfig = field(default_factory=PromptConfig)
+    match_batch: MatchBatchConfig = field(default_factory=MatchBatchConfig)
+    screening: ScreeningConfig = field(default_factory=ScreeningConfig)
+    embedding: EmbeddingConfig = field(default_factory=EmbeddingConfig)
+    metrics: MetricsConfig = field(default_factory=MetricsConfig)
+    routing: RoutingConfig = field(default_factory=RoutingConfig)
+    resilience: ResilienceConfig = field(default_factory=ResilienceConfig)
+    health: HealthConfig = field(default_factory=HealthConfig)
 
     # Analysis settings
     analysis: Dict[str, Any] = field(default_factory=dict)
@@ -158,10 +332,95 @@ class ConfigManager:
             }
         },
         "document_parsers": {
-            "pdf": {"parser": "pdf", "enabled": True},
-            "docx": {"parser": "docx", "enabled": True},
+            "pdf": {"parser": "pdf_fast", "enabled": True},
+            "docx": {"parser": "docx_fast", "enabled": True},
             "text": {"parser": "text", "enabled": True}
         },
+        "parsing": {
+            "enabled": True,
+            "max_workers": 0,
+            "file_timeout": 30,
+            "warm_start": True,
+            "cache_enabled": True,
+            "cache_backend": "memory",
+            "cache_max_items": 512,
+            "cache_ttl": 86400
+        },
+        "uploads": {
+            "max_file_bytes": 10 * 1024 * 1024,
+            "max_request_bytes": 60 * 1024 * 1024,
+            "chunk_size": 64 * 1024,
+            "sniff_content": True
+        },
+        "prompt": {
+            "normalize": True,
+            "max_input_tokens": 12000,
+            "min_input_tokens": 1024,
+            "reserve_tokens": 512,
+            "tokenizer": "cl100k_base"
+        },
+        "match_batch": {
+            "enabled": True,
+            "max_batch_size": 10,
+            "resume_tokens": 1500,
+            "output_tokens_per_resume": 350
+        },
+        "screening": {
+            "enabled": True,
+            "top_k": 20,
+            "min_local_score": 0.0,
+            "embedding_weight": 0.6,
+            "embed_chars": 2000
+        },
+        "embedding": {
+            "backend": "auto",
+            "model_name": "BAAI/bge-small-zh-v1.5",
+            "model_dir": "",
+            "quantized": True,
+            "num_threads": 0,
+            "batch_size": 32,
+            "max_seq_length": 512,
+            "batching": True,
+            "max_batch_size": 64,
+            "max_wait_ms": 5.0
+        },
+        "metrics": {
+            "enabled": True,
+            "latency_buckets": [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0],
+            "chunk_gap_buckets": [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+            "throughput_buckets": [5.0, 10.0, 20.0, 40.0, 80.0, 160.0, 320.0]
+        },
+        "routing": {
+            "enabled": False,
+            "tiers": {
+                "fast": ["deepseek:deepseek-chat", "default"],
+                "strong": ["default"]
+            },
+            "operations": {
+                "extract_resume_fields": {"tier": "fast", "escalate_to": "strong"},
+                "translate_text": {"tier": "fast"},
+                "generate_message": {"tier": "fast"},
+                "evaluate_match": {"tier": "fast", "escalate_to": "strong"},
+                "analyze": {"tier": "strong"}
+            }
+        },
+        "resilience": {
+            "failover": True,
+            "hedging": False,
+            "hedge_quantile": 0.95,
+            "hedge_min_samples": 20,
+            "hedge_min_delay_ms": 500.0,
+            "failure_threshold": 5,
+            "reset_timeout": 30.0,
+            "latency_window": 200,
+            "retry_backoff": 1.0
+        },
+        "health": {
+            "refresh_interval": 5.0,
+            "probe_idle_seconds": 60.0,
+            "failure_threshold": 3,
+            "reset_timeout": 30.0
+        },
         "storage": {
             "backend": "local",
             "enabled": True,
@@ -279,7 +538,8 @@ class ConfigManager:
                 models=models,
                 default_model=cfg.get("default_model", ""),
                 timeout=cfg.get("timeout", 60),
-                max_retries=cfg.get("max_retries", 3)
+                max_retries=cfg.get("max_retries", 3),
+                options=cfg.get("options") or {}
             )
 
         # Convert document parsers
@@ -291,6 +551,114 @@ class ConfigManager:
                 options=cfg.get("options", {})
             )
 
+        # Convert parsing service
+        parsing_cfg = d.get("parsing", {})
+        parsing = ParsingConfig(
+            enabled=parsing_cfg.get("enabled", True),
+            max_workers=parsing_cfg.get("max_workers", 0),
+            file_timeout=parsing_cfg.get("file_timeout", 30),
+            warm_start=parsing_cfg.get("warm_start", True),
+            cache_enabled=parsing_cfg.get("cache_enabled", True),
+            cache_backend=parsing_cfg.get("cache_backend", "memory"),
+            cache_max_items=parsing_cfg.get("cache_max_items", 512),
+            cache_ttl=parsing_cfg.get("cache_ttl", 86400)
+        )
+
+        # Convert upload limits
+        uploads_cfg = d.get("uploads", {})
+        uploads = UploadConfig(
+            max_file_bytes=uploads_cfg.get("max_file_bytes", 10 * 1024 * 1024),
+            max_request_bytes=uploads_cfg.get("max_request_bytes", 60 * 1024 * 1024),
+            chunk_size=uploads_cfg.get("chunk_size", 64 * 1024),
+            sniff_content=uploads_cfg.get("sniff_content", True)
+        )
+
+        # Convert prompt budgeting
+        prompt_cfg = d.get("prompt", {})
+        prompt = PromptConfig(
+            normalize=prompt_cfg.get("normalize", True),
+            max_input_tokens=prompt_cfg.get("max_input_tokens", 12000),
+            min_input_tokens=prompt_cfg.get("min_input_tokens", 1024),
+            reserve_tokens=prompt_cfg.get("reserve_tokens", 512),
+            tokenizer=prompt_cfg.get("tokenizer", "cl100k_base")
+        )
+
+        # Convert batched match scoring
+        match_batch_cfg = d.get("match_batch", {})
+        match_batch = MatchBatchConfig(
+            enabled=match_batch_cfg.get("enabled", True),
+            max_batch_size=match_batch_cfg.get("max_batch_size", 10),
+            resume_tokens=match_batch_cfg.get("resume_tokens", 1500),
+            output_tokens_per_resume=match_batch_cfg.get("output_tokens_per_resume", 350)
+        )
+
+        # Convert screening funnel
+        screening_cfg = d.get("screening", {})
+        screening = ScreeningConfig(
+            enabled=screening_cfg.get("enabled", True),
+            top_k=screening_cfg.get("top_k", 20),
+            min_local_score=screening_cfg.get("min_local_score", 0.0),
+            embedding_weight=screening_cfg.get("embedding_weight", 0.6),
+            embed_chars=screening_cfg.get("embed_chars", 2000)
+        )
+
+        # Convert local embedding model
+        embedding_cfg = d.get("embedding", {})
+        embedding = EmbeddingConfig(
+            backend=embedding_cfg.get("backend", "auto"),
+            model_name=embedding_cfg.get("model_name", "BAAI/bge-small-zh-v1.5"),
+            model_dir=embedding_cfg.get("model_dir") or "",
+            quantized=embedding_cfg.get("quantized", True),
+            num_threads=embedding_cfg.get("num_threads", 0),
+            batch_size=embedding_cfg.get("batch_size", 32),
+            max_seq_length=embedding_cfg.get("max_seq_length", 512),
+            batching=embedding_cfg.get("batching", True),
+            max_batch_size=embedding_cfg.get("max_batch_size", 64),
+            max_wait_ms=embedding_cfg.get("max_wait_ms", 5.0)
+        )
+
+        # Convert metrics
+        metrics_cfg = d.get("metrics", {})
+        metrics = MetricsConfig(enabled=metrics_cfg.get("enabled", True))
+        for name in ("latency_buckets", "chunk_gap_buckets", "throughput_buckets"):
+            if metrics_cfg.get(name):
+                setattr(metrics, name, [float(b) for b in metrics_cfg[name]])
+
+        # Convert model routing
+        routing_cfg = d.get("routing", {})
+        operations = {
+            op: RouteConfig(tier=route.get("tier", "default"), escalate_to=route.get("escalate_to") or "")
+            for op, route in routing_cfg.get("operations", {}).items()
+        }
+        routing = RoutingConfig(
+            enabled=routing_cfg.get("enabled", False),
+            tiers=routing_cfg.get("tiers", _default_routing_tiers()),
+            operations=operations or _default_routing_operations()
+        )
+
+        # Convert provider resilience
+        resilience_cfg = d.get("resilience", {})
+        resilience = ResilienceConfig(
+            failover=resilience_cfg.get("failover", True),
+            hedging=resilience_cfg.get("hedging", False),
+            hedge_quantile=resilience_cfg.get("hedge_quantile", 0.95),
+            hedge_min_samples=resilience_cfg.get("hedge_min_samples", 20),
+            hedge_min_delay_ms=resilience_cfg.get("hedge_min_delay_ms", 500.0),
+            failure_threshold=resilience_cfg.get("failure_threshold", 5),
+            reset_timeout=resilience_cfg.get("reset_timeout", 30.0),
+            latency_window=resilience_cfg.get("latency_window", 200),
+            retry_backoff=resilience_cfg.get("retry_backoff", 1.0)
+        )
+
+        # Convert health monitor
+        health_cfg = d.get("health", {})
+        health = HealthConfig(
+            refresh_interval=health_cfg.get("refresh_interval", 5.0),
+            probe_idle_seconds=health_cfg.get("probe_idle_seconds", 60.0),
+            failure_threshold=health_cfg.get("failure_threshold", 3),
+            reset_timeout=health_cfg.get("reset_timeout", 30.0)
+        )
+
         # Convert storage
         storage_cfg = d.get("storage", {})
         storage = StorageConfig(
@@ -308,6 +676,16 @@ class ConfigManager:
             llm_providers=llm_providers,
             document_parsers=parsers,
             storage=storage,
+            parsing=parsing,
+            uploads=uploads,
+            prompt=prompt,
+            match_batch=match_batch,
+            screening=screening,
+            embedding=embedding,
+            metrics=metrics,
+            routing=routing,
+            resilience=resilience,
+            health=health,
             analysis=d.get("analysis", {}),
             data_dir=paths.get("data_dir", "data"),
             cache_dir=paths.get("cache_dir", "cache"),
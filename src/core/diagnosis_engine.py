@@ -5,8 +5,8 @@ Responsible for deep resume diagnosis using advanced LLM prompts.
 
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
-import json
-import re
+
+from src.core.structured_output import json_mode_kwargs, request_structured
 
 class DiagnosisResult(BaseModel):
     score: int = Field(..., description="Match score (0-100)")
@@ -54,42 +54,27 @@ class DiagnosisEngine:
         system_prompt = self._get_diagnosis_prompt()
         user_prompt = f"CANDIDATE RESUME:\n{resume_text}\n\nTARGET JD:\n{jd_text}"
 
-        response = self.llm_provider.chat(
+        result = request_structured(
+            self.llm_provider.chat,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
             ],
+            schema=DiagnosisResult,
             temperature=0.2,
-            model="deepseek-chat" # Prefer DeepSeek for Chinese context if available, otherwise provider default
+            model="deepseek-chat", # Prefer DeepSeek for Chinese context if available, otherwise provider default
+            **json_mode_kwargs(self.llm_provider)
         )
 
-        content = response.content.strip()
-        
-        # Clean up code blocks if present
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.startswith("```"):
-            content = content[3:]
-        if content.endswith("```"):
-            content = content[:-3]
-        
-        content = content.strip()
+        if result.ok:
+            result.data.raw_response = result.raw
+            return result.data
 
-        try:
-            data = json.loads(content)
-            return DiagnosisResult(
-                score=data.get("score", 0),
-                fatal_flaws=data.get("fatal_flaws", []),
-                boss_reply_probability=data.get("boss_reply_probability", 0),
-                improvement_suggestions=data.get("improvement_suggestions", []),
-                raw_response=content
-            )
-        except json.JSONDecodeError:
-            # Fallback for parsing error
-            return DiagnosisResult(
-                score=0,
-                fatal_flaws=["System Error: Failed to parse diagnosis result"],
-                boss_reply_probability=0,
-                improvement_suggestions=[],
-                raw_response=content
-            )
+        # Fallback for parsing error (after the repair attempt)
+        return DiagnosisResult(
+            score=0,
+            fatal_flaws=["System Error: Failed to parse diagnosis result"],
+            boss_reply_probability=0,
+            improvement_suggestions=[],
+            raw_response=result.raw
+        )
@@ -0,0 +1,126 @@
+"""
+Embedding Batcher / 嵌入批处理调度器
+
+Coalesces concurrent embed requests into batches. Callers queue a text and
+wait on a future; a single worker thread collects requests until the batch
+is full or the wait window closes, encodes them with one embed_batch() call
+and resolves each future with its own vector (or the batch's error).
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+
+_STOP = object()
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batching scheduler in front of a provider's embed_batch().
+
+    The worker thread starts on the first request. A request that arrives
+    to an idle batcher waits at most max_wait_ms for others to join it.
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], List[List[float]]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0
+    ):
+        """
+        Initialize batcher.
+
+        Args:
+            embed_batch: Function embedding a list of texts, in order
+            max_batch_size: Most texts encoded together
+            max_wait_ms: Longest a request waits for others to join its batch
+        """
+        self._embed_batch = embed_batch
+        self._max_batch_size = max(max_batch_size, 1)
+        self._max_wait = max(max_wait_ms, 0.0) / 1000
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._batches = 0
+        self._texts = 0
+
+    def submit(self, text: str) -> Future:
+        """Queue a text; the future resolves to its embedding vector."""
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Embedding batcher is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._thread.start()
+            self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str, timeout: Optional[float] = None) -> List[float]:
+        """Embed one text as part of the next batch (blocking)."""
+        return self.submit(text).result(timeout=timeout)
+
+    def close(self, timeout: float = 5.0):
+        """Encode the requests already queued, then stop the worker."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            self._queue.put(_STOP)
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self) -> Dict:
+        """Batches encoded so far and their mean size."""
+        return {
+            "batches": self._batches,
+            "texts": self._texts,
+            "mean_batch_size": round(self._texts / self._batches, 2) if self._batches else 0.0,
+        }
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self._max_wait
+            while len(batch) < self._max_batch_size:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    def _flush(self, batch: list):
+        """Encode one batch and resolve its futures."""
+        pending = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        if not pending:
+            return
+
+        # Identical texts in a batch are encoded once
+        texts = list(dict.fromkeys(text for text, _ in pending))
+        try:
+            vectors = self._embed_batch(texts)
+            if len(vectors) != len(texts):
+                raise ValueError(f"embed_batch returned {len(vectors)} vectors for {len(texts)} texts")
+        except Exception as e:
+            for _, future in pending:
+                future.set_exception(e)
+            return
+
+        self._batches += 1
+        self._texts += len(texts)
+        by_text = dict(zip(texts, vectors))
+        for text, future in pending:
+            future.set_result(by_text[text])
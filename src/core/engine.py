@@ -9,11 +9,15 @@ import sys
 import time
 import hashlib
 import json
+import functools
+import dataclasses
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
+from pydantic import ValidationError
+
 # Load .env file
 try:
     from dotenv import load_dotenv
@@ -31,12 +35,31 @@ from src.core.exceptions import (
     UnsupportedFormatError,
     AnalysisError,
 )
-from src.interfaces.illm_provider import ILLMProvider, LLMResponse
+from src.interfaces.illm_provider import ILLMProvider, LLMResponse, ReasoningChunk, CACHE_PREFIX_KEY
 from src.interfaces.idocument_parser import IDocumentParser, ParsedDocument
 from src.interfaces.istorage import IStorage
 from src.interfaces.ivector_store import IVectorStore
 from src.plugins.llm_providers import get_provider as get_llm_provider
-from src.plugins.document_parsers import get_parser_for_file
+from src.core.ingestion import get_ingestion_pipeline
+from src.core.prompt_budget import PromptBudgeter, BudgetResult
+from src.core.embedding_batcher import EmbeddingBatcher
+from src.core.health import HealthMonitor, MonitoredStorage
+from src.core.metrics import get_metrics
+from src.core.provider_pool import ProviderPool
+from src.core.resilience import OPEN
+from src.core.router import ModelRouter, Route
+from src.core.screening import ScreeningFunnel, local_match_result
+from src.core.structured_output import (
+    IncrementalJSONParser,
+    MatchBatchItem,
+    MatchEvaluation,
+    ResumeFields,
+    StructuredResult,
+    complete_structured,
+    json_mode_kwargs,
+    load_json,
+    request_structured,
+)
 from src.plugins.storage import get_storage
 from src.plugins.vector_stores.simple_store import SimpleVectorStore
 from src.core.diagnosis_engine import DiagnosisEngine, DiagnosisResult
@@ -71,6 +94,11 @@ class TalentOSEngine:
     - Automatic retry with exponential backoff
     """
 
+    DEFAULT_MATCH_WEIGHTS = {"skills": 30, "experience": 30, "education": 20, "soft_skills": 20}
+
+    # Tokens for the "### RESUME <id>" header and spacing around each resume
+    BATCH_RESUME_OVERHEAD_TOKENS = 8
+
     def __init__(self, config: AppConfig = None, **kwargs):
         """
         Initialize the TalentOS engine.
@@ -81,9 +109,18 @@ class TalentOSEngine:
         """
         self._config = config or get_config()
         self._llm_provider: Optional[ILLMProvider] = None
+        self._embedding_provider: Optional[ILLMProvider] = None
+        self._local_embedding_provider: Optional[ILLMProvider] = None
+        self._embedding_batcher: Optional[EmbeddingBatcher] = None
         self._storage: Optional[IStorage] = None
         self._vector_store: Optional[IVectorStore] = None
         self._personas = self._load_personas()
+        self._budgeter = PromptBudgeter(self._config.prompt)
+        self._metrics = get_metrics()
+        self._pool = ProviderPool(self._config.resilience, self._config, metrics=self._metrics)
+        self._router = ModelRouter(self._config.routing, self._config, provider_factory=self._pool.get_provider)
+        self._provider_pinned = False  # Set by set_llm_provider(); limits routing to that provider
+        self._health = HealthMonitor(self._config.health, describe=self._describe_health)
 
         # Initialize components
         self._setup_llm_provider(kwargs.get('llm_provider'))
@@ -214,7 +251,7 @@ class TalentOSEngine:
         # Cache Key
         if use_cache and self._storage:
             cache_key = self._generate_cache_key(jd_text, "JD_OPTIMIZATION", "headhunter")
-            cached = self._storage.load(cache_key)
+            cached = self._load_cached("optimize_jd", cache_key)
             if cached:
                  return AnalysisResult(
                     report=cached["report"],
@@ -248,6 +285,7 @@ class TalentOSEngine:
                 ],
                 model=model,
                 temperature=temperature,
+                operation="optimize_jd",
                 **kwargs
             )
 
@@ -262,7 +300,11 @@ class TalentOSEngine:
                 tokens_used=response.tokens_used,
                 latency_ms=latency_ms,
                 cached=False,
-                metadata={"type": "jd_optimization", "provider": self._current_provider}
+                metadata={
+                    "type": "jd_optimization",
+                    "provider": self._current_provider,
+                    "cached_tokens": response.cached_tokens
+                }
             )
 
             # Save to cache
@@ -313,65 +355,151 @@ class TalentOSEngine:
         """
         Extract structured data from resume.
         """
+        system_prompt = self._get_extraction_prompt()
+        routes = self._routes("extract_resume_fields", kwargs.pop("model", None))
+        budget = self._fit_inputs(resume_text, "", system_prompt, routes[0].model, routes[0].provider_name)
+        resume_text = budget.resume_text
+
         # Cache Key
         if use_cache and self._storage:
-            cache_key = self._generate_cache_key(resume_text, "EXTRACTION", "parser")
-            cached = self._storage.load(cache_key)
+            cache_key = self._generate_cache_key(resume_text, "EXTRACTION_V2", "parser")
+            cached = self._load_cached("extract_resume_fields", cache_key)
             if cached:
                 return cached
 
         # Prompt
-        system_prompt = self._get_extraction_prompt()
         user_prompt = f"Resume Content:\n\n{resume_text}"
-
-        # Get model config
-        model = kwargs.pop("model", None)
         temperature = kwargs.pop("temperature", 0.1) # Low temp for extraction
-        if self._config.get_model_config(self._current_provider):
-            model_info = self._config.get_model_config(self._current_provider, model)
-            if model_info:
-                model = model_info.name
 
         try:
-            response = self._call_llm_with_retry(
+            result, route = self._request_structured(
+                routes,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
-                model=model,
+                schema=ResumeFields,
                 temperature=temperature,
                 **kwargs
             )
+        except LLMProviderError as e:
+            raise AnalysisError(f"LLM provider error: {e}")
 
-            # Parse JSON
-            content = response.content.strip()
-            # Handle markdown code blocks if present
-            if content.startswith("```json"):
-                content = content[7:]
-            if content.endswith("```"):
-                content = content[:-3]
-            
-            try:
-                data = json.loads(content)
-            except json.JSONDecodeError:
-                # Fallback or retry? For now, return raw content wrapped
-                data = {"raw_content": content, "error": "Failed to parse JSON"}
-
-            # Add metadata
-            data["_metadata"] = {
-                "model": response.model,
-                "tokens_used": response.tokens_used
-            }
+        return self._finish_extraction(result, resume_text, use_cache, route=route,
+                                       escalations=routes.index(route))
 
-            # Save to cache
-            if use_cache and self._storage:
-                cache_key = self._generate_cache_key(resume_text, "EXTRACTION", "parser")
-                self._storage.save(cache_key, data, ttl=self._config.storage.cache_ttl)
+    def extract_resume_fields_stream(
+        self,
+        resume_text: str,
+        use_cache: bool = True,
+        **kwargs
+    ):
+        """
+        Extract structured data from resume, yielding fields as they arrive.
 
-            return data
+        Yields:
+            {"event": "field", "field": name, "value": value} for each
+            top-level field once it is complete, then
+            {"event": "done", "data": {...}} with the validated result
+            (as returned by extract_resume_fields).
+        """
+        system_prompt = self._get_extraction_prompt()
+        routes = self._routes("extract_resume_fields", kwargs.pop("model", None))
+        route = routes[0]
+        budget = self._fit_inputs(resume_text, "", system_prompt, route.model, route.provider_name)
+        resume_text = budget.resume_text
 
-        except LLMProviderError as e:
-            raise AnalysisError(f"LLM provider error: {e}")
+        if use_cache and self._storage:
+            cache_key = self._generate_cache_key(resume_text, "EXTRACTION_V2", "parser")
+            cached = self._load_cached("extract_resume_fields", cache_key)
+            if cached:
+                for name, value in cached.items():
+                    if name != "_metadata":
+                        yield {"event": "field", "field": name, "value": value}
+                yield {"event": "done", "data": cached}
+                return
+
+        temperature = kwargs.pop("temperature", 0.1)
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"Resume Content:\n\n{resume_text}"}
+        ]
+
+        parser = IncrementalJSONParser()
+        try:
+            stream = self._metrics.track_stream(
+                route.provider.chat_stream(
+                    messages=messages,
+                    model=route.model,
+                    temperature=temperature,
+                    **json_mode_kwargs(route.provider),
+                    **kwargs
+                ),
+                "extract_resume_fields", route.provider_name, route.model
+            )
+            for chunk in stream:
+                if isinstance(chunk, ReasoningChunk):
+                    # Thinking text is not part of the JSON answer
+                    continue
+                for name, value in parser.feed(chunk):
+                    yield {"event": "field", "field": name, "value": value}
+
+            # Repairs (if any) only resend the broken part
+            result = complete_structured(
+                functools.partial(self._call_llm_with_retry, route=route), ResumeFields, parser.text,
+                model=route.model, **json_mode_kwargs(route.provider), **kwargs
+            )
+            if stream.response:
+                # Count the streamed answer too, not just its repairs
+                result.tokens_used += stream.response.tokens_used
+                result.cached_tokens += stream.response.cached_tokens
+            escalations = 0
+            if not result.ok and len(routes) > 1:
+                # Still invalid: ask the stronger model for the whole result
+                escalated, route = self._request_structured(
+                    routes[1:], messages=messages, schema=ResumeFields, temperature=temperature, **kwargs
+                )
+                escalated.tokens_used += result.tokens_used
+                escalated.cached_tokens += result.cached_tokens
+                escalated.repairs += result.repairs
+                result, escalations = escalated, routes.index(route)
+        except Exception as e:
+            print(f"Streaming Error: {e}")
+            raise AnalysisError(f"Streaming failed: {e}")
+
+        yield {"event": "done", "data": self._finish_extraction(result, resume_text, use_cache, route=route,
+                                                                escalations=escalations)}
+
+    def _finish_extraction(
+        self,
+        result: StructuredResult,
+        resume_text: str,
+        use_cache: bool,
+        route: Route = None,
+        escalations: int = 0
+    ) -> Dict[str, Any]:
+        """Turn a structured extraction into the result dict; cache only valid output."""
+        if result.ok:
+            data = result.data.model_dump()
+        else:
+            data = {"raw_content": result.raw, "error": "Failed to parse JSON", "details": result.error}
+
+        # Add metadata
+        data["_metadata"] = {
+            "model": result.response.model if result.response else (route.model if route else None),
+            "provider": route.provider_name if route else self._current_provider,
+            "tokens_used": result.tokens_used,
+            "cached_tokens": result.cached_tokens,
+            "repairs": result.repairs,
+            "escalations": escalations
+        }
+
+        # Save to cache (failures are not cached, so a later call can succeed)
+        if result.ok and use_cache and self._storage:
+            cache_key = self._generate_cache_key(resume_text, "EXTRACTION_V2", "parser")
+            self._storage.save(cache_key, data, ttl=self._config.storage.cache_ttl)
+
+        return data
 
     def _get_match_prompt(self) -> str:
         """Get prompt for candidate-job matching."""
@@ -417,54 +545,46 @@ class TalentOSEngine:
 
         # Default weights if not provided
         if not weights:
-            weights = {"skills": 30, "experience": 30, "education": 20, "soft_skills": 20}
+            weights = dict(self.DEFAULT_MATCH_WEIGHTS)
+
+        system_prompt = self._get_match_prompt()
+        routes = self._routes("evaluate_match", kwargs.pop("model", None))
+        budget = self._fit_inputs(resume_text, jd_text, system_prompt, routes[0].model, routes[0].provider_name)
+        resume_text, jd_text = budget.resume_text, budget.jd_text
 
         # Cache Key (include weights in key to avoid stale cache on weight change)
-        weight_str = f"{weights.get('skills')}-{weights.get('experience')}-{weights.get('education')}"
         if use_cache and self._storage:
-            cache_key = self._generate_cache_key(resume_text + jd_text + weight_str, "MATCH_EVAL_CN_V2", "recruiter")
-            cached = self._storage.load(cache_key)
+            cache_key = self._match_cache_key(resume_text, jd_text, weights)
+            cached = self._load_cached("evaluate_match", cache_key)
             if cached:
                 return cached
 
-        system_prompt = self._get_match_prompt()
-        
-        # Add weights to user prompt
-        weight_instruction = f"""
-        SCORING WEIGHTS PREFERENCE:
-        - Skills: {weights.get('skills', 30)}%
-        - Experience: {weights.get('experience', 30)}%
-        - Education: {weights.get('education', 20)}%
-        - Soft Skills: {weights.get('soft_skills', 20)}%
-        
-        Please calculate the overall score based on these weights.
-        """
-        
-        user_prompt = f"JOB DESCRIPTION:\n{jd_text}\n\nSCORING WEIGHTS:\n{weight_instruction}\n\nCANDIDATE RESUME:\n{resume_text}"
+        # JD and weights are shared by every resume screened against this JD:
+        # keep them ahead of the resume so they stay in the cached prefix
+        shared_prompt = self._match_shared_prompt(jd_text, weights)
+        user_prompt = f"{shared_prompt}CANDIDATE RESUME:\n{resume_text}"
 
         try:
-            response = self._call_llm_with_retry(
+            result, _ = self._request_structured(
+                routes,
                 messages=[
                     {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
+                    {"role": "user", "content": user_prompt, CACHE_PREFIX_KEY: shared_prompt}
                 ],
+                schema=MatchEvaluation,
                 temperature=0.2, # Low temp for consistent scoring
                 **kwargs
             )
 
-            content = response.content.strip()
-            # Cleanup JSON
-            if content.startswith("```json"): content = content[7:]
-            if content.endswith("```"): content = content[:-3]
-            
-            try:
-                data = json.loads(content)
-            except:
-                data = {"score": 0, "status": "Error", "reason": "Failed to parse analysis", "raw": content}
+            if not result.ok:
+                # Not cached: a later call may succeed
+                return {"score": 0, "status": "Error", "reason": "Failed to parse analysis",
+                        "raw": result.raw, "details": result.error}
+            data = result.data.model_dump()
 
             # Save to cache
             if use_cache and self._storage:
-                cache_key = self._generate_cache_key(resume_text + jd_text + weight_str, "MATCH_EVAL_CN_V2", "recruiter")
+                cache_key = self._match_cache_key(resume_text, jd_text, weights)
                 self._storage.save(cache_key, data, ttl=self._config.storage.cache_ttl)
 
             return data
@@ -472,6 +592,270 @@ class TalentOSEngine:
         except LLMProviderError as e:
             raise AnalysisError(f"LLM provider error: {e}")
 
+    def _match_shared_prompt(self, jd_text: str, weights: Dict[str, int]) -> str:
+        """JD and scoring weights: the part of a match prompt shared by all resumes."""
+        weight_instruction = f"""
+        SCORING WEIGHTS PREFERENCE:
+        - Skills: {weights.get('skills', 30)}%
+        - Experience: {weights.get('experience', 30)}%
+        - Education: {weights.get('education', 20)}%
+        - Soft Skills: {weights.get('soft_skills', 20)}%
+        
+        Please calculate the overall score based on these weights.
+        """
+        return f"JOB DESCRIPTION:\n{jd_text}\n\nSCORING WEIGHTS:\n{weight_instruction}\n\n"
+
+    def _match_cache_key(self, resume_text: str, jd_text: str, weights: Dict[str, int]) -> str:
+        """Cache key for a match result (shared by single and batched scoring)."""
+        weight_str = f"{weights.get('skills')}-{weights.get('experience')}-{weights.get('education')}"
+        return self._generate_cache_key(resume_text + jd_text + weight_str, "MATCH_EVAL_CN_V3", "recruiter")
+
+    def _get_batch_match_instructions(self) -> str:
+        """Get the extra instructions for scoring several resumes per request."""
+        return """
+        BATCH MODE:
+        The user message contains several candidate resumes, each introduced by a
+        line "### RESUME <id>". Evaluate every resume independently against the
+        same JD and weights.
+
+        Output strictly valid JSON of the form {"results": [...]}, where the array
+        holds exactly one object per resume, in the same order, each following
+        the schema above plus an "id" field with the resume's id.
+        Do not wrap in markdown code blocks.
+        """
+
+    def evaluate_match_batch(
+        self,
+        resumes: List[str],
+        jd_text: str,
+        use_cache: bool = True,
+        weights: Dict[str, int] = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate many resumes against one JD, several resumes per LLM request.
+
+        Each resume is condensed to at most match_batch.resume_tokens tokens
+        (low-priority sections dropped first) and packed with others into a
+        request that carries the JD and weights once. The batch size adapts to
+        the model's context window and output limit. Resumes missing from an
+        unparseable or incomplete batch response are scored one by one with
+        evaluate_match.
+
+        Args:
+            resumes: Resume texts
+            jd_text: Job description text
+            use_cache: Whether to use cached results (per resume)
+            weights: Scoring weights (defaults if None)
+            **kwargs: Additional parameters (model, etc.)
+
+        Returns:
+            One result dict per resume, in input order. Resumes that could
+            not be scored get {"status": "Error", "error": ...}.
+        """
+        batch_config = self._config.match_batch
+        if not jd_text or len(jd_text.strip()) < 10 or not batch_config.enabled or len(resumes) < 2:
+            return [self._evaluate_match_or_error(r, jd_text, use_cache, weights, **kwargs) for r in resumes]
+
+        if not weights:
+            weights = dict(self.DEFAULT_MATCH_WEIGHTS)
+
+        # Batches go to the primary route; escalation happens per resume in evaluate_match
+        route = self._routes("evaluate_match", kwargs.get("model"))[0]
+        system_prompt = self._get_match_prompt() + self._get_batch_match_instructions()
+        jd_text = self._fit_inputs("", jd_text, system_prompt, route.model, route.provider_name).jd_text
+        shared_prompt = self._match_shared_prompt(jd_text, weights)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(resumes)
+        summaries: Dict[int, str] = {}
+        for i, resume_text in enumerate(resumes):
+            summary = self._budgeter.fit(resume_text or "", max_input_tokens=batch_config.resume_tokens).resume_text
+            if use_cache and self._storage:
+                cached = self._load_cached("evaluate_match", self._match_cache_key(summary, jd_text, weights))
+                if cached:
+                    results[i] = cached
+                    continue
+            summaries[i] = summary
+
+        for batch in self._plan_match_batches(summaries, system_prompt + shared_prompt, route):
+            try:
+                scored = self._score_match_batch(batch, summaries, system_prompt, shared_prompt, route, **kwargs)
+            except LLMProviderError as e:
+                for i in batch:
+                    results[i] = self._match_error(e)
+                continue
+
+            for i in batch:
+                data = scored.get(i)
+                if data is None:
+                    # Not in the batch response: score this resume on its own
+                    results[i] = self._evaluate_match_or_error(resumes[i], jd_text, use_cache, weights, **kwargs)
+                    continue
+                if use_cache and self._storage:
+                    self._storage.save(
+                        self._match_cache_key(summaries[i], jd_text, weights),
+                        data,
+                        ttl=self._config.storage.cache_ttl
+                    )
+                results[i] = data
+
+        return results
+
+    def _plan_match_batches(
+        self,
+        summaries: Dict[int, str],
+        fixed_prompt: str,
+        route: Route = None
+    ) -> List[List[int]]:
+        """
+        Group resumes into batches that fit the model.
+
+        A batch is closed when adding the next resume would exceed the input
+        tokens left in the context window, or when the model's output limit
+        could not hold one more result.
+        """
+        batch_config = self._config.match_batch
+        if route is None:
+            route = self._routes("evaluate_match")[0]
+        model_info = self._config.get_model_config(route.provider_name, route.model)
+        context_window = model_info.context_window if model_info else 65536
+        max_output_tokens = model_info.max_tokens if model_info else 4096
+        count = self._budgeter.counter.count
+
+        input_budget = (context_window - max_output_tokens - count(fixed_prompt)
+                        - self._config.prompt.reserve_tokens)
+        max_size = min(batch_config.max_batch_size,
+                       max_output_tokens // max(batch_config.output_tokens_per_resume, 1))
+        max_size = max(max_size, 1)
+
+        batches, current, used = [], [], 0
+        for i, summary in summaries.items():
+            tokens = count(summary) + self.BATCH_RESUME_OVERHEAD_TOKENS
+            if current and (len(current) >= max_size or used + tokens > input_budget):
+                batches.append(current)
+                current, used = [], 0
+            current.append(i)
+            used += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def _score_match_batch(
+        self,
+        batch: List[int],
+        summaries: Dict[int, str],
+        system_prompt: str,
+        shared_prompt: str,
+        route: Route,
+        **kwargs
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Score one batch of resumes in a single request.
+
+        Returns:
+            Results by resume index; resumes the response did not cover
+            (or all of them, if it was not a JSON array) are absent.
+        """
+        ids = {f"R{n}": i for n, i in enumerate(batch, 1)}
+        resumes_block = "\n\n".join(f"### RESUME {rid}\n{summaries[i]}" for rid, i in ids.items())
+        user_prompt = f"{shared_prompt}CANDIDATE RESUMES ({len(batch)}):\n\n{resumes_block}"
+
+        kwargs.pop("model", None)
+        response = self._call_llm_with_retry(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt, CACHE_PREFIX_KEY: shared_prompt}
+            ],
+            model=route.model,
+            temperature=0.2, # Low temp for consistent scoring
+            route=route,
+            **json_mode_kwargs(route.provider),
+            **kwargs
+        )
+
+        try:
+            items = load_json(response.content)
+        except json.JSONDecodeError:
+            return {}
+        if isinstance(items, dict):
+            items = items.get("results", [])
+        if not isinstance(items, list):
+            return {}
+
+        # Invalid items are left out and re-scored on their own
+        scored = {}
+        for item in items:
+            try:
+                item = MatchBatchItem.model_validate(item)
+            except ValidationError:
+                continue
+            index = ids.get(item.id.strip())
+            if index is not None and index not in scored:
+                scored[index] = item.model_dump(exclude={"id"})
+        return scored
+
+    def _evaluate_match_or_error(
+        self,
+        resume_text: str,
+        jd_text: str,
+        use_cache: bool,
+        weights: Dict[str, int],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """evaluate_match for one resume of a batch, reporting failure in the result."""
+        try:
+            return self.evaluate_match(resume_text, jd_text, use_cache=use_cache, weights=weights, **kwargs)
+        except TalentOSError as e:
+            return self._match_error(e)
+
+    def _match_error(self, error: Exception) -> Dict[str, Any]:
+        return {"score": 0, "status": "Error", "reason": "Processing failed", "error": str(error)}
+
+    def screen_candidates(
+        self,
+        resumes: List[str],
+        jd_text: str,
+        top_k: int = None,
+        min_local_score: float = None,
+        use_cache: bool = True,
+        weights: Dict[str, int] = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Two-stage screening: local pre-ranking, then LLM scoring of the best.
+
+        All resumes are ranked by embedding similarity to the JD plus
+        keyword overlap. Only the top_k (at or above min_local_score) are
+        scored by the LLM with evaluate_match_batch; the others get their
+        local score, marked with "scored_by": "local".
+
+        Args:
+            resumes: Resume texts
+            jd_text: Job description text
+            top_k: LLM shortlist size (screening.top_k if None, 0 = no limit)
+            min_local_score: Minimum local score for the LLM (config if None)
+            use_cache: Whether to use cached LLM results
+            weights: Scoring weights for the LLM stage
+            **kwargs: Additional parameters (model, etc.)
+
+        Returns:
+            One result dict per resume, in input order
+        """
+        embed_batch = self._embedding_provider.embed_batch if self._embedding_provider else None
+        funnel = ScreeningFunnel(self._config.screening, embed_batch=embed_batch)
+        ranked = funnel.rank(resumes, jd_text)
+        shortlist, rest = funnel.split(ranked, top_k=top_k, min_local_score=min_local_score)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(resumes)
+        scored = self.evaluate_match_batch(
+            [resumes[c.index] for c in shortlist], jd_text, use_cache=use_cache, weights=weights, **kwargs
+        ) if shortlist else []
+        for candidate, data in zip(shortlist, scored):
+            results[candidate.index] = {**data, "scored_by": "llm", "screening": candidate.to_metadata()}
+        for candidate in rest:
+            results[candidate.index] = local_match_result(candidate)
+        return results
+
     def generate_message(
         self,
         msg_type: str,
@@ -510,18 +894,24 @@ class TalentOSEngine:
         else:
             return "Invalid message type."
 
+        route = self._routes("generate_message")[0]
         response = self._call_llm_with_retry(
             messages=[{"role": "user", "content": prompt}],
-            temperature=0.7
+            model=route.model,
+            temperature=0.7,
+            route=route
         )
         return response.content
 
     def translate_text(self, text: str, target_lang: str = "Chinese") -> str:
         """Translate text to target language."""
         prompt = f"Translate the following text to {target_lang}. Maintain professional tone.\n\n{text}"
+        route = self._routes("translate_text")[0]
         response = self._call_llm_with_retry(
             messages=[{"role": "user", "content": prompt}],
-            temperature=0.3
+            model=route.model,
+            temperature=0.3,
+            route=route
         )
         return response.content
 
@@ -552,6 +942,7 @@ class TalentOSEngine:
                 config=provider_config
             )
             self._current_provider = provider
+            self._pool.register(provider, self._llm_provider)
             
             # Setup separate embedding provider if needed
             self._setup_embedding_provider()
@@ -561,30 +952,50 @@ class TalentOSEngine:
 
     def _setup_embedding_provider(self):
         """
-        Setup a dedicated embedding provider if the main LLM provider doesn't support it.
+        Select the provider for embeddings, without sending any request.
+
         Strategy:
-        1. Check if main provider supports embeddings.
-        2. If not, try to load 'local_embedding' (BAAI/bge-small-zh-v1.5).
+        1. Use the main provider if it supports embeddings (capability flag).
+        2. If not, use 'local_embedding' (BAAI/bge-small-zh-v1.5). It is
+           created once and kept across provider switches; the model loads
+           on first use or via warm_up_embeddings().
         """
-        try:
-            # Test if main provider supports embedding
-            self._llm_provider.embed("test")
-        except NotImplementedError:
-            # Main provider (e.g., DeepSeek) doesn't support embedding.
-            # Load local embedding provider as a fallback for embed() calls.
-            print("Main provider does not support embeddings. Initializing Local BGE model...")
-            try:
-                from src.plugins.llm_providers.local_embedding import LocalEmbeddingProvider
-                self._embedding_provider = LocalEmbeddingProvider()
-                
-                # Monkey patch the main provider's embed method to use the local one
-                self._llm_provider.embed = self._embedding_provider.embed
-                print("Successfully injected Local Embedding Provider (BAAI/bge-small-zh-v1.5)")
-            except Exception as e:
-                print(f"Failed to initialize local embedding fallback: {e}")
-        except Exception:
-            # Other errors, maybe network or config, ignore for now
-            pass
+        if self._llm_provider is not None and self._llm_provider.supports_embeddings:
+            provider = self._llm_provider
+        else:
+            if self._local_embedding_provider is None:
+                try:
+                    self._local_embedding_provider = get_llm_provider(
+                        "local_embedding", embedding_config=self._config.embedding
+                    )
+                except Exception as e:
+                    print(f"Failed to initialize local embedding fallback: {e}")
+            provider = self._local_embedding_provider
+
+        if provider is not self._embedding_provider or self._embedding_batcher is None:
+            if self._embedding_batcher is not None:
+                self._embedding_batcher.close()
+                self._embedding_batcher = None
+            config = self._config.embedding
+            if provider is not None and config.batching:
+                self._embedding_batcher = EmbeddingBatcher(
+                    provider.embed_batch,
+                    max_batch_size=config.max_batch_size,
+                    max_wait_ms=config.max_wait_ms
+                )
+        self._embedding_provider = provider
+
+    def _embed(self, text: str) -> List[float]:
+        """Embed one text, batched with concurrent requests when batching is enabled."""
+        if self._embedding_batcher is not None:
+            return self._embedding_batcher.embed(text)
+        return self._embedding_provider.embed(text)
+
+    def warm_up_embeddings(self):
+        """Start loading a local embedding model in the background (no-op otherwise)."""
+        warm_up = getattr(self._embedding_provider, "warm_up", None)
+        if warm_up is not None:
+            warm_up()
 
     def _get_default_provider(self) -> str:
         """Get the default provider from config."""
@@ -600,10 +1011,13 @@ class TalentOSEngine:
             return
 
         try:
-            self._storage = get_storage(
+            storage = get_storage(
                 self._config.storage.backend,
                 cache_dir=self._config.cache_dir
             )
+            # Cache hits and misses double as passive storage health checks
+            self._storage = MonitoredStorage(storage, self._health)
+            self._health.add_component("storage", probe=lambda: self._probe_storage(storage))
         except Exception as e:
             print(f"Warning: Failed to initialize storage: {e}")
             self._storage = None
@@ -612,10 +1026,14 @@ class TalentOSEngine:
         """
         Switch to a different LLM provider at runtime.
 
+        The switch takes precedence over model routing: routed operations
+        only use tier candidates on this provider (or its default model).
+
         Args:
             provider_name: Name of the provider to use
         """
         self._setup_llm_provider(provider_name)
+        self._provider_pinned = True
 
     def analyze(
         self,
@@ -638,10 +1056,24 @@ class TalentOSEngine:
         Returns:
             AnalysisResult object with report and metadata
         """
+        # Get persona
+        if persona not in self._personas:
+            persona = "hrbp"
+        persona_data = self._personas[persona]
+        route = self._routes("analyze", kwargs.pop("model", None))[0]
+
+        # Normalise and fit inputs to the model's budget
+        budget = self._fit_inputs(
+            resume_text, jd_text,
+            self._get_analysis_system_prompt(persona_data),
+            route.model, route.provider_name
+        )
+        resume_text, jd_text = budget.resume_text, budget.jd_text
+
         # Check cache first
         if use_cache and self._storage:
             cache_key = self._generate_cache_key(resume_text, jd_text, persona)
-            cached = self._storage.load(cache_key)
+            cached = self._load_cached("analyze", cache_key)
             if cached:
                 return AnalysisResult(
                     report=cached["report"],
@@ -649,37 +1081,26 @@ class TalentOSEngine:
                     model=cached.get("model", ""),
                     tokens_used=cached.get("tokens_used", 0),
                     cached=True,
-                    metadata={"cache_key": cache_key}
+                    metadata={"cache_key": cache_key, **budget.to_metadata()}
                 )
 
-        # Get persona
-        if persona not in self._personas:
-            persona = "hrbp"
-        persona_data = self._personas[persona]
+        # Static instructions first, JD then resume last (prompt-cache friendly)
+        messages = self._build_analysis_messages(resume_text, jd_text, persona_data)
 
-        # Construct prompt
-        prompt = self._construct_prompt(resume_text, jd_text, persona_data)
-
-        # Get model and temperature from kwargs or config
-        model = kwargs.pop("model", None)
+        # Get temperature from kwargs or the routed model's config
         temperature = kwargs.pop("temperature", 0.7)
-
-        if self._config.get_model_config(self._current_provider):
-            model_info = self._config.get_model_config(self._current_provider, model)
-            if model_info:
-                temperature = model_info.temperature
-                model = model_info.name
+        model_info = self._config.get_model_config(route.provider_name, route.model)
+        if model_info:
+            temperature = model_info.temperature
 
         # Call LLM with retry
         start_time = time.time()
         try:
             response = self._call_llm_with_retry(
-                messages=[
-                    {"role": "system", "content": persona_data["system_prompt"]},
-                    {"role": "user", "content": prompt}
-                ],
-                model=model,
+                messages=messages,
+                model=route.model,
                 temperature=temperature,
+                route=route,
                 **kwargs
             )
 
@@ -694,7 +1115,12 @@ class TalentOSEngine:
                 tokens_used=response.tokens_used,
                 latency_ms=latency_ms,
                 cached=False,
-                metadata={"persona": persona, "provider": self._current_provider}
+                metadata={
+                    "persona": persona,
+                    "provider": response.provider or route.provider_name,
+                    "cached_tokens": response.cached_tokens,
+                    **budget.to_metadata()
+                }
             )
 
             # Save to cache
@@ -728,42 +1154,49 @@ class TalentOSEngine:
         Analyze resume against JD with streaming response.
         Yields chunks of text.
         """
+        # Get persona
+        if persona not in self._personas:
+            persona = "hrbp"
+        persona_data = self._personas[persona]
+        route = self._routes("analyze", kwargs.pop("model", None))[0]
+
+        # Normalise and fit inputs to the model's budget
+        budget = self._fit_inputs(
+            resume_text, jd_text or "",
+            self._get_analysis_system_prompt(persona_data),
+            route.model, route.provider_name
+        )
+        resume_text, jd_text = budget.resume_text, budget.jd_text
+
         # Check if cache exists
         if use_cache and self._storage:
             cache_key = self._generate_cache_key(resume_text, jd_text, persona)
-            cached = self._storage.load(cache_key)
+            cached = self._load_cached("analyze", cache_key)
             if cached:
                 yield cached["report"]
                 return
 
-        # Get persona
-        if persona not in self._personas:
-            persona = "hrbp"
-        persona_data = self._personas[persona]
-
-        # Construct prompt
-        prompt = self._construct_prompt(resume_text, jd_text, persona_data)
+        # Static instructions first, JD then resume last (prompt-cache friendly)
+        messages = self._build_analysis_messages(resume_text, jd_text, persona_data)
 
         # Get model config
-        model = kwargs.pop("model", None)
+        model = route.model
         temperature = kwargs.pop("temperature", 0.7)
-        if self._config.get_model_config(self._current_provider):
-            model_info = self._config.get_model_config(self._current_provider, model)
-            if model_info:
-                temperature = model_info.temperature
-                model = model_info.name
+        model_info = self._config.get_model_config(route.provider_name, model)
+        if model_info:
+            temperature = model_info.temperature
 
         # Stream response
         full_report = []
         try:
-            stream = self._llm_provider.chat_stream(
-                messages=[
-                    {"role": "system", "content": persona_data["system_prompt"]},
-                    {"role": "user", "content": prompt}
-                ],
-                model=model,
-                temperature=temperature,
-                **kwargs
+            stream = self._metrics.track_stream(
+                route.provider.chat_stream(
+                    messages=messages,
+                    model=model,
+                    temperature=temperature,
+                    **kwargs
+                ),
+                "analyze", route.provider_name, model
             )
 
             for chunk in stream:
@@ -788,7 +1221,7 @@ class TalentOSEngine:
                     "report": report,
                     "score": score,
                     "model": model,
-                    "tokens_used": 0 # Estimate or skip
+                    "tokens_used": stream.response.tokens_used if stream.response else 0
                 },
                 ttl=self._config.storage.cache_ttl
             )
@@ -805,12 +1238,14 @@ class TalentOSEngine:
         """
         # Diagnostic Prompt
         system_prompt = self._get_diagnostic_prompt()
+        budget = self._fit_inputs(resume_text, "", system_prompt, kwargs.get("model"))
+        resume_text = budget.resume_text
         user_prompt = f"Here is the candidate's resume:\n\n{resume_text}\n\nPlease perform the Deep Diagnostic."
 
         # Cache Key (Use "DIAGNOSTIC" as jd_text placeholder)
         if use_cache and self._storage:
             cache_key = self._generate_cache_key(resume_text, "DIAGNOSTIC", persona)
-            cached = self._storage.load(cache_key)
+            cached = self._load_cached("diagnose_resume", cache_key)
             if cached:
                 return AnalysisResult(
                     report=cached["report"],
@@ -840,6 +1275,7 @@ class TalentOSEngine:
                 ],
                 model=model,
                 temperature=temperature,
+                operation="diagnose_resume",
                 **kwargs
             )
 
@@ -853,7 +1289,13 @@ class TalentOSEngine:
                 tokens_used=response.tokens_used,
                 latency_ms=latency_ms,
                 cached=False,
-                metadata={"persona": persona, "provider": self._current_provider, "type": "diagnostic"}
+                metadata={
+                    "persona": persona,
+                    "provider": self._current_provider,
+                    "type": "diagnostic",
+                    "cached_tokens": response.cached_tokens,
+                    **budget.to_metadata()
+                }
             )
 
             # Save to cache
@@ -880,57 +1322,129 @@ class TalentOSEngine:
         messages: List[Dict],
         model: str = None,
         temperature: float = 0.7,
+        route: Route = None,
+        operation: str = None,
         **kwargs
     ) -> LLMResponse:
         """
-        Call LLM with automatic retry on failure.
+        Call LLM with automatic failover on failure.
 
-        Implements exponential backoff for rate limits.
+        The request goes to route's provider if given, else to the current
+        provider (recorded in the metrics under operation). Errors fail
+        over to the other enabled providers (see ProviderPool); backoff
+        only applies once all of them have failed.
         """
         # Safety: Remove any remaining duplicate args
         kwargs.pop('model', None)
         kwargs.pop('temperature', None)
 
-        provider_config = self._config.get_llm_provider_config(self._current_provider)
+        if route is None:
+            route = Route(self._current_provider, model, self._llm_provider, operation=operation or "chat")
+        elif model != route.model:
+            route = dataclasses.replace(route, model=model)
+        provider_config = self._config.get_llm_provider_config(route.provider_name)
         max_retries = provider_config.max_retries if provider_config else 3
 
-        last_error = None
-        for attempt in range(max_retries):
-            try:
-                return self._llm_provider.chat(
-                    messages=messages,
-                    model=model,
-                    temperature=temperature,
-                    **kwargs
-                )
-            except Exception as e:
-                last_error = e
-                if attempt < max_retries - 1:
-                    wait_time = (2 ** attempt)  # Exponential backoff
-                    time.sleep(wait_time)
+        return self._pool.chat(
+            route,
+            messages=messages,
+            max_retries=max_retries,
+            temperature=temperature,
+            **kwargs
+        )
 
-        raise last_error
+    def _routes(self, operation: str, model: str = None) -> List[Route]:
+        """
+        Routes to try for an operation (see ModelRouter).
 
-    def _construct_prompt(
+        An explicitly requested model pins the operation to the current
+        provider, without escalation.
+        """
+        model_info = self._config.get_model_config(self._current_provider, model)
+        default = Route(self._current_provider, model_info.name if model_info else model, self._llm_provider,
+                        operation=operation)
+        if model:
+            return [default]
+        return self._router.routes(operation, default, pin_provider=self._provider_pinned)
+
+    def _request_structured(
+        self,
+        routes: List[Route],
+        messages: List[Dict],
+        schema,
+        **kwargs
+    ) -> Tuple[StructuredResult, Route]:
+        """
+        request_structured over routes, escalating on invalid output.
+
+        Each route gets the request plus its repair attempt; only when the
+        output is still invalid is the next (stronger) route tried.
+
+        Returns:
+            The result (token counts summed over all routes) and the route
+            that produced it
+        """
+        tokens_used = cached_tokens = repairs = 0
+        for route in routes:
+            result = request_structured(
+                functools.partial(self._call_llm_with_retry, route=route),
+                messages=messages,
+                schema=schema,
+                model=route.model,
+                **json_mode_kwargs(route.provider),
+                **kwargs
+            )
+            tokens_used += result.tokens_used
+            cached_tokens += result.cached_tokens
+            repairs += result.repairs
+            if result.ok:
+                break
+            if route is not routes[-1]:
+                print(f"Escalating {schema.__name__} from {route.provider_name}:{route.model}: {result.error}")
+
+        result.tokens_used, result.cached_tokens, result.repairs = tokens_used, cached_tokens, repairs
+        return result, route
+
+    def _fit_inputs(
         self,
         resume_text: str,
         jd_text: str,
-        persona_data: Dict
-    ) -> str:
-        """Construct the analysis prompt."""
+        fixed_prompt: str,
+        model: str = None,
+        provider_name: str = None
+    ) -> BudgetResult:
+        """
+        Normalise resume/JD text and trim it to the model's budget.
+
+        Args:
+            resume_text: Resume content
+            jd_text: Job description content (may be empty)
+            fixed_prompt: The rest of the prompt (system + instructions)
+            model: Model name (provider default if None)
+            provider_name: Provider of the model (current provider if None)
+
+        Returns:
+            BudgetResult with the texts to interpolate
+        """
+        model_info = self._config.get_model_config(provider_name or self._current_provider, model)
+        return self._budgeter.fit(
+            resume_text,
+            jd_text,
+            context_window=model_info.context_window if model_info else 65536,
+            max_output_tokens=model_info.max_tokens if model_info else 4096,
+            fixed_tokens=self._budgeter.counter.count(fixed_prompt)
+        )
+
+    def _get_analysis_instructions(self, persona_data: Dict) -> str:
+        """Get the static task and output instructions for analysis."""
         # Check if this is a Headhunter persona
         if persona_data.get("name") == "B-Side Headhunter":
-            return self._construct_headhunter_prompt(resume_text, jd_text)
+            return self._get_headhunter_instructions()
 
-        prompt = f"""
+        return """
         TASK:
-        Analyze the following Candidate Resume against the Target Job Description (JD).
-
-        TARGET JD:
-        {jd_text}
-
-        CANDIDATE RESUME:
-        {resume_text}
+        Analyze the Candidate Resume against the Target Job Description (JD)
+        provided in the user message.
 
         OUTPUT REQUIREMENTS (Markdown Format):
 
@@ -948,7 +1462,7 @@ class TalentOSEngine:
         ## 3. 技能雷达 (JSON)
         Output a JSON block for radar chart visualization with exactly 6 dimensions:
         ```json
-        {{"radar": {{"技术深度": 0-100, "项目广度": 0-100, "架构能力": 0-100, "工程素养": 0-100, "沟通协作": 0-100, "发展潜力": 0-100}}}}
+        {"radar": {"技术深度": 0-100, "项目广度": 0-100, "架构能力": 0-100, "工程素养": 0-100, "沟通协作": 0-100, "发展潜力": 0-100}}
         ```
         Replace the values (0-100) with your actual assessment scores.
 
@@ -975,24 +1489,13 @@ class TalentOSEngine:
         TONE: Professional, Constructive, Data-Driven.
         LANGUAGE: 全部使用中文输出 (All output must be in Simplified Chinese).
         """
-        return prompt
 
-    def _construct_headhunter_prompt(
-        self,
-        resume_text: str,
-        jd_text: str
-    ) -> str:
-        """Construct the prompt specifically for Headhunters (B-Side)."""
-        prompt = f"""
+    def _get_headhunter_instructions(self) -> str:
+        """Get the instructions specifically for Headhunters (B-Side)."""
+        return """
 TASK:
 You are preparing a Candidate Presentation for your Client (Hiring Manager).
-Analyze the candidate's resume against the Job Description (JD).
-
-TARGET JD:
-{jd_text}
-
-CANDIDATE RESUME:
-{resume_text}
+Analyze the candidate's resume against the Job Description (JD) provided in the user message.
 
 OUTPUT REQUIREMENTS (Markdown Format):
 
@@ -1015,14 +1518,42 @@ OUTPUT REQUIREMENTS (Markdown Format):
         ## 5. 技能雷达 (JSON)
         Output a JSON block for radar chart visualization with exactly 6 dimensions:
         ```json
-        {{"radar": {{"专业技能": 0-100, "项目经验": 0-100, "学历背景": 0-100, "行业匹配": 0-100, "稳定性": 0-100, "性价比": 0-100}}}}
+        {"radar": {"专业技能": 0-100, "项目经验": 0-100, "学历背景": 0-100, "行业匹配": 0-100, "稳定性": 0-100, "性价比": 0-100}}
         ```
         (Note: "稳定性" and "性价比" are key for Headhunters).
 
         TONE: Professional, Objective, Sales-driven.
         LANGUAGE: Chinese (Simplified).
         """
-        return prompt
+
+    def _get_analysis_system_prompt(self, persona_data: Dict) -> str:
+        """Persona prompt followed by the analysis instructions."""
+        return persona_data["system_prompt"] + "\n" + self._get_analysis_instructions(persona_data)
+
+    def _build_analysis_messages(
+        self,
+        resume_text: str,
+        jd_text: str,
+        persona_data: Dict
+    ) -> List[Dict]:
+        """
+        Build the analysis messages with static content first.
+
+        The persona prompt and output instructions are identical on every
+        call, so they form the system prompt. The JD comes before the resume
+        in the user message and is marked as a cacheable prefix: screening a
+        batch of resumes against one JD reuses the provider's prompt cache
+        for everything up to the resume.
+        """
+        jd_part = f"TARGET JD:\n{jd_text}\n\n"
+        return [
+            {"role": "system", "content": self._get_analysis_system_prompt(persona_data)},
+            {
+                "role": "user",
+                "content": f"{jd_part}CANDIDATE RESUME:\n{resume_text}",
+                CACHE_PREFIX_KEY: jd_part
+            }
+        ]
 
     def _generate_cache_key(
         self,
@@ -1034,6 +1565,12 @@ OUTPUT REQUIREMENTS (Markdown Format):
         content = f"{resume_text}:{jd_text}:{persona}"
         return hashlib.md5(content.encode()).hexdigest()
 
+    def _load_cached(self, operation: str, cache_key: str) -> Optional[Dict]:
+        """Load a cached result, counting the hit or miss for operation."""
+        cached = self._storage.load(cache_key)
+        self._metrics.record_cache(operation, bool(cached))
+        return cached
+
     def _extract_score(self, report: str) -> Optional[int]:
         """Extract match score from the report."""
         import re
@@ -1063,11 +1600,10 @@ OUTPUT REQUIREMENTS (Markdown Format):
             file_path: Path to the document
 
         Returns:
-            ParsedDocument object
+            ParsedDocument object (cached and normalised)
         """
         try:
-            parser = get_parser_for_file(file_path)
-            return parser.parse(file_path)
+            return get_ingestion_pipeline().ingest_file(file_path)
         except UnsupportedFormatError:
             raise
         except Exception as e:
@@ -1129,8 +1665,26 @@ OUTPUT REQUIREMENTS (Markdown Format):
             "available": self._llm_provider.is_available()
         }
 
-    def health_check(self) -> Dict:
-        """Check the health of all components."""
+    @property
+    def health_monitor(self) -> HealthMonitor:
+        """Passive health monitor (start() it for background refresh)."""
+        return self._health
+
+    @property
+    def vector_store_enabled(self) -> bool:
+        return self._vector_store is not None
+
+    def health_check(self, live: bool = False) -> Dict:
+        """
+        Health of all components.
+
+        Served from the health monitor's in-memory snapshot, built from the
+        outcome of real requests. live=True runs active checks instead: a
+        chat request to the provider and a storage round trip.
+        """
+        if not live:
+            return self._health.snapshot()
+
         status = {
             "llm_provider": {
                 "provider": self._current_provider,
@@ -1145,7 +1699,8 @@ OUTPUT REQUIREMENTS (Markdown Format):
             "vector_store": {
                 "enabled": self._vector_store is not None,
                 "healthy": True # Simple store is always healthy if initialized
-            }
+            },
+            "llm_pool": self._pool.health_report()
         }
 
         # Check LLM provider
@@ -1158,17 +1713,44 @@ OUTPUT REQUIREMENTS (Markdown Format):
         # Check storage
         if self._storage:
             try:
-                test_key = "__health_check__"
-                self._storage.save(test_key, {"test": True}, ttl=60)
-                loaded = self._storage.load(test_key)
-                if loaded:
-                    status["storage"]["healthy"] = True
-                    self._storage.delete(test_key)
+                self._probe_storage(self._storage)
+                status["storage"]["healthy"] = True
             except Exception as e:
                 status["storage"]["error"] = str(e)
 
         return status
 
+    def _probe_storage(self, storage: IStorage):
+        """Storage round trip; raises if it fails."""
+        test_key = "__health_check__"
+        storage.save(test_key, {"test": True}, ttl=60)
+        if not storage.load(test_key):
+            raise TalentOSError("Storage round trip failed")
+        storage.delete(test_key)
+
+    def _describe_health(self) -> Dict:
+        """Engine entries of the health snapshot (in memory only, no requests)."""
+        llm = self._pool.health(self._current_provider).to_dict()
+        storage = self._health.component_status("storage")
+        return {
+            "llm_provider": {
+                "provider": self._current_provider,
+                "healthy": bool(self._llm_provider and self._llm_provider.is_available()) and llm["state"] != OPEN,
+                "state": llm["state"],
+                "error": llm["last_error"]
+            },
+            "llm_pool": self._pool.health_report(),
+            "storage": {
+                **storage,
+                "enabled": self._storage is not None,
+                "healthy": self._storage is not None and storage["healthy"]
+            },
+            "vector_store": {
+                "enabled": self._vector_store is not None,
+                "healthy": True # Simple store is always healthy if initialized
+            }
+        }
+
     # --- RAG Features ---
 
     def diagnose_resume_v2(self, resume_text: str, jd_text: str) -> DiagnosisResult:
@@ -1209,9 +1791,9 @@ OUTPUT REQUIREMENTS (Markdown Format):
         
         # Generate Embedding
         embedding = None
-        if self._llm_provider:
+        if self._embedding_provider:
             try:
-                embedding = self._llm_provider.embed(resume_text)
+                embedding = self._embed(resume_text)
             except NotImplementedError:
                  # Warn but proceed without embedding (content only storage)
                  # print("Warning: LLM Provider does not support embeddings. Indexing content only.")
@@ -1243,11 +1825,11 @@ OUTPUT REQUIREMENTS (Markdown Format):
         if not self._vector_store:
             raise TalentOSError("Vector store not initialized")
             
-        if not self._llm_provider:
-             raise TalentOSError("LLM provider not initialized")
+        if not self._embedding_provider:
+             raise TalentOSError("Embedding provider not initialized")
 
         try:
-            query_embedding = self._llm_provider.embed(query)
+            query_embedding = self._embed(query)
         except NotImplementedError:
             raise TalentOSError("Current LLM provider does not support embeddings.")
         except Exception as e:
@@ -73,6 +73,23 @@ class ParseError(DocumentParserError):
     pass
 
 
+class UploadError(TalentOSError):
+    """Base exception for rejected uploads."""
+    pass
+
+
+class UploadTooLargeError(UploadError):
+    """Raised when an upload exceeds the per-file or per-request byte limit."""
+    def __init__(self, message: str, limit: Optional[int] = None, **kwargs):
+        super().__init__(message, kwargs)
+        self.limit = limit
+
+
+class UploadRejectedError(UploadError):
+    """Raised when upload content does not match its declared format."""
+    pass
+
+
 class StorageError(PluginError):
     """Base exception for storage errors."""
     pass
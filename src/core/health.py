@@ -0,0 +1,203 @@
+"""
+Health Monitor / 健康监控
+
+Passive health tracking for /health. Components report the outcome of
+real requests; a background thread refreshes an in-memory snapshot and
+probes only components that have been idle. Reading the snapshot never
+touches the network or disk.
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from src.core.config import get_config, HealthConfig
+from src.core.resilience import OPEN, CircuitBreaker, LatencyWindow, ProviderHealth
+from src.interfaces.istorage import IStorage
+
+
+class HealthMonitor:
+    """
+    In-memory health state for the engine's components.
+
+    Each component has a ProviderHealth tracker (circuit breaker, success
+    rate, latency) fed by record_success/record_failure. Components
+    registered with a probe are probed by the background thread once they
+    have seen no traffic for probe_idle_seconds.
+    """
+
+    def __init__(
+        self,
+        config: HealthConfig = None,
+        describe: Callable[[], Dict[str, Any]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize monitor.
+
+        Args:
+            config: HealthConfig object (uses global config if None)
+            describe: Returns extra snapshot entries; must be cheap
+                (no I/O), it runs on every refresh
+            clock: Monotonic clock
+        """
+        self._config = config or get_config().health or HealthConfig()
+        self._describe = describe
+        self._clock = clock
+        self._components: Dict[str, ProviderHealth] = {}
+        self._probes: Dict[str, Callable[[], None]] = {}
+        self._last_activity: Dict[str, float] = {}
+        self._snapshot: Dict[str, Any] = {}
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_component(self, name: str, probe: Callable[[], None] = None) -> ProviderHealth:
+        """
+        Track a component.
+
+        Args:
+            name: Component name (snapshot key)
+            probe: Cheap check that raises on failure, run when idle
+        """
+        with self._lock:
+            if name not in self._components:
+                self._components[name] = ProviderHealth(
+                    name,
+                    CircuitBreaker(self._config.failure_threshold, self._config.reset_timeout, clock=self._clock),
+                    LatencyWindow()
+                )
+                self._last_activity[name] = self._clock()
+            if probe is not None:
+                self._probes[name] = probe
+            return self._components[name]
+
+    def component(self, name: str) -> Optional[ProviderHealth]:
+        return self._components.get(name)
+
+    def record_success(self, name: str, latency_ms: float = 0.0):
+        self.add_component(name).record_success(latency_ms)
+        self._last_activity[name] = self._clock()
+
+    def record_failure(self, name: str, error: str = None):
+        self.add_component(name).record_failure(error)
+        self._last_activity[name] = self._clock()
+
+    def component_status(self, name: str) -> Dict[str, Any]:
+        """Tracker state of a component plus a healthy flag."""
+        tracker = self._components.get(name)
+        if tracker is None:
+            return {"healthy": True, "state": "unknown"}
+        status = tracker.to_dict()
+        status["healthy"] = status["state"] != OPEN
+        return status
+
+    def refresh(self) -> Dict[str, Any]:
+        """Rebuild the snapshot from the trackers (no I/O)."""
+        snapshot = {name: self.component_status(name) for name in list(self._components)}
+        if self._describe:
+            snapshot.update(self._describe())
+        snapshot["checked_at"] = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            self._snapshot = snapshot
+            self._refreshed_at = self._clock()
+        return snapshot
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        The latest health snapshot.
+
+        Served from memory; refreshed inline only when the background
+        thread is not running and the snapshot is older than
+        refresh_interval.
+        """
+        running = self._thread is not None and self._thread.is_alive()
+        stale = self._refreshed_at is None or self._clock() - self._refreshed_at >= self._config.refresh_interval
+        if not running and stale:
+            return self.refresh()
+        return self._snapshot
+
+    def run_probes(self):
+        """Probe the components that have been idle for probe_idle_seconds."""
+        now = self._clock()
+        for name, probe in list(self._probes.items()):
+            if now - self._last_activity.get(name, 0.0) < self._config.probe_idle_seconds:
+                continue
+            start_time = time.time()
+            try:
+                probe()
+            except Exception as e:
+                self.record_failure(name, str(e))
+            else:
+                self.record_success(name, (time.time() - start_time) * 1000)
+
+    def start(self):
+        """Start the background refresh thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        self.refresh()
+        while not self._stop.wait(self._config.refresh_interval):
+            try:
+                self.run_probes()
+                self.refresh()
+            except Exception as e:
+                print(f"Health monitor error: {e}")
+
+
+class MonitoredStorage(IStorage):
+    """Storage wrapper reporting the outcome of every operation to a HealthMonitor."""
+
+    def __init__(self, storage: IStorage, monitor: HealthMonitor, name: str = "storage"):
+        self._storage = storage
+        self._monitor = monitor
+        self._name = name
+
+    @property
+    def storage_name(self) -> str:
+        return self._storage.storage_name
+
+    def _track(self, operation, *args, failure_message: str = None, **kwargs):
+        """Run operation and record one outcome; with failure_message, a falsy result is a failure."""
+        start_time = time.time()
+        try:
+            result = operation(*args, **kwargs)
+        except Exception as e:
+            self._monitor.record_failure(self._name, str(e))
+            raise
+        if failure_message is not None and not result:
+            self._monitor.record_failure(self._name, failure_message)
+        else:
+            self._monitor.record_success(self._name, (time.time() - start_time) * 1000)
+        return result
+
+    def save(self, key: str, value: Any, ttl: int = None, **kwargs) -> bool:
+        return self._track(self._storage.save, key, value, ttl=ttl,
+                           failure_message=f"save failed for key {key}", **kwargs)
+
+    def load(self, key: str) -> Optional[Any]:
+        return self._track(self._storage.load, key)
+
+    def delete(self, key: str) -> bool:
+        return self._track(self._storage.delete, key)
+
+    def exists(self, key: str) -> bool:
+        return self._track(self._storage.exists, key)
+
+    def clear(self) -> bool:
+        return self._track(self._storage.clear)
+
+    def get_cache_key(self, *args) -> str:
+        return self._storage.get_cache_key(*args)
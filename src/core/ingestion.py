@@ -0,0 +1,162 @@
+"""
+Document Ingestion / 文档接入管道
+
+Single path from uploaded or on-disk files to analysis-ready text:
+validate -> hash -> cache lookup -> parse -> normalise.
+Used by every API endpoint, TalentOSEngine.parse_document and the
+legacy DocumentParser, so caching and pooled parsing apply everywhere.
+"""
+
+import os
+import asyncio
+from dataclasses import replace
+from typing import List, Optional
+
+from src.core.config import get_config, UploadConfig
+from src.core.parse_cache import ParseCache, get_parse_cache
+from src.core.parsing_service import ParseOutcome, ParsingService, get_parsing_service
+from src.core.text_normalizer import normalize_text
+from src.core.uploads import UploadReader, sniff_format
+from src.interfaces.idocument_parser import ParsedDocument
+
+
+class IngestionPipeline:
+    """
+    Turns raw documents into normalised ParsedDocument objects.
+
+    - Single uploads and files are parsed in a thread via the parse cache.
+    - Batches go through the process-pool ParsingService (which also uses the cache).
+    """
+
+    def __init__(
+        self,
+        cache: ParseCache = None,
+        parsing_service: ParsingService = None,
+        upload_config: UploadConfig = None
+    ):
+        """
+        Initialize ingestion pipeline.
+
+        Args:
+            cache: ParseCache instance (uses global cache if None)
+            parsing_service: ParsingService for batches (uses global service if None)
+            upload_config: UploadConfig for upload readers (uses global config if None)
+        """
+        self._cache = cache or get_parse_cache()
+        self._parsing_service = parsing_service
+        self._upload_config = upload_config or get_config().uploads or UploadConfig()
+
+    def new_reader(self) -> UploadReader:
+        """Create an upload reader holding one request's byte budget."""
+        return UploadReader(self._upload_config)
+
+    def ingest_bytes(self, content: bytes, file_name: str, validate: bool = True) -> ParsedDocument:
+        """
+        Parse raw document bytes.
+
+        Args:
+            content: Raw file bytes
+            file_name: Original file name (its extension selects the parser)
+            validate: Check magic bytes against the extension
+
+        Returns:
+            Normalised ParsedDocument (metadata includes sha256 and cache_hit)
+
+        Raises:
+            UnsupportedFormatError: If the extension is not supported
+            UploadRejectedError: If the content does not match the extension
+            DocumentParserError: If parsing fails
+        """
+        from src.plugins.document_parsers import get_parser, resolve_parser_name
+
+        parser = get_parser(resolve_parser_name(file_name))
+        if validate and self._upload_config.sniff_content:
+            sniff_format(content[:self._upload_config.chunk_size], file_name)
+
+        ext = os.path.splitext(file_name)[1].lower()
+        doc = self._cache.parse_bytes(parser, content, ext, file_name=file_name)
+        return self.normalize(doc)
+
+    def ingest_file(self, file_path: str) -> ParsedDocument:
+        """
+        Parse a document on disk; the file is read once.
+
+        Args:
+            file_path: Path to the document
+
+        Returns:
+            Normalised ParsedDocument
+        """
+        from src.plugins.document_parsers import resolve_parser_name
+
+        # Reject unsupported formats before touching the file
+        resolve_parser_name(file_path)
+        with open(file_path, "rb") as f:
+            content = f.read()
+        return self.ingest_bytes(content, file_path)
+
+    async def ingest_upload(self, upload, reader: UploadReader = None) -> ParsedDocument:
+        """
+        Stream an upload within the request limits and parse it off the event loop.
+
+        Args:
+            upload: FastAPI/Starlette UploadFile
+            reader: Request-scoped UploadReader (a new one if None)
+
+        Returns:
+            Normalised ParsedDocument
+        """
+        from src.plugins.document_parsers import resolve_parser_name
+
+        file_name = upload.filename or ""
+        resolve_parser_name(file_name)
+        reader = reader or self.new_reader()
+        content = await reader.read(upload)
+        # The reader already checked magic bytes on the first chunk
+        return await asyncio.to_thread(self.ingest_bytes, content, file_name, False)
+
+    async def ingest_uploads(self, uploads: list, reader: UploadReader = None) -> List[ParseOutcome]:
+        """
+        Read a batch of uploads and parse the accepted ones in the worker pool.
+
+        Per-file problems are reported in the outcome; exceeding the
+        request-wide limit raises UploadTooLargeError.
+
+        Returns:
+            List of ParseOutcome objects in upload order
+        """
+        reader = reader or self.new_reader()
+        uploaded = await reader.read_batch(uploads)
+
+        accepted = [(u.file_name, u.content) for u in uploaded if u.ok]
+        service = self._parsing_service or get_parsing_service()
+        parsed = iter(await service.parse_many_async(accepted))
+
+        # Keep rejected files in their original position
+        outcomes = []
+        for u in uploaded:
+            if not u.ok:
+                outcomes.append(ParseOutcome(file_name=u.file_name, error=u.error))
+                continue
+            outcome = next(parsed)
+            if outcome.ok and outcome.document is not None:
+                outcome.document = self.normalize(outcome.document)
+                outcome.content = outcome.document.content
+            outcomes.append(outcome)
+        return outcomes
+
+    def normalize(self, doc: ParsedDocument) -> ParsedDocument:
+        """Return a copy of doc with normalised content."""
+        return replace(doc, content=normalize_text(doc.content))
+
+
+# Global ingestion pipeline instance
+_ingestion_pipeline: Optional[IngestionPipeline] = None
+
+
+def get_ingestion_pipeline() -> IngestionPipeline:
+    """Get or create the global ingestion pipeline."""
+    global _ingestion_pipeline
+    if _ingestion_pipeline is None:
+        _ingestion_pipeline = IngestionPipeline()
+    return _ingestion_pipeline
@@ -0,0 +1,416 @@
+"""
+Metrics / 运行指标
+
+In-process counters and histograms for LLM calls, streams and caches,
+labelled by operation, provider and model, and rendered in the
+Prometheus text exposition format (served at /metrics).
+
+Streams additionally record time to first token, time to the first answer
+chunk (after any reasoning), gaps between chunks, generation throughput
+and the reasoning / answer token split.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.core.config import get_config, AppConfig, MetricsConfig
+from src.interfaces.illm_provider import LLMResponse, ReasoningChunk
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter, one series per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_number(value)}" for key, value in items]
+
+
+class Histogram:
+    """Cumulative-bucket histogram, one series per label combination."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = (), buckets: Iterable[float] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: Dict[Tuple[str, ...], list] = {}  # key -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels) -> int:
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            return series[2] if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, [list(s[0]), s[1], s[2]]) for key, s in self._series.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            for bound, bucket_count in zip(self.buckets, counts):
+                le = f'le="{_format_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {bucket_count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_number(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics, created on first use and rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, labels: Iterable[str] = ()) -> Counter:
+        return self._get_or_create(name, lambda: Counter(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Iterable[str] = (),
+                  buckets: Iterable[float] = ()) -> Histogram:
+        return self._get_or_create(name, lambda: Histogram(name, help_text, labels, buckets))
+
+    def _get_or_create(self, name: str, factory):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = factory()
+            return self._metrics[name]
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format."""
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+LLM_LABELS = ("operation", "provider", "model")
+
+
+class LLMMetrics:
+    """
+    LLM and cache metrics for the engine.
+
+    Per (operation, provider, model): requests by status, latency, time to
+    first token (streams), prompt / completion / cached tokens and the
+    estimated cost from ModelConfig.cost_per_1k_tokens. Cache lookups are
+    counted per operation as hits and misses.
+    """
+
+    def __init__(self, config: MetricsConfig = None, app_config: AppConfig = None,
+                 registry: MetricsRegistry = None):
+        """
+        Initialize metrics.
+
+        Args:
+            config: MetricsConfig object (uses global config if None)
+            app_config: AppConfig with the model prices (global if None)
+            registry: Registry to record into (a new one if None)
+        """
+        self._app_config = app_config or get_config()
+        self._config = config or self._app_config.metrics or MetricsConfig()
+        self.registry = registry or MetricsRegistry()
+        buckets = self._config.latency_buckets
+        r = self.registry
+        self.requests = r.counter("talentos_llm_requests_total", "LLM requests by outcome.", LLM_LABELS + ("status",))
+        self.latency = r.histogram("talentos_llm_request_duration_seconds",
+                                   "LLM request latency (streams: until the last chunk).", LLM_LABELS, buckets)
+        self.ttft = r.histogram("talentos_llm_time_to_first_token_seconds",
+                                "Time to the first streamed chunk.", LLM_LABELS, buckets)
+        self.prompt_tokens = r.counter("talentos_llm_prompt_tokens_total", "Prompt tokens sent.", LLM_LABELS)
+        self.completion_tokens = r.counter("talentos_llm_completion_tokens_total", "Completion tokens received.",
+                                           LLM_LABELS)
+        self.cached_tokens = r.counter("talentos_llm_cached_prompt_tokens_total",
+                                       "Prompt tokens served from the provider's prompt cache.", LLM_LABELS)
+        self.cost = r.counter("talentos_llm_cost_total",
+                              "Estimated cost (tokens x cost_per_1k_tokens, in the configured currency).", LLM_LABELS)
+        self.cache_lookups = r.counter("talentos_cache_lookups_total", "Result cache lookups by outcome.",
+                                       ("operation", "result"))
+
+        # Streaming
+        self.first_content = r.histogram("talentos_llm_time_to_first_content_seconds",
+                                         "Time to the first answer chunk, after any reasoning.", LLM_LABELS, buckets)
+        self.chunk_gap = r.histogram("talentos_llm_stream_chunk_gap_seconds",
+                                     "Time between consecutive streamed chunks.", LLM_LABELS,
+                                     self._config.chunk_gap_buckets)
+        self.throughput = r.histogram("talentos_llm_stream_tokens_per_second",
+                                      "Completion tokens per second after the first chunk.", LLM_LABELS,
+                                      self._config.throughput_buckets)
+        self.stream_tokens = r.counter("talentos_llm_stream_completion_tokens_total",
+                                       "Streamed completion tokens by kind (reasoning or content).",
+                                       LLM_LABELS + ("kind",))
+        self.endpoint_first_chunk = r.histogram("talentos_http_stream_time_to_first_chunk_seconds",
+                                                "Time from request arrival to the first model output chunk.",
+                                                ("endpoint",), buckets)
+
+    @property
+    def enabled(self) -> bool:
+        return self._config.enabled
+
+    def cost_per_1k(self, provider: str, model: str) -> float:
+        """Configured price of a model (0 when unknown; no fallback to another model)."""
+        provider_config = self._app_config.get_llm_provider_config(provider)
+        if not provider_config:
+            return 0.0
+        model = model or provider_config.default_model
+        for model_config in provider_config.models:
+            if model_config.name == model:
+                return model_config.cost_per_1k_tokens
+        return 0.0
+
+    def record_response(self, operation: str, provider: str, model: str, response: LLMResponse,
+                        latency_ms: float = None):
+        """Record a completed request."""
+        if not self.enabled:
+            return
+        labels = dict(operation=operation or "unknown", provider=provider, model=model or response.model or "")
+        self.requests.inc(status="ok", **labels)
+        self.latency.observe((response.latency_ms if latency_ms is None else latency_ms) / 1000, **labels)
+
+        prompt, completion = response.prompt_tokens, response.completion_tokens
+        if not prompt and not completion:
+            completion = response.tokens_used  # Provider only reported the total
+        self.prompt_tokens.inc(prompt, **labels)
+        self.completion_tokens.inc(completion, **labels)
+        self.cached_tokens.inc(response.cached_tokens, **labels)
+        price = self.cost_per_1k(provider, labels["model"])
+        if price:
+            self.cost.inc((prompt + completion) / 1000 * price, **labels)
+
+    def record_stream(self, operation: str, provider: str, model: str, response: LLMResponse,
+                      stats: "StreamStats"):
+        """Record a completed stream: the request itself plus its timing."""
+        if not self.enabled:
+            return
+        self.record_response(operation, provider, model, response, latency_ms=stats.duration_ms)
+        labels = dict(operation=operation or "unknown", provider=provider, model=model or response.model or "")
+        if stats.ttft_ms is not None:
+            self.ttft.observe(stats.ttft_ms / 1000, **labels)
+        if stats.first_content_ms is not None:
+            self.first_content.observe(stats.first_content_ms / 1000, **labels)
+        for gap_ms in stats.gaps_ms:
+            self.chunk_gap.observe(gap_ms / 1000, **labels)
+        if stats.tokens_per_second is not None:
+            self.throughput.observe(stats.tokens_per_second, **labels)
+        self.stream_tokens.inc(stats.reasoning_tokens, kind="reasoning", **labels)
+        self.stream_tokens.inc(stats.completion_tokens - stats.reasoning_tokens, kind="content", **labels)
+
+    def record_endpoint_first_chunk(self, endpoint: str, elapsed_ms: float):
+        """Record how long a streaming endpoint took to send its first model output."""
+        if self.enabled:
+            self.endpoint_first_chunk.observe(elapsed_ms / 1000, endpoint=endpoint)
+
+    def record_error(self, operation: str, provider: str, model: str):
+        """Record a failed request."""
+        if self.enabled:
+            self.requests.inc(status="error", operation=operation or "unknown", provider=provider, model=model or "")
+
+    def record_cache(self, operation: str, hit: bool):
+        """Record a result cache lookup."""
+        if self.enabled:
+            self.cache_lookups.inc(operation=operation, result="hit" if hit else "miss")
+
+    def track_stream(self, stream: Iterator[str], operation: str, provider: str, model: str) -> "MeteredStream":
+        """Wrap a provider's chat_stream() generator so it is recorded when it ends."""
+        return MeteredStream(stream, self, operation, provider, model)
+
+    def render(self) -> str:
+        return self.registry.render()
+
+
+_token_counter = None
+
+
+def _count_tokens(text: str) -> int:
+    """Estimate tokens of streamed text the provider reported no usage for."""
+    global _token_counter
+    if _token_counter is None:
+        from src.core.prompt_budget import TokenCounter
+        _token_counter = TokenCounter()
+    return _token_counter.count(text)
+
+
+@dataclass
+class StreamStats:
+    """Timing and token split of one streamed response (milliseconds)."""
+    ttft_ms: Optional[float] = None  # First chunk of any kind
+    first_content_ms: Optional[float] = None  # First answer chunk (after reasoning)
+    duration_ms: float = 0.0
+    chunks: int = 0
+    gaps_ms: List[float] = field(default_factory=list)
+    completion_tokens: int = 0
+    reasoning_tokens: int = 0
+
+    @property
+    def max_gap_ms(self) -> float:
+        return max(self.gaps_ms, default=0.0)
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Completion tokens over the time from the first chunk to the end."""
+        if self.ttft_ms is None or not self.completion_tokens:
+            return None
+        generation_ms = self.duration_ms - self.ttft_ms
+        return self.completion_tokens / (generation_ms / 1000) if generation_ms > 0 else None
+
+    def to_dict(self) -> Dict:
+        tps = self.tokens_per_second
+        return {
+            "ttft_ms": round(self.ttft_ms, 1) if self.ttft_ms is not None else None,
+            "first_content_ms": round(self.first_content_ms, 1) if self.first_content_ms is not None else None,
+            "duration_ms": round(self.duration_ms, 1),
+            "chunks": self.chunks,
+            "max_gap_ms": round(self.max_gap_ms, 1),
+            "completion_tokens": self.completion_tokens,
+            "reasoning_tokens": self.reasoning_tokens,
+            "tokens_per_second": round(tps, 1) if tps is not None else None,
+        }
+
+
+class MeteredStream:
+    """
+    Iterator over a chat stream that times it and records it once it finishes.
+
+    Providers return an LLMResponse with the stream's usage when their
+    generator ends; it is available as .response afterwards. Without one
+    (or without usage), completion tokens are estimated from the text.
+    Chunks of reasoning text are marked as ReasoningChunk by the provider.
+    """
+
+    def __init__(self, stream: Iterator[str], metrics: LLMMetrics, operation: str, provider: str, model: str):
+        self._stream = iter(stream)
+        self._metrics = metrics
+        self._labels = (operation, provider, model)
+        self._start = time.perf_counter()
+        self._last_chunk_at: Optional[float] = None
+        self._content: List[str] = []
+        self._reasoning: List[str] = []
+        self.stats = StreamStats()
+        self.response: Optional[LLMResponse] = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        try:
+            chunk = next(self._stream)
+        except StopIteration as stop:
+            self._finish(stop.value)
+            raise
+        except Exception:
+            self._metrics.record_error(*self._labels)
+            raise
+
+        now = time.perf_counter()
+        stats = self.stats
+        if self._last_chunk_at is None:
+            stats.ttft_ms = (now - self._start) * 1000
+        else:
+            stats.gaps_ms.append((now - self._last_chunk_at) * 1000)
+        self._last_chunk_at = now
+        stats.chunks += 1
+        if isinstance(chunk, ReasoningChunk):
+            self._reasoning.append(chunk)
+        else:
+            if stats.first_content_ms is None:
+                stats.first_content_ms = (now - self._start) * 1000
+            self._content.append(chunk)
+        return chunk
+
+    def close(self):
+        close = getattr(self._stream, "close", None)
+        if close is not None:
+            close()
+
+    @property
+    def ttft_ms(self) -> Optional[float]:
+        return self.stats.ttft_ms
+
+    def _finish(self, response: Optional[LLMResponse]):
+        operation, provider, model = self._labels
+        stats = self.stats
+        stats.duration_ms = (time.perf_counter() - self._start) * 1000
+        if not isinstance(response, LLMResponse):
+            response = LLMResponse(content="".join(self._content), model=model or "", tokens_used=0,
+                                   latency_ms=stats.duration_ms)
+        if not response.reasoning_tokens and self._reasoning:
+            response.reasoning_tokens = _count_tokens("".join(self._reasoning))
+        if not response.tokens_used:
+            response.completion_tokens = (_count_tokens(response.content or "".join(self._content))
+                                          + response.reasoning_tokens)
+            response.tokens_used = response.prompt_tokens + response.completion_tokens
+
+        stats.completion_tokens = response.completion_tokens or response.tokens_used
+        stats.reasoning_tokens = min(response.reasoning_tokens, stats.completion_tokens)
+        self.response = response
+        self._metrics.record_stream(operation, provider, model, response, stats)
+
+
+# Global metrics instance
+_metrics: Optional[LLMMetrics] = None
+
+
+def get_metrics() -> LLMMetrics:
+    """Get or create the global metrics."""
+    global _metrics
+    if _metrics is None:
+        _metrics = LLMMetrics()
+    return _metrics
@@ -0,0 +1,171 @@
+"""
+Parse Cache / 解析缓存
+
+Content-addressed cache of parsed documents.
+The same resume is typically uploaded several times (analyze, stream,
+diagnose, batch match); repeat uploads skip parsing entirely.
+"""
+
+import hashlib
+import json
+from dataclasses import asdict, replace
+from threading import Lock
+from typing import Dict, Optional
+
+from src.core.config import get_config, ParsingConfig
+from src.interfaces.idocument_parser import IDocumentParser, ParsedDocument
+from src.interfaces.istorage import IStorage
+
+
+class ParseCache:
+    """
+    Cache of ParsedDocument objects keyed by SHA-256 of the raw bytes
+    plus parser name, parser version, output-affecting parser options
+    and file extension.
+
+    Values are stored as plain dicts so any IStorage backend can hold them.
+    """
+
+    KEY_PREFIX = "parsed"
+
+    def __init__(self, storage: IStorage = None, ttl: int = None, config: ParsingConfig = None):
+        """
+        Initialize parse cache.
+
+        Args:
+            storage: Storage backend (built from config if None)
+            ttl: Time-to-live in seconds (uses config if None)
+            config: ParsingConfig object (uses global config if None)
+        """
+        app_config = get_config()
+        self._config = config or app_config.parsing or ParsingConfig()
+        self._ttl = ttl if ttl is not None else self._config.cache_ttl
+        self._storage = storage
+        if self._storage is None and self._config.cache_enabled:
+            from src.plugins.storage import get_storage
+            self._storage = get_storage(
+                self._config.cache_backend,
+                max_size=self._config.cache_max_items,
+                cache_dir=f"{app_config.cache_dir}/parsed"
+            )
+
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._storage is not None
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        """SHA-256 hex digest of raw document bytes."""
+        return hashlib.sha256(content).hexdigest()
+
+    def make_key(self, content_hash: str, parser: IDocumentParser, file_extension: str = "") -> str:
+        """
+        Build the cache key for a document hash and parser.
+
+        The extension is part of the key because it sets file_type
+        (the same bytes parse as .md or .txt).
+        """
+        options = json.dumps(parser.cache_options, sort_keys=True, default=str)
+        options_hash = hashlib.sha256(options.encode("utf-8")).hexdigest()[:12]
+        extension = file_extension.lower().lstrip(".")
+        return (f"{self.KEY_PREFIX}_{parser.parser_name}_v{parser.parser_version}_{options_hash}"
+                f"_{extension}_{content_hash}")
+
+    def get(self, key: str) -> Optional[ParsedDocument]:
+        """Look up a parsed document, recording hit/miss."""
+        if not self.enabled:
+            return None
+
+        try:
+            value = self._storage.load(key)
+        except Exception:
+            value = None
+
+        with self._lock:
+            if value is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+
+        return ParsedDocument(**value)
+
+    def put(self, key: str, doc: ParsedDocument):
+        """Store a parsed document."""
+        if not self.enabled:
+            return
+
+        try:
+            self._storage.save(key, asdict(doc), ttl=self._ttl)
+        except Exception:
+            # Cache failures must never break parsing
+            pass
+
+    def parse_bytes(
+        self,
+        parser: IDocumentParser,
+        content: bytes,
+        file_extension: str,
+        file_name: str = ""
+    ) -> ParsedDocument:
+        """
+        Parse raw bytes through the cache.
+
+        Args:
+            parser: Parser to use on a cache miss
+            content: Raw file bytes
+            file_extension: File extension (e.g., '.pdf')
+            file_name: Original file name
+
+        Returns:
+            ParsedDocument object (metadata includes sha256 and cache_hit)
+        """
+        content_hash = self.content_hash(content)
+        key = self.make_key(content_hash, parser, file_extension)
+
+        cached = self.get(key)
+        if cached is not None:
+            return self.annotate(cached, file_name, content_hash, cache_hit=True)
+
+        doc = parser.parse_bytes(content, file_extension, file_name=file_name)
+        self.put(key, doc)
+        return self.annotate(doc, file_name, content_hash, cache_hit=False)
+
+    @staticmethod
+    def annotate(doc: ParsedDocument, file_name: str, content_hash: str, cache_hit: bool) -> ParsedDocument:
+        """Return a copy of doc tagged with the caller's file name and cache status."""
+        metadata = dict(doc.metadata)
+        metadata.update({"sha256": content_hash, "cache_hit": cache_hit})
+        return replace(doc, file_path=file_name or doc.file_path, metadata=metadata)
+
+    def get_stats(self) -> Dict:
+        """Get cache hit-rate statistics."""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / total, 4) if total else 0.0
+            }
+
+    def reset_stats(self):
+        """Reset hit/miss counters."""
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+
+# Global parse cache instance
+_parse_cache: Optional[ParseCache] = None
+
+
+def get_parse_cache() -> ParseCache:
+    """Get or create the global parse cache."""
+    global _parse_cache
+    if _parse_cache is None:
+        _parse_cache = ParseCache()
+    return _parse_cache
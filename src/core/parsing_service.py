@@ -0,0 +1,332 @@
+"""
+Parsing Service / 文档解析服务
+
+Process-pool backed document parsing for batch uploads.
+Parsers are CPU-bound pure Python (pdfplumber), so batches are fanned
+out across worker processes instead of running on the event loop thread.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from src.core.config import get_config, ParsingConfig
+from src.core.exceptions import DocumentParserError
+from src.core.parse_cache import ParseCache, get_parse_cache
+from src.interfaces.idocument_parser import ParsedDocument
+
+logger = logging.getLogger("talentos.parsing")
+
+
+@dataclass
+class ParseOutcome:
+    """Result of parsing a single uploaded file."""
+    file_name: str
+    content: str = ""
+    error: Optional[str] = None
+    latency_ms: float = 0.0
+    metadata: Dict = None
+    document: Optional[ParsedDocument] = None
+
+    def __post_init__(self):
+        if self.metadata is None:
+            self.metadata = {}
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _warm_worker():
+    """Import parser plugins once per worker process."""
+    import src.plugins.document_parsers  # noqa: F401
+
+
+def _ping() -> int:
+    """No-op task used to spawn workers ahead of the first batch."""
+    return os.getpid()
+
+
+def _parse_in_worker(parser_name: str, content: bytes, file_name: str) -> ParsedDocument:
+    """Parse raw bytes in memory inside a worker process."""
+    from src.plugins.document_parsers import get_parser
+    ext = os.path.splitext(file_name)[1].lower()
+    return get_parser(parser_name).parse_bytes(content, ext, file_name=file_name)
+
+
+class ParsingService:
+    """
+    Document parsing service backed by a ProcessPoolExecutor.
+
+    - Workers are spawned and warmed (parser imports) on start().
+    - Each file gets its own timeout; a hung worker is killed and the pool recycled.
+    - Files of concurrent requests lost to that recycle are re-submitted.
+    - A worker crash (e.g. malformed PDF) only fails the file that caused it.
+    - Files already in the parse cache never reach the pool.
+    """
+
+    # Times a file is re-submitted after another request recycled the pool
+    MAX_RESUBMITS = 3
+
+    def __init__(self, config: ParsingConfig = None, cache: ParseCache = None):
+        """
+        Initialize parsing service.
+
+        Args:
+            config: ParsingConfig object (uses global config if None)
+            cache: ParseCache instance (uses global cache if None)
+        """
+        self._config = config or get_config().parsing or ParsingConfig()
+        self._cache = cache
+        if self._cache is None and self._config.cache_enabled:
+            self._cache = get_parse_cache()
+        self._max_workers = self._config.max_workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = Lock()
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def start(self):
+        """Create the worker pool and optionally warm every worker."""
+        if not self._config.enabled:
+            return
+
+        executor = self._get_executor()
+        if self._config.warm_start:
+            futures = [executor.submit(_ping) for _ in range(self._max_workers)]
+            for future in futures:
+                try:
+                    future.result(timeout=self._config.file_timeout)
+                except Exception as e:
+                    logger.warning(f"Parser worker warm-up failed: {e}")
+
+    def shutdown(self):
+        """Stop all worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def parse_many(self, files: List[Tuple[str, bytes]]) -> List[ParseOutcome]:
+        """
+        Parse a batch of uploaded files.
+
+        Args:
+            files: List of (file_name, raw_bytes) tuples
+
+        Returns:
+            List of ParseOutcome objects in the same order as the input
+        """
+        outcomes: List[Optional[ParseOutcome]] = [None] * len(files)
+        jobs = []
+
+        cache_keys = {}
+
+        for index, (file_name, content) in enumerate(files):
+            try:
+                parser_name = self._resolve_parser_name(file_name)
+            except DocumentParserError as e:
+                outcomes[index] = ParseOutcome(file_name=file_name, error=str(e))
+                continue
+
+            if self._cache is not None and self._cache.enabled:
+                cached = self._lookup_cache(index, file_name, parser_name, content, cache_keys)
+                if cached is not None:
+                    outcomes[index] = cached
+                    continue
+
+            jobs.append((index, file_name, parser_name, content))
+
+        if not self._config.enabled:
+            for index, file_name, parser_name, content in jobs:
+                outcomes[index] = self._parse_inline(file_name, parser_name, content)
+            self._store_cache(outcomes, cache_keys)
+            return outcomes
+
+        broken = self._run_jobs(jobs, outcomes)
+
+        # Re-run files caught in a pool crash one at a time so the bad file
+        # is identified and every other file still gets parsed.
+        for job in broken:
+            if self._run_jobs([job], outcomes):
+                index, file_name = job[0], job[1]
+                outcomes[index] = ParseOutcome(
+                    file_name=file_name,
+                    error="Parser worker crashed while processing this file"
+                )
+
+        self._store_cache(outcomes, cache_keys)
+        return outcomes
+
+    def _lookup_cache(self, index: int, file_name: str, parser_name: str,
+                      content: bytes, cache_keys: dict) -> Optional[ParseOutcome]:
+        """Return a cached outcome, or remember the key for storing later."""
+        from src.plugins.document_parsers import get_parser
+
+        content_hash = self._cache.content_hash(content)
+        extension = os.path.splitext(file_name)[1]
+        key = self._cache.make_key(content_hash, get_parser(parser_name), extension)
+        doc = self._cache.get(key)
+        if doc is None:
+            cache_keys[index] = (key, content_hash)
+            return None
+
+        doc = self._cache.annotate(doc, file_name, content_hash, cache_hit=True)
+        return ParseOutcome(file_name=file_name, content=doc.content, metadata=doc.metadata, document=doc)
+
+    def _store_cache(self, outcomes: list, cache_keys: dict):
+        """Cache successful parse results."""
+        for index, (key, content_hash) in cache_keys.items():
+            outcome = outcomes[index]
+            if outcome is None or outcome.document is None:
+                continue
+            self._cache.put(key, outcome.document)
+            outcome.document = self._cache.annotate(outcome.document, outcome.file_name, content_hash, cache_hit=False)
+            outcome.metadata = outcome.document.metadata
+
+    async def parse_many_async(self, files: List[Tuple[str, bytes]]) -> List[ParseOutcome]:
+        """Async wrapper around parse_many() that keeps the event loop free."""
+        return await asyncio.to_thread(self.parse_many, files)
+
+    def _run_jobs(self, jobs: list, outcomes: list) -> list:
+        """
+        Submit jobs to the pool and collect results.
+
+        Jobs lost because another request recycled the pool (its file hung
+        or crashed a worker) are re-submitted to the new pool.
+
+        Returns:
+            Jobs that did not finish because the pool broke
+        """
+        broken = []
+        for _ in range(self.MAX_RESUBMITS + 1):
+            crashed, jobs = self._submit_jobs(jobs, outcomes)
+            broken.extend(crashed)
+            if not jobs:
+                return broken
+
+        for index, file_name, _, _ in jobs:
+            outcomes[index] = ParseOutcome(
+                file_name=file_name,
+                error="Parser worker pool was restarted repeatedly while processing this file"
+            )
+        return broken
+
+    def _submit_jobs(self, jobs: list, outcomes: list) -> Tuple[list, list]:
+        """
+        Run jobs on the current pool once.
+
+        Returns:
+            (jobs caught in a crash of this pool, jobs lost to a restart by another request)
+        """
+        if not jobs:
+            return [], []
+
+        executor = self._get_executor()
+        submitted = []
+        for job in jobs:
+            index, file_name, parser_name, content = job
+            submitted.append((job, time.time(), executor.submit(_parse_in_worker, parser_name, content, file_name)))
+
+        broken = []
+        interrupted = []
+        timed_out = False
+        for job, start_time, future in submitted:
+            index, file_name = job[0], job[1]
+            try:
+                # Jobs are dispatched FIFO, so by the time earlier results are
+                # collected this one is running: the wait approximates its runtime.
+                doc = future.result(timeout=self._config.file_timeout)
+                outcomes[index] = ParseOutcome(
+                    file_name=file_name,
+                    content=doc.content,
+                    latency_ms=(time.time() - start_time) * 1000,
+                    metadata=doc.metadata,
+                    document=doc
+                )
+            except FutureTimeoutError:
+                timed_out = True
+                future.cancel()
+                outcomes[index] = ParseOutcome(
+                    file_name=file_name,
+                    error=f"Parsing timed out after {self._config.file_timeout}s"
+                )
+            except (BrokenProcessPool, CancelledError):
+                # The pool is swapped out before its workers are killed, so a
+                # replaced pool means another request restarted it.
+                if self._executor is executor:
+                    broken.append(job)
+                else:
+                    interrupted.append(job)
+            except Exception as e:
+                outcomes[index] = ParseOutcome(file_name=file_name, error=str(e))
+
+        if timed_out or broken:
+            self._restart_executor(executor)
+
+        return broken, interrupted
+
+    def _parse_inline(self, file_name: str, parser_name: str, content: bytes) -> ParseOutcome:
+        """Parse in the current process (service disabled)."""
+        start_time = time.time()
+        try:
+            doc = _parse_in_worker(parser_name, content, file_name)
+            return ParseOutcome(
+                file_name=file_name,
+                content=doc.content,
+                latency_ms=(time.time() - start_time) * 1000,
+                metadata=doc.metadata,
+                document=doc
+            )
+        except Exception as e:
+            return ParseOutcome(file_name=file_name, error=str(e))
+
+    def _resolve_parser_name(self, file_name: str) -> str:
+        from src.plugins.document_parsers import resolve_parser_name
+        return resolve_parser_name(file_name)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    initializer=_warm_worker
+                )
+            return self._executor
+
+    def _restart_executor(self, executor: ProcessPoolExecutor):
+        """Kill all workers of executor (including hung ones) so a fresh pool is started."""
+        with self._lock:
+            if self._executor is not executor:
+                # Already restarted by another request
+                return
+            self._executor = None
+
+        # shutdown() cannot interrupt a running task, so terminate workers directly
+        for process in list(getattr(executor, "_processes", {}).values()):
+            try:
+                process.terminate()
+            except Exception:
+                pass
+        executor.shutdown(wait=False, cancel_futures=True)
+        logger.warning("Parser worker pool restarted")
+
+
+# Global parsing service instance
+_parsing_service: Optional[ParsingService] = None
+
+
+def get_parsing_service() -> ParsingService:
+    """Get or create the global parsing service."""
+    global _parsing_service
+    if _parsing_service is None:
+        _parsing_service = ParsingService()
+    return _parsing_service
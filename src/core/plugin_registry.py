@@ -0,0 +1,123 @@
+"""
+Plugin Registry / 插件注册表
+
+Lazy name -> class registries for the plugin packages. Built-in plugins
+are registered as "module:Class" strings and only imported when first
+looked up, so selecting one plugin never imports the SDKs of the others.
+Third-party packages can add plugins through entry points.
+"""
+
+from collections.abc import MutableMapping
+from importlib import import_module
+from typing import Any, Dict, Iterator, Optional, Union
+
+from src.core.exceptions import PluginLoadError
+
+
+class PluginRegistry(MutableMapping):
+    """
+    Registry of plugin classes, loaded on first use.
+
+    Values are classes or "module:Class" import paths (relative modules
+    resolve against package). Names not registered here are looked up in
+    the entry point group, e.g. in a plugin's pyproject.toml:
+
+        [project.entry-points."talentos.llm_providers"]
+        my_llm = "my_package.provider:MyProvider"
+    """
+
+    def __init__(
+        self,
+        plugins: Dict[str, Union[str, type]],
+        package: str = None,
+        entry_point_group: str = None
+    ):
+        """
+        Initialize registry.
+
+        Args:
+            plugins: Built-in plugins by name
+            package: Package that relative import paths resolve against
+            entry_point_group: Entry point group with third-party plugins
+        """
+        self._plugins: Dict[str, Any] = dict(plugins)
+        self._package = package
+        self._entry_point_group = entry_point_group
+        self._entry_points_loaded = entry_point_group is None
+
+    def __getitem__(self, name: str) -> type:
+        if name not in self._plugins:
+            self._load_entry_points()
+        target = self._plugins[name]
+        if isinstance(target, type):
+            return target
+
+        try:
+            if isinstance(target, str):
+                module_name, _, class_name = target.partition(":")
+                cls = getattr(import_module(module_name, self._package), class_name)
+            else:
+                cls = target.load()  # Entry point
+        except Exception as e:
+            raise PluginLoadError(f"Failed to load plugin '{name}' ({target}): {e}")
+        self._plugins[name] = cls
+        return cls
+
+    def __setitem__(self, name: str, plugin: Union[str, type]):
+        self._plugins[name] = plugin
+
+    def __delitem__(self, name: str):
+        del self._plugins[name]
+
+    def __contains__(self, name: object) -> bool:
+        if name not in self._plugins:
+            self._load_entry_points()
+        return name in self._plugins
+
+    def __iter__(self) -> Iterator[str]:
+        self._load_entry_points()
+        return iter(list(self._plugins))
+
+    def __len__(self) -> int:
+        self._load_entry_points()
+        return len(self._plugins)
+
+    def is_loaded(self, name: str) -> bool:
+        """Whether the plugin's module has been imported."""
+        return isinstance(self._plugins.get(name), type)
+
+    def import_path(self, name: str) -> Optional[str]:
+        """The "module:Class" path of a registered but not yet loaded plugin."""
+        target = self._plugins.get(name)
+        return target if isinstance(target, str) else None
+
+    def _load_entry_points(self):
+        """Register third-party plugins (built-ins take precedence)."""
+        if self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+        from importlib.metadata import entry_points  # Slow to import; only needed on a miss
+        try:
+            discovered = entry_points(group=self._entry_point_group)
+        except Exception as e:
+            print(f"Failed to read entry points '{self._entry_point_group}': {e}")
+            return
+        for entry_point in discovered:
+            self._plugins.setdefault(entry_point.name, entry_point)
+
+
+def lazy_exports(module_name: str, registry: PluginRegistry, exports: Dict[str, str]):
+    """
+    Module __getattr__ (PEP 562) that loads exported plugin classes on access.
+
+    Args:
+        module_name: Name of the exporting module (for error messages)
+        registry: Registry holding the classes
+        exports: Exported class name -> registry name
+    """
+    def __getattr__(name: str):
+        if name in exports:
+            return registry[exports[name]]
+        raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+
+    return __getattr__
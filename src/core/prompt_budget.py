@@ -0,0 +1,306 @@
+"""
+Prompt Budget / 提示词预算
+
+Token counting and budget-driven trimming of resume/JD text.
+Resumes are split into sections; when the input would exceed the
+budget, low-priority sections (hobbies, self-evaluation, references...)
+are dropped first, then the remaining sections are shortened from the
+end, so the prompt always fits the model's context window.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from src.core.config import get_config, PromptConfig
+from src.core.text_normalizer import normalize_text
+
+try:
+    import tiktoken
+    HAS_TIKTOKEN = True
+except ImportError:
+    HAS_TIKTOKEN = False
+
+_CJK = re.compile(r"[\u3000-\u303f\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uff00-\uffef]")
+
+# Section priorities (lower = more important). Text before the first
+# recognised heading (name, contact, summary) gets HEADER_PRIORITY.
+HEADER_PRIORITY = 0
+SECTION_PRIORITIES = [
+    (1, ["工作经历", "工作经验", "职业经历", "实习经历", "work experience", "professional experience",
+         "experience", "employment", "career history"]),
+    (1, ["项目经历", "项目经验", "projects", "project experience"]),
+    (1, ["专业技能", "技能", "技术栈", "skills", "technical skills", "core competencies"]),
+    (2, ["教育经历", "教育背景", "学历", "education"]),
+    (2, ["个人总结", "个人简介", "summary", "profile", "objective", "求职意向"]),
+    (4, ["证书", "资格证书", "certifications", "certificates", "licenses"]),
+    (4, ["获奖", "荣誉", "awards", "honors", "achievements"]),
+    (4, ["培训经历", "培训", "training", "courses"]),
+    (4, ["语言能力", "languages"]),
+    (4, ["发表", "论文", "publications"]),
+    (5, ["自我评价", "自我介绍", "self evaluation", "self-evaluation", "about me"]),
+    (6, ["兴趣爱好", "爱好", "hobbies", "interests"]),
+    (6, ["推荐人", "references"]),
+    (6, ["其他", "附加信息", "additional information", "other"]),
+]
+
+# Headings are short lines, possibly decorated ("【工作经历】", "## Skills", "教育背景：")
+HEADING_MAX_CHARS = 30
+_HEADING_DECORATION = re.compile(r"^[\s#*\-=_|【\[（(<《]+|[\s#*\-=_|】\]）)>》:：]+$")
+
+# Keep at least this share of the budget for the resume when the JD is long
+JD_MAX_SHARE = 0.3
+
+TRUNCATION_MARK = "..."
+
+
+class TokenCounter:
+    """
+    Counts tokens with tiktoken when available, otherwise estimates.
+
+    The estimate counts each CJK character as one token and every four
+    other characters as one token, which errs slightly high for the
+    tokenizers used by the supported providers.
+    """
+
+    def __init__(self, encoding: str = "cl100k_base"):
+        self._encoding = None
+        if HAS_TIKTOKEN and encoding:
+            try:
+                self._encoding = tiktoken.get_encoding(encoding)
+            except Exception:
+                self._encoding = None
+
+    @property
+    def exact(self) -> bool:
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        """Count (or estimate) the tokens in text."""
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        cjk = len(_CJK.findall(text))
+        return cjk + (len(text) - cjk + 3) // 4
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text to at most max_tokens, preferring a line boundary."""
+        if self.count(text) <= max_tokens:
+            return text
+        max_tokens -= self.count(TRUNCATION_MARK)
+        if max_tokens <= 0:
+            return ""
+
+        # Binary search on character length; counting is monotonic enough for this
+        low, high = 0, len(text)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.count(text[:mid]) <= max_tokens:
+                low = mid
+            else:
+                high = mid - 1
+
+        cut = text[:low]
+        newline = cut.rfind("\n")
+        if newline > len(cut) // 2:
+            cut = cut[:newline]
+        return cut.rstrip() + TRUNCATION_MARK
+
+
+@dataclass
+class Section:
+    """A resume section and its trimming priority."""
+    title: str
+    text: str
+    priority: int
+
+
+@dataclass
+class BudgetResult:
+    """Prompt inputs after normalisation and trimming."""
+    resume_text: str
+    jd_text: str
+    input_tokens: int
+    budget_tokens: int
+    original_tokens: int
+    dropped_sections: List[str] = field(default_factory=list)
+    truncated: bool = False
+
+    def to_metadata(self) -> Dict:
+        return {
+            "input_tokens_estimate": self.input_tokens,
+            "input_tokens_original": self.original_tokens,
+            "input_budget": self.budget_tokens,
+            "dropped_sections": self.dropped_sections,
+            "truncated": self.truncated,
+        }
+
+
+def _heading_priority(line: str) -> Optional[int]:
+    """Return the priority if line looks like a known section heading."""
+    stripped = line.strip()
+    if not stripped or len(stripped) > HEADING_MAX_CHARS:
+        return None
+    title = _HEADING_DECORATION.sub("", stripped).strip().lower()
+    if not title:
+        return None
+    for priority, keywords in SECTION_PRIORITIES:
+        for keyword in keywords:
+            if title == keyword or (title.startswith(keyword) and len(title) <= len(keyword) + 6):
+                return priority
+    return None
+
+
+def split_sections(text: str) -> List[Section]:
+    """Split resume text into sections at recognised headings."""
+    sections = [Section(title="header", text="", priority=HEADER_PRIORITY)]
+    lines: List[str] = []
+
+    for line in text.split("\n"):
+        priority = _heading_priority(line)
+        if priority is not None:
+            sections[-1].text = "\n".join(lines).strip()
+            sections.append(Section(title=line.strip(), text="", priority=priority))
+            lines = [line]
+        else:
+            lines.append(line)
+    sections[-1].text = "\n".join(lines).strip()
+
+    return [s for s in sections if s.text]
+
+
+class PromptBudgeter:
+    """
+    Fits resume and JD text into a token budget.
+
+    The budget is the smaller of the configured max_input_tokens and what
+    the model's context window leaves after the output tokens, the fixed
+    prompt (system + instructions) and a safety reserve.
+    """
+
+    def __init__(self, config: PromptConfig = None, counter: TokenCounter = None):
+        """
+        Initialize budgeter.
+
+        Args:
+            config: PromptConfig object (uses global config if None)
+            counter: TokenCounter (built from config if None)
+        """
+        self._config = config or get_config().prompt or PromptConfig()
+        self._counter = counter or TokenCounter(self._config.tokenizer)
+
+    @property
+    def counter(self) -> TokenCounter:
+        return self._counter
+
+    def compute_budget(self, context_window: int, max_output_tokens: int, fixed_tokens: int) -> int:
+        """Tokens available for resume + JD."""
+        available = context_window - max_output_tokens - fixed_tokens - self._config.reserve_tokens
+        if self._config.max_input_tokens:
+            available = min(available, self._config.max_input_tokens)
+        return max(available, self._config.min_input_tokens)
+
+    def fit(
+        self,
+        resume_text: str,
+        jd_text: str = "",
+        context_window: int = 65536,
+        max_output_tokens: int = 4096,
+        fixed_tokens: int = 0,
+        max_input_tokens: Optional[int] = None
+    ) -> BudgetResult:
+        """
+        Normalise and trim resume/JD text to fit the budget.
+
+        Args:
+            resume_text: Resume text
+            jd_text: Job description text (may be empty)
+            context_window: Model context window in tokens
+            max_output_tokens: Tokens reserved for the completion
+            fixed_tokens: Tokens used by the rest of the prompt
+            max_input_tokens: Tighter cap for this call (e.g. a resume
+                condensed for batched scoring)
+
+        Returns:
+            BudgetResult with the texts to send
+        """
+        count = self._counter.count
+        original_tokens = count(resume_text or "") + count(jd_text or "")
+
+        if self._config.normalize:
+            resume_text = normalize_text(resume_text or "")
+            jd_text = normalize_text(jd_text or "")
+        else:
+            resume_text = resume_text or ""
+            jd_text = jd_text or ""
+
+        budget = self.compute_budget(context_window, max_output_tokens, fixed_tokens)
+        if max_input_tokens:
+            budget = min(budget, max_input_tokens)
+        resume_tokens = count(resume_text)
+        jd_tokens = count(jd_text)
+
+        result = BudgetResult(
+            resume_text=resume_text,
+            jd_text=jd_text,
+            input_tokens=resume_tokens + jd_tokens,
+            budget_tokens=budget,
+            original_tokens=original_tokens
+        )
+        if result.input_tokens <= budget:
+            return result
+
+        # A long JD may take at most its share; the rest goes to the resume
+        jd_budget = max(budget - resume_tokens, int(budget * JD_MAX_SHARE))
+        if jd_tokens > jd_budget:
+            result.jd_text = self._counter.truncate(jd_text, jd_budget)
+            result.truncated = True
+            jd_tokens = count(result.jd_text)
+
+        resume_budget = budget - jd_tokens
+        if resume_tokens > resume_budget:
+            result.resume_text, result.dropped_sections = self._trim_resume(resume_text, resume_budget)
+            result.truncated = True
+
+        result.input_tokens = count(result.resume_text) + jd_tokens
+        return result
+
+    def _trim_resume(self, text: str, budget: int) -> Tuple[str, List[str]]:
+        """Drop low-priority sections, then shorten the rest from the end."""
+        count = self._counter.count
+        sections = split_sections(text)
+        tokens = [count(s.text) for s in sections]
+        total = sum(tokens)
+        dropped = []
+
+        # 1. Drop whole sections, least important (and latest) first
+        order = sorted(range(len(sections)), key=lambda i: (-sections[i].priority, -i))
+        keep = set(range(len(sections)))
+        for i in order:
+            if total <= budget or sections[i].priority <= 2:
+                break
+            keep.discard(i)
+            total -= tokens[i]
+            dropped.append(sections[i].title)
+
+        # 2. Shorten remaining sections, largest lower-priority first
+        remaining = sorted(keep)
+        texts = {i: sections[i].text for i in remaining}
+        for i in sorted(remaining, key=lambda i: (-sections[i].priority, -tokens[i])):
+            if total <= budget:
+                break
+            excess = total - budget
+            target = max(tokens[i] - excess, 0)
+            texts[i] = self._counter.truncate(texts[i], target)
+            new_tokens = count(texts[i])
+            total -= tokens[i] - new_tokens
+            tokens[i] = new_tokens
+
+        trimmed = "\n\n".join(texts[i] for i in remaining if texts[i])
+
+        # 3. Heuristic counts can drift; guarantee the limit
+        if count(trimmed) > budget:
+            trimmed = self._counter.truncate(trimmed, budget)
+
+        return trimmed, dropped
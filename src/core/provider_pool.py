@@ -0,0 +1,259 @@
+"""
+Provider Pool / 提供商池
+
+Sends chat requests with failover across the enabled LLM providers,
+optional hedging of slow requests and a circuit breaker per provider.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+from typing import Callable, Dict, List, Optional
+
+from src.core.config import get_config, AppConfig, ResilienceConfig
+from src.core.exceptions import LLMAuthenticationError, LLMProviderError, LLMRateLimitError
+from src.core.metrics import LLMMetrics, get_metrics
+from src.core.resilience import OPEN, CircuitBreaker, LatencyWindow, ProviderHealth
+from src.core.router import Route
+from src.interfaces.illm_provider import ILLMProvider, LLMResponse
+
+# Client errors worth another attempt (request timeout, rate limit)
+RETRYABLE_CLIENT_STATUS = (408, 429)
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Whether a provider error could succeed on another attempt or provider.
+
+    Other 4xx errors (bad payload, context too long) and authentication
+    failures are caused by the request, not the provider's health.
+    """
+    if isinstance(error, LLMAuthenticationError):
+        return False
+    status = getattr(error, "status_code", None)
+    return not (status and 400 <= status < 500 and status not in RETRYABLE_CLIENT_STATUS)
+
+
+class ProviderPool:
+    """
+    Failover, hedging and health tracking for LLM providers.
+
+    A request goes to the requested provider first. On error it moves
+    straight on to the next enabled provider (healthiest first, in their
+    default model); only once every provider has failed does it back off
+    before the next round. Providers whose circuit is open are skipped.
+    Errors caused by the request itself (see is_retryable) are raised
+    at once, without failover or a recorded provider failure.
+
+    With hedging on, a request still running after the provider's p95
+    latency gets a duplicate (on the next provider if there is one) and
+    the first response wins.
+    """
+
+    def __init__(
+        self,
+        config: ResilienceConfig = None,
+        app_config: AppConfig = None,
+        provider_factory: Callable[..., ILLMProvider] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        metrics: LLMMetrics = None
+    ):
+        """
+        Initialize pool.
+
+        Args:
+            config: ResilienceConfig object (uses global config if None)
+            app_config: AppConfig with the provider settings (global if None)
+            provider_factory: Creates a provider by name (plugin registry if None)
+            sleep: Used for backoff between rounds
+            metrics: Where requests are recorded (global metrics if None)
+        """
+        self._app_config = app_config or get_config()
+        self._config = config or self._app_config.resilience or ResilienceConfig()
+        if provider_factory is None:
+            from src.plugins.llm_providers import get_provider as provider_factory
+        self._factory = provider_factory
+        self._sleep = sleep
+        self._metrics = metrics or get_metrics()
+        self._providers: Dict[str, Optional[ILLMProvider]] = {}
+        self._health: Dict[str, ProviderHealth] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def register(self, name: str, provider: ILLMProvider):
+        """Use an existing provider instance for name."""
+        with self._lock:
+            self._providers[name] = provider
+
+    def get_provider(self, name: str, config=None) -> Optional[ILLMProvider]:
+        """
+        Get (creating on first use) the provider instance for name.
+
+        Returns:
+            The provider, or None if it could not be created
+        """
+        with self._lock:
+            if name not in self._providers:
+                try:
+                    self._providers[name] = self._factory(
+                        name, config=config or self._app_config.get_llm_provider_config(name)
+                    )
+                except Exception as e:
+                    print(f"Provider pool: provider '{name}' unavailable: {e}")
+                    self._providers[name] = None
+            return self._providers[name]
+
+    def health(self, name: str) -> ProviderHealth:
+        """Health tracker for a provider."""
+        with self._lock:
+            if name not in self._health:
+                self._health[name] = ProviderHealth(
+                    name,
+                    CircuitBreaker(self._config.failure_threshold, self._config.reset_timeout),
+                    LatencyWindow(self._config.latency_window)
+                )
+            return self._health[name]
+
+    def health_report(self) -> Dict[str, Dict]:
+        """Health of every provider that has served requests."""
+        with self._lock:
+            trackers = list(self._health.values())
+        return {tracker.name: tracker.to_dict() for tracker in trackers}
+
+    def chat(
+        self,
+        route: Route,
+        messages: List[Dict],
+        max_retries: int = 3,
+        **kwargs
+    ) -> LLMResponse:
+        """
+        Send a chat request, failing over (and hedging) as configured.
+
+        Args:
+            route: Requested provider and model
+            messages: Chat messages
+            max_retries: Total attempts over all providers
+            **kwargs: Passed to provider.chat (temperature, response_format, ...)
+
+        Returns:
+            LLMResponse (its provider field names the provider that served it)
+
+        Raises:
+            The first non-retryable error, the last provider error, or
+            LLMProviderError if every circuit is open
+        """
+        candidates = self._candidates(route)
+        attempts = max(max_retries, 1)
+        last_error: Optional[Exception] = None
+        round_number = 0
+        i = 0
+        while i < attempts:
+            available = [c for c in candidates if self.health(c.provider_name).breaker.state != OPEN]
+            if not available:
+                break
+            candidate = available[i % len(available)]
+            if i and i % len(available) == 0:
+                # Every provider failed this round: back off before retrying
+                delay = self._config.retry_backoff * (2 ** round_number)
+                if isinstance(last_error, LLMRateLimitError) and last_error.retry_after:
+                    delay = max(delay, last_error.retry_after)
+                self._sleep(delay)
+                round_number += 1
+            backup = available[(i + 1) % len(available)]
+            i += 1
+
+            try:
+                return self._hedged(candidate, backup, messages, **kwargs)
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+                last_error = e
+                print(f"LLM request to {candidate.provider_name} failed: {e}")
+
+        if last_error is not None:
+            raise last_error
+        names = ", ".join(c.provider_name for c in candidates)
+        raise LLMProviderError(f"No LLM provider available (circuit open: {names})")
+
+    def _candidates(self, route: Route) -> List[Route]:
+        """The requested route, then the other enabled providers, healthiest first."""
+        candidates = [route]
+        if not self._config.failover:
+            return candidates
+
+        others = []
+        for name in self._app_config.get_enabled_providers():
+            if name == route.provider_name:
+                continue
+            provider = self.get_provider(name)
+            if provider is None or not provider.is_available():
+                continue
+            # Model names are provider-specific: use the provider's default
+            others.append(Route(name, None, provider, route.tier, route.operation))
+        others.sort(key=lambda r: self.health(r.provider_name).score, reverse=True)
+        return candidates + others
+
+    def _hedged(self, primary: Route, backup: Route, messages: List[Dict], **kwargs) -> LLMResponse:
+        """Call primary; past its hedge delay, race a duplicate on backup."""
+        delay_ms = self._hedge_delay(primary.provider_name)
+        if delay_ms is None:
+            return self._call(primary, messages, **kwargs)
+
+        executor = self._get_executor()
+        first = executor.submit(self._call, primary, messages, **kwargs)
+        try:
+            return first.result(timeout=delay_ms / 1000)
+        except FutureTimeout:
+            pass
+
+        second = executor.submit(self._call, backup, messages, **kwargs)
+        pending, last_error = {first, second}, None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # The slower request finishes in the background
+                    return future.result()
+                last_error = future.exception()
+        raise last_error
+
+    def _hedge_delay(self, name: str) -> Optional[float]:
+        """Milliseconds before hedging a request to name, None to not hedge."""
+        if not self._config.hedging:
+            return None
+        latencies = self.health(name).latencies
+        if len(latencies) < self._config.hedge_min_samples:
+            return None
+        return max(latencies.percentile(self._config.hedge_quantile), self._config.hedge_min_delay_ms)
+
+    def _call(self, route: Route, messages: List[Dict], **kwargs) -> LLMResponse:
+        """One request to one provider, recorded in its health and the metrics."""
+        health = self.health(route.provider_name)
+        if not health.breaker.allow_request():
+            raise LLMProviderError(f"Circuit open for provider '{route.provider_name}'")
+        if not getattr(route.provider, "supports_json_mode", False):
+            kwargs.pop("response_format", None)
+
+        start_time = time.time()
+        try:
+            response = route.provider.chat(messages=messages, model=route.model, **kwargs)
+        except Exception as e:
+            if is_retryable(e):
+                health.record_failure(str(e))
+            else:
+                health.breaker.release()
+            self._metrics.record_error(route.operation, route.provider_name, route.model)
+            raise
+        latency_ms = (time.time() - start_time) * 1000
+        health.record_success(latency_ms)
+        response.provider = route.provider_name
+        self._metrics.record_response(route.operation, route.provider_name, route.model, response,
+                                      latency_ms=latency_ms)
+        return response
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="llm-hedge")
+            return self._executor
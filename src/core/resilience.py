@@ -0,0 +1,162 @@
+"""
+Resilience Primitives / 容错组件
+
+Circuit breaker, rolling latency window and per-provider health used by
+the provider pool to decide where (and whether) to send LLM requests.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a provider that keeps failing.
+
+    After failure_threshold consecutive failures the circuit opens and
+    requests are refused; after reset_timeout seconds a single probe is
+    let through (half-open). A successful probe closes the circuit, a
+    failed one opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Whether a request may be sent now (claims the probe when half-open)."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._current_state() == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = self._clock()
+            self._probe_in_flight = False
+
+    def release(self):
+        """Free a claimed probe without recording an outcome (e.g. the request itself was rejected)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+
+class LatencyWindow:
+    """Latencies of the most recent successful requests."""
+
+    def __init__(self, size: int = 200):
+        self._samples = deque(maxlen=max(size, 1))
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms: float):
+        with self._lock:
+            self._samples.append(latency_ms)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency at quantile q (0-1) by nearest rank, None if empty."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = min(int(q * len(samples)), len(samples) - 1)
+        return samples[rank]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class ProviderHealth:
+    """
+    Health of one provider (or other component): circuit state, success
+    rate and latency.
+
+    The score (0-1) is an exponentially weighted success rate, halved while
+    the circuit is half-open and zero while it is open.
+    """
+
+    def __init__(self, name: str, breaker: CircuitBreaker, latencies: LatencyWindow, alpha: float = 0.2):
+        self.name = name
+        self.breaker = breaker
+        self.latencies = latencies
+        self._alpha = alpha
+        self._success_rate = 1.0
+        self.requests = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def record_success(self, latency_ms: float):
+        self.breaker.record_success()
+        self.latencies.record(latency_ms)
+        with self._lock:
+            self.requests += 1
+            self._success_rate += self._alpha * (1.0 - self._success_rate)
+
+    def record_failure(self, error: str = None):
+        self.breaker.record_failure()
+        with self._lock:
+            self.requests += 1
+            self.failures += 1
+            self.last_error = error
+            self._success_rate -= self._alpha * self._success_rate
+
+    @property
+    def score(self) -> float:
+        state = self.breaker.state
+        if state == OPEN:
+            return 0.0
+        return self._success_rate * (0.5 if state == HALF_OPEN else 1.0)
+
+    def to_dict(self) -> Dict:
+        p50 = self.latencies.percentile(0.5)
+        p95 = self.latencies.percentile(0.95)
+        return {
+            "state": self.breaker.state,
+            "score": round(self.score, 3),
+            "requests": self.requests,
+            "failures": self.failures,
+            "p50_ms": round(p50, 1) if p50 is not None else None,
+            "p95_ms": round(p95, 1) if p95 is not None else None,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,135 @@
+"""
+Model Router / 模型路由
+
+Picks the provider and model for each engine operation. Operations are
+mapped to tiers (latency/cost classes such as "fast" and "strong"), each
+an ordered list of "provider:model" candidates; the first enabled and
+configured candidate wins. Structured operations can name a stronger
+tier to escalate to when the cheap model's output fails validation.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from src.core.config import get_config, AppConfig, RoutingConfig
+from src.interfaces.illm_provider import ILLMProvider
+
+# Tier candidate standing for the engine's current provider and model
+DEFAULT_CANDIDATE = "default"
+
+
+@dataclass
+class Route:
+    """A provider instance and model to send a request to."""
+    provider_name: str
+    model: Optional[str]
+    provider: ILLMProvider
+    tier: str = DEFAULT_CANDIDATE
+    operation: str = ""  # Engine operation the request belongs to (metrics label)
+
+
+class ModelRouter:
+    """
+    Resolves operations to routes.
+
+    Provider instances other than the engine's own are created on first
+    use and reused; providers that are disabled, fail to initialise or
+    have no credentials are skipped.
+    """
+
+    def __init__(
+        self,
+        config: RoutingConfig = None,
+        app_config: AppConfig = None,
+        provider_factory: Callable[..., ILLMProvider] = None
+    ):
+        """
+        Initialize router.
+
+        Args:
+            config: RoutingConfig object (uses global config if None)
+            app_config: AppConfig with the provider settings (global if None)
+            provider_factory: Creates a provider by name (plugin registry if None)
+        """
+        self._app_config = app_config or get_config()
+        self._config = config or self._app_config.routing or RoutingConfig()
+        if provider_factory is None:
+            from src.plugins.llm_providers import get_provider as provider_factory
+        self._factory = provider_factory
+        self._providers: Dict[str, Optional[ILLMProvider]] = {}
+        self._lock = threading.Lock()
+
+    def routes(self, operation: str, default: Route, pin_provider: bool = False) -> List[Route]:
+        """
+        Routes to try for an operation, in order.
+
+        Args:
+            operation: Engine operation name (e.g. "extract_resume_fields")
+            default: The engine's current provider and model
+            pin_provider: Only use candidates on the default route's provider
+                (set after an explicit provider switch)
+
+        Returns:
+            The primary route, followed by the escalation route if the
+            operation has one that differs from the primary
+        """
+        route_config = self._config.operations.get(operation)
+        if not self._config.enabled or route_config is None:
+            return [default]
+
+        primary = self._first_available(route_config.tier, default, pin_provider)
+        routes = [primary]
+        if route_config.escalate_to:
+            for route in self._candidates(route_config.escalate_to, default, pin_provider):
+                if (route.provider_name, route.model) != (primary.provider_name, primary.model):
+                    routes.append(route)
+                    break
+        return routes
+
+    def _first_available(self, tier: str, default: Route, pin_provider: bool = False) -> Route:
+        for route in self._candidates(tier, default, pin_provider):
+            return route
+        return default
+
+    def _candidates(self, tier: str, default: Route, pin_provider: bool = False):
+        """Yield the available routes of a tier, in preference order."""
+        for candidate in self._config.tiers.get(tier, [DEFAULT_CANDIDATE]):
+            if candidate == DEFAULT_CANDIDATE:
+                yield Route(default.provider_name, self._model(default.provider_name, default.model),
+                            default.provider, tier, default.operation)
+                continue
+
+            provider_name, _, model = candidate.partition(":")
+            if pin_provider and provider_name != default.provider_name:
+                continue
+            provider_config = self._app_config.get_llm_provider_config(provider_name)
+            if not provider_config or not provider_config.enabled:
+                continue
+            if provider_name == default.provider_name:
+                provider = default.provider
+            else:
+                provider = self._provider(provider_name)
+            if provider is None or not provider.is_available():
+                continue
+            yield Route(provider_name, self._model(provider_name, model), provider, tier, default.operation)
+
+    def _model(self, provider_name: str, model: Optional[str]) -> Optional[str]:
+        """Resolve an empty model to the provider's default (None if unknown)."""
+        if model:
+            return model
+        provider_config = self._app_config.get_llm_provider_config(provider_name)
+        return (provider_config.default_model or None) if provider_config else None
+
+    def _provider(self, name: str) -> Optional[ILLMProvider]:
+        """Get (creating on first use) the provider instance for name."""
+        with self._lock:
+            if name not in self._providers:
+                try:
+                    self._providers[name] = self._factory(
+                        name, config=self._app_config.get_llm_provider_config(name)
+                    )
+                except Exception as e:
+                    print(f"Router: provider '{name}' unavailable: {e}")
+                    self._providers[name] = None
+            return self._providers[name]
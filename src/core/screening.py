@@ -0,0 +1,208 @@
+"""
+Screening Funnel / 筛选漏斗
+
+Cheap local pre-ranking of resumes against a JD. Every resume gets a
+local score from embedding similarity and keyword overlap; only the
+best-ranked ones are sent to the LLM for full match scoring, so cost and
+latency follow the shortlist size instead of the upload size.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from src.core.config import get_config, ScreeningConfig
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_LATIN_TERM = re.compile(r"[a-z][a-z0-9+#.\-]*[a-z0-9+#]")
+_CJK_RUN = re.compile(r"[\u4e00-\u9fff]+")
+
+_LATIN_STOPWORDS = {
+    "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of", "on", "or",
+    "our", "the", "to", "we", "with", "you", "your", "will", "have", "has", "can", "etc",
+    "years", "year", "experience", "work", "working", "team", "strong", "good", "ability",
+    "skills", "knowledge", "responsible", "responsibilities", "requirements", "plus", "preferred",
+}
+_CJK_STOPWORDS = {
+    "负责", "熟悉", "熟练", "掌握", "了解", "具有", "具备", "以上", "优先", "相关", "经验", "能力",
+    "工作", "良好", "我们", "岗位", "职位", "要求", "任职", "进行", "以及", "参与", "能够", "公司",
+}
+
+# Matched/missing keywords listed in a local result
+REPORT_KEYWORDS = 10
+
+
+def extract_keywords(text: str) -> Dict[str, bool]:
+    """
+    Extract comparable keywords from text.
+
+    Latin terms (java, c++, node.js, k8s) are kept whole; Chinese text has
+    no word boundaries, so runs of CJK characters contribute bigrams.
+
+    Returns:
+        Ordered mapping of keyword -> True for Latin terms, False for CJK bigrams
+    """
+    text = (text or "").lower()
+    keywords: Dict[str, bool] = {}
+    for term in _LATIN_TERM.findall(text):
+        term = term.rstrip(".-")
+        if len(term) >= 2 and term not in _LATIN_STOPWORDS:
+            keywords.setdefault(term, True)
+    for run in _CJK_RUN.findall(text):
+        for i in range(len(run) - 1):
+            bigram = run[i:i + 2]
+            if bigram not in _CJK_STOPWORDS:
+                keywords.setdefault(bigram, False)
+    return keywords
+
+
+@dataclass
+class ScreeningCandidate:
+    """Local pre-ranking result for one resume."""
+    index: int
+    local_score: float
+    keyword_overlap: float
+    similarity: Optional[float] = None
+    matched_keywords: List[str] = field(default_factory=list)
+    missing_keywords: List[str] = field(default_factory=list)
+    rank: int = 0
+
+    def to_metadata(self) -> Dict[str, Any]:
+        return {
+            "rank": self.rank,
+            "local_score": self.local_score,
+            "keyword_overlap": round(self.keyword_overlap, 3),
+            "similarity": None if self.similarity is None else round(self.similarity, 3),
+        }
+
+
+class ScreeningFunnel:
+    """
+    Ranks resumes locally and splits them into an LLM shortlist and the rest.
+
+    The local score (0-100) blends cosine similarity of the JD and resume
+    embeddings with the share of JD keywords found in the resume. The JD and
+    all resumes are embedded in one embed_batch call. When no embedding
+    function is available, or it fails, keywords alone are used.
+    """
+
+    def __init__(
+        self,
+        config: ScreeningConfig = None,
+        embed_batch: Optional[Callable[[List[str]], List[List[float]]]] = None
+    ):
+        """
+        Initialize funnel.
+
+        Args:
+            config: ScreeningConfig object (uses global config if None)
+            embed_batch: Function returning one embedding vector per text
+        """
+        self._config = config or get_config().screening or ScreeningConfig()
+        self._embed_batch = embed_batch
+
+    def rank(self, resumes: List[str], jd_text: str) -> List[ScreeningCandidate]:
+        """
+        Score every resume locally.
+
+        Args:
+            resumes: Resume texts
+            jd_text: Job description text
+
+        Returns:
+            Candidates sorted by local score, best first
+        """
+        jd_keywords = extract_keywords(jd_text)
+        similarities = self._similarities(resumes, jd_text)
+        weight = self._config.embedding_weight if similarities is not None else 0.0
+
+        candidates = []
+        for i, resume_text in enumerate(resumes):
+            resume_keywords = extract_keywords(resume_text)
+            matched = [k for k in jd_keywords if k in resume_keywords]
+            overlap = len(matched) / len(jd_keywords) if jd_keywords else 0.0
+            similarity = float(similarities[i]) if similarities is not None else None
+
+            score = weight * (similarity or 0.0) + (1 - weight) * overlap
+            candidates.append(ScreeningCandidate(
+                index=i,
+                local_score=round(100 * score, 1),
+                keyword_overlap=overlap,
+                similarity=similarity,
+                matched_keywords=[k for k in matched if jd_keywords[k]][:REPORT_KEYWORDS],
+                missing_keywords=[k for k, latin in jd_keywords.items()
+                                  if latin and k not in resume_keywords][:REPORT_KEYWORDS]
+            ))
+
+        candidates.sort(key=lambda c: (-c.local_score, c.index))
+        for rank, candidate in enumerate(candidates, 1):
+            candidate.rank = rank
+        return candidates
+
+    def split(
+        self,
+        ranked: List[ScreeningCandidate],
+        top_k: int = None,
+        min_local_score: float = None
+    ) -> Tuple[List[ScreeningCandidate], List[ScreeningCandidate]]:
+        """
+        Split ranked candidates into the LLM shortlist and the rest.
+
+        Args:
+            ranked: Output of rank()
+            top_k: Shortlist size (config default if None, 0 = no limit)
+            min_local_score: Minimum local score (config default if None)
+
+        Returns:
+            (shortlist, rest), both in rank order
+        """
+        top_k = self._config.top_k if top_k is None else top_k
+        min_local_score = self._config.min_local_score if min_local_score is None else min_local_score
+
+        shortlist = [c for c in ranked if c.local_score >= min_local_score]
+        if top_k:
+            shortlist = shortlist[:top_k]
+        selected = {c.index for c in shortlist}
+        return shortlist, [c for c in ranked if c.index not in selected]
+
+    def _similarities(self, resumes: List[str], jd_text: str) -> Optional["np.ndarray"]:
+        """Cosine similarity of each resume to the JD, clipped to [0, 1]."""
+        if self._embed_batch is None or not resumes:
+            return None
+        import numpy as np  # Only needed with embeddings; keeps engine import light
+
+        limit = self._config.embed_chars
+        try:
+            vectors = self._embed_batch([text[:limit] for text in [jd_text] + list(resumes)])
+            matrix = np.array(vectors, dtype=float)
+        except Exception as e:
+            # NotImplementedError, provider or model errors: rank by keywords only
+            print(f"Screening: embeddings unavailable, ranking by keywords only ({e})")
+            return None
+        if matrix.ndim != 2:
+            return None
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix = matrix / norms
+        return np.clip(matrix[1:] @ matrix[0], 0.0, 1.0)
+
+
+def local_match_result(candidate: ScreeningCandidate) -> Dict[str, Any]:
+    """
+    Match result for a resume that was not sent to the LLM.
+
+    Missing the shortlist is not a rejection: the resume only has a local score.
+    """
+    return {
+        "score": int(round(candidate.local_score)),
+        "status": "Not Shortlisted",
+        "reason": "本地预筛排名靠后, 未进入 LLM 精评",
+        "strengths": candidate.matched_keywords,
+        "missing": candidate.missing_keywords,
+        "recommendation": "Locally scored only; not reviewed by the LLM",
+        "scored_by": "local",
+        "screening": candidate.to_metadata(),
+    }
@@ -0,0 +1,445 @@
+"""
+Structured Output / 结构化输出
+
+Pydantic schemas for the JSON the engine asks models for, plus helpers to
+get valid instances with as few tokens as possible:
+
+- JSON mode is requested from providers that support it
+- output is extracted and cheaply repaired locally (code fences, prose,
+  trailing commas, truncation) before anything is retried
+- a retry sends only the malformed part (the broken JSON, or just the
+  invalid fields) instead of re-running the whole prompt
+- IncrementalJSONParser yields top-level fields while a response streams
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from src.interfaces.illm_provider import LLMResponse
+
+
+# =============================================================================
+# Schemas
+# =============================================================================
+
+class EducationEntry(BaseModel):
+    model_config = ConfigDict(extra="allow", coerce_numbers_to_str=True)
+
+    school: Optional[str] = None
+    degree: Optional[str] = None
+    major: Optional[str] = None
+    year: Optional[str] = None
+
+
+class ExperienceEntry(BaseModel):
+    model_config = ConfigDict(extra="allow", coerce_numbers_to_str=True)
+
+    company: Optional[str] = None
+    title: Optional[str] = None
+    duration: Optional[str] = None
+    key_achievements: Optional[Any] = None
+
+
+class ResumeFields(BaseModel):
+    """Fields extracted by extract_resume_fields."""
+    model_config = ConfigDict(extra="allow", coerce_numbers_to_str=True)
+
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    education: List[EducationEntry] = Field(default_factory=list)
+    experience: List[ExperienceEntry] = Field(default_factory=list)
+    skills: List[str] = Field(default_factory=list)
+    years_of_experience: Optional[float] = None
+    current_company: Optional[str] = None
+    current_position: Optional[str] = None
+
+
+class MatchDimension(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    score: int = Field(..., ge=0, le=100)
+    comment: str = ""
+
+
+class MatchEvaluation(BaseModel):
+    """Result of evaluate_match."""
+    model_config = ConfigDict(extra="allow")
+
+    score: int = Field(..., ge=0, le=100)
+    status: str = ""
+    dimensions: Dict[str, MatchDimension] = Field(default_factory=dict)
+    reason: str = ""
+    strengths: List[str] = Field(default_factory=list)
+    missing: List[str] = Field(default_factory=list)
+    recommendation: str = ""
+
+
+class MatchBatchItem(MatchEvaluation):
+    """One result of a batched match request."""
+    id: str
+
+
+# =============================================================================
+# JSON extraction and local repair
+# =============================================================================
+
+_FENCE = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+
+
+def _scan(text: str) -> Tuple[List[str], bool]:
+    """Return the open bracket stack and whether a string is left open."""
+    stack: List[str] = []
+    in_string = escape = False
+    for ch in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append(ch)
+        elif ch in "}]" and stack:
+            stack.pop()
+    return stack, in_string
+
+
+def extract_json_text(content: str) -> str:
+    """
+    Cut the JSON value out of a model response.
+
+    Drops markdown code fences and any prose before the first '{' or '['
+    or after the matching closing bracket.
+    """
+    text = _FENCE.sub("", (content or "").strip())
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        return text
+    text = text[min(starts):]
+
+    # Stop at the bracket that closes the first value
+    depth = 0
+    in_string = escape = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[:i + 1]
+    return text
+
+
+def repair_json_text(text: str) -> str:
+    """Fix trailing commas and close a truncated value."""
+    text = _TRAILING_COMMA.sub(r"\1", text.rstrip())
+    stack, in_string = _scan(text)
+    if in_string:
+        text += '"'
+    text = text.rstrip().rstrip(",")
+    if text.endswith(":"):
+        text += " null"
+    closing = {"{": "}", "[": "]"}
+    return text + "".join(closing[b] for b in reversed(stack))
+
+
+def load_json(content: str) -> Any:
+    """
+    Parse JSON from a model response, repairing it locally if needed.
+
+    Raises:
+        json.JSONDecodeError: If the output cannot be repaired
+    """
+    text = extract_json_text(content)
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return json.loads(repair_json_text(text))
+
+
+def parse_structured(
+    content: str,
+    schema: Type[BaseModel]
+) -> Tuple[Optional[BaseModel], Any, Optional[str]]:
+    """
+    Parse and validate a model response.
+
+    Returns:
+        (instance or None, parsed JSON or None, error message or None)
+    """
+    try:
+        payload = load_json(content)
+    except json.JSONDecodeError as e:
+        return None, None, f"Invalid JSON: {e}"
+    try:
+        return schema.model_validate(payload), payload, None
+    except ValidationError as e:
+        return None, payload, str(e)
+
+
+def _invalid_fields(schema: Type[BaseModel], payload: Dict) -> Dict[str, Any]:
+    """Top-level fields of payload that fail validation (missing ones as None)."""
+    try:
+        schema.model_validate(payload)
+        return {}
+    except ValidationError as e:
+        fields = {str(err["loc"][0]) for err in e.errors() if err.get("loc")}
+        return {name: payload.get(name) for name in sorted(fields)}
+
+
+# =============================================================================
+# Requests with repair-only retries
+# =============================================================================
+
+@dataclass
+class StructuredResult:
+    """Validated output of a structured request."""
+    data: Optional[BaseModel]
+    raw: str
+    response: Optional[LLMResponse] = None
+    error: Optional[str] = None
+    tokens_used: int = 0
+    cached_tokens: int = 0
+    repairs: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.data is not None
+
+
+def json_mode_kwargs(provider) -> Dict[str, Any]:
+    """Request arguments enabling JSON mode, if the provider supports it."""
+    if provider is not None and getattr(provider, "supports_json_mode", False):
+        return {"response_format": {"type": "json_object"}}
+    return {}
+
+
+def _repair_messages(schema: Type[BaseModel], raw: str, payload: Any, error: str) -> List[Dict]:
+    """Messages asking the model to fix only what is broken."""
+    system = (
+        "You fix JSON produced by another step. Return ONLY valid JSON, "
+        "without markdown code blocks or commentary. Do not invent new content."
+    )
+    if isinstance(payload, dict):
+        invalid = _invalid_fields(schema, payload)
+        field_schema = {
+            name: schema.model_json_schema().get("properties", {}).get(name, {})
+            for name in invalid
+        }
+        user = (
+            f"These fields of a JSON object failed validation:\n{json.dumps(invalid, ensure_ascii=False)}\n\n"
+            f"Errors:\n{error}\n\n"
+            f"Expected JSON schema for these fields:\n{json.dumps(field_schema, ensure_ascii=False)}\n\n"
+            "Return a JSON object containing only these fields, corrected."
+        )
+    else:
+        user = (
+            f"This output should be JSON but could not be parsed ({error}):\n\n{raw}\n\n"
+            "Return the same content as valid JSON."
+        )
+    return [{"role": "system", "content": system}, {"role": "user", "content": user}]
+
+
+def request_structured(
+    chat: Callable[..., LLMResponse],
+    messages: List[Dict],
+    schema: Type[BaseModel],
+    max_repairs: int = 1,
+    **kwargs
+) -> StructuredResult:
+    """
+    Send messages and return output validated against schema.
+
+    Args:
+        chat: Function taking messages (and kwargs) and returning an LLMResponse
+        messages: Chat messages
+        schema: Pydantic model the output must satisfy
+        max_repairs: Follow-up requests allowed for repairs
+        **kwargs: Passed to chat (model, temperature, response_format, ...)
+
+    Returns:
+        StructuredResult (data is None if the output stayed invalid)
+    """
+    response = chat(messages=messages, **kwargs)
+    return complete_structured(chat, schema, response.content or "", response, max_repairs, **kwargs)
+
+
+def complete_structured(
+    chat: Callable[..., LLMResponse],
+    schema: Type[BaseModel],
+    raw: str,
+    response: Optional[LLMResponse] = None,
+    max_repairs: int = 1,
+    **kwargs
+) -> StructuredResult:
+    """
+    Validate output already received, repairing only what is broken.
+
+    When the output is invalid, up to max_repairs follow-up requests carry
+    only the broken JSON (or just the invalid fields) with the validation
+    errors; fixed fields are merged back into the original output.
+
+    Args:
+        chat: Function used for repair requests
+        schema: Pydantic model the output must satisfy
+        raw: Model output (e.g. the text of a finished stream)
+        response: The response raw came from, if any (for token accounting)
+        max_repairs: Follow-up requests allowed for repairs
+        **kwargs: Passed to chat
+
+    Returns:
+        StructuredResult (data is None if the output stayed invalid)
+    """
+    data, payload, error = parse_structured(raw, schema)
+    result = StructuredResult(
+        data=data, raw=raw, response=response, error=error,
+        tokens_used=response.tokens_used if response else 0,
+        cached_tokens=response.cached_tokens if response else 0
+    )
+
+    kwargs["temperature"] = 0.0
+    while not result.ok and result.repairs < max_repairs:
+        result.repairs += 1
+        fix = chat(messages=_repair_messages(schema, raw, payload, error), **kwargs)
+        result.tokens_used += fix.tokens_used
+
+        if isinstance(payload, dict):
+            try:
+                patch = load_json(fix.content)
+            except json.JSONDecodeError as e:
+                result.error = f"Invalid JSON in repair: {e}"
+                continue
+            if isinstance(patch, dict):
+                payload = {**payload, **patch}
+            try:
+                result.data = schema.model_validate(payload)
+                result.error = None
+            except ValidationError as e:
+                error = result.error = str(e)
+        else:
+            raw = fix.content or ""
+            data, payload, error = parse_structured(raw, schema)
+            result.data, result.error = data, error
+
+    return result
+
+
+# =============================================================================
+# Incremental parsing
+# =============================================================================
+
+class IncrementalJSONParser:
+    """
+    Yields top-level members of a JSON value while its text streams in.
+
+    For an object each completed member is reported as (key, value); for an
+    array as (index, value). Text before the value (code fences, prose) is
+    ignored.
+
+    Example:
+        parser = IncrementalJSONParser()
+        for chunk in stream:
+            for key, value in parser.feed(chunk):
+                ...
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._root: Optional[str] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key_start: Optional[int] = None
+        self._key: Any = None
+        self._value_start: Optional[int] = None
+        self._index = 0
+        self.done = False
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return self._buffer
+
+    def feed(self, chunk: str) -> Iterator[Tuple[Any, Any]]:
+        """Add text and yield the members it completes."""
+        self._buffer += chunk
+        buffer = self._buffer
+        while self._pos < len(buffer) and not self.done:
+            i = self._pos
+            ch = buffer[i]
+            self._pos += 1
+
+            if self._root is None:
+                if ch in "{[":
+                    self._root = ch
+                    self._depth = 1
+                    if ch == "[":
+                        self._value_start = i + 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = json.loads(buffer[self._key_start:i + 1])
+                        self._key_start = None
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._root == "{" and self._depth == 1 and self._value_start is None:
+                    self._key_start = i
+            elif ch == ":" and self._root == "{" and self._depth == 1 and self._value_start is None:
+                self._value_start = i + 1
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]" or (ch == "," and self._depth == 1):
+                if ch != ",":
+                    self._depth -= 1
+                if self._depth <= 1:
+                    member = self._complete(buffer, i, closing=self._depth == 0)
+                    if member is not None:
+                        yield member
+                if self._depth == 0:
+                    self.done = True
+
+    def _complete(self, buffer: str, end: int, closing: bool) -> Optional[Tuple[Any, Any]]:
+        """Finish the member ending at end (a ',' or the root's closing bracket)."""
+        if self._value_start is None or (not closing and buffer[end] != ","):
+            return None
+        text = buffer[self._value_start:end].strip()
+        key = self._key if self._root == "{" else self._index
+        self._key = None
+        self._value_start = end + 1 if self._root == "[" else None
+        if not text:
+            return None
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        if self._root == "[":
+            self._index += 1
+        return key, value
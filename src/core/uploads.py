@@ -0,0 +1,245 @@
+"""
+Upload Handling / 上传处理
+
+Streaming upload reads with per-file and per-request byte limits.
+Uploads are read in chunks, the first chunk is checked against the
+file's declared format, and reading stops as soon as a limit is hit,
+so memory per request stays bounded whatever the client sends.
+"""
+
+import os
+import json
+from dataclasses import dataclass
+from typing import List, Optional
+
+from src.core.config import get_config, UploadConfig
+from src.core.exceptions import UploadTooLargeError, UploadRejectedError, UnsupportedFormatError
+
+# Leading bytes checked per document format (keys match EXTENSION_MAP values)
+MAGIC_BYTES = {
+    "pdf": b"%PDF-",
+    "docx": b"PK\x03\x04",
+}
+
+# The PDF header may be preceded by junk within the first 1024 bytes
+PDF_HEADER_WINDOW = 1024
+
+
+def sniff_format(head: bytes, file_name: str):
+    """
+    Check the first bytes of an upload against its extension.
+
+    Args:
+        head: Leading bytes of the file
+        file_name: Original file name
+
+    Raises:
+        UnsupportedFormatError: If the extension is not supported
+        UploadRejectedError: If the content does not match the extension
+    """
+    from src.plugins.document_parsers import EXTENSION_MAP
+
+    ext = os.path.splitext(file_name)[1].lower().lstrip(".")
+    file_format = EXTENSION_MAP.get(ext)
+    if file_format is None:
+        raise UnsupportedFormatError(f"Unsupported file format: .{ext}")
+
+    if not head:
+        raise UploadRejectedError(f"Empty file: {file_name}")
+
+    if file_format == "pdf":
+        matched = MAGIC_BYTES["pdf"] in head[:PDF_HEADER_WINDOW]
+    elif file_format in MAGIC_BYTES:
+        matched = head.startswith(MAGIC_BYTES[file_format])
+    else:
+        # Plain text must not contain NUL bytes
+        matched = b"\x00" not in head
+
+    if not matched:
+        raise UploadRejectedError(f"File content does not match its extension: {file_name}")
+
+
+@dataclass
+class UploadedFile:
+    """An upload read into memory, or the reason it was rejected."""
+    file_name: str
+    content: bytes = b""
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class UploadReader:
+    """
+    Reads UploadFile objects for a single request.
+
+    One reader is created per request so the request-wide byte budget
+    covers every file it reads.
+    """
+
+    def __init__(self, config: UploadConfig = None):
+        """
+        Initialize upload reader.
+
+        Args:
+            config: UploadConfig object (uses global config if None)
+        """
+        self._config = config or get_config().uploads or UploadConfig()
+        self._bytes_read = 0
+
+    @property
+    def bytes_read(self) -> int:
+        return self._bytes_read
+
+    async def read(self, upload) -> bytes:
+        """
+        Read an upload in chunks, enforcing limits while reading.
+
+        Args:
+            upload: FastAPI/Starlette UploadFile
+
+        Returns:
+            Raw file bytes
+
+        Raises:
+            UploadTooLargeError: If the file or request limit is exceeded
+            UploadRejectedError: If the content does not match the extension
+            UnsupportedFormatError: If the extension is not supported
+        """
+        file_name = upload.filename or ""
+
+        # Multipart parsing already knows the size; reject before reading anything
+        size = getattr(upload, "size", None)
+        if size is not None:
+            self._check_limits(file_name, size, self._bytes_read + size)
+
+        chunks: List[bytes] = []
+        file_bytes = 0
+        while True:
+            chunk = await upload.read(self._config.chunk_size)
+            if not chunk:
+                break
+
+            if not chunks and self._config.sniff_content:
+                sniff_format(chunk, file_name)
+
+            file_bytes += len(chunk)
+            self._bytes_read += len(chunk)
+            self._check_limits(file_name, file_bytes, self._bytes_read)
+            chunks.append(chunk)
+
+        if not chunks and self._config.sniff_content:
+            sniff_format(b"", file_name)
+
+        return b"".join(chunks)
+
+    async def read_batch(self, uploads: list) -> List[UploadedFile]:
+        """
+        Read several uploads; per-file problems are reported, not raised.
+
+        Raises:
+            UploadTooLargeError: If the request-wide limit is exceeded
+        """
+        results = []
+        for upload in uploads:
+            file_name = upload.filename or ""
+            try:
+                results.append(UploadedFile(file_name=file_name, content=await self.read(upload)))
+            except UploadTooLargeError as e:
+                if e.details.get("scope") == "request":
+                    raise
+                results.append(UploadedFile(file_name=file_name, error=str(e)))
+            except (UploadRejectedError, UnsupportedFormatError) as e:
+                results.append(UploadedFile(file_name=file_name, error=str(e)))
+        return results
+
+    def _check_limits(self, file_name: str, file_bytes: int, request_bytes: int):
+        if request_bytes > self._config.max_request_bytes:
+            raise UploadTooLargeError(
+                f"Request exceeds {self._config.max_request_bytes} bytes",
+                limit=self._config.max_request_bytes,
+                scope="request"
+            )
+        if file_bytes > self._config.max_file_bytes:
+            raise UploadTooLargeError(
+                f"File {file_name} exceeds {self._config.max_file_bytes} bytes",
+                limit=self._config.max_file_bytes,
+                scope="file"
+            )
+
+
+class UploadLimitMiddleware:
+    """
+    ASGI middleware bounding request body size.
+
+    Requests with a Content-Length over the limit are rejected before the
+    body is read; otherwise received bytes are counted and the request is
+    answered with 413 as soon as the limit is crossed, before multipart
+    parsing buffers the rest.
+    """
+
+    def __init__(self, app, max_request_bytes: int = None):
+        self.app = app
+        self.max_request_bytes = max_request_bytes or get_config().uploads.max_request_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") not in ("POST", "PUT", "PATCH"):
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    declared = 0
+                if declared > self.max_request_bytes:
+                    await self._send_413(send)
+                    return
+                break
+
+        state = {"received": 0, "exceeded": False, "response_started": False}
+
+        async def limited_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                state["received"] += len(message.get("body", b""))
+                if state["received"] > self.max_request_bytes:
+                    state["exceeded"] = True
+                    raise UploadTooLargeError(
+                        f"Request exceeds {self.max_request_bytes} bytes",
+                        limit=self.max_request_bytes,
+                        scope="request"
+                    )
+            return message
+
+        async def guarded_send(message):
+            # Once the limit is crossed, downstream responses are replaced by the 413
+            if state["exceeded"]:
+                return
+            if message["type"] == "http.response.start":
+                state["response_started"] = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not state["exceeded"]:
+                raise
+
+        if state["exceeded"] and not state["response_started"]:
+            await self._send_413(send)
+
+    async def _send_413(self, send):
+        body = json.dumps({"detail": f"Request body exceeds {self.max_request_bytes} bytes"}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -1,11 +1,15 @@
 import os
-import pdfplumber
-import docx
+
+from src.core.exceptions import UnsupportedFormatError
+from src.core.ingestion import get_ingestion_pipeline
 
 class DocumentParser:
     """
     Parses various document formats into text.
     Supported: .pdf, .docx, .txt, .md
+
+    Legacy wrapper around the ingestion pipeline (src.core.ingestion),
+    so files parsed here share the parse cache and configured parsers.
     """
 
     def parse_file(self, file_path: str) -> str:
@@ -15,57 +19,14 @@ class DocumentParser:
         _, ext = os.path.splitext(file_path)
         ext = ext.lower()
 
-        if ext == '.pdf':
-            return self._parse_pdf(file_path)
-        elif ext == '.docx' or ext == '.doc': # doc support is limited, but docx is main target
-             # Note: python-docx only supports .docx. .doc support requires other tools like pywin32 or antiword.
-             # For this MVP, we will only strictly support .docx. 
-             # If .doc is passed, we might try but it will likely fail if we treat it as docx.
-             if ext == '.doc':
-                 # Fallback or error. For now, let's just error for .doc or treat as binary if we wanted, 
-                 # but requirement said "doc, docx". 
-                 # Handling .doc properly usually requires `textract` (which needs heavy deps) or `pywin32` (windows only).
-                 # Given I am on windows, I could use COM, but let's stick to .docx first as it's standard.
-                 # I'll raise error for .doc for now to be safe, or try to read as text if it's actually xml.
-                 raise ValueError("Legacy .doc format is not fully supported in this version. Please save as .docx or .pdf.")
-             return self._parse_docx(file_path)
-        elif ext in ['.txt', '.md']:
-            return self._parse_text(file_path)
-        else:
-            raise ValueError(f"Unsupported file format: {ext}")
-
-    def _parse_pdf(self, file_path: str) -> str:
-        text = ""
-        try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-        except Exception as e:
-            print(f"Error parsing PDF {file_path}: {e}")
-            return ""
-        return text
-
-    def _parse_docx(self, file_path: str) -> str:
-        text = ""
-        try:
-            doc = docx.Document(file_path)
-            for para in doc.paragraphs:
-                text += para.text + "\n"
-        except Exception as e:
-            print(f"Error parsing DOCX {file_path}: {e}")
-            return ""
-        return text
+        if ext == '.doc':
+            # python-docx only reads .docx; legacy .doc needs external tools
+            raise ValueError("Legacy .doc format is not fully supported in this version. Please save as .docx or .pdf.")
 
-    def _parse_text(self, file_path: str) -> str:
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except UnicodeDecodeError:
-            # Try a common fallback encoding
-            with open(file_path, 'r', encoding='gbk') as f:
-                return f.read()
+            return get_ingestion_pipeline().ingest_file(file_path).content
+        except UnsupportedFormatError:
+            raise ValueError(f"Unsupported file format: {ext}")
         except Exception as e:
-            print(f"Error parsing Text file {file_path}: {e}")
+            print(f"Error parsing file {file_path}: {e}")
             return ""
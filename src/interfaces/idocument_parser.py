@@ -4,8 +4,10 @@ IDocumentParser Interface / 文档解析器接口
 Abstract base class for document parser plugins.
 """
 
+import io
+import os
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from typing import BinaryIO, Dict, Optional
 from dataclasses import dataclass
 
 
@@ -31,6 +33,10 @@ class IDocumentParser(ABC):
     - parse(): Parse a file and return content
     - get_supported_formats(): List supported file extensions
     - validate_file(): Check if file can be processed
+
+    Uploads are parsed in memory through parse_stream(), which by default
+    reads the stream and calls parse_content(). Parsers that can read
+    file-like objects directly should override it.
     """
 
     @property
@@ -45,6 +51,26 @@ class IDocumentParser(ABC):
         """List of supported file extensions (e.g., ['.pdf', '.docx'])."""
         pass
 
+    @property
+    def parser_version(self) -> str:
+        """
+        Version of the extraction logic.
+
+        Bump PARSER_VERSION whenever output for the same input changes,
+        so cached parse results are invalidated.
+        """
+        return str(getattr(self, "PARSER_VERSION", "0"))
+
+    @property
+    def cache_options(self) -> dict:
+        """
+        Options that change the parsed output (e.g., max_pages).
+
+        Part of the parse cache key, so documents parsed with different
+        settings do not share an entry. Defaults to none.
+        """
+        return {}
+
     @abstractmethod
     def parse(self, file_path: str) -> ParsedDocument:
         """
@@ -84,3 +110,38 @@ class IDocumentParser(ABC):
             Extracted text content
         """
         pass
+
+    def parse_stream(self, stream: BinaryIO, file_name: str = "") -> ParsedDocument:
+        """
+        Parse a document from a binary file-like object.
+
+        The default reads the stream and calls parse_content(); parsers
+        that can work on the stream directly should override it.
+
+        Args:
+            stream: Seekable binary stream positioned at the start of the document
+            file_name: Original file name (its extension is passed to parse_content)
+
+        Returns:
+            ParsedDocument object with extracted content and metadata
+        """
+        ext = os.path.splitext(file_name)[1].lower()
+        return ParsedDocument(
+            content=self.parse_content(stream.read(), ext),
+            file_path=file_name,
+            file_type=ext.lstrip(".")
+        )
+
+    def parse_bytes(self, content: bytes, file_extension: str, file_name: str = "") -> ParsedDocument:
+        """
+        Parse a document held in memory.
+
+        Args:
+            content: Raw file bytes
+            file_extension: File extension (e.g., '.pdf')
+            file_name: Original file name (used for metadata only)
+
+        Returns:
+            ParsedDocument object with extracted content and metadata
+        """
+        return self.parse_stream(io.BytesIO(content), file_name=file_name or f"upload{file_extension}")
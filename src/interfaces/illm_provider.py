@@ -5,9 +5,15 @@ Abstract base class for LLM provider plugins.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
+# Optional message key marking the leading part of a message's content as
+# a stable, cacheable prompt prefix (e.g. the JD shared by a batch of
+# resumes). Providers with explicit cache breakpoints (Anthropic) split the
+# content there; providers with automatic prefix caching drop the key.
+CACHE_PREFIX_KEY = "cache_prefix"
+
 
 @dataclass
 class LLMResponse:
@@ -17,6 +23,30 @@ class LLMResponse:
     tokens_used: int
     latency_ms: float
     raw_response: Optional[Any] = None
+    cached_tokens: int = 0  # Prompt tokens served from the provider's prompt cache
+    provider: str = ""  # Provider that served the request (set by the provider pool)
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    reasoning_tokens: int = 0  # Completion tokens spent on reasoning (thinking models)
+
+
+class ReasoningChunk(str):
+    """
+    Streamed text that belongs to the model's reasoning, not its answer.
+
+    chat_stream() implementations of thinking models yield reasoning as
+    ReasoningChunk so consumers (and metrics) can tell the two apart;
+    everyone else can treat it as a plain str.
+    """
+    __slots__ = ()
+
+
+def strip_cache_hints(messages: List[Dict]) -> List[Dict]:
+    """Remove cache hints from messages for APIs that reject unknown keys."""
+    return [
+        {k: v for k, v in msg.items() if k != CACHE_PREFIX_KEY} if CACHE_PREFIX_KEY in msg else msg
+        for msg in messages
+    ]
 
 
 class ILLMProvider(ABC):
@@ -41,6 +71,16 @@ class ILLMProvider(ABC):
         """List of supported model names."""
         pass
 
+    @property
+    def supports_json_mode(self) -> bool:
+        """Whether chat() accepts response_format={"type": "json_object"}."""
+        return False
+
+    @property
+    def supports_embeddings(self) -> bool:
+        """Whether embed() is implemented (checked instead of probing with a request)."""
+        return False
+
     @abstractmethod
     def chat(
         self,
@@ -54,7 +94,11 @@ class ILLMProvider(ABC):
         Send a chat completion request.
 
         Args:
-            messages: List of message dicts with 'role' and 'content'
+            messages: List of message dicts with 'role' and 'content'.
+                Static content (system prompt, shared instructions) comes
+                first so providers can reuse their prompt cache; a message
+                may carry CACHE_PREFIX_KEY with the cacheable start of its
+                content.
             model: Model name (uses default if None)
             temperature: Response creativity (0.0-1.0)
             max_tokens: Maximum response tokens
@@ -105,6 +149,21 @@ class ILLMProvider(ABC):
         """
         pass
 
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """
+        Generate embedding vectors for several texts.
+
+        Providers that can embed a batch in one call should override this;
+        the default embeds the texts one by one.
+
+        Args:
+            texts: Input texts to embed
+
+        Returns:
+            One embedding vector per text, in input order
+        """
+        return [self.embed(text) for text in texts]
+
     @abstractmethod
     def is_available(self) -> bool:
         """Check if provider is properly configured and ready."""
@@ -1,20 +1,40 @@
 """
 Document Parsers Package / 文档解析器插件包
 
-Plugin implementations for various document formats.
+Plugin implementations for various document formats. Parsers (and their
+PDF/DOCX libraries) are imported only when selected.
 """
 
-from .pdf_parser import PDFParser
-from .docx_parser import DOCXParser
-from .text_parser import TextParser
+from src.core.plugin_registry import PluginRegistry, lazy_exports
 
-__all__ = ['PDFParser', 'DOCXParser', 'TextParser']
+__all__ = ['PDFParser', 'PdfiumParser', 'DOCXParser', 'OOXMLParser', 'TextParser']
 
 # Parser registry for dynamic loading
-PARSER_REGISTRY = {
-    'pdf': PDFParser,
-    'docx': DOCXParser,
-    'text': TextParser,
+PARSER_REGISTRY = PluginRegistry({
+    'pdf': '.pdf_parser:PDFParser',
+    'pdf_fast': '.pdfium_parser:PdfiumParser',
+    'docx': '.docx_parser:DOCXParser',
+    'docx_fast': '.ooxml_parser:OOXMLParser',
+    'text': '.text_parser:TextParser',
+}, package=__name__, entry_point_group='talentos.document_parsers')
+
+__getattr__ = lazy_exports(__name__, PARSER_REGISTRY, {
+    'PDFParser': 'pdf',
+    'PdfiumParser': 'pdf_fast',
+    'DOCXParser': 'docx',
+    'OOXMLParser': 'docx_fast',
+    'TextParser': 'text',
+})
+
+# File extension to document format mapping.
+# The format's `document_parsers.<format>.parser` config entry selects the
+# registered parser implementation (e.g. pdf -> pdf_fast).
+EXTENSION_MAP = {
+    'pdf': 'pdf',
+    'docx': 'docx',
+    'doc': 'docx',  # Legacy support
+    'txt': 'text',
+    'md': 'text',
 }
 
 
@@ -23,8 +43,8 @@ def get_parser(parser_name: str, **kwargs):
     Factory function to get a parser instance.
 
     Args:
-        parser_name: Name of the parser (pdf, docx, text)
-        **kwargs: Configuration parameters
+        parser_name: Name of the parser (pdf, pdf_fast, docx, docx_fast, text)
+        **kwargs: Configuration parameters (defaults to configured options)
 
     Returns:
         IDocumentParser instance
@@ -34,36 +54,70 @@ def get_parser(parser_name: str, **kwargs):
         raise PluginNotFoundError(f"Document parser '{parser_name}' not found. "
                                    f"Available: {list(PARSER_REGISTRY.keys())}")
 
+    if not kwargs:
+        kwargs = _get_configured_options(parser_name)
+
     return PARSER_REGISTRY[parser_name](**kwargs)
 
 
-def get_parser_for_file(file_path: str, **kwargs):
+def _get_configured_options(parser_name: str) -> dict:
+    """Get options for a parser from the document_parsers config section."""
+    from src.core.config import get_config
+
+    parsers = get_config().document_parsers
+    for format_name, parser_config in parsers.items():
+        if parser_config.parser == parser_name:
+            return dict(parser_config.options)
+    if parser_name in parsers:
+        return dict(parsers[parser_name].options)
+    return {}
+
+
+def resolve_parser_name(file_path: str) -> str:
     """
-    Factory function to get appropriate parser for a file.
+    Resolve the registered parser name for a file path or file name.
 
     Args:
-        file_path: Path to the file
-        **kwargs: Configuration parameters
+        file_path: Path or name of the file
 
     Returns:
-        IDocumentParser instance
+        Parser name (key of PARSER_REGISTRY)
     """
     import os
     _, ext = os.path.splitext(file_path)
     ext = ext.lower().lstrip('.')
 
-    # Map extension to parser name
-    ext_map = {
-        'pdf': 'pdf',
-        'docx': 'docx',
-        'doc': 'docx',  # Legacy support
-        'txt': 'text',
-        'md': 'text',
-    }
-
-    parser_name = ext_map.get(ext)
-    if parser_name is None:
+    format_name = EXTENSION_MAP.get(ext)
+    if format_name is None:
         from src.core.exceptions import UnsupportedFormatError
         raise UnsupportedFormatError(f"Unsupported file format: .{ext}")
 
-    return get_parser(parser_name, **kwargs)
+    # Let config pick the implementation for this format
+    from src.core.config import get_config
+    parser_config = get_config().document_parsers.get(format_name)
+    if parser_config and parser_config.enabled and parser_config.parser in PARSER_REGISTRY:
+        return parser_config.parser
+
+    return format_name
+
+
+def get_parser_for_file(file_path: str, **kwargs):
+    """
+    Factory function to get appropriate parser for a file.
+
+    Args:
+        file_path: Path to the file
+        **kwargs: Configuration parameters
+
+    Returns:
+        IDocumentParser instance
+    """
+    return get_parser(resolve_parser_name(file_path), **kwargs)
+
+
+def shutdown_worker_pools():
+    """Stop worker processes started by parsers (page-parallel PDF extraction), if any."""
+    import sys
+    pdf_parser = sys.modules.get(__name__ + '.pdf_parser')
+    if pdf_parser is not None:
+        pdf_parser.shutdown_page_pool()
@@ -5,7 +5,7 @@ Document parser plugin for Microsoft Word files.
 """
 
 import os
-from typing import Dict, Optional
+from typing import BinaryIO, Dict, Optional, Union
 import docx
 
 from src.interfaces.idocument_parser import IDocumentParser, ParsedDocument
@@ -21,6 +21,7 @@ class DOCXParser(IDocumentParser):
     """
 
     PARSER_NAME = "docx"
+    PARSER_VERSION = "1"
     SUPPORTED_FORMATS = ['.docx']
 
     def __init__(self, extract_tables: bool = True, **kwargs):
@@ -41,6 +42,10 @@ class DOCXParser(IDocumentParser):
     def supported_formats(self) -> list:
         return self.SUPPORTED_FORMATS
 
+    @property
+    def cache_options(self) -> dict:
+        return {"extract_tables": self._extract_tables}
+
     def parse(self, file_path: str) -> ParsedDocument:
         """
         Parse a DOCX file and extract text content.
@@ -59,8 +64,25 @@ class DOCXParser(IDocumentParser):
         if ext.lower() not in self.SUPPORTED_FORMATS:
             raise UnsupportedFormatError(f"DOCX parser only supports .docx, got: {ext}")
 
+        return self._parse_source(file_path, file_path)
+
+    def parse_stream(self, stream: BinaryIO, file_name: str = "") -> ParsedDocument:
+        """
+        Parse a DOCX from a binary stream without touching disk.
+
+        Args:
+            stream: Seekable binary stream of the DOCX
+            file_name: Original file name
+
+        Returns:
+            ParsedDocument object
+        """
+        return self._parse_source(stream, file_name)
+
+    def _parse_source(self, source: Union[str, BinaryIO], file_path: str) -> ParsedDocument:
+        """Extract text from a path or file-like object."""
         try:
-            doc = docx.Document(file_path)
+            doc = docx.Document(source)
             text = ""
             metadata = {
                 "paragraphs": 0,
@@ -109,18 +131,7 @@ class DOCXParser(IDocumentParser):
         Returns:
             Extracted text content
         """
-        import tempfile
-
-        with tempfile.NamedTemporaryFile(suffix=file_extension, delete=False) as tmp:
-            tmp.write(content)
-            tmp_path = tmp.name
-
-        try:
-            doc = self.parse(tmp_path)
-            return doc.content
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+        return self.parse_bytes(content, file_extension).content
 
     def _format_table(self, table) -> str:
         """Format extracted table data as text."""
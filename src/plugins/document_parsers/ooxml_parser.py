@@ -0,0 +1,165 @@
+"""
+OOXML DOCX Parser / 快速DOCX解析器
+
+Streaming DOCX text extraction straight from word/document.xml.
+Avoids building the python-docx object model; paragraphs and tables are
+emitted in document order.
+"""
+
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import BinaryIO, List, Union
+
+from src.interfaces.idocument_parser import ParsedDocument
+from src.core.exceptions import ParseError
+from .docx_parser import DOCXParser
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+W_BODY = W_NS + "body"
+W_P = W_NS + "p"
+W_PPR = W_NS + "pPr"
+W_T = W_NS + "t"
+W_TAB = W_NS + "tab"
+W_BR = W_NS + "br"
+W_CR = W_NS + "cr"
+W_TBL = W_NS + "tbl"
+W_TR = W_NS + "tr"
+W_TC = W_NS + "tc"
+W_VMERGE = W_NS + "vMerge"
+W_VAL = W_NS + "val"
+W_SECTPR = W_NS + "sectPr"
+
+DOCUMENT_PART = "word/document.xml"
+
+
+class OOXMLParser(DOCXParser):
+    """
+    DOCX parser reading the OOXML package directly.
+
+    word/document.xml is decompressed and parsed incrementally; elements
+    are discarded as soon as their text is emitted.
+
+    Merged cells are emitted once: a horizontally spanned cell (gridSpan)
+    is a single w:tc, and vertical merge continuations are left empty
+    instead of repeating the first cell's text.
+    """
+
+    PARSER_NAME = "docx_fast"
+    PARSER_VERSION = "2"
+
+    def _parse_source(self, source: Union[str, BinaryIO], file_path: str) -> ParsedDocument:
+        """Stream paragraphs and tables out of the document part."""
+        try:
+            with zipfile.ZipFile(source) as package:
+                with package.open(DOCUMENT_PART) as part:
+                    lines, metadata = self._extract(part)
+
+            return ParsedDocument(
+                content="\n".join(lines).strip(),
+                file_path=file_path,
+                file_type="docx",
+                metadata=metadata
+            )
+
+        except KeyError:
+            raise ParseError(f"Failed to parse DOCX {file_path}: missing {DOCUMENT_PART}")
+        except Exception as e:
+            raise ParseError(f"Failed to parse DOCX {file_path}: {e}")
+
+    def _extract(self, part: BinaryIO) -> tuple:
+        """
+        Walk document.xml events once.
+
+        Returns:
+            Tuple of (output lines, metadata)
+        """
+        lines: List[str] = []
+        metadata = {"paragraphs": 0, "tables": 0, "sections": 0, "backend": "ooxml"}
+
+        body = None
+        depth = 0
+        skip_depth = 0          # > 0 while inside an mc:Fallback duplicate
+        props_depth = 0         # > 0 inside paragraph properties (w:tabs holds tab-stop w:tab elements)
+        table_depth = 0
+        paragraphs: List[List[str]] = []   # open paragraphs (text boxes nest them)
+        rows: List[str] = []               # formatted rows of the open top-level table
+        cells: List[str] = []              # cells of the open top-level row
+        cell_lines: List[str] = []         # paragraphs of the open top-level cell
+        vmerge_continue = False
+
+        for event, elem in ET.iterparse(part, events=("start", "end")):
+            tag = elem.tag
+
+            if event == "start":
+                depth += 1
+                if skip_depth or tag == MC_FALLBACK:
+                    skip_depth += 1
+                elif tag == W_P:
+                    paragraphs.append([])
+                elif tag == W_PPR:
+                    props_depth += 1
+                elif tag == W_TBL:
+                    table_depth += 1
+                elif tag == W_TC and table_depth == 1:
+                    cell_lines = []
+                    vmerge_continue = False
+                elif tag == W_BODY:
+                    body = elem
+                continue
+
+            depth -= 1
+            if skip_depth:
+                skip_depth -= 1
+                if tag == MC_FALLBACK:
+                    elem.clear()
+                continue
+
+            if tag == W_T:
+                if paragraphs and elem.text:
+                    paragraphs[-1].append(elem.text)
+            elif tag == W_PPR:
+                props_depth -= 1
+            elif tag == W_TAB:
+                if paragraphs and not props_depth:
+                    paragraphs[-1].append("\t")
+            elif tag in (W_BR, W_CR):
+                if paragraphs and not props_depth:
+                    paragraphs[-1].append("\n")
+            elif tag == W_VMERGE and table_depth == 1:
+                # <w:vMerge/> without val (or val="continue") continues the cell above
+                vmerge_continue = elem.get(W_VAL, "continue") == "continue"
+            elif tag == W_P:
+                text = "".join(paragraphs.pop()) if paragraphs else ""
+                if table_depth:
+                    if text.strip():
+                        cell_lines.append(text.strip())
+                elif text.strip():
+                    lines.append(text)
+                    metadata["paragraphs"] += 1
+                elem.clear()
+            elif tag == W_TC and table_depth == 1:
+                cells.append("" if vmerge_continue else "\n".join(cell_lines))
+                elem.clear()
+            elif tag == W_TR and table_depth == 1:
+                if cells:
+                    rows.append(" | ".join(cells))
+                cells = []
+                elem.clear()
+            elif tag == W_TBL:
+                table_depth -= 1
+                if table_depth == 0:
+                    if self._extract_tables:
+                        metadata["tables"] += 1
+                        lines.append("\n".join(rows))
+                    rows = []
+                elem.clear()
+            elif tag == W_SECTPR:
+                metadata["sections"] += 1
+
+            # Drop finished top-level blocks so memory stays flat
+            if depth == 2 and body is not None:
+                body.clear()
+
+        return lines, metadata
@@ -4,12 +4,80 @@ PDF Parser / PDF解析器
 Document parser plugin for PDF files using pdfplumber.
 """
 
+import io
 import os
-from typing import Dict, Optional
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from threading import Lock
+from typing import BinaryIO, Dict, List, Optional, Union
 import pdfplumber
 
 from src.interfaces.idocument_parser import IDocumentParser, ParsedDocument
 from src.core.exceptions import ParseError
+from src.core.text_normalizer import strip_page_furniture
+
+
+@dataclass
+class PageText:
+    """Text extracted from a single PDF page."""
+    index: int
+    text: str
+    tables: int = 0
+    fallback: bool = False
+
+
+# Shared pool for page-parallel extraction of large documents
+_page_pool: Optional[ProcessPoolExecutor] = None
+_page_pool_lock = Lock()
+
+
+def _get_page_pool(max_workers: int) -> ProcessPoolExecutor:
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            # Spawned, not forked: the pool is created from a threaded server
+            # where another thread may hold a lock at fork time
+            _page_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return _page_pool
+
+
+def _discard_page_pool(pool: ProcessPoolExecutor):
+    """Kill a broken or hung pool; the next large document gets a fresh one."""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is pool:
+            _page_pool = None
+
+    # shutdown() cannot interrupt a running task, so terminate workers directly
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        try:
+            process.terminate()
+        except Exception:
+            pass
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_page_pool():
+    """Stop the page-parallel worker processes (on application shutdown)."""
+    with _page_pool_lock:
+        pool = _page_pool
+    if pool is not None:
+        _discard_page_pool(pool)
+
+
+def _extract_chunk(
+    parser_cls,
+    options: dict,
+    source: Union[str, bytes],
+    start: int,
+    end: int,
+    char_budget: int = 0
+) -> List[PageText]:
+    """Extract a page range inside a page-pool worker."""
+    return parser_cls(**options)._extract_page_range(source, start, end, char_budget=char_budget)
 
 
 class PDFParser(IDocumentParser):
@@ -17,20 +85,51 @@ class PDFParser(IDocumentParser):
     PDF document parser using pdfplumber.
 
     Extracts text from PDF files with page-by-page processing.
+    Large documents are split into page ranges extracted in parallel,
+    and extraction stops early once the page/character budget is spent.
     """
 
     PARSER_NAME = "pdf"
+    PARSER_VERSION = "4"
     SUPPORTED_FORMATS = ['.pdf']
+    BACKEND = "pdfplumber"
 
-    def __init__(self, extract_tables: bool = False, **kwargs):
+    def __init__(
+        self,
+        extract_tables: bool = False,
+        max_pages: int = 50,
+        max_chars: int = 200000,
+        parallel_page_threshold: int = 16,
+        page_workers: int = 0,
+        page_timeout: int = 30,
+        **kwargs
+    ):
         """
         Initialize PDF parser.
 
         Args:
             extract_tables: Whether to extract table data
+            max_pages: Maximum pages to extract (0 = no limit)
+            max_chars: Maximum characters to extract (0 = no limit)
+            parallel_page_threshold: Page count from which pages are extracted in parallel (0 = never)
+            page_workers: Worker processes for page-parallel extraction (0 = CPU count)
+            page_timeout: Seconds allowed for page-parallel extraction of one document (0 = no limit)
             **kwargs: Additional parameters
         """
         self._extract_tables = extract_tables
+        self._max_pages = max_pages
+        self._max_chars = max_chars
+        self._parallel_page_threshold = parallel_page_threshold
+        self._page_workers = page_workers or min(os.cpu_count() or 1, 8)
+        self._page_timeout = page_timeout
+        self._options = {
+            "extract_tables": extract_tables,
+            "max_pages": max_pages,
+            "max_chars": max_chars,
+            "parallel_page_threshold": parallel_page_threshold,
+            "page_workers": page_workers,
+            "page_timeout": page_timeout,
+        }
 
     @property
     def parser_name(self) -> str:
@@ -40,6 +139,10 @@ class PDFParser(IDocumentParser):
     def supported_formats(self) -> list:
         return self.SUPPORTED_FORMATS
 
+    @property
+    def cache_options(self) -> dict:
+        return {"extract_tables": self._extract_tables, "max_pages": self._max_pages, "max_chars": self._max_chars}
+
     def parse(self, file_path: str) -> ParsedDocument:
         """
         Parse a PDF file and extract text content.
@@ -53,39 +156,179 @@ class PDFParser(IDocumentParser):
         if not os.path.exists(file_path):
             raise ParseError(f"File not found: {file_path}")
 
+        return self._parse_source(file_path, file_path)
+
+    def parse_stream(self, stream: BinaryIO, file_name: str = "") -> ParsedDocument:
+        """
+        Parse a PDF from a binary stream without touching disk.
+
+        Args:
+            stream: Seekable binary stream of the PDF
+            file_name: Original file name
+
+        Returns:
+            ParsedDocument object
+        """
+        return self._parse_source(stream.read(), file_name)
+
+    def _parse_source(self, source: Union[str, bytes], file_path: str) -> ParsedDocument:
+        """Extract text from a path or raw bytes within the page/char budget."""
         try:
-            text = ""
-            metadata = {
-                "pages": 0,
-                "extracted_tables": 0
-            }
-
-            with pdfplumber.open(file_path) as pdf:
-                metadata["pages"] = len(pdf.pages)
-
-                for i, page in enumerate(pdf.pages):
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-
-                    # Extract tables if enabled
-                    if self._extract_tables:
-                        tables = page.extract_tables()
-                        if tables:
-                            metadata["extracted_tables"] += len(tables)
-                            for table in tables:
-                                text += self._format_table(table) + "\n"
+            page_count = self._count_pages(source)
+            page_limit = min(page_count, self._max_pages) if self._max_pages else page_count
+
+            if self._should_parallelize(page_limit):
+                pages = self._extract_parallel(source, page_limit)
+            else:
+                pages = self._extract_page_range(source, 0, page_limit, char_budget=self._max_chars)
+
+            parts = []
+            total_chars = 0
+            # Pages skipped by max_pages or once the character budget was spent
+            truncated = len(pages) < page_count
+            for text in strip_page_furniture([page.text for page in pages]):
+                if not text:
+                    continue
+                if self._max_chars:
+                    # total_chars counts the newlines joining parts
+                    remaining = self._max_chars - total_chars
+                    if remaining <= 0 or len(text) > remaining:
+                        if remaining > 0:
+                            parts.append(text[:remaining])
+                        truncated = True
+                        break
+                parts.append(text)
+                total_chars += len(text) + 1
 
             return ParsedDocument(
-                content=text.strip(),
+                content="\n".join(parts).strip(),
                 file_path=file_path,
                 file_type="pdf",
-                metadata=metadata
+                metadata=self._build_metadata(pages, page_count, truncated)
             )
 
+        except ParseError:
+            raise
         except Exception as e:
             raise ParseError(f"Failed to parse PDF {file_path}: {e}")
 
+    def _build_metadata(self, pages: List[PageText], page_count: int, truncated: bool) -> Dict:
+        return {
+            "pages": page_count,
+            "pages_parsed": len(pages),
+            "truncated": truncated,
+            "extracted_tables": sum(page.tables for page in pages),
+            "backend": self.BACKEND
+        }
+
+    def _count_pages(self, source: Union[str, bytes]) -> int:
+        with pdfplumber.open(self._open_arg(source)) as pdf:
+            return len(pdf.pages)
+
+    def _extract_page_range(
+        self,
+        source: Union[str, bytes],
+        start: int,
+        end: int,
+        char_budget: int = 0
+    ) -> List[PageText]:
+        """
+        Extract pages [start, end).
+
+        Args:
+            source: File path or raw PDF bytes
+            start: First page index
+            end: Page index to stop before
+            char_budget: Stop once this many characters are extracted (0 = no limit)
+
+        Returns:
+            List of PageText objects
+        """
+        pages = []
+        extracted = 0
+
+        with pdfplumber.open(self._open_arg(source)) as pdf:
+            for index in range(start, end):
+                page = pdf.pages[index]
+                lines = [page.extract_text() or ""]
+                table_count = 0
+
+                # Extract tables if enabled
+                if self._extract_tables:
+                    tables = page.extract_tables()
+                    if tables:
+                        table_count = len(tables)
+                        lines.extend(self._format_table(table) for table in tables)
+
+                text = "\n".join(line for line in lines if line)
+                pages.append(PageText(index=index, text=text, tables=table_count))
+                page.close()
+
+                extracted += len(text)
+                if char_budget and extracted >= char_budget:
+                    break
+
+        return pages
+
+    def _should_parallelize(self, page_limit: int) -> bool:
+        """Only fan out large documents, and never from inside a worker process."""
+        if not self._parallel_page_threshold or page_limit < self._parallel_page_threshold:
+            return False
+        if self._page_workers < 2:
+            return False
+        return multiprocessing.parent_process() is None
+
+    def _extract_parallel(self, source: Union[str, bytes], page_limit: int) -> List[PageText]:
+        """
+        Split pages into contiguous ranges and extract them across processes.
+
+        Each range stops once it has extracted max_chars, and ranges not yet
+        started are cancelled once earlier ones fill the budget.
+
+        A pool broken by a dead worker (this document or another sharing the
+        pool) is replaced and the document retried once. Extraction that
+        exceeds page_timeout kills the pool's workers and fails the document.
+        """
+        workers = min(self._page_workers, page_limit)
+        chunk_size = -(-page_limit // workers)
+        ranges = [(start, min(start + chunk_size, page_limit)) for start in range(0, page_limit, chunk_size)]
+
+        for attempt in range(2):
+            pool = _get_page_pool(self._page_workers)
+            try:
+                futures = [
+                    pool.submit(_extract_chunk, type(self), self._options, source, start, end, self._max_chars)
+                    for start, end in ranges
+                ]
+                return self._collect_pages(pool, futures)
+            except BrokenProcessPool:
+                _discard_page_pool(pool)
+        raise ParseError("PDF page worker crashed while extracting this document")
+
+    def _collect_pages(self, pool: ProcessPoolExecutor, futures: list) -> List[PageText]:
+        """Wait for the page ranges in order, within page_timeout for the whole document."""
+        deadline = time.monotonic() + self._page_timeout if self._page_timeout else None
+        pages = []
+        extracted = 0
+        for position, future in enumerate(futures):
+            if self._max_chars and extracted >= self._max_chars:
+                for pending in futures[position:]:
+                    pending.cancel()
+                break
+            timeout = max(deadline - time.monotonic(), 0) if deadline else None
+            try:
+                chunk = future.result(timeout=timeout)
+            except FutureTimeoutError:
+                _discard_page_pool(pool)
+                raise ParseError(f"PDF page extraction timed out after {self._page_timeout}s")
+            pages.extend(chunk)
+            extracted += sum(len(page.text) for page in chunk)
+        return pages
+
+    @staticmethod
+    def _open_arg(source: Union[str, bytes]):
+        return source if isinstance(source, str) else io.BytesIO(source)
+
     def validate_file(self, file_path: str) -> bool:
         """Check if file is a valid PDF."""
         if not os.path.exists(file_path):
@@ -105,18 +348,7 @@ class PDFParser(IDocumentParser):
         Returns:
             Extracted text content
         """
-        import tempfile
-
-        with tempfile.NamedTemporaryFile(suffix=file_extension, delete=False) as tmp:
-            tmp.write(content)
-            tmp_path = tmp.name
-
-        try:
-            doc = self.parse(tmp_path)
-            return doc.content
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+        return self.parse_bytes(content, file_extension).content
 
     def _format_table(self, table: list) -> str:
         """Format extracted table data as text."""
@@ -0,0 +1,131 @@
+"""
+Pdfium PDF Parser / 快速PDF解析器
+
+Fast-path PDF text extraction using pypdfium2 (PDFium bindings).
+Falls back to pdfplumber per page when the fast output looks garbled.
+"""
+
+import unicodedata
+from threading import Lock
+from typing import Dict, List, Union
+
+import pypdfium2 as pdfium
+
+from .pdf_parser import PDFParser, PageText
+
+# PDFium is not thread-safe; serialize access within a process
+_PDFIUM_LOCK = Lock()
+
+
+class PdfiumParser(PDFParser):
+    """
+    PDF parser backed by PDFium.
+
+    PDFium extracts plain text without computing the per-character layout
+    pdfplumber builds, which is all the analysis prompts need.
+    Table extraction is not supported by PDFium; when enabled the whole
+    document is delegated to pdfplumber.
+    """
+
+    PARSER_NAME = "pdf_fast"
+    PARSER_VERSION = "4"
+    BACKEND = "pdfium"
+
+    # Share of suspicious characters above which a page is re-extracted
+    GARBLED_THRESHOLD = 0.1
+
+    def _count_pages(self, source: Union[str, bytes]) -> int:
+        if self._extract_tables:
+            return super()._count_pages(source)
+
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(source)
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+
+    def _extract_page_range(
+        self,
+        source: Union[str, bytes],
+        start: int,
+        end: int,
+        char_budget: int = 0
+    ) -> List[PageText]:
+        """Extract pages [start, end) with PDFium, re-extracting garbled pages with pdfplumber."""
+        if self._extract_tables:
+            return super()._extract_page_range(source, start, end, char_budget)
+
+        pages = []
+        extracted = 0
+
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(source)
+            try:
+                for index in range(start, end):
+                    page = pdf[index]
+                    textpage = page.get_textpage()
+                    try:
+                        char_count = textpage.count_chars()
+                        page_text = textpage.get_text_range() if char_count else ""
+                    finally:
+                        textpage.close()
+                        page.close()
+
+                    page_text = page_text.replace("\r\n", "\n").replace("\r", "\n")
+                    pages.append(PageText(
+                        index=index,
+                        text=page_text,
+                        fallback=self._looks_garbled(page_text, char_count)
+                    ))
+
+                    extracted += len(page_text)
+                    if char_budget and extracted >= char_budget:
+                        break
+            finally:
+                pdf.close()
+
+        fallback = [page for page in pages if page.fallback]
+        if fallback:
+            self._fallback_extract(source, fallback)
+
+        return pages
+
+    def _build_metadata(self, pages: List[PageText], page_count: int, truncated: bool) -> Dict:
+        metadata = super()._build_metadata(pages, page_count, truncated)
+        if not self._extract_tables:
+            metadata["fallback_pages"] = [page.index for page in pages if page.fallback]
+        else:
+            metadata["backend"] = PDFParser.BACKEND
+        return metadata
+
+    def _fallback_extract(self, source: Union[str, bytes], pages: List[PageText]):
+        """Re-extract the given pages with pdfplumber in place."""
+        import pdfplumber
+
+        with pdfplumber.open(self._open_arg(source)) as pdf:
+            for page in pages:
+                page.text = pdf.pages[page.index].extract_text() or ""
+
+    def _looks_garbled(self, text: str, char_count: int) -> bool:
+        """
+        Heuristic check for broken text extraction.
+
+        A page is considered garbled when PDFium reports characters but
+        returns no text, or when too many characters are replacement,
+        private-use or control codepoints (typical of broken CMaps).
+        """
+        stripped = text.strip()
+        if not stripped:
+            return char_count > 0
+
+        suspicious = 0
+        for ch in stripped:
+            if ch == "\ufffd":
+                suspicious += 1
+                continue
+            category = unicodedata.category(ch)
+            if category == "Co" or (category == "Cc" and ch not in "\n\t"):
+                suspicious += 1
+
+        return suspicious / len(stripped) > self.GARBLED_THRESHOLD
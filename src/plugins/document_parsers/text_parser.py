@@ -5,25 +5,52 @@ Document parser plugin for plain text and Markdown files.
 """
 
 import os
-from typing import Dict, Optional
+import codecs
+from typing import BinaryIO, Dict, Iterator, Optional
 
 from src.interfaces.idocument_parser import IDocumentParser, ParsedDocument
 from src.core.exceptions import ParseError, UnsupportedFormatError
 
+try:
+    from charset_normalizer import from_bytes as detect_charset
+    HAS_CHARSET_NORMALIZER = True
+except ImportError:
+    HAS_CHARSET_NORMALIZER = False
+
+# Byte order marks, longest first (the UTF-32 LE BOM starts with the UTF-16 LE BOM)
+BOM_ENCODINGS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
 
 class TextParser(IDocumentParser):
     """
     Text document parser for plain text and Markdown files.
 
     Handles various text encodings with automatic fallback.
+    Files are read once: the encoding is picked from a BOM, strict
+    decoding of a leading sample, or charset_normalizer when installed,
+    and large files are decoded incrementally in chunks.
     """
 
     PARSER_NAME = "text"
+    PARSER_VERSION = "2"
     SUPPORTED_FORMATS = ['.txt', '.md']
 
     # Common encodings to try in order
     ENCODING_PRIORITY = ['utf-8', 'gbk', 'gb2312', 'latin-1', 'cp1252']
 
+    # Single-byte encodings accept any input, so they are only a last resort
+    SINGLE_BYTE_ENCODINGS = {'latin-1', 'cp1252'}
+
+    # Bytes inspected to pick an encoding; larger files are decoded in chunks
+    SAMPLE_SIZE = 64 * 1024
+    CHUNK_SIZE = 1024 * 1024
+
     def __init__(self, **kwargs):
         """
         Initialize text parser.
@@ -59,19 +86,40 @@ class TextParser(IDocumentParser):
         if ext.lower() not in self.SUPPORTED_FORMATS:
             raise UnsupportedFormatError(f"Text parser only supports .txt and .md, got: {ext}")
 
-        content = self._read_file(file_path)
+        with open(file_path, 'rb') as f:
+            return self._build_document(f, file_path)
 
-        # Detect file type
-        file_type = "markdown" if ext.lower() == '.md' else "text"
+    def parse_stream(self, stream: BinaryIO, file_name: str = "") -> ParsedDocument:
+        """
+        Parse text from a binary stream.
+
+        Args:
+            stream: Binary stream of the text file
+            file_name: Original file name
+
+        Returns:
+            ParsedDocument object
+        """
+        return self._build_document(stream, file_name)
+
+    def _build_document(self, stream: BinaryIO, file_path: str) -> ParsedDocument:
+        """Decode a stream once and use the same result for content and metadata."""
+        try:
+            content, encoding = self._decode_stream(stream)
+        except (OSError, LookupError) as e:
+            raise ParseError(f"Failed to read text file {file_path}: {e}")
+
+        _, ext = os.path.splitext(file_path)
 
         return ParsedDocument(
             content=content,
             file_path=file_path,
-            file_type=file_type,
+            file_type="markdown" if ext.lower() == '.md' else "text",
             metadata={
-                "encoding": self._detect_encoding(file_path),
+                "encoding": encoding,
                 "lines": len(content.splitlines())
-            }
+            },
+            encoding=encoding
         )
 
     def validate_file(self, file_path: str) -> bool:
@@ -93,35 +141,80 @@ class TextParser(IDocumentParser):
         Returns:
             Decoded text content
         """
-        for encoding in self.ENCODING_PRIORITY:
+        return self._decode_bytes(content)[0]
+
+    def _decode_bytes(self, content: bytes) -> tuple:
+        """Decode raw bytes, returning (text, encoding)."""
+        for encoding in self._candidate_encodings(content):
             try:
-                return content.decode(encoding)
+                return content.decode(encoding), encoding
             except (UnicodeDecodeError, UnicodeError):
                 continue
 
         # Last resort: ignore errors
-        return content.decode('utf-8', errors='ignore')
+        return content.decode('utf-8', errors='ignore'), "unknown"
 
-    def _read_file(self, file_path: str) -> str:
-        """Read file with automatic encoding detection."""
-        # First try UTF-8
-        for encoding in self.ENCODING_PRIORITY:
+    def _decode_stream(self, stream: BinaryIO) -> tuple:
+        """
+        Decode a binary stream, returning (text, encoding).
+
+        Small inputs are decoded in one go. For larger ones the encoding
+        is chosen from a leading sample and the rest is decoded in chunks;
+        the stream is only rewound if a candidate fails past the sample.
+        """
+        sample = stream.read(self.SAMPLE_SIZE)
+        if len(sample) < self.SAMPLE_SIZE:
+            return self._decode_bytes(sample)
+
+        start = stream.tell() - len(sample)
+        for encoding in self._candidate_encodings(sample):
+            if not self._decodes_sample(sample, encoding):
+                continue
             try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    return f.read()
+                return self._decode_chunks(sample, stream, encoding), encoding
             except (UnicodeDecodeError, UnicodeError):
-                continue
+                stream.seek(start)
+                sample = stream.read(self.SAMPLE_SIZE)
+
+        stream.seek(start)
+        return stream.read().decode('utf-8', errors='ignore'), "unknown"
+
+    def _decode_chunks(self, sample: bytes, stream: BinaryIO, encoding: str) -> str:
+        """Incrementally decode the sample followed by the rest of the stream."""
+        decoder = codecs.getincrementaldecoder(encoding)()
+        parts = [decoder.decode(sample)]
+        while True:
+            chunk = stream.read(self.CHUNK_SIZE)
+            if not chunk:
+                break
+            parts.append(decoder.decode(chunk))
+        parts.append(decoder.decode(b"", final=True))
+        return "".join(parts)
+
+    def _decodes_sample(self, sample: bytes, encoding: str) -> bool:
+        """Check a leading sample, tolerating a multi-byte sequence cut at its end."""
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return True
+        except (UnicodeDecodeError, UnicodeError):
+            return False
 
-        raise ParseError(f"Unable to decode file with any supported encoding: {file_path}")
+    def _candidate_encodings(self, sample: bytes) -> Iterator[str]:
+        """Yield encodings to try, most likely first."""
+        for bom, encoding in BOM_ENCODINGS:
+            if sample.startswith(bom):
+                yield encoding
+                return
 
-    def _detect_encoding(self, file_path: str) -> str:
-        """Detect the encoding of a file."""
         for encoding in self.ENCODING_PRIORITY:
-            try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    f.read()
-                return encoding
-            except (UnicodeDecodeError, UnicodeError):
-                continue
+            if encoding not in self.SINGLE_BYTE_ENCODINGS:
+                yield encoding
+
+        if HAS_CHARSET_NORMALIZER:
+            best = detect_charset(sample).best()
+            if best is not None:
+                yield best.encoding
 
-        return "unknown"
+        for encoding in self.ENCODING_PRIORITY:
+            if encoding in self.SINGLE_BYTE_ENCODINGS:
+                yield encoding
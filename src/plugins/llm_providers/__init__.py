@@ -1,23 +1,31 @@
 """
 LLM Providers Package / LLM提供商插件包
 
-Plugin implementations for various LLM services.
+Plugin implementations for various LLM services. Providers (and their
+SDKs) are imported only when selected.
 """
 
-from .deepseek import DeepSeekProvider
-from .openai import OpenAIProvider
-from .anthropic import AnthropicProvider
-from .local_embedding import LocalEmbeddingProvider
+from src.core.plugin_registry import PluginRegistry, lazy_exports
 
-__all__ = ['DeepSeekProvider', 'OpenAIProvider', 'AnthropicProvider', 'LocalEmbeddingProvider']
+__all__ = ['DeepSeekProvider', 'OpenAIProvider', 'AnthropicProvider', 'LocalEmbeddingProvider',
+           'ReplayProvider']
 
 # Provider registry for dynamic loading
-PROVIDER_REGISTRY = {
-    'deepseek': DeepSeekProvider,
-    'openai': OpenAIProvider,
-    'anthropic': AnthropicProvider,
-    'local_embedding': LocalEmbeddingProvider,
-}
+PROVIDER_REGISTRY = PluginRegistry({
+    'deepseek': '.deepseek:DeepSeekProvider',
+    'openai': '.openai:OpenAIProvider',
+    'anthropic': '.anthropic:AnthropicProvider',
+    'local_embedding': '.local_embedding:LocalEmbeddingProvider',
+    'replay': '.replay:ReplayProvider',
+}, package=__name__, entry_point_group='talentos.llm_providers')
+
+__getattr__ = lazy_exports(__name__, PROVIDER_REGISTRY, {
+    'DeepSeekProvider': 'deepseek',
+    'OpenAIProvider': 'openai',
+    'AnthropicProvider': 'anthropic',
+    'LocalEmbeddingProvider': 'local_embedding',
+    'ReplayProvider': 'replay',
+})
 
 
 def get_provider(provider_name: str, **kwargs):
@@ -25,7 +33,7 @@ def get_provider(provider_name: str, **kwargs):
     Factory function to get a provider instance.
 
     Args:
-        provider_name: Name of the provider (deepseek, openai, anthropic)
+        provider_name: Name of the provider (deepseek, openai, anthropic, replay)
         **kwargs: Configuration parameters
 
     Returns:
@@ -6,7 +6,7 @@ LLM provider implementation for Claude API.
 
 import os
 import time
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 try:
     from anthropic import Anthropic, APIError, RateLimitError, AuthenticationError
@@ -14,7 +14,7 @@ try:
 except ImportError:
     HAS_ANTHROPIC = False
 
-from src.interfaces.illm_provider import ILLMProvider, LLMResponse
+from src.interfaces.illm_provider import ILLMProvider, LLMResponse, CACHE_PREFIX_KEY
 from src.core.config import get_config, LLMProviderConfig
 from src.core.exceptions import (
     LLMAuthenticationError,
@@ -45,6 +45,10 @@ class AnthropicProvider(ILLMProvider):
         "claude-haiku-3-20250514": "haiku-3"
     }
 
+    # Marks the end of a cacheable prompt prefix (at most 4 per request;
+    # prefixes below the model's minimum length are simply not cached)
+    CACHE_CONTROL = {"type": "ephemeral"}
+
     def __init__(self, config: LLMProviderConfig = None, api_key: str = None,
                  base_url: str = None, **kwargs):
         """
@@ -149,23 +153,15 @@ class AnthropicProvider(ILLMProvider):
         start_time = time.time()
         tokens_used = 0
 
-        # Convert messages format (Anthropic uses different format)
-        # Anthropic expects: [{"role": "user", "content": "..."}]
-        # System messages should be separate
-        system_message = None
-        user_messages = []
-        for msg in messages:
-            if msg.get("role") == "system":
-                system_message = msg.get("content")
-            else:
-                user_messages.append(msg)
+        system_blocks, user_messages = self._convert_messages(messages)
+        if system_blocks:
+            kwargs["system"] = system_blocks
 
         try:
             # Claude API call
             response = self._client.messages.create(
                 model=self.MODEL_NAME_MAP.get(model, model),
                 messages=user_messages,
-                system=system_message,
                 temperature=temperature,
                 max_tokens=max_tokens,
                 **kwargs
@@ -173,14 +169,21 @@ class AnthropicProvider(ILLMProvider):
 
             latency_ms = (time.time() - start_time) * 1000
             content = response.content[0].text
-            tokens_used = response.usage.input_tokens + response.usage.output_tokens
+            usage = response.usage
+            # input_tokens excludes the tokens written to / read from the cache
+            cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+            cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+            tokens_used = usage.input_tokens + cache_read + cache_write + usage.output_tokens
 
             return LLMResponse(
                 content=content,
                 model=model,
                 tokens_used=tokens_used,
                 latency_ms=latency_ms,
-                raw_response=response
+                raw_response=response,
+                cached_tokens=cache_read,
+                prompt_tokens=tokens_used - usage.output_tokens,
+                completion_tokens=usage.output_tokens
             )
 
         except AuthenticationError as e:
@@ -192,7 +195,7 @@ class AnthropicProvider(ILLMProvider):
                 retry_after=retry_after
             )
         except APIError as e:
-            raise LLMAPIError(f"Anthropic API error: {e}")
+            raise LLMAPIError(f"Anthropic API error: {e}", status_code=getattr(e, "status_code", None))
         except Exception as e:
             raise LLMAPIError(f"Unexpected error calling Anthropic: {e}")
 
@@ -206,6 +209,9 @@ class AnthropicProvider(ILLMProvider):
     ):
         """
         Send a streaming chat completion request to Anthropic.
+
+        Yields text chunks; the generator's return value is an LLMResponse
+        with the content and the usage of the final message.
         """
         if not self.is_available():
             raise LLMAuthenticationError("Anthropic API key not configured.")
@@ -217,29 +223,73 @@ class AnthropicProvider(ILLMProvider):
             else:
                 model = "claude-sonnet-4-20250514"
 
-        # Convert messages format
-        system_message = None
-        user_messages = []
-        for msg in messages:
-            if msg.get("role") == "system":
-                system_message = msg.get("content")
-            else:
-                user_messages.append(msg)
+        system_blocks, user_messages = self._convert_messages(messages)
+        if system_blocks:
+            kwargs["system"] = system_blocks
 
         try:
+            start_time = time.time()
             with self._client.messages.stream(
                 model=self.MODEL_NAME_MAP.get(model, model),
                 messages=user_messages,
-                system=system_message,
                 temperature=temperature,
                 max_tokens=max_tokens,
                 **kwargs
             ) as stream:
+                content_parts = []
                 for text in stream.text_stream:
+                    content_parts.append(text)
                     yield text
+                usage = stream.get_final_message().usage
+
+            cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+            cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+            prompt_tokens = usage.input_tokens + cache_read + cache_write
+            return LLMResponse(
+                content="".join(content_parts),
+                model=model,
+                tokens_used=prompt_tokens + usage.output_tokens,
+                latency_ms=(time.time() - start_time) * 1000,
+                cached_tokens=cache_read,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=usage.output_tokens
+            )
 
         except Exception as e:
-            raise LLMAPIError(f"Anthropic API error: {e}")
+            raise LLMAPIError(f"Anthropic API error: {e}", status_code=getattr(e, "status_code", None))
+
+    def _convert_messages(self, messages: list) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Convert OpenAI-style messages to Anthropic system blocks and messages.
+
+        System messages become text blocks with a cache breakpoint after the
+        last one, so the static instructions are cached across calls. A
+        message carrying CACHE_PREFIX_KEY is split into two text blocks with
+        a breakpoint after the shared prefix (e.g. the JD in a batch).
+
+        Returns:
+            (system_blocks, messages)
+        """
+        system_blocks = []
+        converted = []
+        for msg in messages:
+            content = msg.get("content")
+            if msg.get("role") == "system":
+                system_blocks.append({"type": "text", "text": content})
+                continue
+
+            prefix = msg.get(CACHE_PREFIX_KEY)
+            if prefix and isinstance(content, str) and content.startswith(prefix):
+                blocks = [{"type": "text", "text": prefix, "cache_control": self.CACHE_CONTROL}]
+                if content[len(prefix):]:
+                    blocks.append({"type": "text", "text": content[len(prefix):]})
+                converted.append({"role": msg["role"], "content": blocks})
+            else:
+                converted.append({"role": msg["role"], "content": content})
+
+        if system_blocks:
+            system_blocks[-1]["cache_control"] = self.CACHE_CONTROL
+        return system_blocks, converted
 
     def get_model_info(self, model: str) -> Dict:
         """Get configuration info for a specific model."""
@@ -10,7 +10,7 @@ from typing import Dict, Optional, Any
 from openai import OpenAI, APIError, RateLimitError, AuthenticationError
 import httpx
 
-from src.interfaces.illm_provider import ILLMProvider, LLMResponse
+from src.interfaces.illm_provider import ILLMProvider, LLMResponse, ReasoningChunk, strip_cache_hints
 from src.core.config import get_config, LLMProviderConfig
 from src.core.exceptions import (
     LLMAuthenticationError,
@@ -102,6 +102,10 @@ class DeepSeekProvider(ILLMProvider):
     def supported_models(self) -> list:
         return self.SUPPORTED_MODELS
 
+    @property
+    def supports_json_mode(self) -> bool:
+        return True
+
     def chat(
         self,
         messages: list,
@@ -148,7 +152,7 @@ class DeepSeekProvider(ILLMProvider):
         try:
             response = self._client.chat.completions.create(
                 model=model,
-                messages=messages,
+                messages=strip_cache_hints(messages),
                 temperature=temperature,
                 max_tokens=max_tokens,
                 stream=False,
@@ -164,7 +168,10 @@ class DeepSeekProvider(ILLMProvider):
                 model=model,
                 tokens_used=tokens_used,
                 latency_ms=latency_ms,
-                raw_response=response
+                raw_response=response,
+                cached_tokens=self._cached_tokens(response.usage),
+                prompt_tokens=response.usage.prompt_tokens if response.usage else 0,
+                completion_tokens=response.usage.completion_tokens if response.usage else 0
             )
 
         except AuthenticationError as e:
@@ -176,7 +183,7 @@ class DeepSeekProvider(ILLMProvider):
                 retry_after=retry_after
             )
         except APIError as e:
-            raise LLMAPIError(f"DeepSeek API error: {e}")
+            raise LLMAPIError(f"DeepSeek API error: {e}", status_code=getattr(e, "status_code", None))
         except Exception as e:
             raise LLMAPIError(f"Unexpected error calling DeepSeek: {e}")
 
@@ -190,6 +197,10 @@ class DeepSeekProvider(ILLMProvider):
     ):
         """
         Send a streaming chat completion request to DeepSeek.
+
+        Yields text chunks; reasoning (deepseek-reasoner) comes first as a
+        blockquote of ReasoningChunk. The generator's return value is an
+        LLMResponse with the answer content and the usage reported at the end.
         """
         if not self.is_available():
             raise LLMAuthenticationError(
@@ -210,10 +221,14 @@ class DeepSeekProvider(ILLMProvider):
             if model_cfg:
                 max_tokens = model_cfg.get("max_tokens", max_tokens)
 
+        # Ask for token usage in the final chunk
+        kwargs.setdefault("stream_options", {"include_usage": True})
+
         try:
+            start_time = time.time()
             stream = self._client.chat.completions.create(
                 model=model,
-                messages=messages,
+                messages=strip_cache_hints(messages),
                 temperature=temperature,
                 max_tokens=max_tokens,
                 stream=True,
@@ -222,29 +237,35 @@ class DeepSeekProvider(ILLMProvider):
 
             # Track if we are in reasoning mode
             in_reasoning = False
+            content_parts = []
+            usage = None
             
             for chunk in stream:
+                usage = getattr(chunk, "usage", None) or usage
                 if chunk.choices:
                     delta = chunk.choices[0].delta
                     
                     # Handle reasoning content (DeepSeek R1/V3)
                     if hasattr(delta, 'reasoning_content') and delta.reasoning_content:
                         if not in_reasoning:
-                            yield "> **Thinking Process:**\n> "
+                            yield ReasoningChunk("> **Thinking Process:**\n> ")
                             in_reasoning = True
                         
                         # Replace newlines with newline + > for blockquote continuity
                         content = delta.reasoning_content.replace("\n", "\n> ")
-                        yield content
+                        yield ReasoningChunk(content)
                         
                     elif hasattr(delta, 'content') and delta.content:
                         # If we were in reasoning mode and now getting content, close the blockquote
                         if in_reasoning:
-                            yield "\n\n---\n\n"
+                            yield ReasoningChunk("\n\n---\n\n")
                             in_reasoning = False
                             
+                        content_parts.append(delta.content)
                         yield delta.content
 
+            return self._stream_response(model, content_parts, usage, start_time)
+
         except AuthenticationError as e:
             raise LLMAuthenticationError(f"DeepSeek authentication failed: {e}")
         except RateLimitError as e:
@@ -254,10 +275,29 @@ class DeepSeekProvider(ILLMProvider):
                 retry_after=retry_after
             )
         except APIError as e:
-            raise LLMAPIError(f"DeepSeek API error: {e}")
+            raise LLMAPIError(f"DeepSeek API error: {e}", status_code=getattr(e, "status_code", None))
         except Exception as e:
             raise LLMAPIError(f"Unexpected error calling DeepSeek: {e}")
 
+    def _stream_response(self, model: str, content_parts: list, usage, start_time: float) -> LLMResponse:
+        """Summary of a finished stream (usage is None if the API sent none)."""
+        return LLMResponse(
+            content="".join(content_parts),
+            model=model,
+            tokens_used=getattr(usage, "total_tokens", 0) or 0,
+            latency_ms=(time.time() - start_time) * 1000,
+            cached_tokens=self._cached_tokens(usage),
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+            reasoning_tokens=getattr(getattr(usage, "completion_tokens_details", None), "reasoning_tokens", 0) or 0
+        )
+
+    def _cached_tokens(self, usage) -> int:
+        """Prompt tokens served from DeepSeek's automatic context cache."""
+        if usage is None:
+            return 0
+        return getattr(usage, "prompt_cache_hit_tokens", 0) or 0
+
     def get_model_info(self, model: str) -> Dict:
         """Get configuration info for a specific model."""
         if not self._config:
@@ -294,16 +334,10 @@ class DeepSeekProvider(ILLMProvider):
     def embed(self, text: str) -> list[float]:
         """
         DeepSeek currently does not provide an embedding API.
-        This method will raise an error.
+        This method will raise an error (supports_embeddings is False, so
+        the engine uses the local embedding model instead).
         """
-        # raise NotImplementedError("DeepSeek does not support embeddings. Please use OpenAI provider for RAG features.")
-        # For MVP/Testing: If forced to use DeepSeek, return a mock embedding to unblock flow
-        # In production, this MUST be replaced by a real embedding service (OpenAI/Cohere/HuggingFace)
-        import hashlib
-        import numpy as np
-        hash_val = int(hashlib.md5(text.encode()).hexdigest(), 16)
-        np.random.seed(hash_val % 2**32)
-        return np.random.rand(1536).tolist()
+        raise NotImplementedError("DeepSeek does not support embeddings. Please use OpenAI provider for RAG features.")
 
     def is_available(self) -> bool:
         """Check if provider is properly configured."""
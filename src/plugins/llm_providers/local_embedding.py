@@ -1,49 +1,268 @@
 """
 Local Embedding Provider / 本地嵌入模型提供商
 
-Uses sentence-transformers to run embedding models locally.
-Optimized for China usage (using mirror for downloads).
+Runs embedding models locally, with two backends:
+- onnx: an exported model in a local directory, run by ONNX Runtime
+  (int8-quantized by default) with a fixed thread count. No network.
+- sentence_transformers: the model from a local directory or the Hub
+  (using a mirror for downloads, optimized for China usage).
+
+The model is loaded on first use (or by warm_up() in the background),
+never at construction.
 """
 
+import json
 import os
-from typing import List
+import sys
+import threading
+from importlib.util import find_spec
+from typing import Dict, List, Optional
 from src.interfaces.illm_provider import ILLMProvider, LLMResponse
 from src.core.exceptions import LLMAPIError
 
-# Set HF mirror for China
-os.environ["HF_ENDPOINT"] = "https://hf-mirror.com"
+# HF mirror for China (applied when the model is loaded, unless already set)
+HF_MIRROR = "https://hf-mirror.com"
+
+ONNX_MODEL = "model.onnx"
+ONNX_QUANTIZED_MODEL = "model_quantized.onnx"
+
+
+def _importable(name: str) -> bool:
+    """Whether a module can be imported, without importing it."""
+    try:
+        return find_spec(name) is not None
+    except ValueError:  # Already imported, without a spec
+        return sys.modules.get(name) is not None
+
+
+def _find_file(model_dir: str, name: str) -> Optional[str]:
+    """Look for name in model_dir or its onnx/ subdirectory (Hub layout)."""
+    for directory in (model_dir, os.path.join(model_dir, "onnx")):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _onnx_model_path(model_dir: str, quantized: bool) -> str:
+    """
+    Pick the ONNX file to run.
+
+    With quantized, model_quantized.onnx is preferred; if only model.onnx
+    exists, int8 weights are created from it once (dynamic quantization)
+    and saved next to it.
+    """
+    full = _find_file(model_dir, ONNX_MODEL)
+    if quantized:
+        path = _find_file(model_dir, ONNX_QUANTIZED_MODEL)
+        if path:
+            return path
+        if full:
+            target = os.path.join(os.path.dirname(full), ONNX_QUANTIZED_MODEL)
+            try:
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+                print(f"Quantizing {full} to int8...")
+                quantize_dynamic(full, target, weight_type=QuantType.QInt8)
+                return target
+            except Exception as e:
+                print(f"Quantization failed, using full-precision model: {e}")
+    if full:
+        return full
+    raise FileNotFoundError(f"No {ONNX_MODEL} found in {model_dir}")
+
+
+def _pooling_mode(model_dir: str) -> str:
+    """Pooling from a sentence-transformers export (1_Pooling/config.json); CLS otherwise."""
+    path = os.path.join(model_dir, "1_Pooling", "config.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if json.load(f).get("pooling_mode_mean_tokens"):
+                return "mean"
+    except (OSError, ValueError):
+        pass
+    return "cls"
+
+
+class _OnnxEncoder:
+    """Tokenizes with `tokenizers` and runs the model with ONNX Runtime on CPU."""
+
+    def __init__(self, model_dir: str, quantized: bool = True, num_threads: int = 0,
+                 max_seq_length: int = 512):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        tokenizer_path = _find_file(model_dir, "tokenizer.json")
+        if not tokenizer_path:
+            raise FileNotFoundError(f"No tokenizer.json found in {model_dir}")
+        self._tokenizer = Tokenizer.from_file(tokenizer_path)
+        self._tokenizer.enable_truncation(max_length=max_seq_length)
+        if self._tokenizer.padding is None:
+            self._tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        if num_threads > 0:
+            options.intra_op_num_threads = num_threads
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.model_path = _onnx_model_path(model_dir, quantized)
+        self._session = ort.InferenceSession(
+            self.model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self._session.get_inputs()}
+        self._pooling = _pooling_mode(model_dir)
+
+    def encode(self, texts: List[str], batch_size: int):
+        import numpy as np
+
+        # Batch texts of similar length together to minimize padding
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors = [None] * len(texts)
+        for start in range(0, len(order), batch_size):
+            indices = order[start:start + batch_size]
+            for i, vector in zip(indices, self._encode_batch([texts[i] for i in indices])):
+                vectors[i] = vector
+        return np.stack(vectors)
+
+    def _encode_batch(self, texts: List[str]):
+        import numpy as np
+
+        encodings = self._tokenizer.encode_batch(texts)
+        mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": mask,
+        }
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        hidden = np.asarray(self._session.run(None, feeds)[0], dtype=np.float32)
+        if hidden.ndim == 3:
+            if self._pooling == "mean":
+                weights = mask[:, :, None].astype(np.float32)
+                hidden = (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+            else:
+                hidden = hidden[:, 0]
+        norms = np.linalg.norm(hidden, axis=1, keepdims=True)
+        return hidden / np.clip(norms, 1e-12, None)
+
+
+class _SentenceTransformerEncoder:
+    """Runs the model with sentence-transformers (PyTorch)."""
+
+    def __init__(self, model_path: str, num_threads: int = 0, max_seq_length: int = 512):
+        from sentence_transformers import SentenceTransformer
+
+        if num_threads > 0:
+            import torch
+            torch.set_num_threads(num_threads)
+        self._model = SentenceTransformer(model_path)
+        if getattr(self._model, "max_seq_length", None):
+            self._model.max_seq_length = min(self._model.max_seq_length, max_seq_length)
+
+    def encode(self, texts: List[str], batch_size: int):
+        return self._model.encode(texts, batch_size=batch_size, normalize_embeddings=True)
+
 
 class LocalEmbeddingProvider(ILLMProvider):
     """
-    Local embedding provider using SentenceTransformers.
+    Local embedding provider (ONNX Runtime or SentenceTransformers).
     Wrapper to fit ILLMProvider interface, though only embed() is implemented.
     """
-    
+
     PROVIDER_NAME = "local_embedding"
     # SOTA small model for Chinese, works well for English too
-    DEFAULT_MODEL = "BAAI/bge-small-zh-v1.5" 
+    DEFAULT_MODEL = "BAAI/bge-small-zh-v1.5"
 
-    def __init__(self, model_name: str = None, **kwargs):
+    def __init__(self, model_name: str = None, embedding_config=None, **kwargs):
         """
-        Initialize local embedding model.
-        
+        Initialize local embedding provider (the model is not loaded yet).
+
         Args:
-            model_name: HuggingFace model ID
+            model_name: HuggingFace model ID (overrides the configured one)
+            embedding_config: EmbeddingConfig (defaults to the app config)
         """
-        self.model_name = model_name or self.DEFAULT_MODEL
-        self._model = None
-        self._load_model()
+        if embedding_config is None:
+            from src.core.config import get_config
+            embedding_config = get_config().embedding
+        self._config = embedding_config
+        self.model_name = model_name or embedding_config.model_name or self.DEFAULT_MODEL
+        self.backend: Optional[str] = None  # Resolved at load
+        self._encoder = None
+        self._load_error: Optional[str] = None
+        self._load_lock = threading.Lock()
+        self._warm_thread: Optional[threading.Thread] = None
+
+    def _resolve_backend(self) -> str:
+        """'auto' picks onnx when model_dir holds an ONNX model and its runtime is installed."""
+        backend = self._config.backend
+        if backend != "auto":
+            return backend
+        model_dir = self._config.model_dir
+        if (model_dir
+                and (_find_file(model_dir, ONNX_MODEL) or _find_file(model_dir, ONNX_QUANTIZED_MODEL))
+                and _importable("onnxruntime") and _importable("tokenizers")):
+            return "onnx"
+        return "sentence_transformers"
 
     def _load_model(self):
-        """Lazy load the model."""
-        try:
-            from sentence_transformers import SentenceTransformer
-            print(f"Loading local embedding model: {self.model_name}...")
-            self._model = SentenceTransformer(self.model_name)
-            print("Model loaded successfully.")
-        except Exception as e:
-            print(f"Failed to load local embedding model: {e}")
-            self._model = None
+        """Load the model once; concurrent callers wait for the same load."""
+        with self._load_lock:
+            if self._encoder is not None:
+                return
+            try:
+                backend = self._resolve_backend()
+                source = self._config.model_dir or self.model_name
+                print(f"Loading local embedding model: {source} ({backend})...")
+                if backend == "onnx":
+                    if not self._config.model_dir:
+                        raise ValueError("The onnx backend needs embedding.model_dir")
+                    self._encoder = _OnnxEncoder(
+                        self._config.model_dir,
+                        quantized=self._config.quantized,
+                        num_threads=self._config.num_threads,
+                        max_seq_length=self._config.max_seq_length
+                    )
+                elif backend == "sentence_transformers":
+                    if not self._config.model_dir:
+                        os.environ.setdefault("HF_ENDPOINT", HF_MIRROR)
+                    self._encoder = _SentenceTransformerEncoder(
+                        source,
+                        num_threads=self._config.num_threads,
+                        max_seq_length=self._config.max_seq_length
+                    )
+                else:
+                    raise ValueError(f"Unknown embedding backend: {backend}")
+                self.backend = backend
+                self._load_error = None
+                print("Model loaded successfully.")
+            except Exception as e:
+                print(f"Failed to load local embedding model: {e}")
+                self._load_error = str(e)
+
+    def warm_up(self) -> Optional[threading.Thread]:
+        """
+        Start loading the model in a background thread.
+
+        Returns:
+            The loader thread, or None if the model is already loaded
+        """
+        if self._encoder is not None:
+            return None
+        with self._load_lock:
+            if self._warm_thread is None or not self._warm_thread.is_alive():
+                self._warm_thread = threading.Thread(
+                    target=self._load_model, name="embedding-warmup", daemon=True
+                )
+                self._warm_thread.start()
+            return self._warm_thread
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._encoder is not None
+
+    @property
+    def supports_embeddings(self) -> bool:
+        return True
 
     @property
     def provider_name(self) -> str:
@@ -53,6 +272,13 @@ class LocalEmbeddingProvider(ILLMProvider):
     def supported_models(self) -> list:
         return [self.model_name]
 
+    def get_model_info(self, model: str) -> Dict:
+        return {
+            "name": model or self.model_name,
+            "capabilities": ["embedding"],
+            "backend": self.backend or self._config.backend,
+        }
+
     def chat(self, messages: list, **kwargs) -> LLMResponse:
         raise NotImplementedError("LocalEmbeddingProvider only supports embedding, not chat.")
 
@@ -63,21 +289,30 @@ class LocalEmbeddingProvider(ILLMProvider):
         """
         Generate embedding for text.
         """
-        if not self._model:
-            # Try reloading
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for several texts, batch_size texts per forward pass.
+        """
+        if self._encoder is None:
+            # First use (or a failed load): load now, waiting for a warm-up in progress
             self._load_model()
-            if not self._model:
-                raise LLMAPIError("Local embedding model not loaded.")
+            if self._encoder is None:
+                raise LLMAPIError(f"Local embedding model not loaded: {self._load_error}")
+        if not texts:
+            return []
 
         try:
-            # sentence-transformers returns numpy array, convert to list
-            embedding = self._model.encode(text, normalize_embeddings=True)
-            return embedding.tolist()
+            # Encoders return a numpy array, convert to lists
+            embeddings = self._encoder.encode(list(texts), max(self._config.batch_size, 1))
+            return embeddings.tolist()
         except Exception as e:
             raise LLMAPIError(f"Embedding generation failed: {e}")
 
     def is_available(self) -> bool:
-        return self._model is not None
+        """True unless loading the model has failed (not loaded yet is fine)."""
+        return self._load_error is None
 
     def health_check(self) -> bool:
         try:
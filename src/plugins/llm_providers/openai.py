@@ -9,7 +9,7 @@ import time
 from typing import Dict, Optional, Any
 from openai import OpenAI, APIError, RateLimitError, AuthenticationError
 
-from src.interfaces.illm_provider import ILLMProvider, LLMResponse
+from src.interfaces.illm_provider import ILLMProvider, LLMResponse, strip_cache_hints
 from src.core.config import get_config, LLMProviderConfig
 from src.core.exceptions import (
     LLMAuthenticationError,
@@ -85,6 +85,14 @@ class OpenAIProvider(ILLMProvider):
     def supported_models(self) -> list:
         return self.SUPPORTED_MODELS
 
+    @property
+    def supports_json_mode(self) -> bool:
+        return True
+
+    @property
+    def supports_embeddings(self) -> bool:
+        return True
+
     def chat(
         self,
         messages: list,
@@ -118,7 +126,7 @@ class OpenAIProvider(ILLMProvider):
         try:
             response = self._client.chat.completions.create(
                 model=model,
-                messages=messages,
+                messages=strip_cache_hints(messages),
                 temperature=temperature,
                 max_tokens=max_tokens,
                 stream=False,
@@ -134,7 +142,10 @@ class OpenAIProvider(ILLMProvider):
                 model=model,
                 tokens_used=tokens_used,
                 latency_ms=latency_ms,
-                raw_response=response
+                raw_response=response,
+                cached_tokens=self._cached_tokens(response.usage),
+                prompt_tokens=response.usage.prompt_tokens if response.usage else 0,
+                completion_tokens=response.usage.completion_tokens if response.usage else 0
             )
 
         except AuthenticationError as e:
@@ -146,7 +157,7 @@ class OpenAIProvider(ILLMProvider):
                 retry_after=retry_after
             )
         except APIError as e:
-            raise LLMAPIError(f"OpenAI API error: {e}")
+            raise LLMAPIError(f"OpenAI API error: {e}", status_code=getattr(e, "status_code", None))
         except Exception as e:
             raise LLMAPIError(f"Unexpected error calling OpenAI: {e}")
 
@@ -160,6 +171,9 @@ class OpenAIProvider(ILLMProvider):
     ):
         """
         Send a streaming chat completion request to OpenAI.
+
+        Yields text chunks; the generator's return value is an LLMResponse
+        with the content and the usage reported at the end.
         """
         if not self.is_available():
             raise LLMAuthenticationError("OpenAI API key not configured.")
@@ -171,22 +185,45 @@ class OpenAIProvider(ILLMProvider):
             else:
                 model = "gpt-4o"
 
+        # Ask for token usage in the final chunk
+        kwargs.setdefault("stream_options", {"include_usage": True})
+
         try:
+            start_time = time.time()
             stream = self._client.chat.completions.create(
                 model=model,
-                messages=messages,
+                messages=strip_cache_hints(messages),
                 temperature=temperature,
                 max_tokens=max_tokens,
                 stream=True,
                 **kwargs
             )
 
+            content_parts = []
+            usage = None
             for chunk in stream:
+                usage = getattr(chunk, "usage", None) or usage
                 if chunk.choices and chunk.choices[0].delta.content:
+                    content_parts.append(chunk.choices[0].delta.content)
                     yield chunk.choices[0].delta.content
 
+            return LLMResponse(
+                content="".join(content_parts),
+                model=model,
+                tokens_used=getattr(usage, "total_tokens", 0) or 0,
+                latency_ms=(time.time() - start_time) * 1000,
+                cached_tokens=self._cached_tokens(usage),
+                prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+                completion_tokens=getattr(usage, "completion_tokens", 0) or 0
+            )
+
         except Exception as e:
-            raise LLMAPIError(f"OpenAI API error: {e}")
+            raise LLMAPIError(f"OpenAI API error: {e}", status_code=getattr(e, "status_code", None))
+
+    def _cached_tokens(self, usage) -> int:
+        """Prompt tokens served from OpenAI's automatic prompt cache."""
+        details = getattr(usage, "prompt_tokens_details", None) if usage else None
+        return getattr(details, "cached_tokens", 0) or 0
 
     def get_model_info(self, model: str) -> Dict:
         """Get configuration info for a specific model."""
@@ -236,6 +273,22 @@ class OpenAIProvider(ILLMProvider):
             # Wrap error
             raise LLMAPIError(f"Embedding failed: {e}")
 
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Generate embeddings for several texts in one request."""
+        if not texts:
+            return []
+        if not self.is_available():
+             raise LLMAuthenticationError("OpenAI API key not configured.")
+
+        try:
+            response = self._client.embeddings.create(
+                input=list(texts),
+                model="text-embedding-3-small"
+            )
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        except Exception as e:
+            raise LLMAPIError(f"Embedding failed: {e}")
+
     def is_available(self) -> bool:
         """Check if provider is properly configured."""
         return self._client is not None
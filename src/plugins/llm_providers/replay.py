@@ -0,0 +1,399 @@
+"""
+Replay Provider / 回放模型提供商
+
+Offline stand-in for a real LLM, for load tests and benchmarks. Requests
+are answered from recorded responses (JSONL) or, on a miss, with seeded
+synthetic responses shaped after the engine's own prompts (valid JSON
+for structured operations, a scored report otherwise). Latency, stream
+chunk cadence and error / 429 rates follow configurable distributions.
+
+The same seed and request sequence always give the same responses.
+"""
+
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Iterator, List, Optional
+
+from src.interfaces.illm_provider import (
+    ILLMProvider, LLMResponse, ReasoningChunk, strip_cache_hints
+)
+from src.core.config import LLMProviderConfig
+from src.core.exceptions import LLMAPIError, LLMRateLimitError
+
+DEFAULT_OPTIONS = {
+    "recordings": "",            # JSONL file of recorded responses
+    "on_miss": "synthetic",      # synthetic | error
+    "record_upstream": "",       # provider to call on a miss, appending its responses to recordings
+    "seed": 0,
+    "time_scale": 1.0,           # multiplies every simulated delay (0 = never sleep)
+    "latency_median_ms": 800.0,  # chat(): lognormal latency
+    "latency_sigma": 0.4,
+    "ttft_median_ms": 400.0,     # chat_stream(): lognormal time to first chunk
+    "ttft_sigma": 0.4,
+    "chunk_interval_ms": 25.0,   # mean gap between stream chunks (exponential)
+    "chunk_chars": 12,
+    "reasoning_chars": 0,        # synthetic reasoning streamed before the answer
+    "completion_chars": 1200,    # length of synthetic text responses
+    "error_rate": 0.0,           # share of requests failing with a 503
+    "rate_limit_rate": 0.0,      # share of requests failing with a 429
+    "retry_after": 1,
+    "embedding_dim": 384,
+}
+
+_BATCH_ID = re.compile(r"### RESUME (R\d+)")
+
+_WORDS = [
+    "候选人", "具备", "相关", "项目", "经验", "技能", "匹配", "岗位", "要求", "团队", "沟通",
+    "candidate", "experience", "skills", "project", "delivery", "ownership", "backend",
+    "cloud", "python", "java", "leadership", "stakeholders", "growth", "impact",
+]
+
+
+def request_key(messages: List[Dict]) -> str:
+    """Stable key of a request's messages (cache hints ignored)."""
+    payload = json.dumps(strip_cache_hints(messages), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ReplayProvider(ILLMProvider):
+    """
+    Deterministic mock/replay provider (no network, no API key).
+
+    Options come from the provider config's `options`:
+
+        llm_providers:
+          replay:
+            provider: "replay"
+            options:
+              recordings: "benchmarks/recordings.jsonl"
+              seed: 7
+              latency_median_ms: 600
+              error_rate: 0.01
+
+    Recording lines look like
+    {"key": request_key(messages), "content": "...", "chunks": [...],
+     "latency_ms": 812, "ttft_ms": 350, "prompt_tokens": 900, "completion_tokens": 300};
+    several lines with the same key are served in turn.
+    """
+
+    PROVIDER_NAME = "replay"
+    DEFAULT_MODEL = "replay"
+
+    def __init__(self, config: LLMProviderConfig = None, options: Dict = None,
+                 sleep: Callable[[float], None] = time.sleep, **kwargs):
+        """
+        Initialize replay provider.
+
+        Args:
+            config: LLMProviderConfig object (optional)
+            options: Options overriding config.options
+            sleep: Used for simulated delays
+        """
+        self._config = config
+        self.options = {**DEFAULT_OPTIONS, **(config.options if config else {}), **(options or {})}
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._calls: Dict[str, int] = defaultdict(int)
+        self._recordings: Dict[str, List[Dict]] = defaultdict(list)
+        self._upstream: Optional[ILLMProvider] = None
+        self._token_counter = None
+        self._load_recordings()
+
+    def _load_recordings(self):
+        path = self.options["recordings"]
+        if not path:
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._recordings[record["key"]].append(record)
+        except FileNotFoundError:
+            if not self.options["record_upstream"]:
+                raise LLMAPIError(f"Replay recordings not found: {path}")
+
+    @property
+    def provider_name(self) -> str:
+        return self.PROVIDER_NAME
+
+    @property
+    def supported_models(self) -> list:
+        if self._config and self._config.models:
+            return [m.name for m in self._config.models]
+        return [self.DEFAULT_MODEL]
+
+    @property
+    def supports_json_mode(self) -> bool:
+        return True
+
+    @property
+    def supports_embeddings(self) -> bool:
+        return True
+
+    def get_model_info(self, model: str) -> Dict:
+        if self._config:
+            for m in self._config.models:
+                if m.name == model:
+                    return {"name": m.name, "max_tokens": m.max_tokens, "temperature": m.temperature}
+        return {"name": model or self.DEFAULT_MODEL, "max_tokens": 16384, "temperature": 0.7}
+
+    def chat(self, messages: list, model: str = None, **kwargs) -> LLMResponse:
+        """Answer from the recordings, the upstream provider or synthetically."""
+        model = model or self._default_model()
+        key, rng = self._begin(messages)
+        record = self._recorded(key)
+        if record is None and self.options["record_upstream"]:
+            return self._record_chat(key, messages, model, **kwargs)
+        self._maybe_fail(rng)
+
+        if record is not None:
+            content = record["content"]
+            latency_ms = record.get("latency_ms") or self._lognormal(rng, "latency")
+        else:
+            content = self._synthetic(messages, rng, kwargs.get("response_format"))
+            latency_ms = self._lognormal(rng, "latency")
+        self._delay(latency_ms)
+        return self._response(messages, model, content, latency_ms, record)
+
+    def chat_stream(self, messages: list, model: str = None, **kwargs) -> Iterator[str]:
+        """
+        Stream a recorded or synthetic response with simulated cadence.
+
+        Yields text chunks (reasoning as ReasoningChunk); returns the
+        LLMResponse with usage when done.
+        """
+        model = model or self._default_model()
+        start_time = time.time()
+        key, rng = self._begin(messages)
+        record = self._recorded(key)
+        if record is None and self.options["record_upstream"]:
+            return (yield from self._record_stream(key, messages, model, **kwargs))
+        self._maybe_fail(rng)
+
+        if record is not None:
+            content = record["content"]
+            chunks = record.get("chunks") or self._split(content)
+            ttft_ms = record.get("ttft_ms") or self._lognormal(rng, "ttft")
+            reasoning = []
+        else:
+            content = self._synthetic(messages, rng, kwargs.get("response_format"))
+            chunks = self._split(content)
+            ttft_ms = self._lognormal(rng, "ttft")
+            reasoning_chars = int(self.options["reasoning_chars"])
+            reasoning = self._split(self._text(rng, reasoning_chars)) if reasoning_chars > 0 else []
+
+        self._delay(ttft_ms)
+        interval = float(self.options["chunk_interval_ms"])
+        for i, chunk in enumerate([ReasoningChunk(c) for c in reasoning] + list(chunks)):
+            if i:
+                self._delay(rng.expovariate(1 / interval) if interval > 0 else 0)
+            yield chunk
+
+        response = self._response(messages, model, content, (time.time() - start_time) * 1000, record)
+        if reasoning:
+            response.reasoning_tokens = self._count("".join(reasoning))
+            response.completion_tokens += response.reasoning_tokens
+            response.tokens_used += response.reasoning_tokens
+        return response
+
+    def embed(self, text: str) -> List[float]:
+        """Deterministic unit vector derived from the text."""
+        rng = random.Random(hashlib.sha256(text.encode("utf-8")).hexdigest())
+        vector = [rng.gauss(0, 1) for _ in range(int(self.options["embedding_dim"]))]
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def is_available(self) -> bool:
+        return True
+
+    def health_check(self) -> bool:
+        return True
+
+    # ------------------------------------------------------------------
+
+    def _default_model(self) -> str:
+        if self._config and self._config.default_model:
+            return self._config.default_model
+        return self.DEFAULT_MODEL
+
+    def _begin(self, messages: List[Dict]):
+        """Request key and the request's own RNG (seed, key and repeat count)."""
+        key = request_key(messages)
+        with self._lock:
+            n = self._calls[key]
+            self._calls[key] += 1
+        return key, random.Random(f"{self.options['seed']}:{key}:{n}")
+
+    def _recorded(self, key: str) -> Optional[Dict]:
+        """Next recording for key (cycling), or None; a miss may be an error."""
+        with self._lock:
+            records = self._recordings.get(key)
+            if records:
+                return records[(self._calls[key] - 1) % len(records)]
+        if self.options["on_miss"] == "error" and not self.options["record_upstream"]:
+            raise LLMAPIError(f"No recorded response for request {key[:12]}", status_code=404)
+        return None
+
+    def _maybe_fail(self, rng: random.Random):
+        roll = rng.random()
+        rate_limit_rate = float(self.options["rate_limit_rate"])
+        if roll < rate_limit_rate:
+            raise LLMRateLimitError("Replay: simulated rate limit", retry_after=self.options["retry_after"])
+        if roll < rate_limit_rate + float(self.options["error_rate"]):
+            raise LLMAPIError("Replay: simulated server error", status_code=503)
+
+    def _lognormal(self, rng: random.Random, name: str) -> float:
+        median = float(self.options[f"{name}_median_ms"])
+        return median * math.exp(float(self.options[f"{name}_sigma"]) * rng.gauss(0, 1))
+
+    def _delay(self, ms: float):
+        seconds = ms / 1000 * float(self.options["time_scale"])
+        if seconds > 0:
+            self._sleep(seconds)
+
+    def _split(self, text: str) -> List[str]:
+        size = max(int(self.options["chunk_chars"]), 1)
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    def _count(self, text: str) -> int:
+        if self._token_counter is None:
+            from src.core.prompt_budget import TokenCounter
+            self._token_counter = TokenCounter()
+        return self._token_counter.count(text)
+
+    def _response(self, messages: List[Dict], model: str, content: str, latency_ms: float,
+                  record: Optional[Dict]) -> LLMResponse:
+        record = record or {}
+        prompt_tokens = record.get("prompt_tokens") or self._count(
+            "\n".join(str(m.get("content", "")) for m in messages)
+        )
+        completion_tokens = record.get("completion_tokens") or self._count(content)
+        return LLMResponse(
+            content=content,
+            model=model,
+            tokens_used=prompt_tokens + completion_tokens,
+            latency_ms=latency_ms,
+            cached_tokens=record.get("cached_tokens", 0),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens
+        )
+
+    # Synthetic responses -------------------------------------------------
+
+    def _synthetic(self, messages: List[Dict], rng: random.Random, response_format=None) -> str:
+        """JSON valid for the engine's schemas in JSON mode, a scored report otherwise."""
+        if not response_format:
+            score = rng.randint(40, 95)
+            return f"## Match Score: {score}/100\n\n" + self._text(rng, int(self.options["completion_chars"]))
+
+        user_text = "\n".join(str(m.get("content", "")) for m in messages if m.get("role") == "user")
+        ids = _BATCH_ID.findall(user_text)
+        if ids:
+            return json.dumps({"results": [{"id": rid, **self._evaluation(rng)} for rid in ids]},
+                              ensure_ascii=False)
+        # One object satisfying both MatchEvaluation and ResumeFields (extra fields allowed)
+        return json.dumps({**self._evaluation(rng), **self._resume_fields(rng)}, ensure_ascii=False)
+
+    def _evaluation(self, rng: random.Random) -> Dict:
+        score = rng.randint(40, 95)
+        return {
+            "score": score,
+            "status": "Recommended" if score >= 75 else "Consider" if score >= 60 else "Not Recommended",
+            "dimensions": {
+                name: {"score": rng.randint(40, 100), "comment": self._text(rng, 40)}
+                for name in ("skills", "experience", "education")
+            },
+            "reason": self._text(rng, 120),
+            "strengths": [self._text(rng, 20) for _ in range(2)],
+            "missing": [self._text(rng, 20)],
+            "recommendation": self._text(rng, 60),
+        }
+
+    def _resume_fields(self, rng: random.Random) -> Dict:
+        n = rng.randint(100, 999)
+        return {
+            "name": f"候选人{n}",
+            "email": f"candidate{n}@example.com",
+            "phone": f"138{rng.randint(10000000, 99999999)}",
+            "education": [{"school": "示例大学", "degree": "本科", "major": "计算机科学", "year": "2018"}],
+            "experience": [{"company": f"示例科技{n}", "title": "后端工程师", "duration": "2019-2024",
+                            "key_achievements": [self._text(rng, 40)]}],
+            "skills": rng.sample(["Python", "Java", "Go", "SQL", "Kubernetes", "React", "Redis"], 3),
+            "years_of_experience": float(rng.randint(1, 12)),
+            "current_company": f"示例科技{n}",
+            "current_position": "后端工程师",
+        }
+
+    def _text(self, rng: random.Random, chars: int) -> str:
+        words = []
+        length = 0
+        while length < chars:
+            word = rng.choice(_WORDS)
+            words.append(word)
+            length += len(word) + 1
+        return " ".join(words)
+
+    # Recording -----------------------------------------------------------
+
+    def _get_upstream(self) -> ILLMProvider:
+        with self._lock:
+            if self._upstream is None:
+                from src.core.config import get_config
+                from src.plugins.llm_providers import get_provider
+                name = self.options["record_upstream"]
+                self._upstream = get_provider(name, config=get_config().get_llm_provider_config(name))
+            return self._upstream
+
+    def _record_chat(self, key: str, messages: List[Dict], model: str, **kwargs) -> LLMResponse:
+        response = self._get_upstream().chat(messages=messages, model=self._upstream_model(model), **kwargs)
+        self._append({
+            "key": key, "content": response.content, "latency_ms": response.latency_ms,
+            "prompt_tokens": response.prompt_tokens, "completion_tokens": response.completion_tokens,
+            "cached_tokens": response.cached_tokens,
+        })
+        return response
+
+    def _record_stream(self, key: str, messages: List[Dict], model: str, **kwargs):
+        start_time = time.time()
+        ttft_ms = None
+        chunks = []
+        stream = self._get_upstream().chat_stream(messages=messages, model=self._upstream_model(model), **kwargs)
+        while True:
+            try:
+                chunk = next(stream)
+            except StopIteration as stop:
+                response = stop.value
+                break
+            if ttft_ms is None:
+                ttft_ms = (time.time() - start_time) * 1000
+            chunks.append(str(chunk))
+            yield chunk
+
+        content = response.content if isinstance(response, LLMResponse) else "".join(chunks)
+        record = {"key": key, "content": content, "chunks": chunks, "ttft_ms": ttft_ms,
+                  "latency_ms": (time.time() - start_time) * 1000}
+        if isinstance(response, LLMResponse):
+            record.update(prompt_tokens=response.prompt_tokens, completion_tokens=response.completion_tokens,
+                          cached_tokens=response.cached_tokens)
+        self._append(record)
+        return response
+
+    def _upstream_model(self, model: str) -> Optional[str]:
+        """The replay model name means "the upstream provider's default"."""
+        return None if model in self.supported_models else model
+
+    def _append(self, record: Dict):
+        """Add a recording (served from now on) and append it to the recordings file."""
+        with self._lock:
+            self._recordings[record["key"]].append(record)
+            path = self.options["recordings"]
+            if path:
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
@@ -1,21 +1,26 @@
 """
 Storage Package / 存储插件包
 
-Plugin implementations for caching and persistence.
+Plugin implementations for caching and persistence. Backends (and their
+client libraries) are imported only when selected.
 """
 
-from .local_storage import LocalStorage
-from .memory_cache import MemoryCache
-from .supabase_storage import SupabaseStorage
+from src.core.plugin_registry import PluginRegistry, lazy_exports
 
 __all__ = ['LocalStorage', 'MemoryCache', 'SupabaseStorage']
 
 # Storage registry for dynamic loading
-STORAGE_REGISTRY = {
-    'local': LocalStorage,
-    'memory': MemoryCache,
-    'supabase': SupabaseStorage,
-}
+STORAGE_REGISTRY = PluginRegistry({
+    'local': '.local_storage:LocalStorage',
+    'memory': '.memory_cache:MemoryCache',
+    'supabase': '.supabase_storage:SupabaseStorage',
+}, package=__name__, entry_point_group='talentos.storage')
+
+__getattr__ = lazy_exports(__name__, STORAGE_REGISTRY, {
+    'LocalStorage': 'local',
+    'MemoryCache': 'memory',
+    'SupabaseStorage': 'supabase',
+})
 
 
 def get_storage(storage_name: str, **kwargs):
@@ -0,0 +1,80 @@
+"""
+Fixture builders for parser tests and benchmarks.
+
+Builds small PDF / DOCX documents in memory so no binary fixtures
+need to be checked in.
+"""
+
+import io
+
+
+def _escape_pdf_text(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_pdf(pages: list) -> bytes:
+    """
+    Build a minimal text-only PDF.
+
+    Args:
+        pages: List of pages, each a list of ASCII text lines
+
+    Returns:
+        Raw PDF bytes
+    """
+    page_ids = [4 + i * 2 for i in range(len(pages))]
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for page_id, lines in zip(page_ids, pages):
+        body = " ".join(f"({_escape_pdf_text(line)}) Tj T*" for line in lines)
+        stream = f"BT /F1 12 Tf 72 720 Td 14 TL {body} ET".encode("latin-1")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def build_docx(blocks: list) -> bytes:
+    """
+    Build a DOCX with python-docx.
+
+    Args:
+        blocks: List of paragraphs (str) and tables (list of row lists)
+
+    Returns:
+        Raw DOCX bytes
+    """
+    import docx
+
+    document = docx.Document()
+    for block in blocks:
+        if isinstance(block, str):
+            document.add_paragraph(block)
+        else:
+            table = document.add_table(rows=len(block), cols=len(block[0]))
+            for r, row in enumerate(block):
+                for c, value in enumerate(row):
+                    table.cell(r, c).text = value
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,114 @@
+import unittest
+from dataclasses import replace
+from unittest.mock import patch
+import json
+import os
+import re
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config import MatchBatchConfig
+from src.core.exceptions import LLMAPIError
+from src.interfaces.illm_provider import LLMResponse
+from src.plugins.storage.memory_cache import MemoryCache
+
+JD = "招聘高级Java工程师, 负责支付系统架构设计"
+RESUMES = [f"候选人{i}\n工作经历\n{i} 年 Java 开发经验" for i in range(5)]
+
+
+def batch_reply(messages, **kwargs):
+    """Fake model: one result per "### RESUME <id>" in the request."""
+    ids = re.findall(r"### RESUME (R\d+)", messages[1]["content"])
+    items = [{"id": rid, "score": 60 + n, "status": "Unsuitable"} for n, rid in enumerate(ids)]
+    return LLMResponse(content=json.dumps(items), model="test", tokens_used=10, latency_ms=1.0)
+
+
+class TestBatchMatch(unittest.TestCase):
+    def setUp(self):
+        from src.core.engine import TalentOSEngine
+
+        self.engine = TalentOSEngine()
+        self.engine._storage = None
+        self.use_batch_config(max_batch_size=2)
+
+    def use_batch_config(self, **kwargs):
+        # Copy so the shared global config is left untouched
+        self.engine._config = replace(self.engine._config, match_batch=MatchBatchConfig(**kwargs))
+
+    def test_packs_resumes_per_request(self):
+        with patch.object(self.engine, '_call_llm_with_retry', side_effect=batch_reply) as mock_call:
+            results = self.engine.evaluate_match_batch(RESUMES, JD, use_cache=False)
+
+        # 5 resumes, at most 2 per request
+        self.assertEqual(mock_call.call_count, 3)
+        self.assertEqual([r["score"] for r in results], [60, 61, 60, 61, 60])
+        self.assertTrue(all("id" not in r for r in results))
+        # The JD is sent once per request, ahead of the resumes
+        prompt = mock_call.call_args_list[0].kwargs["messages"][1]["content"]
+        self.assertEqual(prompt.count(JD), 1)
+        self.assertLess(prompt.index(JD), prompt.index("### RESUME R1"))
+
+    def test_batch_size_follows_output_limit(self):
+        self.use_batch_config(max_batch_size=10, output_tokens_per_resume=100000)
+        summaries = {i: text for i, text in enumerate(RESUMES)}
+        self.assertEqual(self.engine._plan_match_batches(summaries, "system"), [[0], [1], [2], [3], [4]])
+
+        self.use_batch_config(max_batch_size=10, output_tokens_per_resume=1)
+        self.assertEqual(self.engine._plan_match_batches(summaries, "system"), [[0, 1, 2, 3, 4]])
+
+    def test_falls_back_to_single_calls(self):
+        def partial_reply(messages, **kwargs):
+            if "### RESUME" not in messages[1]["content"]:
+                return LLMResponse(content='{"score": 90}', model="test", tokens_used=10, latency_ms=1.0)
+            # Only the first resume of each batch comes back
+            return LLMResponse(content='```json\n[{"id": "R1", "score": 70}]\n```', model="test",
+                               tokens_used=10, latency_ms=1.0)
+
+        with patch.object(self.engine, '_call_llm_with_retry', side_effect=partial_reply) as mock_call:
+            results = self.engine.evaluate_match_batch(RESUMES[:2], JD, use_cache=False)
+
+        self.assertEqual([r["score"] for r in results], [70, 90])
+        self.assertEqual(mock_call.call_count, 2)
+
+    def test_provider_error_reported_per_resume(self):
+        with patch.object(self.engine, '_call_llm_with_retry', side_effect=LLMAPIError("down")):
+            results = self.engine.evaluate_match_batch(RESUMES[:2], JD, use_cache=False)
+        self.assertEqual([r["status"] for r in results], ["Error", "Error"])
+
+    def test_results_cached_per_resume(self):
+        self.engine._storage = MemoryCache()
+        with patch.object(self.engine, '_call_llm_with_retry', side_effect=batch_reply) as mock_call:
+            self.engine.evaluate_match_batch(RESUMES[:2], JD)
+            results = self.engine.evaluate_match_batch(RESUMES[:3], JD)
+
+        # Second call only sends the new resume
+        self.assertEqual(mock_call.call_count, 2)
+        self.assertEqual([r["score"] for r in results[:2]], [60, 61])
+
+    def test_single_match_cached_with_storage(self):
+        self.engine._storage = MemoryCache()
+        reply = LLMResponse(content='{"score": 88}', model="test", tokens_used=10, latency_ms=1.0)
+        with patch.object(self.engine, '_call_llm_with_retry', return_value=reply) as mock_call:
+            first = self.engine.evaluate_match(RESUMES[0], JD)
+            second = self.engine.evaluate_match(RESUMES[0], JD)
+
+        self.assertEqual((first["score"], second["score"]), (88, 88))
+        self.assertEqual(mock_call.call_count, 1)
+
+    def test_fallback_saves_with_storage(self):
+        self.engine._storage = MemoryCache()
+
+        def no_batch_results(messages, **kwargs):
+            if "### RESUME" in messages[1]["content"]:
+                return LLMResponse(content="not json", model="test", tokens_used=10, latency_ms=1.0)
+            return LLMResponse(content='{"score": 75}', model="test", tokens_used=10, latency_ms=1.0)
+
+        with patch.object(self.engine, '_call_llm_with_retry', side_effect=no_batch_results):
+            results = self.engine.evaluate_match_batch(RESUMES[:2], JD)
+        self.assertEqual([r["score"] for r in results], [75, 75])
+
+
+if __name__ == '__main__':
+    unittest.main()
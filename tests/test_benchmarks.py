@@ -0,0 +1,60 @@
+import unittest
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks import api_load, cache, parsing, vector_search
+from benchmarks.common import build_documents, load_jds, load_resumes, summarize
+from benchmarks.run_all import compare
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    """Smoke runs at minimal sizes, so the benchmarks keep working as the code changes."""
+
+    def test_corpus(self):
+        resumes = load_resumes()
+        self.assertGreater(len(resumes), 3)
+        self.assertEqual(len(load_jds()), 3)
+        documents = build_documents(resumes[:1])
+        self.assertTrue(documents[".pdf"][0][1].startswith(b"%PDF"))
+        self.assertTrue(documents[".docx"][0][1].startswith(b"PK"))
+
+    def test_summarize(self):
+        stats = summarize([float(i) for i in range(1, 101)])
+        self.assertEqual((stats["n"], stats["p50_ms"], stats["p99_ms"], stats["max_ms"]), (100, 50.0, 99.0, 100.0))
+
+    def test_parsing_and_cache(self):
+        [text] = parsing.run(["text"], repeat=1)
+        self.assertGreater(text["docs_per_s"], 0)
+        [memory] = cache.run(["memory"], keys=5)
+        self.assertEqual(memory["load_hit"]["n"], 15)
+        self.assertIn("evaluate_match_hit", memory)
+
+    def test_vector_search(self):
+        [result] = vector_search.run([50], dim=16, queries=3)
+        self.assertEqual(result["search"]["n"], 3)
+
+    def test_api_load(self):
+        results = api_load.run(["analyze", "search"], concurrency=[2], requests=2, time_scale=0)
+        self.assertEqual([r["scenario"] for r in results], ["analyze", "search"])
+        for result in results:
+            self.assertEqual(result["errors"], {})
+            self.assertEqual(result["latency"]["n"], 2)
+
+    def test_compare_flags_regressions(self):
+        def report(p50, rps):
+            return {"results": {"api_load": [
+                {"scenario": "analyze", "concurrency": 8, "throughput_rps": rps,
+                 "latency": {"p50_ms": p50, "min_ms": p50}}
+            ]}}
+
+        self.assertEqual(compare(report(11.0, 95.0), report(10.0, 100.0), tolerance=0.2), [])
+        regressions = compare(report(15.0, 70.0), report(10.0, 100.0), tolerance=0.2)
+        self.assertEqual(sorted(name for name, _, _ in regressions),
+                         ["api_load/analyze,8/latency/p50_ms", "api_load/analyze,8/throughput_rps"])
+
+
+if __name__ == '__main__':
+    unittest.main()
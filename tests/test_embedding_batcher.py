@@ -0,0 +1,103 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+import os
+import sys
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.embedding_batcher import EmbeddingBatcher
+
+
+class CountingEmbedder:
+    """embed_batch stand-in with a fixed per-call cost, recording batch sizes."""
+
+    def __init__(self, call_seconds=0.02):
+        self.call_seconds = call_seconds
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def embed_batch(self, texts):
+        time.sleep(self.call_seconds)
+        with self._lock:
+            self.batches.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+
+class TestEmbeddingBatcher(unittest.TestCase):
+    def test_coalesces_concurrent_requests(self):
+        embedder = CountingEmbedder()
+        batcher = EmbeddingBatcher(embedder.embed_batch, max_batch_size=64, max_wait_ms=20)
+        texts = ["x" * i for i in range(1, 33)]
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            vectors = list(executor.map(batcher.embed, texts))
+        batcher.close()
+
+        # Every caller gets its own vector back
+        self.assertEqual(vectors, [[float(len(t))] for t in texts])
+        self.assertLess(len(embedder.batches), 8)
+        self.assertEqual(batcher.stats()["texts"], len(texts))
+
+    def test_max_batch_size(self):
+        embedder = CountingEmbedder(call_seconds=0)
+        batcher = EmbeddingBatcher(embedder.embed_batch, max_batch_size=3, max_wait_ms=50)
+        futures = [batcher.submit(f"t{i}") for i in range(7)]
+        self.assertEqual([f.result(timeout=2) for f in futures], [[2.0]] * 7)
+        batcher.close()
+        self.assertTrue(all(len(batch) <= 3 for batch in embedder.batches))
+
+    def test_lone_request_waits_at_most_window(self):
+        embedder = CountingEmbedder(call_seconds=0)
+        batcher = EmbeddingBatcher(embedder.embed_batch, max_wait_ms=10)
+        start = time.monotonic()
+        batcher.embed("solo", timeout=2)
+        self.assertLess(time.monotonic() - start, 0.5)
+        batcher.close()
+
+    def test_duplicates_encoded_once(self):
+        embedder = CountingEmbedder(call_seconds=0)
+        batcher = EmbeddingBatcher(embedder.embed_batch, max_wait_ms=50)
+        futures = [batcher.submit("same") for _ in range(3)]
+        self.assertEqual([f.result(timeout=2) for f in futures], [[4.0]] * 3)
+        batcher.close()
+        self.assertEqual(embedder.batches, [["same"]])
+
+    def test_errors_reach_every_caller(self):
+        embed_batch = MagicMock(side_effect=RuntimeError("model crashed"))
+        batcher = EmbeddingBatcher(embed_batch, max_wait_ms=20)
+        futures = [batcher.submit(t) for t in ("a", "b")]
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result(timeout=2)
+
+        # The worker survives a failed batch
+        embed_batch.side_effect = None
+        embed_batch.return_value = [[1.0]]
+        self.assertEqual(batcher.embed("c", timeout=2), [1.0])
+        batcher.close()
+        with self.assertRaises(RuntimeError):
+            batcher.submit("d")
+
+
+class TestEngineBatching(unittest.TestCase):
+    def test_search_goes_through_batcher(self):
+        from src.core.engine import TalentOSEngine
+
+        engine = TalentOSEngine(llm_provider="deepseek")
+        provider = MagicMock()
+        provider.supports_embeddings = True
+        provider.embed_batch.side_effect = lambda texts: [[1.0, 0.0] for _ in texts]
+        engine._llm_provider = provider
+        engine._setup_embedding_provider()
+        self.assertIsNotNone(engine._embedding_batcher)
+
+        self.assertEqual(engine._embed("Java"), [1.0, 0.0])
+        provider.embed_batch.assert_called_once_with(["Java"])
+        provider.embed.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,222 @@
+import unittest
+from types import ModuleType, SimpleNamespace
+from unittest.mock import MagicMock, patch
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from src.core.config import EmbeddingConfig
+from src.core.exceptions import LLMAPIError
+from src.plugins.llm_providers.deepseek import DeepSeekProvider
+from src.plugins.llm_providers.local_embedding import LocalEmbeddingProvider
+
+
+def fake_sentence_transformers(load_seconds=0.0):
+    """A sentence_transformers module whose model counts its loads."""
+    loads = []
+
+    class SentenceTransformer:
+        def __init__(self, name):
+            time.sleep(load_seconds)
+            loads.append(name)
+
+        def encode(self, texts, batch_size=32, normalize_embeddings=True):
+            return np.array([[1.0, 0.0] for _ in texts])
+
+    module = ModuleType("sentence_transformers")
+    module.SentenceTransformer = SentenceTransformer
+    return module, loads
+
+
+class TestLocalEmbeddingProvider(unittest.TestCase):
+    def test_not_loaded_at_construction(self):
+        module, loads = fake_sentence_transformers()
+        with patch.dict(sys.modules, {"sentence_transformers": module}):
+            provider = LocalEmbeddingProvider()
+            self.assertFalse(provider.is_loaded)
+            self.assertTrue(provider.is_available())
+            self.assertEqual(loads, [])
+
+            self.assertEqual(provider.embed("Java"), [1.0, 0.0])
+            self.assertEqual(loads, [LocalEmbeddingProvider.DEFAULT_MODEL])
+
+    def test_concurrent_first_use_loads_once(self):
+        module, loads = fake_sentence_transformers(load_seconds=0.05)
+        with patch.dict(sys.modules, {"sentence_transformers": module}):
+            provider = LocalEmbeddingProvider()
+            provider.warm_up()
+            threads = [threading.Thread(target=provider.embed, args=("q",)) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(loads), 1)
+        self.assertIsNone(provider.warm_up())
+
+    def test_failed_load(self):
+        with patch.dict(sys.modules, {"sentence_transformers": None}):
+            provider = LocalEmbeddingProvider()
+            with self.assertRaises(LLMAPIError):
+                provider.embed("q")
+        self.assertFalse(provider.is_available())
+
+
+def fake_onnx_runtime():
+    """onnxruntime / tokenizers modules; the model's CLS vector encodes the text length."""
+    sessions = []
+    quantized = []
+
+    class SessionOptions:
+        intra_op_num_threads = 0
+        inter_op_num_threads = 0
+        graph_optimization_level = None
+
+    class InferenceSession:
+        def __init__(self, path, sess_options=None, providers=None):
+            self.path, self.options, self.providers = path, sess_options, providers
+            self.batches = []
+            sessions.append(self)
+
+        def get_inputs(self):
+            return [SimpleNamespace(name=n) for n in ("input_ids", "attention_mask", "token_type_ids")]
+
+        def run(self, outputs, feeds):
+            self.batches.append(feeds["attention_mask"].sum(axis=1).tolist())
+            lengths = feeds["attention_mask"].sum(axis=1).astype(np.float32)
+            hidden = np.ones(feeds["input_ids"].shape + (2,), dtype=np.float32)
+            hidden[:, 0, 0] = lengths * 3
+            hidden[:, 0, 1] = lengths * 4
+            return [hidden]
+
+    def quantize_dynamic(source, target, weight_type=None):
+        quantized.append((source, target))
+        open(target, "w").close()
+
+    class Tokenizer:
+        padding = None
+
+        @classmethod
+        def from_file(cls, path):
+            return cls()
+
+        def enable_truncation(self, max_length):
+            self.max_length = max_length
+
+        def enable_padding(self):
+            self.padding = {}
+
+        def encode_batch(self, texts):
+            width = max(len(t) for t in texts)
+            return [SimpleNamespace(
+                ids=[1] * width, type_ids=[0] * width,
+                attention_mask=[1] * len(t) + [0] * (width - len(t))
+            ) for t in texts]
+
+    ort = ModuleType("onnxruntime")
+    ort.SessionOptions = SessionOptions
+    ort.InferenceSession = InferenceSession
+    ort.GraphOptimizationLevel = SimpleNamespace(ORT_ENABLE_ALL="all")
+    quantization = ModuleType("onnxruntime.quantization")
+    quantization.quantize_dynamic = quantize_dynamic
+    quantization.QuantType = SimpleNamespace(QInt8="int8")
+    ort.quantization = quantization
+    tokenizers = ModuleType("tokenizers")
+    tokenizers.Tokenizer = Tokenizer
+    modules = {"onnxruntime": ort, "onnxruntime.quantization": quantization, "tokenizers": tokenizers}
+    return modules, sessions, quantized
+
+
+class TestOnnxBackend(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.model_dir = self.tmp.name
+        for name in ("model.onnx", "tokenizer.json"):
+            open(os.path.join(self.model_dir, name), "w").close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def provider(self, **overrides):
+        config = EmbeddingConfig(model_dir=self.model_dir, num_threads=2, batch_size=2, **overrides)
+        return LocalEmbeddingProvider(embedding_config=config)
+
+    def test_quantizes_once_and_sets_threads(self):
+        modules, sessions, quantized = fake_onnx_runtime()
+        with patch.dict(sys.modules, modules):
+            provider = self.provider()
+            provider.embed("Java")
+            self.assertEqual(provider.backend, "onnx")
+            self.provider().embed("Go")
+
+        target = os.path.join(self.model_dir, "model_quantized.onnx")
+        self.assertEqual(quantized, [(os.path.join(self.model_dir, "model.onnx"), target)])
+        self.assertEqual(sessions[0].path, target)
+        self.assertEqual(sessions[1].path, target)
+        self.assertEqual(sessions[0].options.intra_op_num_threads, 2)
+        self.assertEqual(sessions[0].providers, ["CPUExecutionProvider"])
+
+    def test_full_precision(self):
+        modules, sessions, quantized = fake_onnx_runtime()
+        with patch.dict(sys.modules, modules):
+            self.provider(quantized=False).embed("Java")
+        self.assertEqual(quantized, [])
+        self.assertEqual(sessions[0].path, os.path.join(self.model_dir, "model.onnx"))
+
+    def test_batches_by_length_and_keeps_order(self):
+        modules, sessions, _ = fake_onnx_runtime()
+        texts = ["python", "go", "javascript", "c"]
+        with patch.dict(sys.modules, modules):
+            vectors = self.provider().embed_batch(texts)
+
+        # CLS pooling, L2-normalized
+        for vector in vectors:
+            np.testing.assert_allclose(vector, [0.6, 0.8], rtol=1e-6)
+        # Similar lengths share a batch; results come back in input order
+        self.assertEqual(sessions[0].batches, [[1, 2], [6, 10]])
+        self.assertEqual(len(vectors), len(texts))
+
+    def test_auto_without_runtime_uses_sentence_transformers(self):
+        module, loads = fake_sentence_transformers()
+        torch = MagicMock()
+        with patch.dict(sys.modules, {"sentence_transformers": module, "torch": torch}), \
+                patch("src.plugins.llm_providers.local_embedding._importable", return_value=False):
+            provider = self.provider()
+            provider.embed("Java")
+        self.assertEqual(provider.backend, "sentence_transformers")
+        self.assertEqual(loads, [self.model_dir])
+        torch.set_num_threads.assert_called_once_with(2)
+
+
+class TestEngineEmbeddings(unittest.TestCase):
+    def test_capability_flags_instead_of_probe(self):
+        from src.core.engine import TalentOSEngine
+
+        self.assertFalse(DeepSeekProvider(api_key="test").supports_embeddings)
+        with patch.object(DeepSeekProvider, "embed") as mock_embed:
+            engine = TalentOSEngine(llm_provider="deepseek")
+        mock_embed.assert_not_called()
+        self.assertIsInstance(engine._embedding_provider, LocalEmbeddingProvider)
+        self.assertFalse(engine._embedding_provider.is_loaded)
+
+        # The local provider is kept across provider switches
+        local = engine._embedding_provider
+        engine.set_llm_provider("deepseek")
+        self.assertIs(engine._embedding_provider, local)
+
+        # Providers with their own embeddings are used directly
+        provider = MagicMock()
+        provider.supports_embeddings = True
+        engine._llm_provider = provider
+        engine._setup_embedding_provider()
+        self.assertIs(engine._embedding_provider, provider)
+
+
+if __name__ == '__main__':
+    unittest.main()
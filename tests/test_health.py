@@ -0,0 +1,106 @@
+import unittest
+from unittest.mock import MagicMock
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config import HealthConfig
+from src.core.health import HealthMonitor, MonitoredStorage
+from src.plugins.storage.memory_cache import MemoryCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestHealthMonitor(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.monitor = HealthMonitor(HealthConfig(refresh_interval=5, probe_idle_seconds=60, failure_threshold=2),
+                                     clock=self.clock)
+
+    def test_passive_outcomes(self):
+        self.monitor.record_success("storage", 1.5)
+        self.assertTrue(self.monitor.snapshot()["storage"]["healthy"])
+
+        self.monitor.record_failure("storage", "disk full")
+        self.monitor.record_failure("storage", "disk full")
+        # Served from memory until the snapshot is stale
+        self.assertTrue(self.monitor.snapshot()["storage"]["healthy"])
+        self.clock.now = 5
+        status = self.monitor.snapshot()["storage"]
+        self.assertFalse(status["healthy"])
+        self.assertEqual(status["last_error"], "disk full")
+
+    def test_probes_only_idle_components(self):
+        probe = MagicMock()
+        self.monitor.add_component("storage", probe=probe)
+        self.monitor.run_probes()
+        probe.assert_not_called()
+
+        self.clock.now = 60
+        self.monitor.run_probes()
+        probe.assert_called_once()
+
+        # Real traffic resets the idle timer
+        self.monitor.record_success("storage")
+        self.clock.now = 100
+        self.monitor.run_probes()
+        probe.assert_called_once()
+
+    def test_failed_probe_recorded(self):
+        self.monitor.add_component("storage", probe=MagicMock(side_effect=OSError("read-only")))
+        self.clock.now = 60
+        self.monitor.run_probes()
+        self.assertEqual(self.monitor.component_status("storage")["failures"], 1)
+
+    def test_monitored_storage(self):
+        storage = MonitoredStorage(MemoryCache(), self.monitor)
+        storage.save("k", {"v": 1})
+        self.assertEqual(storage.load("k"), {"v": 1})
+        self.assertEqual(self.monitor.component_status("storage")["requests"], 2)
+
+    def test_failed_saves_open_breaker(self):
+        backend = MagicMock()
+        backend.save.return_value = False
+        storage = MonitoredStorage(backend, self.monitor)
+        storage.save("k", {"v": 1})
+        storage.save("k", {"v": 1})
+
+        status = self.monitor.component_status("storage")
+        self.assertEqual((status["requests"], status["failures"]), (2, 2))
+        self.assertFalse(status["healthy"])
+
+
+class TestEngineHealth(unittest.TestCase):
+    def test_health_check_sends_no_requests(self):
+        from src.core.engine import TalentOSEngine
+
+        engine = TalentOSEngine()
+        provider = MagicMock()
+        provider.is_available.return_value = True
+        engine._llm_provider = provider
+
+        status = engine.health_check()
+        provider.health_check.assert_not_called()
+        provider.chat.assert_not_called()
+        self.assertTrue(status["llm_provider"]["healthy"])
+        self.assertIn("storage", status)
+
+        # Real failures open the provider's circuit
+        breaker = engine._pool.health(engine._current_provider).breaker
+        for _ in range(breaker.failure_threshold):
+            engine._pool.health(engine._current_provider).record_failure("timeout")
+        status = engine.health_monitor.refresh()
+        self.assertFalse(status["llm_provider"]["healthy"])
+        self.assertEqual(status["llm_provider"]["error"], "timeout")
+
+
+if __name__ == '__main__':
+    unittest.main()
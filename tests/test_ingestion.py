@@ -0,0 +1,85 @@
+import unittest
+import asyncio
+import io
+import os
+import sys
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from starlette.datastructures import UploadFile
+
+from src.core.config import ParsingConfig, UploadConfig
+from src.core.exceptions import UnsupportedFormatError, UploadRejectedError
+from src.core.ingestion import IngestionPipeline, normalize_text
+from src.core.parse_cache import ParseCache
+from src.core.parsing_service import ParsingService
+from src.plugins.storage.memory_cache import MemoryCache
+from tests.fixture_builders import build_pdf
+
+
+class TestIngestionPipeline(unittest.TestCase):
+    def setUp(self):
+        self.cache = ParseCache(storage=MemoryCache(), ttl=60)
+        self.pipeline = IngestionPipeline(
+            cache=self.cache,
+            parsing_service=ParsingService(ParsingConfig(enabled=False), cache=self.cache),
+            upload_config=UploadConfig()
+        )
+
+    def test_normalize_text(self):
+        self.assertEqual(normalize_text("a  \r\nb\r\n\r\n\r\n\r\nc\x00 "), "a\nb\n\nc")
+
+    def test_file_and_upload_share_cache(self):
+        content = build_pdf([["Data Engineer", "Spark, Flink"]])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cv.pdf")
+            with open(path, "wb") as f:
+                f.write(content)
+            first = self.pipeline.ingest_file(path)
+
+        upload = UploadFile(io.BytesIO(content), filename="cv.pdf")
+        second = asyncio.run(self.pipeline.ingest_upload(upload))
+
+        self.assertIn("Spark, Flink", first.content)
+        self.assertEqual(first.content, second.content)
+        self.assertFalse(first.metadata["cache_hit"])
+        self.assertTrue(second.metadata["cache_hit"])
+
+    def test_validation(self):
+        with self.assertRaises(UnsupportedFormatError):
+            self.pipeline.ingest_bytes(b"data", "cv.xyz")
+        with self.assertRaises(UploadRejectedError):
+            self.pipeline.ingest_bytes(b"not a pdf", "cv.pdf")
+
+    def test_batch_keeps_order_and_rejections(self):
+        uploads = [
+            UploadFile(io.BytesIO(b"first\r\n\r\n\r\n"), filename="a.txt"),
+            UploadFile(io.BytesIO(b"plain"), filename="fake.pdf"),
+            UploadFile(io.BytesIO(b"second"), filename="b.md"),
+        ]
+        outcomes = asyncio.run(self.pipeline.ingest_uploads(uploads))
+        self.assertEqual(outcomes[0].content, "first")
+        self.assertFalse(outcomes[1].ok)
+        self.assertEqual(outcomes[2].content, "second")
+
+
+class TestLegacyDocumentParser(unittest.TestCase):
+    def test_uses_pipeline(self):
+        from src.document_parser import DocumentParser
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cv.txt")
+            with open(path, "wb") as f:
+                f.write("销售经理".encode("gbk"))
+            self.assertEqual(DocumentParser().parse_file(path), "销售经理")
+
+        with self.assertRaises(ValueError):
+            DocumentParser().parse_file("cv.doc")
+        with self.assertRaises(ValueError):
+            DocumentParser().parse_file("cv.xyz")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config import AppConfig, LLMProviderConfig, MetricsConfig, ModelConfig, ResilienceConfig
+from src.core.exceptions import LLMAPIError
+from src.core.metrics import LLMMetrics, MetricsRegistry
+from src.core.provider_pool import ProviderPool
+from src.core.router import Route
+from src.interfaces.illm_provider import LLMResponse, ReasoningChunk
+
+
+def app_config():
+    return AppConfig(llm_providers={
+        "deepseek": LLMProviderConfig(
+            provider="deepseek",
+            models=[ModelConfig(name="deepseek-chat", cost_per_1k_tokens=0.002)],
+            default_model="deepseek-chat"
+        ),
+    })
+
+
+def stream(chunks, response=None):
+    """A chat_stream() generator returning response when exhausted."""
+    yield from chunks
+    return response
+
+
+class TestRegistry(unittest.TestCase):
+    def test_prometheus_text_format(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("demo_total", "Demo counter.", ("kind",))
+        counter.inc(kind='a"b')
+        counter.inc(2, kind='a"b')
+        histogram = registry.histogram("demo_seconds", "Demo histogram.", ("kind",), buckets=(0.1, 1.0))
+        histogram.observe(0.5, kind="x")
+        histogram.observe(2.0, kind="x")
+
+        text = registry.render()
+        self.assertIn("# TYPE demo_total counter", text)
+        self.assertIn('demo_total{kind="a\\"b"} 3', text)
+        self.assertIn("# TYPE demo_seconds histogram", text)
+        self.assertIn('demo_seconds_bucket{kind="x",le="0.1"} 0', text)
+        self.assertIn('demo_seconds_bucket{kind="x",le="1"} 1', text)
+        self.assertIn('demo_seconds_bucket{kind="x",le="+Inf"} 2', text)
+        self.assertIn('demo_seconds_sum{kind="x"} 2.5', text)
+        self.assertIn('demo_seconds_count{kind="x"} 2', text)
+
+
+class TestLLMMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = LLMMetrics(MetricsConfig(), app_config())
+        self.labels = dict(operation="analyze", provider="deepseek", model="deepseek-chat")
+
+    def test_tokens_and_cost(self):
+        response = LLMResponse(content="ok", model="deepseek-chat", tokens_used=1500, latency_ms=800,
+                               cached_tokens=200, prompt_tokens=1000, completion_tokens=500)
+        self.metrics.record_response("analyze", "deepseek", "deepseek-chat", response)
+
+        self.assertEqual(self.metrics.requests.value(status="ok", **self.labels), 1)
+        self.assertEqual(self.metrics.prompt_tokens.value(**self.labels), 1000)
+        self.assertEqual(self.metrics.completion_tokens.value(**self.labels), 500)
+        self.assertEqual(self.metrics.cached_tokens.value(**self.labels), 200)
+        self.assertAlmostEqual(self.metrics.cost.value(**self.labels), 0.003)
+        self.assertEqual(self.metrics.latency.count(**self.labels), 1)
+
+    def test_unknown_model_has_no_cost(self):
+        self.assertEqual(self.metrics.cost_per_1k("deepseek", "deepseek-reasoner"), 0.0)
+        self.assertEqual(self.metrics.cost_per_1k("openai", "gpt-4o"), 0.0)
+
+    def test_stream_usage_from_provider(self):
+        usage = LLMResponse(content="ab", model="deepseek-chat", tokens_used=30, latency_ms=0,
+                            prompt_tokens=28, completion_tokens=2)
+        metered = self.metrics.track_stream(stream(["a", "b"], usage), "analyze", "deepseek", "deepseek-chat")
+        self.assertEqual(list(metered), ["a", "b"])
+
+        self.assertIs(metered.response, usage)
+        self.assertIsNotNone(metered.ttft_ms)
+        self.assertEqual(self.metrics.ttft.count(**self.labels), 1)
+        self.assertEqual(self.metrics.completion_tokens.value(**self.labels), 2)
+
+    def test_stream_without_usage_is_estimated(self):
+        metered = self.metrics.track_stream(iter(["hello ", "world"]), "analyze", "deepseek", "deepseek-chat")
+        self.assertEqual("".join(metered), "hello world")
+        self.assertGreater(metered.response.completion_tokens, 0)
+        self.assertEqual(metered.response.tokens_used, metered.response.completion_tokens)
+
+    def test_stream_error(self):
+        def broken():
+            yield "a"
+            raise LLMAPIError("connection reset")
+
+        metered = self.metrics.track_stream(broken(), "analyze", "deepseek", "deepseek-chat")
+        with self.assertRaises(LLMAPIError):
+            list(metered)
+        self.assertEqual(self.metrics.requests.value(status="error", **self.labels), 1)
+        self.assertIsNone(metered.response)
+
+    def test_disabled(self):
+        metrics = LLMMetrics(MetricsConfig(enabled=False), app_config())
+        metrics.record_cache("analyze", True)
+        metrics.record_error("analyze", "deepseek", "deepseek-chat")
+        self.assertEqual(metrics.cache_lookups.value(operation="analyze", result="hit"), 0)
+
+
+class TestStreamInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.metrics = LLMMetrics(MetricsConfig(), app_config())
+        self.labels = dict(operation="analyze", provider="deepseek", model="deepseek-reasoner")
+
+    def test_reasoning_then_content(self):
+        def reasoner():
+            yield ReasoningChunk("> **Thinking Process:**\n> ")
+            time.sleep(0.02)
+            yield ReasoningChunk("weighing skills")
+            time.sleep(0.02)
+            yield "Score: 80"
+            yield "/100"
+            return LLMResponse(content="Score: 80/100", model="deepseek-reasoner", tokens_used=150,
+                               latency_ms=0, prompt_tokens=100, completion_tokens=50, reasoning_tokens=40)
+
+        metered = self.metrics.track_stream(reasoner(), "analyze", "deepseek", "deepseek-reasoner")
+        self.assertEqual(list(metered)[-2:], ["Score: 80", "/100"])
+        stats = metered.stats
+
+        self.assertEqual(stats.chunks, 4)
+        self.assertEqual(len(stats.gaps_ms), 3)
+        self.assertGreaterEqual(stats.first_content_ms - stats.ttft_ms, 30)
+        self.assertGreaterEqual(stats.max_gap_ms, 15)
+        self.assertIsNotNone(stats.tokens_per_second)
+        self.assertEqual(stats.to_dict()["reasoning_tokens"], 40)
+
+        self.assertEqual(self.metrics.stream_tokens.value(kind="reasoning", **self.labels), 40)
+        self.assertEqual(self.metrics.stream_tokens.value(kind="content", **self.labels), 10)
+        self.assertEqual(self.metrics.first_content.count(**self.labels), 1)
+        self.assertEqual(self.metrics.chunk_gap.count(**self.labels), 3)
+        self.assertEqual(self.metrics.throughput.count(**self.labels), 1)
+
+    def test_reasoning_estimated_without_usage(self):
+        chunks = [ReasoningChunk("think " * 20), "answer"]
+        metered = self.metrics.track_stream(iter(chunks), "analyze", "deepseek", "deepseek-reasoner")
+        list(metered)
+        self.assertGreater(metered.response.reasoning_tokens, 0)
+        self.assertGreater(metered.response.completion_tokens, metered.response.reasoning_tokens)
+
+    def test_deepseek_marks_reasoning_and_reports_usage(self):
+        from src.plugins.llm_providers.deepseek import DeepSeekProvider
+
+        def chunk(reasoning=None, content=None):
+            delta = SimpleNamespace(reasoning_content=reasoning, content=content)
+            return SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+
+        usage = SimpleNamespace(total_tokens=60, prompt_tokens=20, completion_tokens=40, prompt_cache_hit_tokens=0,
+                                completion_tokens_details=SimpleNamespace(reasoning_tokens=30))
+        provider = DeepSeekProvider(api_key="test")
+        provider._client = MagicMock()
+        provider._client.chat.completions.create.return_value = [
+            chunk(reasoning="hmm"), chunk(content="done"), SimpleNamespace(choices=[], usage=usage)
+        ]
+
+        metered = self.metrics.track_stream(provider.chat_stream([{"role": "user", "content": "q"}],
+                                                                 model="deepseek-reasoner"),
+                                            "analyze", "deepseek", "deepseek-reasoner")
+        chunks = list(metered)
+        self.assertTrue(all(isinstance(c, ReasoningChunk) for c in chunks[:-1]))
+        self.assertNotIsInstance(chunks[-1], ReasoningChunk)
+        self.assertEqual(metered.response.content, "done")
+        self.assertEqual(metered.response.reasoning_tokens, 30)
+        self.assertEqual(self.metrics.stream_tokens.value(kind="content", **self.labels), 10)
+        kwargs = provider._client.chat.completions.create.call_args.kwargs
+        self.assertEqual(kwargs["stream_options"], {"include_usage": True})
+
+
+class TestPoolMetrics(unittest.TestCase):
+    def test_calls_recorded_per_operation(self):
+        metrics = LLMMetrics(MetricsConfig(), app_config())
+        provider = MagicMock()
+        provider.supports_json_mode = False
+        provider.chat.return_value = LLMResponse(content="ok", model="deepseek-chat", tokens_used=12,
+                                                 latency_ms=5, prompt_tokens=10, completion_tokens=2)
+        pool = ProviderPool(ResilienceConfig(failover=False), app_config(), metrics=metrics)
+        route = Route("deepseek", "deepseek-chat", provider, operation="evaluate_match")
+        pool.chat(route, [{"role": "user", "content": "hi"}])
+
+        provider.chat.side_effect = LLMAPIError("down", status_code=503)
+        with self.assertRaises(LLMAPIError):
+            pool.chat(route, [{"role": "user", "content": "hi"}], max_retries=1)
+
+        labels = dict(operation="evaluate_match", provider="deepseek", model="deepseek-chat")
+        self.assertEqual(metrics.requests.value(status="ok", **labels), 1)
+        self.assertEqual(metrics.requests.value(status="error", **labels), 1)
+        self.assertEqual(metrics.prompt_tokens.value(**labels), 10)
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+    def test_metrics_endpoint(self):
+        from fastapi.testclient import TestClient
+        from src.api_server import app
+        from src.core.metrics import get_metrics
+
+        get_metrics().record_cache("analyze", False)
+        response = TestClient(app).get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        self.assertIn('talentos_cache_lookups_total{operation="analyze",result="miss"}', response.text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config import ParsingConfig
+from src.core.parse_cache import ParseCache
+from src.core.parsing_service import ParsingService
+from src.plugins.document_parsers import get_parser
+from src.plugins.document_parsers.pdf_parser import PDFParser
+from src.plugins.storage.memory_cache import MemoryCache
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = ParseCache(storage=MemoryCache(), ttl=60)
+        self.parser = get_parser('text')
+
+    def test_repeat_upload_skips_parsing(self):
+        content = "Resume: Java, Kafka".encode('utf-8')
+        first = self.cache.parse_bytes(self.parser, content, '.txt', file_name='a.txt')
+
+        with patch.object(self.parser, 'parse_bytes', side_effect=AssertionError("parsed twice")):
+            second = self.cache.parse_bytes(self.parser, content, '.txt', file_name='b.txt')
+
+        self.assertEqual(first.content, second.content)
+        self.assertFalse(first.metadata["cache_hit"])
+        self.assertTrue(second.metadata["cache_hit"])
+        self.assertEqual(second.file_path, 'b.txt')
+        self.assertEqual(self.cache.get_stats()["hit_rate"], 0.5)
+
+    def test_key_includes_parser_version(self):
+        content_hash = self.cache.content_hash(b"same bytes")
+        key_v1 = self.cache.make_key(content_hash, self.parser)
+        with patch.object(type(self.parser), 'PARSER_VERSION', "99"):
+            key_v2 = self.cache.make_key(content_hash, self.parser)
+        self.assertNotEqual(key_v1, key_v2)
+
+    def test_key_includes_parser_options(self):
+        content_hash = self.cache.content_hash(b"same bytes")
+        full = self.cache.make_key(content_hash, PDFParser(max_pages=0), '.pdf')
+        truncated = self.cache.make_key(content_hash, PDFParser(max_pages=1), '.pdf')
+        self.assertNotEqual(full, truncated)
+        # Options that do not change the output keep the key
+        self.assertEqual(full, self.cache.make_key(content_hash, PDFParser(max_pages=0, page_workers=2), '.pdf'))
+
+    def test_key_includes_file_extension(self):
+        content = b"# Resume\nJava, Kafka"
+        markdown = self.cache.parse_bytes(self.parser, content, '.md', file_name='a.md')
+        text = self.cache.parse_bytes(self.parser, content, '.txt', file_name='a.txt')
+        self.assertFalse(text.metadata["cache_hit"])
+        self.assertEqual((markdown.file_type, text.file_type), ("markdown", "text"))
+
+    def test_parsing_service_uses_cache(self):
+        service = ParsingService(ParsingConfig(enabled=False), cache=self.cache)
+        files = [("a.txt", b"same resume")]
+        self.assertFalse(service.parse_many(files)[0].metadata["cache_hit"])
+        self.assertTrue(service.parse_many(files)[0].metadata["cache_hit"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,279 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.exceptions import ParseError
+from src.interfaces.idocument_parser import IDocumentParser
+from src.plugins.document_parsers import get_parser, resolve_parser_name
+from src.plugins.document_parsers import pdf_parser
+from src.plugins.document_parsers.pdf_parser import PDFParser
+from src.plugins.document_parsers.pdfium_parser import PdfiumParser
+from tests.fixture_builders import build_pdf, build_docx
+
+
+class HangingPDFParser(PDFParser):
+    """Page extraction that never finishes in time (runs in page-pool workers)."""
+
+    def _extract_page_range(self, source, start, end, char_budget=0):
+        time.sleep(30)
+        return []
+
+
+class UpperCaseParser(IDocumentParser):
+    """Minimal third-party parser implementing only the abstract methods."""
+
+    parser_name = "upper"
+    supported_formats = [".up"]
+
+    def parse(self, file_path):
+        with open(file_path, 'rb') as f:
+            return self.parse_stream(f, file_path)
+
+    def validate_file(self, file_path):
+        return file_path.endswith(".up")
+
+    def parse_content(self, content, file_extension):
+        return content.decode('utf-8').upper()
+
+
+class TestInMemoryParsing(unittest.TestCase):
+    """Uploads are parsed from bytes without spilling to temp files."""
+
+    def setUp(self):
+        patcher = patch('tempfile.NamedTemporaryFile', side_effect=AssertionError("temp file used"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_pdf_parse_bytes(self):
+        content = build_pdf([["Senior Java Engineer"], ["Spring Boot, Kafka"]])
+        doc = get_parser('pdf').parse_bytes(content, '.pdf', file_name='cv.pdf')
+        self.assertIn("Senior Java Engineer", doc.content)
+        self.assertIn("Spring Boot, Kafka", doc.content)
+        self.assertEqual(doc.metadata["pages"], 2)
+        self.assertEqual(doc.file_path, 'cv.pdf')
+
+    def test_docx_parse_content(self):
+        content = build_docx(["Product Manager", [["Skill", "Level"], ["SQL", "Expert"]]])
+        text = get_parser('docx').parse_content(content, '.docx')
+        self.assertIn("Product Manager", text)
+        self.assertIn("SQL | Expert", text)
+
+    def test_text_parse_bytes(self):
+        doc = get_parser('text').parse_bytes("简历内容".encode('gbk'), '.txt')
+        self.assertEqual(doc.content, "简历内容")
+        self.assertEqual(doc.metadata["encoding"], "gbk")
+
+    def test_default_parse_stream_uses_parse_content(self):
+        doc = UpperCaseParser().parse_bytes(b"java engineer", '.up', file_name='cv.up')
+        self.assertEqual((doc.content, doc.file_type, doc.file_path), ("JAVA ENGINEER", "up", "cv.up"))
+
+
+class TestTextParserDecoding(unittest.TestCase):
+    def test_file_opened_once(self):
+        import tempfile
+        from src.plugins.document_parsers.text_parser import TextParser
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cv.txt")
+            with open(path, "wb") as f:
+                f.write("高级产品经理\n负责增长".encode("gbk"))
+
+            real_open = open
+            with patch('builtins.open', side_effect=real_open) as mock_open:
+                doc = TextParser().parse(path)
+
+        self.assertEqual(mock_open.call_count, 1)
+        self.assertEqual(doc.content, "高级产品经理\n负责增长")
+        self.assertEqual(doc.metadata["encoding"], "gbk")
+        self.assertEqual(doc.encoding, "gbk")
+
+    def test_bom(self):
+        parser = get_parser('text')
+        doc = parser.parse_bytes("简历".encode("utf-16"), '.txt')
+        self.assertEqual(doc.content, "简历")
+        self.assertEqual(doc.metadata["encoding"], "utf-16")
+        doc = parser.parse_bytes(b"\xef\xbb\xbfResume", '.md')
+        self.assertEqual(doc.content, "Resume")
+
+    def test_incremental_decoding(self):
+        from src.plugins.document_parsers.text_parser import TextParser
+
+        parser = TextParser()
+        parser.SAMPLE_SIZE = 7
+        parser.CHUNK_SIZE = 5
+        text = "工程师 Java " * 50
+        for encoding in ("utf-8", "gbk"):
+            doc = parser.parse_bytes(text.encode(encoding), '.txt')
+            self.assertEqual(doc.content, text)
+            self.assertEqual(doc.metadata["encoding"], encoding)
+
+    def test_invalid_utf8_after_sample_falls_back(self):
+        from src.plugins.document_parsers.text_parser import TextParser
+
+        parser = TextParser()
+        parser.SAMPLE_SIZE = 8
+        content = b"plain ascii header " + "中文".encode("gbk")
+        doc = parser.parse_bytes(content, '.txt')
+        self.assertEqual(doc.content, "plain ascii header 中文")
+        self.assertEqual(doc.metadata["encoding"], "gbk")
+
+
+class TestPdfiumParser(unittest.TestCase):
+    def test_matches_pdfplumber_text(self):
+        content = build_pdf([["Senior Java Engineer", "Kafka, Redis"], ["Education: BSc"]])
+        fast = get_parser('pdf_fast').parse_bytes(content, '.pdf')
+        slow = get_parser('pdf').parse_bytes(content, '.pdf')
+        self.assertEqual(fast.content, slow.content)
+        self.assertEqual(fast.metadata["backend"], "pdfium")
+        self.assertEqual(fast.metadata["fallback_pages"], [])
+
+    def test_garbled_page_falls_back(self):
+        content = build_pdf([["Page one"], ["Page two"]])
+        parser = PdfiumParser()
+        with patch.object(PdfiumParser, '_looks_garbled', side_effect=[False, True]):
+            doc = parser.parse_bytes(content, '.pdf')
+        self.assertEqual(doc.metadata["fallback_pages"], [1])
+        self.assertIn("Page two", doc.content)
+
+    def test_garbled_heuristic(self):
+        parser = PdfiumParser()
+        self.assertTrue(parser._looks_garbled("\ufffd\ufffd\ufffdab", 5))
+        self.assertTrue(parser._looks_garbled("", 10))
+        self.assertFalse(parser._looks_garbled("高级Java工程师", 9))
+
+    def test_config_selects_fast_backend(self):
+        self.assertEqual(resolve_parser_name("resume.pdf"), "pdf_fast")
+
+
+class TestOOXMLParser(unittest.TestCase):
+    def test_document_order(self):
+        content = build_docx(["Summary", [["Skill", "Level"], ["SQL", "Expert"]], "Education"])
+        doc = get_parser('docx_fast').parse_bytes(content, '.docx')
+        self.assertEqual(doc.content, "Summary\nSkill | Level\nSQL | Expert\nEducation")
+        self.assertEqual(doc.metadata["tables"], 1)
+        self.assertEqual(doc.metadata["paragraphs"], 2)
+
+    def test_matches_python_docx_paragraphs(self):
+        content = build_docx(["张三", "高级Java工程师", "Kafka\tRedis"])
+        fast = get_parser('docx_fast').parse_bytes(content, '.docx')
+        slow = get_parser('docx').parse_bytes(content, '.docx')
+        self.assertEqual(fast.content, slow.content)
+
+    def test_merged_cells_emitted_once(self):
+        import io
+        import docx
+
+        document = docx.Document()
+        table = document.add_table(rows=3, cols=3)
+        table.cell(0, 0).merge(table.cell(0, 2)).text = "Work Experience"
+        table.cell(1, 0).merge(table.cell(2, 0)).text = "2020-2024"
+        table.cell(1, 1).text = "ACME"
+        table.cell(2, 1).text = "Globex"
+        buffer = io.BytesIO()
+        document.save(buffer)
+
+        doc = get_parser('docx_fast').parse_bytes(buffer.getvalue(), '.docx')
+        self.assertEqual(doc.content.count("Work Experience"), 1)
+        self.assertEqual(doc.content.count("2020-2024"), 1)
+        self.assertIn("ACME", doc.content)
+        self.assertIn("Globex", doc.content)
+
+    def test_tab_stops_are_not_text(self):
+        import io
+        import docx
+        from docx.shared import Inches
+
+        document = docx.Document()
+        document.add_paragraph("Summary")
+        paragraph = document.add_paragraph("Engineer\t2020")
+        for position in (1, 2, 3):
+            paragraph.paragraph_format.tab_stops.add_tab_stop(Inches(position))
+        document.add_paragraph("Java")
+        buffer = io.BytesIO()
+        document.save(buffer)
+
+        fast = get_parser('docx_fast').parse_bytes(buffer.getvalue(), '.docx')
+        self.assertEqual(fast.content, "Summary\nEngineer\t2020\nJava")
+        self.assertEqual(fast.content, get_parser('docx').parse_bytes(buffer.getvalue(), '.docx').content)
+
+    def test_tables_skipped_when_disabled(self):
+        content = build_docx(["Summary", [["Skill", "Level"]]])
+        doc = get_parser('docx_fast', extract_tables=False).parse_bytes(content, '.docx')
+        self.assertEqual(doc.content, "Summary")
+
+    def test_config_selects_fast_backend(self):
+        self.assertEqual(resolve_parser_name("resume.docx"), "docx_fast")
+
+
+class TestPdfPageBudget(unittest.TestCase):
+    def setUp(self):
+        # Distinct page text (identical lines would be stripped as running headers)
+        self.content = build_pdf([[f"Experience {chr(65 + i)}"] for i in range(6)])
+
+    def test_parallel_matches_sequential(self):
+        for name in ('pdf', 'pdf_fast'):
+            sequential = get_parser(name, parallel_page_threshold=0).parse_bytes(self.content, '.pdf')
+            parallel = get_parser(name, parallel_page_threshold=2, page_workers=3).parse_bytes(self.content, '.pdf')
+            self.assertEqual(parallel.content, sequential.content)
+            self.assertEqual(parallel.metadata["pages_parsed"], 6)
+
+    def test_recovers_from_dead_page_worker(self):
+        parser = get_parser('pdf_fast', parallel_page_threshold=2, page_workers=2)
+        expected = parser.parse_bytes(self.content, '.pdf').content
+
+        # A worker dies (e.g. OOM-killed): the pool is broken for every later document
+        for process in list(pdf_parser._page_pool._processes.values()):
+            process.kill()
+            process.join()
+
+        self.assertEqual(parser.parse_bytes(self.content, '.pdf').content, expected)
+
+    def test_hung_page_worker_times_out(self):
+        parser = HangingPDFParser(parallel_page_threshold=2, page_workers=2, page_timeout=1)
+        start = time.monotonic()
+        with self.assertRaises(ParseError):
+            parser.parse_bytes(self.content, '.pdf')
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertIsNone(pdf_parser._page_pool)
+
+    @classmethod
+    def tearDownClass(cls):
+        pdf_parser.shutdown_page_pool()
+
+    def test_max_pages(self):
+        doc = get_parser('pdf', max_pages=2).parse_bytes(self.content, '.pdf')
+        self.assertIn("Experience B", doc.content)
+        self.assertNotIn("Experience C", doc.content)
+        self.assertEqual(doc.metadata["pages"], 6)
+        self.assertEqual(doc.metadata["pages_parsed"], 2)
+        self.assertTrue(doc.metadata["truncated"])
+
+    def test_max_chars_stops_early(self):
+        doc = get_parser('pdf_fast', max_chars=15).parse_bytes(self.content, '.pdf')
+        self.assertLessEqual(len(doc.content), 20)
+        self.assertLess(doc.metadata["pages_parsed"], 6)
+        self.assertTrue(doc.metadata["truncated"])
+
+    def test_max_chars_at_page_boundary(self):
+        content = build_pdf([["abcdefghij"], ["XYZ"]])
+        for name in ('pdf', 'pdf_fast'):
+            doc = get_parser(name, max_chars=10).parse_bytes(content, '.pdf')
+            self.assertEqual(doc.content, "abcdefghij")
+            self.assertTrue(doc.metadata["truncated"])
+
+    def test_parallel_respects_max_chars(self):
+        sequential = get_parser('pdf_fast', max_chars=15).parse_bytes(self.content, '.pdf')
+        parallel = get_parser('pdf_fast', max_chars=15, parallel_page_threshold=2,
+                              page_workers=3).parse_bytes(self.content, '.pdf')
+        self.assertEqual(parallel.content, sequential.content)
+        self.assertLessEqual(len(parallel.content), 15)
+        self.assertLess(parallel.metadata["pages_parsed"], 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
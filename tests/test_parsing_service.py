@@ -0,0 +1,104 @@
+import unittest
+import os
+import sys
+import time
+import threading
+import multiprocessing
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config import ParsingConfig
+from src.core.parsing_service import ParsingService
+from src.plugins.document_parsers import PARSER_REGISTRY, EXTENSION_MAP
+from src.plugins.document_parsers.text_parser import TextParser
+
+
+class CrashingParser(TextParser):
+    """Simulates a parser segfaulting on a malformed file."""
+
+    def parse_bytes(self, content: bytes, file_extension: str, file_name: str = ""):
+        os._exit(1)
+
+
+class SlowParser(TextParser):
+    """Simulates a parser hanging on a pathological file."""
+
+    def parse_bytes(self, content: bytes, file_extension: str, file_name: str = ""):
+        time.sleep(30)
+
+
+class SteadyParser(TextParser):
+    """Takes a moment per file, well within the timeout."""
+
+    def parse_bytes(self, content: bytes, file_extension: str, file_name: str = ""):
+        time.sleep(0.3)
+        return super().parse_bytes(content, '.txt', file_name=file_name)
+
+
+@unittest.skipUnless(multiprocessing.get_start_method() == "fork",
+                     "Test parsers are registered in the parent process")
+class TestParsingService(unittest.TestCase):
+    def setUp(self):
+        PARSER_REGISTRY['crash'] = CrashingParser
+        PARSER_REGISTRY['slow'] = SlowParser
+        PARSER_REGISTRY['steady'] = SteadyParser
+        EXTENSION_MAP['crash'] = 'crash'
+        EXTENSION_MAP['slow'] = 'slow'
+        EXTENSION_MAP['steady'] = 'steady'
+        self.service = ParsingService(ParsingConfig(max_workers=2, file_timeout=2))
+        self.service.start()
+
+    def tearDown(self):
+        self.service.shutdown()
+        for name in ('crash', 'slow', 'steady'):
+            PARSER_REGISTRY.pop(name, None)
+            EXTENSION_MAP.pop(name, None)
+
+    def test_parse_many_preserves_order(self):
+        files = [(f"resume_{i}.txt", f"Resume {i}".encode("utf-8")) for i in range(6)]
+        outcomes = self.service.parse_many(files)
+        self.assertEqual([o.content for o in outcomes], [f"Resume {i}" for i in range(6)])
+        self.assertTrue(all(o.ok for o in outcomes))
+
+    def test_unsupported_format(self):
+        outcomes = self.service.parse_many([("resume.xyz", b"data")])
+        self.assertFalse(outcomes[0].ok)
+        self.assertIn("Unsupported", outcomes[0].error)
+
+    def test_crash_is_isolated(self):
+        files = [("a.txt", b"first"), ("bad.crash", b"boom"), ("b.txt", b"second")]
+        outcomes = self.service.parse_many(files)
+        self.assertEqual(outcomes[0].content, "first")
+        self.assertFalse(outcomes[1].ok)
+        self.assertEqual(outcomes[2].content, "second")
+
+    def test_timeout(self):
+        outcomes = self.service.parse_many([("hang.slow", b"..."), ("ok.txt", b"fine")])
+        self.assertIn("timed out", outcomes[0].error)
+        self.assertEqual(outcomes[1].content, "fine")
+        # Pool is recycled and still usable
+        self.assertEqual(self.service.parse_many([("c.txt", b"again")])[0].content, "again")
+
+    def test_timeout_spares_concurrent_requests(self):
+        hung = []
+        thread = threading.Thread(target=lambda: hung.extend(self.service.parse_many([("hang.slow", b"...")])))
+        thread.start()
+        time.sleep(0.2)
+
+        # Still queued or running when the hung file's pool is recycled
+        files = [(f"resume_{i}.steady", f"Resume {i}".encode("utf-8")) for i in range(10)]
+        outcomes = self.service.parse_many(files)
+        thread.join()
+
+        self.assertIn("timed out", hung[0].error)
+        self.assertEqual([o.content for o in outcomes], [f"Resume {i}" for i in range(10)])
+
+    def test_inline_when_disabled(self):
+        service = ParsingService(ParsingConfig(enabled=False))
+        outcomes = service.parse_many([("a.md", b"# Title")])
+        self.assertEqual(outcomes[0].content, "# Title")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+import os
+import subprocess
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.exceptions import PluginLoadError, PluginNotFoundError
+from src.core.plugin_registry import PluginRegistry
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestPluginRegistry(unittest.TestCase):
+    def test_loads_on_first_lookup(self):
+        registry = PluginRegistry({'ordered': 'collections:OrderedDict'})
+        self.assertFalse(registry.is_loaded('ordered'))
+        self.assertIn('ordered', registry)
+
+        from collections import OrderedDict
+        self.assertIs(registry['ordered'], OrderedDict)
+        self.assertTrue(registry.is_loaded('ordered'))
+
+    def test_broken_plugin(self):
+        registry = PluginRegistry({'broken': 'no_such_module_xyz:Plugin'})
+        with self.assertRaises(PluginLoadError):
+            registry['broken']
+
+    def test_entry_points(self):
+        entry_point = SimpleNamespace(name='external', load=lambda: dict)
+        registry = PluginRegistry({'local': dict}, entry_point_group='talentos.test')
+        with patch('importlib.metadata.entry_points', return_value=[entry_point]) as mock_entry_points:
+            self.assertIs(registry['local'], dict)
+            mock_entry_points.assert_not_called()
+            self.assertIs(registry['external'], dict)
+        self.assertEqual(sorted(registry), ['external', 'local'])
+
+    def test_unknown_provider(self):
+        from src.plugins.llm_providers import get_provider
+
+        with self.assertRaises(PluginNotFoundError):
+            get_provider('no_such_provider')
+
+    def test_lazy_exports(self):
+        from src.plugins.storage import MemoryCache, STORAGE_REGISTRY
+
+        self.assertIs(MemoryCache, STORAGE_REGISTRY['memory'])
+
+
+class TestColdImport(unittest.TestCase):
+    def test_engine_import_skips_unselected_sdks(self):
+        code = (
+            "import sys, os; import src.core.engine; "
+            "print(','.join(m for m in ('openai', 'anthropic', 'supabase', 'sentence_transformers', 'pdfplumber') "
+            "if m in sys.modules)); print(os.environ.get('HF_ENDPOINT', ''))"
+        )
+        env = {k: v for k, v in os.environ.items() if k != 'HF_ENDPOINT'}
+        proc = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, env=env)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertEqual(proc.stdout.splitlines(), ['', ''])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config import PromptConfig
+from src.core.prompt_budget import PromptBudgeter, TokenCounter, split_sections
+from src.core.text_normalizer import normalize_text, strip_page_furniture
+from src.interfaces.illm_provider import LLMResponse
+
+RESUME = """张三 | 13800000000 | zhangsan@example.com
+工作经历
+2020-2024 ACME 高级Java工程师
+负责支付系统架构设计, 日均交易 1000 万笔
+项目经历
+分布式账务系统: Kafka, Redis, MySQL 分库分表
+教育背景
+2012-2016 浙江大学 计算机科学 本科
+自我评价
+""" + "热爱学习, 积极向上, 抗压能力强。" * 40 + """
+兴趣爱好
+""" + "篮球, 摄影, 旅行, 阅读。" * 40
+
+
+class TestTextNormalizer(unittest.TestCase):
+    def test_page_numbers_and_whitespace(self):
+        text = "Java   Engineer\t\tACME\n- 2 -\nPage 3 of 5\n第 2 页 共 3 页\n\n\n\nSkills"
+        self.assertEqual(normalize_text(text), "Java Engineer ACME\n\nSkills")
+
+    def test_repeated_boilerplate(self):
+        notice = "本简历仅供招聘使用, 请勿外传或用于其他用途"
+        text = f"{notice}\n工作经历\n{notice}\n项目经历\n项目描述:\nA\n项目描述:\nB"
+        cleaned = normalize_text(text)
+        self.assertEqual(cleaned.count(notice), 1)
+        self.assertEqual(cleaned.count("项目描述:"), 2)
+
+    def test_page_furniture(self):
+        bodies = ["Java\nKafka\nRedis", "MySQL\nSpark\nFlink", "Go\nRust\nK8s"]
+        pages = [
+            f"Zhang San - Resume\n{body}\nConfidential page {i}" for i, body in enumerate(bodies, 1)
+        ]
+        self.assertEqual(strip_page_furniture(pages), bodies)
+        # Short pages are left alone
+        self.assertEqual(strip_page_furniture(["Body 1\nEnd", "Body 2\nEnd"]), ["Body 1\nEnd", "Body 2\nEnd"])
+
+
+class TestPromptBudgeter(unittest.TestCase):
+    def setUp(self):
+        self.counter = TokenCounter(encoding="")
+
+    def budgeter(self, max_input_tokens):
+        config = PromptConfig(max_input_tokens=max_input_tokens, min_input_tokens=50, reserve_tokens=0)
+        return PromptBudgeter(config, counter=self.counter)
+
+    def test_estimate(self):
+        self.assertEqual(self.counter.count("工程师"), 3)
+        self.assertEqual(self.counter.count("abcdefgh"), 2)
+
+    def test_split_sections(self):
+        titles = [s.title for s in split_sections(RESUME)]
+        self.assertEqual(titles, ["header", "工作经历", "项目经历", "教育背景", "自我评价", "兴趣爱好"])
+
+    def test_untouched_under_budget(self):
+        result = self.budgeter(100000).fit(RESUME, "Java 工程师")
+        self.assertFalse(result.truncated)
+        self.assertEqual(result.dropped_sections, [])
+
+    def test_low_priority_sections_dropped_first(self):
+        result = self.budgeter(200).fit(RESUME, "招聘高级Java工程师")
+        self.assertLessEqual(result.input_tokens, 200)
+        self.assertEqual(result.dropped_sections, ["兴趣爱好", "自我评价"])
+        self.assertIn("支付系统架构设计", result.resume_text)
+        self.assertIn("浙江大学", result.resume_text)
+        self.assertIn("招聘高级Java工程师", result.jd_text)
+
+    def test_hard_limit(self):
+        result = self.budgeter(60).fit(RESUME, "JD " * 500)
+        self.assertLessEqual(result.input_tokens, 60)
+        self.assertTrue(result.truncated)
+
+    def test_context_window_limits_budget(self):
+        budgeter = self.budgeter(0)
+        self.assertEqual(budgeter.compute_budget(8192, 4096, 1000), 3096)
+
+
+class TestEngineBudget(unittest.TestCase):
+    def test_prompt_uses_trimmed_resume(self):
+        from src.core.engine import TalentOSEngine
+
+        engine = TalentOSEngine()
+        engine._storage = None
+        engine._budgeter = PromptBudgeter(
+            PromptConfig(max_input_tokens=300, min_input_tokens=50, reserve_tokens=0),
+            counter=TokenCounter(encoding="")
+        )
+        noisy = RESUME.replace("\n", "\n- 1 -\n")
+        response = LLMResponse(content="Score: 80", model="test", tokens_used=10, latency_ms=1.0)
+
+        with patch.object(engine, '_call_llm_with_retry', return_value=response) as mock_call:
+            result = engine.analyze(noisy, "招聘高级Java工程师", use_cache=False)
+
+        prompt = mock_call.call_args.kwargs["messages"][1]["content"]
+        self.assertNotIn("- 1 -", prompt)
+        self.assertNotIn("兴趣爱好", prompt)
+        self.assertLess(result.metadata["input_tokens_estimate"], result.metadata["input_tokens_original"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.interfaces.illm_provider import CACHE_PREFIX_KEY, LLMResponse, strip_cache_hints
+from src.plugins.llm_providers.anthropic import AnthropicProvider
+from src.plugins.llm_providers.deepseek import DeepSeekProvider
+from src.plugins.llm_providers.openai import OpenAIProvider
+
+JD = "招聘高级Java工程师, 负责支付系统架构"
+
+
+class TestPromptPrefix(unittest.TestCase):
+    def setUp(self):
+        from src.core.engine import TalentOSEngine
+
+        self.engine = TalentOSEngine()
+        self.engine._storage = None
+        self.response = LLMResponse(content="Score: 80", model="test", tokens_used=10, latency_ms=1.0,
+                                    cached_tokens=1024)
+
+    def test_analysis_messages_share_prefix(self):
+        persona = self.engine._personas["hrbp"]
+        first = self.engine._build_analysis_messages("Resume A: Java, Kafka", JD, persona)
+        second = self.engine._build_analysis_messages("Resume B: Go, Redis", JD, persona)
+
+        # System prompt is static; the user message starts with the JD
+        self.assertEqual(first[0], second[0])
+        self.assertNotIn(JD, first[0]["content"])
+        self.assertIn("OUTPUT REQUIREMENTS", first[0]["content"])
+        self.assertEqual(first[1][CACHE_PREFIX_KEY], second[1][CACHE_PREFIX_KEY])
+        self.assertTrue(first[1]["content"].startswith(first[1][CACHE_PREFIX_KEY]))
+        self.assertTrue(first[1]["content"].endswith("Resume A: Java, Kafka"))
+
+    def test_match_prompt_puts_resume_last(self):
+        with patch.object(self.engine, '_call_llm_with_retry', return_value=self.response) as mock_call:
+            self.engine.evaluate_match("Resume A: Java, Kafka", JD, use_cache=False)
+
+        system, user = mock_call.call_args_list[0].kwargs["messages"]
+        self.assertNotIn(JD, system["content"])
+        self.assertTrue(user["content"].startswith(user[CACHE_PREFIX_KEY]))
+        self.assertIn(JD, user[CACHE_PREFIX_KEY])
+        self.assertNotIn("Resume A", user[CACHE_PREFIX_KEY])
+
+    def test_cached_tokens_reported(self):
+        with patch.object(self.engine, '_call_llm_with_retry', return_value=self.response):
+            result = self.engine.analyze("Resume A: Java, Kafka", JD, use_cache=False)
+        self.assertEqual(result.metadata["cached_tokens"], 1024)
+
+
+class TestProviderCaching(unittest.TestCase):
+    def test_strip_cache_hints(self):
+        messages = [
+            {"role": "system", "content": "static"},
+            {"role": "user", "content": "JD\nresume", CACHE_PREFIX_KEY: "JD\n"},
+        ]
+        self.assertEqual(strip_cache_hints(messages), [
+            {"role": "system", "content": "static"},
+            {"role": "user", "content": "JD\nresume"},
+        ])
+        # The caller's messages are untouched
+        self.assertIn(CACHE_PREFIX_KEY, messages[1])
+
+    def test_openai_compatible_usage(self):
+        openai = OpenAIProvider(api_key="test")
+        usage = SimpleNamespace(prompt_tokens_details=SimpleNamespace(cached_tokens=512))
+        self.assertEqual(openai._cached_tokens(usage), 512)
+        self.assertEqual(openai._cached_tokens(SimpleNamespace(prompt_tokens_details=None)), 0)
+
+        deepseek = DeepSeekProvider(api_key="test")
+        self.assertEqual(deepseek._cached_tokens(SimpleNamespace(prompt_cache_hit_tokens=256)), 256)
+        self.assertEqual(deepseek._cached_tokens(None), 0)
+
+    def test_anthropic_cache_breakpoints(self):
+        provider = AnthropicProvider(api_key="test")
+        provider._client = MagicMock()
+        provider._client.messages.create.return_value = SimpleNamespace(
+            content=[SimpleNamespace(text="ok")],
+            usage=SimpleNamespace(input_tokens=20, output_tokens=5,
+                                  cache_read_input_tokens=1500, cache_creation_input_tokens=0)
+        )
+
+        response = provider.chat(
+            messages=[
+                {"role": "system", "content": "static instructions"},
+                {"role": "user", "content": "JD\nresume", CACHE_PREFIX_KEY: "JD\n"},
+            ],
+            model="claude-sonnet-4-20250514"
+        )
+
+        kwargs = provider._client.messages.create.call_args.kwargs
+        self.assertEqual(kwargs["system"], [
+            {"type": "text", "text": "static instructions", "cache_control": {"type": "ephemeral"}}
+        ])
+        self.assertEqual(kwargs["messages"], [{"role": "user", "content": [
+            {"type": "text", "text": "JD\n", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "resume"},
+        ]}])
+        self.assertEqual(response.cached_tokens, 1500)
+        self.assertEqual(response.tokens_used, 1525)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import unittest
+from unittest.mock import MagicMock
+import os
+import sys
+import threading
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config import AppConfig, LLMProviderConfig, ResilienceConfig
+from src.core.exceptions import LLMAPIError, LLMProviderError
+from src.core.provider_pool import ProviderPool
+from src.core.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, LatencyWindow
+from src.core.router import Route
+from src.interfaces.illm_provider import LLMResponse
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+def reply(content="ok"):
+    return LLMResponse(content=content, model="test", tokens_used=10, latency_ms=1.0)
+
+
+def fake_provider(side_effect=None):
+    provider = MagicMock()
+    provider.is_available.return_value = True
+    provider.supports_json_mode = False
+    provider.chat.side_effect = side_effect or (lambda **kwargs: reply())
+    return provider
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_and_probes(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow_request())
+
+        clock.now = 10
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertTrue(breaker.allow_request())
+        # Only one probe at a time
+        self.assertFalse(breaker.allow_request())
+
+        # A failed probe opens the circuit again
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        clock.now = 20
+        self.assertTrue(breaker.allow_request())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_latency_percentile(self):
+        window = LatencyWindow(size=100)
+        self.assertIsNone(window.percentile(0.95))
+        for ms in range(1, 101):
+            window.record(float(ms))
+        self.assertEqual(window.percentile(0.5), 51.0)
+        self.assertEqual(window.percentile(0.95), 96.0)
+
+
+class TestProviderPool(unittest.TestCase):
+    def setUp(self):
+        self.app_config = AppConfig(llm_providers={
+            "deepseek": LLMProviderConfig(provider="deepseek"),
+            "openai": LLMProviderConfig(provider="openai"),
+        })
+        self.providers = {"deepseek": fake_provider(), "openai": fake_provider()}
+        self.sleep = MagicMock()
+
+    def pool(self, **config):
+        return ProviderPool(ResilienceConfig(**config), self.app_config,
+                            provider_factory=lambda name, config: self.providers[name], sleep=self.sleep)
+
+    def route(self, name="deepseek", model="deepseek-chat"):
+        return Route(name, model, self.providers[name])
+
+    def test_fails_over_without_sleeping(self):
+        self.providers["deepseek"].chat.side_effect = LLMAPIError("timeout", status_code=504)
+        pool = self.pool()
+        response = pool.chat(self.route(), MESSAGES, temperature=0.2)
+
+        self.assertEqual(response.provider, "openai")
+        self.sleep.assert_not_called()
+        # The fallback provider uses its own default model
+        self.assertIsNone(self.providers["openai"].chat.call_args.kwargs["model"])
+        self.assertEqual(pool.health_report()["deepseek"]["failures"], 1)
+
+    def test_backoff_only_after_full_round(self):
+        for provider in self.providers.values():
+            provider.chat.side_effect = LLMAPIError("down", status_code=503)
+        with self.assertRaises(LLMAPIError):
+            self.pool().chat(self.route(), MESSAGES, max_retries=3)
+        self.sleep.assert_called_once_with(1.0)
+
+    def test_open_circuit_skipped(self):
+        self.providers["deepseek"].chat.side_effect = LLMAPIError("down", status_code=503)
+        pool = self.pool(failure_threshold=2)
+        for _ in range(2):
+            pool.chat(self.route(), MESSAGES)
+        self.assertEqual(pool.health_report()["deepseek"]["state"], OPEN)
+
+        self.providers["deepseek"].chat.reset_mock()
+        pool.chat(self.route(), MESSAGES)
+        self.providers["deepseek"].chat.assert_not_called()
+
+        # Without failover there is nowhere left to send the request
+        pool = self.pool(failure_threshold=1, failover=False)
+        with self.assertRaises(LLMAPIError):
+            pool.chat(self.route(), MESSAGES, max_retries=1)
+        with self.assertRaises(LLMProviderError):
+            pool.chat(self.route(), MESSAGES)
+
+    def test_client_error_neither_fails_over_nor_opens_circuit(self):
+        self.providers["deepseek"].chat.side_effect = LLMAPIError("context too long", status_code=400)
+        pool = self.pool(failure_threshold=1)
+        for _ in range(2):
+            with self.assertRaises(LLMAPIError):
+                pool.chat(self.route(), MESSAGES)
+
+        self.assertEqual(self.providers["deepseek"].chat.call_count, 2)
+        self.providers["openai"].chat.assert_not_called()
+        self.sleep.assert_not_called()
+        self.assertEqual(pool.health_report()["deepseek"]["state"], CLOSED)
+
+        # Timeouts and rate limits are still retried elsewhere
+        self.providers["deepseek"].chat.side_effect = LLMAPIError("rate limited", status_code=429)
+        self.assertEqual(pool.chat(self.route(), MESSAGES).provider, "openai")
+
+    def test_hedges_slow_request(self):
+        release = threading.Event()
+
+        def slow(**kwargs):
+            release.wait(5)
+            return reply("slow")
+
+        pool = self.pool(hedging=True, hedge_min_samples=3, hedge_min_delay_ms=10)
+        for _ in range(3):
+            pool.health("deepseek").record_success(20.0)
+
+        self.providers["deepseek"].chat.side_effect = slow
+        self.providers["openai"].chat.side_effect = lambda **kwargs: reply("fast")
+        try:
+            response = pool.chat(self.route(), MESSAGES)
+        finally:
+            release.set()
+
+        self.assertEqual(response.content, "fast")
+        self.assertEqual(response.provider, "openai")
+
+    def test_no_hedge_without_latency_history(self):
+        pool = self.pool(hedging=True, hedge_min_samples=3)
+        pool.chat(self.route(), MESSAGES)
+        self.providers["openai"].chat.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config import AppConfig, LLMProviderConfig, ModelConfig, StorageConfig
+from src.core.exceptions import LLMAPIError, LLMRateLimitError
+from src.core.structured_output import MatchBatchItem, MatchEvaluation, ResumeFields
+from src.interfaces.illm_provider import LLMResponse, ReasoningChunk
+from src.plugins.llm_providers import get_provider
+from src.plugins.llm_providers.replay import ReplayProvider, request_key
+
+MESSAGES = [{"role": "system", "content": "You are a recruiter."},
+            {"role": "user", "content": "Evaluate this resume."}]
+JSON_MODE = {"response_format": {"type": "json_object"}}
+
+
+def replay(**options):
+    options.setdefault("time_scale", 0)
+    return ReplayProvider(LLMProviderConfig(provider="replay", options=options))
+
+
+def drain(stream):
+    """Chunks of a chat_stream() generator and its return value."""
+    chunks = []
+    while True:
+        try:
+            chunks.append(next(stream))
+        except StopIteration as stop:
+            return chunks, stop.value
+
+
+class TestReplayProvider(unittest.TestCase):
+    def test_registered(self):
+        provider = get_provider("replay", config=LLMProviderConfig(provider="replay"))
+        self.assertIsInstance(provider, ReplayProvider)
+        self.assertTrue(provider.health_check())
+
+    def test_deterministic_for_seed(self):
+        def run(seed):
+            provider = replay(seed=seed)
+            return [provider.chat(MESSAGES).content for _ in range(2)]
+
+        first = run(3)
+        # Repeats of a request differ from each other, but not across runs
+        self.assertNotEqual(first[0], first[1])
+        self.assertEqual(run(3), first)
+        self.assertNotEqual(run(4), first)
+
+    def test_recordings_cycle(self):
+        key = request_key(MESSAGES)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "recordings.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                for content in ("first", "second"):
+                    f.write(json.dumps({"key": key, "content": content, "latency_ms": 120,
+                                        "prompt_tokens": 50, "completion_tokens": 5}) + "\n")
+
+            provider = replay(recordings=path, on_miss="error")
+            responses = [provider.chat(MESSAGES) for _ in range(3)]
+            self.assertEqual([r.content for r in responses], ["first", "second", "first"])
+            self.assertEqual(responses[0].latency_ms, 120)
+            self.assertEqual(responses[0].tokens_used, 55)
+
+            with self.assertRaises(LLMAPIError):
+                provider.chat([{"role": "user", "content": "not recorded"}])
+
+    def test_record_upstream(self):
+        upstream = replay(seed=9)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "recordings.jsonl")
+            recorder = replay(recordings=path, record_upstream="upstream")
+            recorder._upstream = upstream
+            recorded = recorder.chat(MESSAGES).content
+
+            self.assertEqual(replay(recordings=path, on_miss="error").chat(MESSAGES).content, recorded)
+
+    def test_synthetic_json_matches_schemas(self):
+        provider = replay()
+        single = json.loads(provider.chat(MESSAGES, **JSON_MODE).content)
+        MatchEvaluation.model_validate(single)
+        ResumeFields.model_validate(single)
+
+        batch_messages = [{"role": "user", "content": "### RESUME R1\nJava\n\n### RESUME R2\nGo"}]
+        batch = json.loads(provider.chat(batch_messages, **JSON_MODE).content)
+        items = [MatchBatchItem.model_validate(item) for item in batch["results"]]
+        self.assertEqual([item.id for item in items], ["R1", "R2"])
+
+    def test_error_and_rate_limit_rates(self):
+        provider = replay(error_rate=0.2, rate_limit_rate=0.3, retry_after=2)
+        outcomes = {"ok": 0, "error": 0, "rate_limited": 0}
+        for i in range(400):
+            try:
+                provider.chat([{"role": "user", "content": f"q{i}"}])
+                outcomes["ok"] += 1
+            except LLMRateLimitError as e:
+                self.assertEqual(e.retry_after, 2)
+                outcomes["rate_limited"] += 1
+            except LLMAPIError as e:
+                self.assertEqual(e.status_code, 503)
+                outcomes["error"] += 1
+
+        self.assertAlmostEqual(outcomes["rate_limited"] / 400, 0.3, delta=0.08)
+        self.assertAlmostEqual(outcomes["error"] / 400, 0.2, delta=0.08)
+
+    def test_stream_cadence_and_usage(self):
+        delays = []
+        provider = ReplayProvider(
+            LLMProviderConfig(provider="replay", options={
+                "ttft_median_ms": 300, "ttft_sigma": 0, "chunk_interval_ms": 10,
+                "chunk_chars": 5, "reasoning_chars": 20, "completion_chars": 40,
+            }),
+            sleep=delays.append
+        )
+        chunks, response = drain(provider.chat_stream(MESSAGES))
+
+        self.assertAlmostEqual(delays[0], 0.3)
+        self.assertEqual(len(delays), len(chunks))
+        self.assertIsInstance(chunks[0], ReasoningChunk)
+        self.assertNotIsInstance(chunks[-1], ReasoningChunk)
+        self.assertIsInstance(response, LLMResponse)
+        content = "".join(c for c in chunks if not isinstance(c, ReasoningChunk))
+        self.assertEqual(response.content, content)
+        self.assertGreater(response.reasoning_tokens, 0)
+        self.assertGreater(response.completion_tokens, response.reasoning_tokens)
+
+    def test_embeddings_deterministic(self):
+        provider = replay(embedding_dim=8)
+        vector = provider.embed("Java engineer")
+        self.assertEqual(len(vector), 8)
+        self.assertEqual(vector, replay(embedding_dim=8).embed("Java engineer"))
+        self.assertAlmostEqual(sum(v * v for v in vector), 1.0)
+
+
+class TestEngineWithReplay(unittest.TestCase):
+    def test_evaluate_match_end_to_end(self):
+        from src.core.engine import TalentOSEngine
+
+        config = AppConfig(
+            llm_providers={"replay": LLMProviderConfig(
+                provider="replay", models=[ModelConfig(name="replay")], default_model="replay",
+                options={"time_scale": 0}
+            )},
+            storage=StorageConfig(backend="sqlite", enabled=False)
+        )
+        engine = TalentOSEngine(config=config, llm_provider="replay")
+        result = engine.evaluate_match("张三 Python 后端工程师 五年经验", "招聘 Python 后端工程师，三年以上经验")
+        self.assertIn("score", result)
+        self.assertTrue(0 <= result["score"] <= 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config import AppConfig, LLMProviderConfig, ModelConfig, RouteConfig, RoutingConfig
+from src.core.router import ModelRouter, Route
+from src.interfaces.illm_provider import LLMResponse
+
+RESUME = "张三 | zhangsan@example.com\n2018-2024 ACME Java 工程师"
+
+
+def provider_config(name, model, enabled=True):
+    return LLMProviderConfig(provider=name, enabled=enabled, default_model=model,
+                             models=[ModelConfig(name=model, temperature=0.5)])
+
+
+def fake_provider(available=True):
+    provider = MagicMock()
+    provider.is_available.return_value = available
+    provider.supports_json_mode = False
+    return provider
+
+
+class TestModelRouter(unittest.TestCase):
+    def setUp(self):
+        self.app_config = AppConfig(llm_providers={
+            "deepseek": provider_config("deepseek", "deepseek-chat"),
+            "openai": provider_config("openai", "gpt-4o"),
+            "anthropic": provider_config("anthropic", "claude-sonnet", enabled=False),
+        })
+        self.providers = {"openai": fake_provider()}
+        self.factory = MagicMock(side_effect=lambda name, config: self.providers[name])
+        self.routing = RoutingConfig(
+            enabled=True,
+            tiers={
+                "fast": ["deepseek:deepseek-chat", "default"],
+                "strong": ["anthropic:claude-sonnet", "openai", "default"],
+            },
+            operations={
+                "extract_resume_fields": RouteConfig(tier="fast", escalate_to="strong"),
+                "translate_text": RouteConfig(tier="fast"),
+                "analyze": RouteConfig(tier="strong"),
+            },
+        )
+        self.default = Route("deepseek", None, fake_provider())
+
+    def router(self, routing=None):
+        return ModelRouter(routing or self.routing, self.app_config, provider_factory=self.factory)
+
+    def test_tiers_and_escalation(self):
+        routes = self.router().routes("extract_resume_fields", self.default)
+        self.assertEqual([(r.provider_name, r.model, r.tier) for r in routes],
+                         [("deepseek", "deepseek-chat", "fast"), ("openai", "gpt-4o", "strong")])
+        # The engine's own provider instance is reused
+        self.assertIs(routes[0].provider, self.default.provider)
+        self.assertIs(routes[1].provider, self.providers["openai"])
+
+        self.assertEqual(len(self.router().routes("translate_text", self.default)), 1)
+
+    def test_providers_created_once(self):
+        router = self.router()
+        router.routes("analyze", self.default)
+        router.routes("analyze", self.default)
+        self.factory.assert_called_once()
+        # Disabled providers are never created
+        self.assertEqual(self.factory.call_args.args[0], "openai")
+
+    def test_unavailable_candidates_skipped(self):
+        self.providers["openai"] = fake_provider(available=False)
+        routes = self.router().routes("analyze", self.default)
+        self.assertEqual([(r.provider_name, r.model) for r in routes], [("deepseek", "deepseek-chat")])
+
+        # No escalation to the same model
+        routes = self.router().routes("extract_resume_fields", self.default)
+        self.assertEqual(len(routes), 1)
+
+    def test_disabled_or_unrouted(self):
+        self.assertEqual(self.router().routes("generate_message", self.default), [self.default])
+        routing = RoutingConfig(enabled=False, tiers=self.routing.tiers, operations=self.routing.operations)
+        self.assertEqual(self.router(routing).routes("analyze", self.default), [self.default])
+        # Shipped default
+        self.assertFalse(RoutingConfig().enabled)
+
+    def test_pinned_provider_skips_other_providers(self):
+        switched = Route("openai", None, fake_provider())
+        routes = self.router().routes("extract_resume_fields", switched, pin_provider=True)
+        self.assertEqual([(r.provider_name, r.model) for r in routes], [("openai", "gpt-4o")])
+        self.assertIs(routes[0].provider, switched.provider)
+
+
+class TestEngineRouting(unittest.TestCase):
+    def setUp(self):
+        from src.core.engine import TalentOSEngine
+
+        self.engine = TalentOSEngine()
+        self.engine._storage = None
+        self.cheap = Route("deepseek", "deepseek-chat", fake_provider(), "fast")
+        self.strong = Route("openai", "gpt-4o", fake_provider(), "strong")
+        self.engine._router = MagicMock()
+        self.engine._router.routes.return_value = [self.cheap, self.strong]
+
+    def test_invalid_output_escalates(self):
+        def chat(messages, route=None, **kwargs):
+            if route is self.cheap:
+                return LLMResponse(content="不是JSON", model="deepseek-chat", tokens_used=100, latency_ms=1.0)
+            return LLMResponse(content='{"name": "张三"}', model="gpt-4o", tokens_used=300, latency_ms=1.0)
+
+        with patch.object(self.engine, '_call_llm_with_retry', side_effect=chat) as mock_call:
+            data = self.engine.extract_resume_fields(RESUME, use_cache=False)
+
+        self.assertEqual(data["name"], "张三")
+        self.assertEqual(data["_metadata"]["provider"], "openai")
+        self.assertEqual(data["_metadata"]["escalations"], 1)
+        # Cheap request + repair, then one strong request
+        self.assertEqual(data["_metadata"]["tokens_used"], 500)
+        self.assertEqual([c.kwargs["model"] for c in mock_call.call_args_list],
+                         ["deepseek-chat", "deepseek-chat", "gpt-4o"])
+
+    def test_valid_output_stays_cheap(self):
+        response = LLMResponse(content='{"score": 75, "status": "Suitable"}', model="deepseek-chat",
+                               tokens_used=100, latency_ms=1.0)
+        with patch.object(self.engine, '_call_llm_with_retry', return_value=response) as mock_call:
+            data = self.engine.evaluate_match(RESUME, "招聘高级Java工程师, 负责支付系统架构设计", use_cache=False)
+
+        self.assertEqual(data["score"], 75)
+        mock_call.assert_called_once()
+        self.assertIs(mock_call.call_args.kwargs["route"], self.cheap)
+
+    def test_provider_switch_overrides_routing(self):
+        app_config = AppConfig(llm_providers={
+            "deepseek": provider_config("deepseek", "deepseek-chat"),
+            "openai": provider_config("openai", "gpt-4o"),
+        })
+        routing = RoutingConfig(enabled=True, tiers={"fast": ["deepseek:deepseek-chat", "default"]},
+                                operations={"evaluate_match": RouteConfig(tier="fast")})
+        self.engine._router = ModelRouter(routing, app_config, provider_factory=lambda name, config: fake_provider())
+        self.engine._current_provider = "openai"
+        self.assertEqual(self.engine._routes("evaluate_match")[0].provider_name, "deepseek")
+
+        def switch(provider_name):
+            self.engine._current_provider = provider_name
+            self.engine._llm_provider = fake_provider()
+
+        with patch.object(self.engine, '_setup_llm_provider', side_effect=switch):
+            self.engine.set_llm_provider("openai")
+        [route] = self.engine._routes("evaluate_match")
+        self.assertEqual(route.provider_name, "openai")
+        self.assertIs(route.provider, self.engine._llm_provider)
+
+    def test_explicit_model_pins_current_provider(self):
+        routes = self.engine._routes("analyze", model="deepseek-chat")
+        self.assertEqual(len(routes), 1)
+        self.assertEqual(routes[0].provider_name, self.engine._current_provider)
+        self.engine._router.routes.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config import ScreeningConfig
+from src.core.screening import ScreeningFunnel, extract_keywords
+
+JD = "招聘 Java 后端工程师: 熟悉 Spring Boot, Kafka, Redis, MySQL, 有支付系统经验优先"
+RESUMES = [
+    "前端工程师, React, TypeScript, CSS 动画",
+    "Java 后端开发, Spring Boot, Kafka, Redis, MySQL, 负责支付系统重构",
+    "Java 开发, Spring Boot, MySQL",
+    "销售经理, 负责华东区域渠道拓展",
+]
+
+
+class TestScreeningFunnel(unittest.TestCase):
+    def test_extract_keywords(self):
+        keywords = extract_keywords("Java, C++ and Node.js; 支付系统")
+        self.assertTrue(keywords["java"])
+        self.assertTrue(keywords["c++"])
+        self.assertTrue(keywords["node.js"])
+        self.assertNotIn("and", keywords)
+        self.assertFalse(keywords["支付"])
+
+    def test_keyword_ranking(self):
+        funnel = ScreeningFunnel(ScreeningConfig(top_k=2))
+        ranked = funnel.rank(RESUMES, JD)
+        self.assertEqual([c.index for c in ranked[:2]], [1, 2])
+        self.assertIsNone(ranked[0].similarity)
+        self.assertIn("kafka", ranked[0].matched_keywords)
+        self.assertIn("kafka", ranked[1].missing_keywords)
+
+        shortlist, rest = funnel.split(ranked)
+        self.assertEqual([c.index for c in shortlist], [1, 2])
+        self.assertEqual(sorted(c.index for c in rest), [0, 3])
+
+        # Threshold instead of a fixed count
+        shortlist, _ = funnel.split(ranked, top_k=0, min_local_score=ranked[1].local_score)
+        self.assertEqual([c.index for c in shortlist], [1, 2])
+
+    def test_embeddings_blended(self):
+        vectors = {JD: [1.0, 0.0]}
+
+        calls = []
+
+        def embed_batch(texts):
+            calls.append(texts)
+            # Resume 3 is "semantically" closest to the JD
+            return [vectors.get(text, [1.0, 0.0] if text == RESUMES[3] else [0.0, 1.0]) for text in texts]
+
+        funnel = ScreeningFunnel(ScreeningConfig(embedding_weight=0.9), embed_batch=embed_batch)
+        ranked = funnel.rank(RESUMES, JD)
+        self.assertEqual(ranked[0].index, 3)
+        self.assertEqual(ranked[0].similarity, 1.0)
+        # JD and every resume in a single request
+        self.assertEqual(calls, [[JD] + RESUMES])
+
+    def test_embedding_failure_falls_back_to_keywords(self):
+        def embed_batch(texts):
+            raise NotImplementedError("no embeddings")
+
+        ranked = ScreeningFunnel(ScreeningConfig(), embed_batch=embed_batch).rank(RESUMES, JD)
+        self.assertEqual(ranked[0].index, 1)
+        self.assertIsNone(ranked[0].similarity)
+
+
+class TestEngineScreening(unittest.TestCase):
+    def test_only_shortlist_reaches_llm(self):
+        from src.core.engine import TalentOSEngine
+
+        engine = TalentOSEngine()
+        engine._embedding_provider = None  # keyword-only ranking
+
+        def fake_batch(resumes, jd_text, **kwargs):
+            return [{"score": 88, "status": "Suitable"} for _ in resumes]
+
+        with patch.object(engine, 'evaluate_match_batch', side_effect=fake_batch) as mock_batch:
+            results = engine.screen_candidates(RESUMES, JD, top_k=1)
+
+        self.assertEqual(mock_batch.call_args.args[0], [RESUMES[1]])
+        self.assertEqual(results[1]["scored_by"], "llm")
+        self.assertEqual(results[1]["score"], 88)
+        self.assertEqual(results[1]["screening"]["rank"], 1)
+        for i in (0, 2, 3):
+            self.assertEqual(results[i]["scored_by"], "local")
+            self.assertEqual(results[i]["status"], "Not Shortlisted")
+            self.assertLess(results[i]["score"], 88)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import json
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config import RoutingConfig
+from src.core.router import ModelRouter
+from src.core.structured_output import (
+    IncrementalJSONParser,
+    MatchEvaluation,
+    ResumeFields,
+    load_json,
+    request_structured,
+)
+from src.interfaces.illm_provider import LLMResponse, ReasoningChunk
+from src.plugins.storage.memory_cache import MemoryCache
+
+RESUME = "张三 | zhangsan@example.com\n2018-2024 ACME Java 工程师"
+JD = "招聘高级Java工程师, 负责支付系统架构设计"
+
+
+def reply(content, tokens=10):
+    return LLMResponse(content=content, model="test", tokens_used=tokens, latency_ms=1.0)
+
+
+class TestJSONHelpers(unittest.TestCase):
+    def test_load_json_repairs_locally(self):
+        self.assertEqual(load_json('```json\n{"a": 1}\n```'), {"a": 1})
+        self.assertEqual(load_json('Result: {"a": [1, 2,],} Thanks!'), {"a": [1, 2]})
+        # Truncated output is closed
+        self.assertEqual(load_json('{"a": {"b": "cut'), {"a": {"b": "cut"}})
+
+    def test_incremental_parser(self):
+        text = '```json\n{"name": "张三", "skills": ["Java", "a,b}"], "years_of_experience": 6}\n```'
+        parser = IncrementalJSONParser()
+        seen = []
+        for i in range(0, len(text), 4):
+            for name, value in parser.feed(text[i:i + 4]):
+                seen.append((name, value, len(parser.text)))
+
+        self.assertEqual([(n, v) for n, v, _ in seen],
+                         [("name", "张三"), ("skills", ["Java", "a,b}"]), ("years_of_experience", 6)])
+        # Fields are reported before the stream ends
+        self.assertLess(seen[0][2], len(text) // 2)
+        self.assertTrue(parser.done)
+
+    def test_incremental_parser_array(self):
+        parser = IncrementalJSONParser()
+        self.assertEqual(list(parser.feed('[{"id": "R1"}, {"id": "R2"}]')),
+                         [(0, {"id": "R1"}), (1, {"id": "R2"})])
+
+
+class TestRequestStructured(unittest.TestCase):
+    def test_valid_output_single_call(self):
+        chat = MagicMock(return_value=reply('{"score": "85", "status": "Suitable"}'))
+        result = request_structured(chat, [{"role": "user", "content": RESUME}], MatchEvaluation)
+        self.assertTrue(result.ok)
+        self.assertEqual(result.data.score, 85)
+        self.assertEqual(chat.call_count, 1)
+
+    def test_repair_sends_only_invalid_fields(self):
+        chat = MagicMock(side_effect=[
+            reply('{"name": "张三", "skills": ["Java"], "years_of_experience": "六年"}', tokens=500),
+            reply('{"years_of_experience": 6}', tokens=40),
+        ])
+        result = request_structured(chat, [{"role": "user", "content": RESUME}], ResumeFields)
+
+        self.assertTrue(result.ok)
+        self.assertEqual(result.data.years_of_experience, 6)
+        self.assertEqual(result.data.skills, ["Java"])
+        self.assertEqual(result.repairs, 1)
+        self.assertEqual(result.tokens_used, 540)
+
+        repair_prompt = json.dumps(chat.call_args.kwargs["messages"], ensure_ascii=False)
+        self.assertIn("六年", repair_prompt)
+        self.assertNotIn("ACME", repair_prompt)
+        self.assertNotIn("Java", repair_prompt)
+
+    def test_gives_up_after_max_repairs(self):
+        chat = MagicMock(return_value=reply("I cannot help with that."))
+        result = request_structured(chat, [{"role": "user", "content": RESUME}], MatchEvaluation, max_repairs=1)
+        self.assertFalse(result.ok)
+        self.assertEqual(chat.call_count, 2)
+
+
+class TestEngineStructuredOutput(unittest.TestCase):
+    def setUp(self):
+        from src.core.engine import TalentOSEngine
+
+        self.engine = TalentOSEngine()
+        self.engine._storage = MemoryCache()
+        # One route per operation: no escalation to other configured providers
+        self.engine._router = ModelRouter(RoutingConfig(enabled=False))
+
+    def test_failures_not_cached(self):
+        bad = reply("Sorry, something went wrong")
+        good = reply('{"score": 82, "status": "Suitable"}')
+        with patch.object(self.engine, '_call_llm_with_retry', side_effect=[bad, bad, good]) as mock_call:
+            first = self.engine.evaluate_match(RESUME, JD)
+            second = self.engine.evaluate_match(RESUME, JD)
+            third = self.engine.evaluate_match(RESUME, JD)
+
+        self.assertEqual(first["status"], "Error")
+        self.assertEqual(second["score"], 82)
+        self.assertEqual(third["score"], 82)
+        # Initial call + one repair, then a fresh call; the third is a cache hit
+        self.assertEqual(mock_call.call_count, 3)
+
+    def test_json_mode_requested_when_supported(self):
+        provider = MagicMock()
+        provider.supports_json_mode = True
+        self.engine._llm_provider = provider
+        with patch.object(self.engine, '_call_llm_with_retry', return_value=reply('{"name": "张三"}')) as mock_call:
+            self.engine.extract_resume_fields(RESUME, use_cache=False)
+        self.assertEqual(mock_call.call_args.kwargs["response_format"], {"type": "json_object"})
+
+        provider.supports_json_mode = False
+        with patch.object(self.engine, '_call_llm_with_retry', return_value=reply('{"name": "张三"}')) as mock_call:
+            self.engine.extract_resume_fields(RESUME, use_cache=False)
+        self.assertNotIn("response_format", mock_call.call_args.kwargs)
+
+    def test_extraction_stream(self):
+        provider = MagicMock()
+        provider.supports_json_mode = False
+        provider.chat_stream.return_value = iter(['{"name": "张', '三", "skills": ["Ja', 'va"]}'])
+        self.engine._llm_provider = provider
+
+        events = list(self.engine.extract_resume_fields_stream(RESUME))
+        self.assertEqual(events[0], {"event": "field", "field": "name", "value": "张三"})
+        self.assertEqual(events[1], {"event": "field", "field": "skills", "value": ["Java"]})
+        self.assertEqual(events[-1]["event"], "done")
+        self.assertEqual(events[-1]["data"]["skills"], ["Java"])
+
+        # The validated result was cached and is replayed without a request
+        provider.chat_stream.reset_mock()
+        events = list(self.engine.extract_resume_fields_stream(RESUME))
+        provider.chat_stream.assert_not_called()
+        self.assertEqual(events[-1]["data"]["name"], "张三")
+
+    def test_extraction_stream_skips_reasoning(self):
+        provider = MagicMock()
+        provider.supports_json_mode = False
+        provider.chat_stream.return_value = iter([
+            ReasoningChunk("> **Thinking Process:**\n> "),
+            ReasoningChunk('The output should look like {"name": ..., "skills": [...]}'),
+            ReasoningChunk("\n\n---\n\n"),
+            '{"name": "张三", "skills": ["Java"]}',
+        ])
+        self.engine._llm_provider = provider
+
+        with patch.object(self.engine, '_call_llm_with_retry') as mock_repair:
+            events = list(self.engine.extract_resume_fields_stream(RESUME, use_cache=False))
+        mock_repair.assert_not_called()
+        self.assertEqual(events[0], {"event": "field", "field": "name", "value": "张三"})
+        self.assertEqual(events[-1]["data"]["skills"], ["Java"])
+
+
+class TestDiagnosisEngine(unittest.TestCase):
+    def test_repairs_instead_of_failing(self):
+        from src.core.diagnosis_engine import DiagnosisEngine
+
+        provider = MagicMock()
+        provider.supports_json_mode = True
+        provider.chat.side_effect = [
+            reply('{"score": 40, "fatal_flaws": ["频繁跳槽"], "boss_reply_probability": "低", '
+                  '"improvement_suggestions": ["量化成果"]}'),
+            reply('{"boss_reply_probability": 20}'),
+        ]
+        result = DiagnosisEngine(provider).diagnose(RESUME, JD)
+        self.assertEqual(result.score, 40)
+        self.assertEqual(result.boss_reply_probability, 20)
+        self.assertEqual(provider.chat.call_args_list[0].kwargs["response_format"], {"type": "json_object"})
+
+
+if __name__ == '__main__':
+    unittest.main()
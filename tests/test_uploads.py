@@ -0,0 +1,128 @@
+import unittest
+import asyncio
+import io
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi import FastAPI, UploadFile, File
+from fastapi.testclient import TestClient
+from starlette.datastructures import UploadFile as StarletteUploadFile
+
+from src.core.config import UploadConfig
+from src.core.exceptions import UploadTooLargeError, UploadRejectedError
+from src.core.uploads import UploadReader, UploadLimitMiddleware, sniff_format
+from tests.fixture_builders import build_pdf
+
+
+class CountingStream(io.BytesIO):
+    """BytesIO that records how many bytes were handed out."""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.consumed = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.consumed += len(chunk)
+        return chunk
+
+
+def make_upload(name: str, data: bytes, with_size: bool = False):
+    stream = CountingStream(data)
+    return StarletteUploadFile(stream, filename=name, size=len(data) if with_size else None)
+
+
+class TestUploadReader(unittest.TestCase):
+    def setUp(self):
+        self.config = UploadConfig(max_file_bytes=1000, max_request_bytes=1500, chunk_size=100)
+
+    def read(self, reader, upload):
+        return asyncio.run(reader.read(upload))
+
+    def test_reads_valid_pdf(self):
+        content = build_pdf([["Resume"]])
+        reader = UploadReader(UploadConfig(chunk_size=100))
+        self.assertEqual(self.read(reader, make_upload("cv.pdf", content)), content)
+
+    def test_stops_reading_oversized_file(self):
+        upload = make_upload("cv.txt", b"a" * 5000)
+        with self.assertRaises(UploadTooLargeError):
+            self.read(UploadReader(self.config), upload)
+        self.assertLessEqual(upload.file.consumed, 1100)
+
+    def test_rejects_declared_size_without_reading(self):
+        upload = make_upload("cv.txt", b"a" * 5000, with_size=True)
+        with self.assertRaises(UploadTooLargeError):
+            self.read(UploadReader(self.config), upload)
+        self.assertEqual(upload.file.consumed, 0)
+
+    def test_magic_bytes_checked_on_first_chunk(self):
+        upload = make_upload("cv.pdf", b"PK\x03\x04" + b"x" * 900)
+        with self.assertRaises(UploadRejectedError):
+            self.read(UploadReader(self.config), upload)
+        self.assertEqual(upload.file.consumed, 100)
+
+    def test_batch_reports_per_file_errors(self):
+        reader = UploadReader(self.config)
+        files = [
+            make_upload("a.txt", b"first"),
+            make_upload("big.txt", b"a" * 1200),
+            make_upload("fake.docx", b"plain text"),
+            make_upload("b.md", b"second"),
+        ]
+        results = asyncio.run(reader.read_batch(files))
+        self.assertEqual([r.ok for r in results], [True, False, False, True])
+        self.assertEqual(results[3].content, b"second")
+
+    def test_batch_request_limit_raises(self):
+        reader = UploadReader(self.config)
+        files = [make_upload(f"{i}.txt", b"a" * 900) for i in range(3)]
+        with self.assertRaises(UploadTooLargeError):
+            asyncio.run(reader.read_batch(files))
+
+    def test_sniff_format(self):
+        sniff_format(b"\n%PDF-1.4", "cv.pdf")
+        sniff_format("简历".encode("gbk"), "cv.txt")
+        with self.assertRaises(UploadRejectedError):
+            sniff_format(b"MZ\x00\x00", "cv.txt")
+        with self.assertRaises(UploadRejectedError):
+            sniff_format(b"\xd0\xcf\x11\xe0", "cv.doc")
+
+
+class TestUploadLimitMiddleware(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+        app.add_middleware(UploadLimitMiddleware, max_request_bytes=2000)
+
+        @app.post("/upload")
+        async def upload(file: UploadFile = File(...)):
+            return {"size": len(await file.read())}
+
+        self.client = TestClient(app)
+
+    def test_small_request_passes(self):
+        response = self.client.post("/upload", files={"file": ("a.txt", b"hello")})
+        self.assertEqual(response.json(), {"size": 5})
+
+    def test_content_length_over_limit(self):
+        response = self.client.post("/upload", files={"file": ("a.txt", b"a" * 5000)})
+        self.assertEqual(response.status_code, 413)
+
+    def test_streamed_body_over_limit(self):
+        def body():
+            for _ in range(10):
+                yield b"a" * 500
+
+        response = self.client.post(
+            "/upload",
+            content=body(),
+            headers={"content-type": "multipart/form-data; boundary=x"}
+        )
+        self.assertEqual(response.status_code, 413)
+
+
+if __name__ == '__main__':
+    unittest.main()